@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Callable, Optional, Tuple, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 PRODUCTION_ENVIRONMENTS = {"prod", "production"}
 PROD_WRITE_ACK_ENV = "MW_PROD_WRITES_ACK"
@@ -106,6 +106,56 @@ def compute_retry_backoff(
     return candidate
 
 
+# Observers told about every upstream HTTP attempt (request tracing, metrics);
+# the clients stay unaware of who (if anyone) is listening.
+_UPSTREAM_OBSERVERS: List[Callable[..., None]] = []
+
+
+def register_upstream_observer(observer: Callable[..., None]) -> None:
+    if observer not in _UPSTREAM_OBSERVERS:
+        _UPSTREAM_OBSERVERS.append(observer)
+
+
+def notify_upstream_attempt(
+    service: str,
+    *,
+    attempt: int,
+    status_code: Optional[int],
+    latency_ms: Optional[int] = None,
+) -> None:
+    for observer in _UPSTREAM_OBSERVERS:
+        try:
+            observer(
+                service, attempt=attempt, status_code=status_code, latency_ms=latency_ms
+            )
+        except Exception:
+            # Instrumentation must never break an upstream call.
+            pass
+
+
+# Replaces the clients' default HttpTransport process-wide (cassette
+# record/replay, load simulation). An explicit ``transport=`` still wins.
+_TRANSPORT_FACTORY: Dict[str, Optional[Callable[[str, Callable[[], Any]], Any]]] = {
+    "factory": None
+}
+
+
+def set_transport_factory(
+    factory: Optional[Callable[[str, Callable[[], Any]], Any]]
+) -> Optional[Callable[[str, Callable[[], Any]], Any]]:
+    """Install ``factory(service, default)``; returns the previous one."""
+    previous = _TRANSPORT_FACTORY["factory"]
+    _TRANSPORT_FACTORY["factory"] = factory
+    return previous
+
+
+def default_transport(service: str, default: Callable[[], Any]) -> Any:
+    factory = _TRANSPORT_FACTORY["factory"]
+    if factory is None:
+        return default()
+    return factory(service, default)
+
+
 def get_header_value(
     headers: Dict[str, str], keys: Tuple[str, ...]
 ) -> Optional[str]:
@@ -128,9 +178,13 @@ __all__ = [
     "PROD_WRITE_ACK_ENV",
     "PROD_WRITE_ACK_PHRASE",
     "compute_retry_backoff",
+    "default_transport",
     "get_header_value",
     "log_env_resolution_warning",
+    "notify_upstream_attempt",
     "prod_write_acknowledged",
     "prod_write_ack_matches",
+    "register_upstream_observer",
     "resolve_env_name",
+    "set_transport_factory",
 ]
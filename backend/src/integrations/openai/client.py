@@ -5,14 +5,20 @@ import json
 import logging
 import os
 import random
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
-from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
-
-from integrations.common import compute_retry_backoff, resolve_env_name
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Deque, Dict, List, Optional, Protocol, Tuple
+
+from integrations.common import (
+    compute_retry_backoff,
+    default_transport,
+    notify_upstream_attempt,
+    resolve_env_name,
+)
 
 try:
     import boto3  # type: ignore
@@ -42,6 +48,175 @@ def _uses_max_completion_tokens(model: str) -> bool:
     return model.strip().lower().startswith("gpt-5")
 
 
+def latency_budget_from_env(name: str) -> Optional[float]:
+    """Read a per-call-type latency budget (seconds); unset/invalid/<=0 means none."""
+    raw = os.environ.get(name)
+    if raw is None or not str(raw).strip():
+        return None
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+class LatencyHistogram:
+    """
+    Rolling window of completed-request latencies per model.
+
+    Shared by every client in the process (clients are built per call), so the
+    percentiles reflect recent traffic rather than a single request.
+    """
+
+    def __init__(self, *, window: int = 200) -> None:
+        self._window = max(1, int(window))
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None:
+                samples = self._samples[model] = deque(maxlen=self._window)
+            samples.append(max(0.0, float(seconds)))
+
+    def count(self, model: str) -> int:
+        with self._lock:
+            return len(self._samples.get(model) or ())
+
+    def percentile(self, model: str, pct: float) -> Optional[float]:
+        with self._lock:
+            ordered = sorted(self._samples.get(model) or ())
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            models = list(self._samples)
+        summary: Dict[str, Dict[str, Any]] = {}
+        for model in models:
+            summary[model] = {
+                "count": self.count(model),
+                "p50_ms": round((self.percentile(model, 50) or 0.0) * 1000, 1),
+                "p95_ms": round((self.percentile(model, 95) or 0.0) * 1000, 1),
+                "p99_ms": round((self.percentile(model, 99) or 0.0) * 1000, 1),
+            }
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+LATENCY_HISTOGRAM = LatencyHistogram()
+
+
+class PromptCacheStats:
+    """
+    Per-call-type prompt token totals, split by provider prompt-cache hits.
+
+    A call counts as a hit when the provider reports any cached prompt tokens.
+    latency_saved_ms estimates the win as (mean miss latency - mean hit
+    latency) * hit calls, and is None until both sides have samples.
+    """
+
+    _FIELDS = (
+        "calls",
+        "prompt_tokens",
+        "cached_tokens",
+        "completion_tokens",
+        "hit_calls",
+        "hit_latency_ms",
+        "miss_latency_ms",
+    )
+
+    def __init__(self) -> None:
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self, call_type: Optional[str], usage: "ChatCompletionUsage", latency_ms: int
+    ) -> None:
+        key = call_type or "unspecified"
+        hit = usage.cached_tokens > 0
+        with self._lock:
+            totals = self._totals.get(key)
+            if totals is None:
+                totals = self._totals[key] = dict.fromkeys(self._FIELDS, 0)
+            totals["calls"] += 1
+            totals["prompt_tokens"] += usage.prompt_tokens
+            totals["cached_tokens"] += usage.cached_tokens
+            totals["completion_tokens"] += usage.completion_tokens
+            if hit:
+                totals["hit_calls"] += 1
+                totals["hit_latency_ms"] += max(0, int(latency_ms))
+            else:
+                totals["miss_latency_ms"] += max(0, int(latency_ms))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items = [(key, dict(totals)) for key, totals in self._totals.items()]
+        summary: Dict[str, Dict[str, Any]] = {}
+        for key, totals in sorted(items):
+            calls = totals["calls"]
+            hits = totals["hit_calls"]
+            misses = calls - hits
+            mean_hit = totals["hit_latency_ms"] / hits if hits else None
+            mean_miss = totals["miss_latency_ms"] / misses if misses else None
+            saved = None
+            if mean_hit is not None and mean_miss is not None:
+                saved = round(max(0.0, mean_miss - mean_hit) * hits, 1)
+            summary[key] = {
+                "calls": calls,
+                "prompt_tokens": totals["prompt_tokens"],
+                "cached_tokens": totals["cached_tokens"],
+                "completion_tokens": totals["completion_tokens"],
+                "cache_hit_ratio": round(totals["cached_tokens"] / totals["prompt_tokens"], 4)
+                if totals["prompt_tokens"]
+                else 0.0,
+                "cache_hit_calls": hits,
+                "mean_latency_ms_hit": round(mean_hit, 1) if mean_hit is not None else None,
+                "mean_latency_ms_miss": round(mean_miss, 1) if mean_miss is not None else None,
+                "latency_saved_ms": saved,
+            }
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+PROMPT_CACHE_STATS = PromptCacheStats()
+
+# call_type -> monotonic time until which the fast model is used.
+_FAST_MODEL_UNTIL: Dict[str, float] = {}
+_FAST_MODEL_LOCK = threading.Lock()
+
+_HEDGE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_HEDGE_EXECUTOR_LOCK = threading.Lock()
+_HEDGE_WORKERS = 8
+# Never let a nearly spent budget shrink an attempt timeout below this.
+_MIN_ATTEMPT_TIMEOUT_SECONDS = 1.0
+
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    global _HEDGE_EXECUTOR
+    if _HEDGE_EXECUTOR is None:
+        with _HEDGE_EXECUTOR_LOCK:
+            if _HEDGE_EXECUTOR is None:
+                _HEDGE_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=_HEDGE_WORKERS, thread_name_prefix="openai-hedge"
+                )
+    return _HEDGE_EXECUTOR
+
+
+def reset_fast_model_fallbacks() -> None:
+    with _FAST_MODEL_LOCK:
+        _FAST_MODEL_UNTIL.clear()
+
+
 @dataclass
 class ChatMessage:
     role: str
@@ -56,6 +231,9 @@ class ChatCompletionRequest:
     max_tokens: int = 256
     metadata: Dict[str, Any] = field(default_factory=dict)
     timeout_seconds: Optional[float] = None
+    # Client-side only (never sent): which caller this is, and how long it may take.
+    call_type: Optional[str] = None
+    latency_budget_seconds: Optional[float] = None
 
     def to_payload(self) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
@@ -79,6 +257,37 @@ class ChatCompletionRequest:
         return payload
 
 
+@dataclass(frozen=True)
+class ChatCompletionUsage:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    # Prompt tokens served from the provider's prefix cache.
+    cached_tokens: int = 0
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> Optional["ChatCompletionUsage"]:
+        usage = raw.get("usage") if isinstance(raw, dict) else None
+        if not isinstance(usage, dict):
+            return None
+        details = usage.get("prompt_tokens_details")
+        if not isinstance(details, dict):
+            details = {}
+
+        def _count(value: Any) -> int:
+            try:
+                return max(0, int(value or 0))
+            except (TypeError, ValueError):
+                return 0
+
+        return cls(
+            prompt_tokens=_count(usage.get("prompt_tokens")),
+            completion_tokens=_count(usage.get("completion_tokens")),
+            total_tokens=_count(usage.get("total_tokens")),
+            cached_tokens=_count(details.get("cached_tokens")),
+        )
+
+
 @dataclass
 class ChatCompletionResponse:
     model: str
@@ -88,6 +297,7 @@ class ChatCompletionResponse:
     raw: Dict[str, Any] = field(default_factory=dict)
     dry_run: bool = False
     reason: Optional[str] = None
+    usage: Optional[ChatCompletionUsage] = None
 
 
 @dataclass
@@ -132,6 +342,9 @@ class HttpTransport:
     """Minimal urllib-based transport to avoid external deps."""
 
     def send(self, request: TransportRequest) -> TransportResponse:
+        import urllib.error
+        import urllib.request
+
         req = urllib.request.Request(
             request.url,
             data=request.body,
@@ -161,6 +374,10 @@ class OpenAIClient:
     - Defaults to blocking network calls unless explicitly allowed.
     - Short-circuits when safe_mode is True or automation_enabled is False.
     - Retries 429/5xx and transport errors with jittered backoff.
+    - Optionally hedges: once an attempt outlives the model's observed p95,
+      a duplicate request is sent and the first answer wins.
+    - Honors per-request latency budgets; a breach switches that call type
+      to OPENAI_FAST_MODEL for a cooldown window.
     - Redacts Authorization headers in logs.
     - API key is loaded from AWS Secrets Manager by default
       (rp-mw/<env>/openai/api_key); env var override remains supported.
@@ -182,6 +399,9 @@ class OpenAIClient:
         sleeper: Optional[Callable[[float], None]] = None,
         rng: Optional[Callable[[], float]] = None,
         secrets_client: Optional[Any] = None,
+        latency_histogram: Optional[LatencyHistogram] = None,
+        clock: Optional[Callable[[], float]] = None,
+        prompt_cache_stats: Optional[PromptCacheStats] = None,
     ) -> None:
         self.environment, _ = resolve_env_name()
         self.base_url = (
@@ -211,11 +431,23 @@ class OpenAIClient:
         self.backoff_max_seconds = float(
             os.environ.get("OPENAI_BACKOFF_MAX_SECONDS", backoff_max_seconds)
         )
-        self.transport = transport or HttpTransport()
+        self.transport = transport or default_transport("openai", HttpTransport)
         self._logger = logger or logging.getLogger(__name__)
         self._sleeper = sleeper or time.sleep
         self._rng = rng or random.random
         self._secrets_client_obj = secrets_client
+        self.latency_histogram = latency_histogram or LATENCY_HISTOGRAM
+        self.prompt_cache_stats = prompt_cache_stats or PROMPT_CACHE_STATS
+        self._clock = clock or time.monotonic
+        self.hedge_enabled = _to_bool(os.environ.get("OPENAI_HEDGE_ENABLED"), default=False)
+        self.hedge_percentile = float(os.environ.get("OPENAI_HEDGE_PERCENTILE", 95))
+        self.hedge_min_samples = max(
+            1, int(os.environ.get("OPENAI_HEDGE_MIN_SAMPLES", 20))
+        )
+        self.fast_model = (os.environ.get("OPENAI_FAST_MODEL") or "").strip() or None
+        self.fast_model_cooldown_seconds = float(
+            os.environ.get("OPENAI_FAST_MODEL_COOLDOWN_SECONDS", 300)
+        )
 
     def chat_completion(
         self,
@@ -261,30 +493,52 @@ class OpenAIClient:
                 reason=reason,
             )
 
+        fast_model = self.fast_model
+        if fast_model and self._fast_model_active(request.call_type):
+            request = replace(request, model=fast_model)
         payload = self._encode_body(request)
         headers = self._build_headers(has_body=bool(payload))
 
         attempt = 1
         last_response: Optional[ChatCompletionResponse] = None
+        deadline = (
+            self._clock() + request.latency_budget_seconds
+            if request.latency_budget_seconds
+            else None
+        )
 
         while attempt <= self.max_attempts:
             start = time.monotonic()
             try:
-                transport_response = self.transport.send(
+                transport_response = self._send(
                     TransportRequest(
                         method="POST",
                         url=url,
                         headers=headers,
                         body=payload,
-                        timeout=float(request.timeout_seconds or self.timeout_seconds),
-                    )
+                        timeout=self._attempt_timeout(request, deadline),
+                    ),
+                    request.model,
                 )
             except TransportError as exc:
+                notify_upstream_attempt(
+                    "openai",
+                    attempt=attempt,
+                    status_code=None,
+                    latency_ms=int((time.monotonic() - start) * 1000),
+                )
                 self._logger.warning(
                     "openai.transport_error",
                     extra={"url": url, "attempt": attempt},
                 )
-                if attempt >= self.max_attempts:
+                fast_request = self._budget_fallback(request, deadline)
+                if fast_request is not None and attempt < self.max_attempts:
+                    # One last attempt on the fast model with a normal timeout.
+                    request, deadline = fast_request, None
+                    payload = self._encode_body(request)
+                    attempt = self.max_attempts
+                    continue
+                if attempt >= self.max_attempts or self._budget_spent(deadline):
                     raise OpenAIRequestError(
                         f"OpenAI transport failed after {attempt} attempts"
                     ) from exc
@@ -295,17 +549,36 @@ class OpenAIClient:
 
             latency_ms = int((time.monotonic() - start) * 1000)
             response = self._to_response(transport_response, url, request.model)
+            notify_upstream_attempt(
+                "openai",
+                attempt=attempt,
+                status_code=response.status_code,
+                latency_ms=latency_ms,
+            )
             last_response = response
 
             should_retry, delay = self._should_retry(response, attempt)
             self._log_response(
-                response, latency_ms, attempt, delay if should_retry else None
+                response,
+                latency_ms,
+                attempt,
+                delay if should_retry else None,
+                call_type=request.call_type,
             )
 
             if should_retry and attempt < self.max_attempts:
-                self._sleep(delay)
-                attempt += 1
-                continue
+                fast_request = self._budget_fallback(request, deadline)
+                if fast_request is not None:
+                    request, deadline = fast_request, None
+                    payload = self._encode_body(request)
+                    attempt = self.max_attempts
+                    continue
+                if not self._budget_spent(deadline):
+                    self._sleep(delay)
+                    attempt += 1
+                    continue
+            elif self._budget_spent(deadline):
+                self._budget_fallback(request, deadline)
 
             if response.status_code >= 500 or response.status_code == 429:
                 raise OpenAIRequestError(
@@ -313,6 +586,10 @@ class OpenAIClient:
                     response=response,
                 )
 
+            if response.usage is not None:
+                self.prompt_cache_stats.record(
+                    request.call_type, response.usage, latency_ms
+                )
             return response
 
         raise OpenAIRequestError(
@@ -320,6 +597,104 @@ class OpenAIClient:
             response=last_response,
         )
 
+    def _send(self, transport_request: TransportRequest, model: str) -> TransportResponse:
+        """Send one attempt, hedging with a duplicate once it outlives the model's p95."""
+        hedge_delay = self._hedge_delay(model, transport_request.timeout)
+        if hedge_delay is None:
+            return self._timed_send(transport_request, model)
+
+        executor = _hedge_executor()
+        pending = {executor.submit(self._timed_send, transport_request, model)}
+        done, pending = wait(pending, timeout=hedge_delay)
+        if not done:
+            self._logger.info(
+                "openai.hedge_sent",
+                extra={
+                    "url": transport_request.url,
+                    "model": model,
+                    "hedge_delay_ms": int(hedge_delay * 1000),
+                },
+            )
+            pending.add(executor.submit(self._timed_send, transport_request, model))
+        last_error: Optional[BaseException] = None
+        while True:
+            for future in done:
+                try:
+                    return future.result()
+                except TransportError as exc:
+                    last_error = exc
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        if last_error is None:  # pragma: no cover - every future either returns or raises
+            raise TransportError("hedged request produced no response")
+        raise last_error
+
+    def _timed_send(
+        self, transport_request: TransportRequest, model: str
+    ) -> TransportResponse:
+        start = time.monotonic()
+        response = self.transport.send(transport_request)
+        if response.status_code < 500 and response.status_code != 429:
+            self.latency_histogram.record(model, time.monotonic() - start)
+        return response
+
+    def _hedge_delay(self, model: str, timeout: float) -> Optional[float]:
+        if not self.hedge_enabled:
+            return None
+        if self.latency_histogram.count(model) < self.hedge_min_samples:
+            return None
+        delay = self.latency_histogram.percentile(model, self.hedge_percentile)
+        if delay is None or delay >= timeout:
+            return None
+        return delay
+
+    def _attempt_timeout(
+        self, request: ChatCompletionRequest, deadline: Optional[float]
+    ) -> float:
+        timeout = float(request.timeout_seconds or self.timeout_seconds)
+        if deadline is None:
+            return timeout
+        remaining = deadline - self._clock()
+        return min(timeout, max(remaining, _MIN_ATTEMPT_TIMEOUT_SECONDS))
+
+    def _budget_spent(self, deadline: Optional[float]) -> bool:
+        return deadline is not None and self._clock() >= deadline
+
+    def _fast_model_active(self, call_type: Optional[str]) -> bool:
+        if not self.fast_model or not call_type:
+            return False
+        with _FAST_MODEL_LOCK:
+            until = _FAST_MODEL_UNTIL.get(call_type)
+        return until is not None and self._clock() < until
+
+    def _budget_fallback(
+        self, request: ChatCompletionRequest, deadline: Optional[float]
+    ) -> Optional[ChatCompletionRequest]:
+        """
+        On a budget breach, pin the call type to the fast model for the cooldown
+        and return the request re-targeted at it (None if already there / unset).
+        """
+        if not self._budget_spent(deadline):
+            return None
+        self._logger.warning(
+            "openai.latency_budget_exceeded",
+            extra={
+                "call_type": request.call_type,
+                "model": request.model,
+                "budget_seconds": request.latency_budget_seconds,
+            },
+        )
+        if not self.fast_model or not request.call_type:
+            return None
+        with _FAST_MODEL_LOCK:
+            _FAST_MODEL_UNTIL[request.call_type] = (
+                self._clock() + self.fast_model_cooldown_seconds
+            )
+        if request.model == self.fast_model:
+            return None
+        return replace(request, model=self.fast_model)
+
     def _short_circuit_reason(
         self, safe_mode: bool, automation_enabled: bool
     ) -> Optional[str]:
@@ -411,6 +786,7 @@ class OpenAIClient:
             url=url,
             raw=raw_json,
             dry_run=False,
+            usage=ChatCompletionUsage.from_raw(raw_json),
         )
 
     def _should_retry(
@@ -448,14 +824,21 @@ class OpenAIClient:
         latency_ms: int,
         attempt: int,
         retry_in: Optional[float],
+        *,
+        call_type: Optional[str] = None,
     ) -> None:
-        extra = {
+        extra: Dict[str, Any] = {
             "url": response.url,
             "status": response.status_code,
             "latency_ms": latency_ms,
             "attempt": attempt,
             "dry_run": response.dry_run,
         }
+        if call_type:
+            extra["call_type"] = call_type
+        if response.usage is not None:
+            extra["prompt_tokens"] = response.usage.prompt_tokens
+            extra["cached_tokens"] = response.usage.cached_tokens
         if retry_in is not None:
             extra["retry_in"] = retry_in
             self._logger.warning("openai.retry", extra=extra)
@@ -481,13 +864,20 @@ class OpenAIClient:
 __all__ = [
     "ChatCompletionRequest",
     "ChatCompletionResponse",
+    "ChatCompletionUsage",
     "ChatMessage",
     "HttpTransport",
+    "LATENCY_HISTOGRAM",
+    "LatencyHistogram",
     "OpenAIClient",
     "OpenAIConfigError",
     "OpenAIRequestError",
+    "PROMPT_CACHE_STATS",
+    "PromptCacheStats",
     "Transport",
     "TransportError",
     "TransportRequest",
     "TransportResponse",
+    "latency_budget_from_env",
+    "reset_fast_model_fallbacks",
 ]
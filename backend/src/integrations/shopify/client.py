@@ -7,9 +7,7 @@ import os
 import random
 import re
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
@@ -18,7 +16,9 @@ from integrations.common import (
     PROD_WRITE_ACK_ENV,
     PRODUCTION_ENVIRONMENTS,
     compute_retry_backoff,
+    default_transport,
     log_env_resolution_warning,
+    notify_upstream_attempt,
     prod_write_acknowledged,
     resolve_env_name,
 )
@@ -133,6 +133,9 @@ class HttpTransport:
     """Minimal urllib-based transport to avoid external dependencies."""
 
     def send(self, request: TransportRequest) -> TransportResponse:
+        import urllib.error
+        import urllib.request
+
         req = urllib.request.Request(
             request.url,
             data=request.body,
@@ -240,7 +243,7 @@ class ShopifyClient:
         self.backoff_max_seconds = float(
             os.environ.get("SHOPIFY_HTTP_BACKOFF_MAX_SECONDS", backoff_max_seconds)
         )
-        self.transport = transport or HttpTransport()
+        self.transport = transport or default_transport("shopify", HttpTransport)
         self._logger = logger or logging.getLogger(__name__)
         log_env_resolution_warning(
             self._logger,
@@ -402,6 +405,12 @@ class ShopifyClient:
                     )
                 )
             except TransportError as exc:
+                notify_upstream_attempt(
+                    "shopify",
+                    attempt=attempt,
+                    status_code=None,
+                    latency_ms=int((time.monotonic() - start) * 1000),
+                )
                 self._logger.warning(
                     "shopify.transport_error",
                     extra={"method": method_upper, "url": url, "attempt": attempt},
@@ -418,6 +427,12 @@ class ShopifyClient:
 
             latency_ms = int((time.monotonic() - start) * 1000)
             response = self._to_response(transport_response, url)
+            notify_upstream_attempt(
+                "shopify",
+                attempt=attempt,
+                status_code=response.status_code,
+                latency_ms=latency_ms,
+            )
             last_response = response
 
             refresh_reason = "refresh_unavailable"
@@ -16,12 +16,46 @@ except ImportError:  # pragma: no cover
 
     BotoCoreError = ClientError = _FallbackBotoError  # type: ignore
 
-from richpanel_middleware.ingest.envelope import build_event_envelope
+from richpanel_middleware.ingest.claim_check import (
+    PayloadStore,
+    payload_store_from_env,
+    prepare_payload,
+    slimming_enabled,
+)
+from richpanel_middleware.ingest.envelope import EventEnvelope, build_event_envelope
+from richpanel_middleware.ingest.lanes import (
+    DEFAULT_LANE_PIN_TTL_SECONDS,
+    LANE_FAST,
+    DynamoLanePinStore,
+    InMemoryLanePinStore,
+    LanePinStore,
+    resolve_lane,
+)
+from richpanel_middleware.integrations.richpanel.write_journal import (
+    DEFAULT_WRITE_JOURNAL_TTL_SECONDS,
+    ECHO_SUPPRESSION_STATS,
+    DynamoWriteJournal,
+    WriteJournal,
+    classify_echo,
+    echo_suppression_enabled,
+)
 
 LOGGER = logging.getLogger()
 LOGGER.setLevel(logging.INFO)
 
 QUEUE_URL = os.environ["QUEUE_URL"]
+# Optional fast lane for route-only events; unset keeps a single queue.
+FAST_QUEUE_URL = os.environ.get("FAST_QUEUE_URL", "")
+LANE_PIN_TABLE_NAME = os.environ.get("LANE_PIN_TABLE_NAME", "")
+LANE_PIN_TTL_SECONDS = int(
+    os.environ.get("MW_LANE_PIN_TTL_SECONDS", str(DEFAULT_LANE_PIN_TTL_SECONDS))
+)
+# Journal of our own Richpanel writes (filled by the worker); webhooks that
+# only echo those writes are acknowledged without being enqueued.
+WRITE_JOURNAL_TABLE_NAME = os.environ.get("WRITE_JOURNAL_TABLE_NAME", "")
+WRITE_JOURNAL_TTL_SECONDS = int(
+    os.environ.get("MW_WRITE_JOURNAL_TTL_SECONDS", str(DEFAULT_WRITE_JOURNAL_TTL_SECONDS))
+)
 WEBHOOK_SECRET_ARN = os.environ["WEBHOOK_SECRET_ARN"]
 DEFAULT_MESSAGE_GROUP_ID = os.environ.get("DEFAULT_MESSAGE_GROUP_ID", "rp-mw-default")
 EVENT_SOURCE = os.environ.get("EVENT_SOURCE", "richpanel_http_target")
@@ -30,6 +64,9 @@ TOKEN_CACHE_TTL_SECONDS = int(os.environ.get("WEBHOOK_TOKEN_CACHE_TTL", "300"))
 
 _SECRETS_CLIENT = None
 _SQS_CLIENT = None
+_LANE_PIN_STORE: LanePinStore | None = None
+_WRITE_JOURNAL: WriteJournal | None = None
+_PAYLOAD_STORE: Dict[str, Any] = {"loaded": False, "store": None}
 _TOKEN_CACHE: Dict[str, Any] = {"token": None, "expires_at": 0.0}
 
 
@@ -51,13 +88,31 @@ def lambda_handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
         return _error_response(401, "invalid_token")
 
     payload = _parse_payload(event)
+    if _is_echo(payload):
+        return {
+            "statusCode": 200,
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps({"status": "suppressed_echo"}),
+        }
     message_envelope = build_event_envelope(
         payload, default_group_id=DEFAULT_MESSAGE_GROUP_ID, source=EVENT_SOURCE
     )
+    if message_envelope.group_fallback:
+        # Counted by the IngressDefaultGroupFallback metric filter.
+        LOGGER.info(
+            "ingress.default_group_fallback",
+            extra={
+                "event_id": message_envelope.event_id,
+                "group_id": message_envelope.group_id,
+                "shard_key": message_envelope.group_fallback,
+            },
+        )
+    queue_url = _select_queue(message_envelope)
+    _slim_payload(message_envelope)
 
     try:
         _sqs_client().send_message(
-            QueueUrl=QUEUE_URL,
+            QueueUrl=queue_url,
             MessageBody=json.dumps(message_envelope.to_message()),
             MessageGroupId=message_envelope.group_id,
             MessageDeduplicationId=message_envelope.dedupe_id,
@@ -75,6 +130,7 @@ def lambda_handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
             "event_id": message_envelope.event_id,
             "group_id": message_envelope.group_id,
             "conversation_id": message_envelope.conversation_id,
+            "lane": message_envelope.lane,
         },
     )
 
@@ -90,6 +146,97 @@ def lambda_handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
     }
 
 
+def _select_queue(message_envelope: EventEnvelope) -> str:
+    """Pick the lane queue for the event and stamp the lane on the envelope."""
+    if not FAST_QUEUE_URL:
+        return QUEUE_URL
+    try:
+        decision, lane = resolve_lane(
+            message_envelope.payload,
+            message_envelope.group_id,
+            pin_store=_lane_pin_store(),
+        )
+    except Exception:
+        # Lane choice is an optimization; never fail ingress over it.
+        LOGGER.exception(
+            "ingress.lane_select_failed",
+            extra={"event_id": message_envelope.event_id},
+        )
+        return QUEUE_URL
+    message_envelope.lane = lane
+    LOGGER.info(
+        "ingress.lane_selected",
+        extra={
+            "event_id": message_envelope.event_id,
+            "lane": lane,
+            "classified_lane": decision.lane,
+            "lane_reason": decision.reason,
+            "pinned": lane != decision.lane,
+        },
+    )
+    return FAST_QUEUE_URL if lane == LANE_FAST else QUEUE_URL
+
+
+def _is_echo(payload: Dict[str, Any]) -> bool:
+    """True when the webhook only reflects a write the middleware just made."""
+    journal = _write_journal()
+    if journal is None or not echo_suppression_enabled():
+        return False
+    try:
+        decision = classify_echo(payload, journal=journal)
+    except Exception:
+        # Suppression is an optimization; never drop an event over it.
+        LOGGER.exception("ingress.echo_check_failed")
+        return False
+    if decision.echo:
+        # Counted by the IngressEchoSuppressed metric filter.
+        LOGGER.info(
+            "ingress.echo_suppressed",
+            extra={
+                "ticket_id": decision.ticket_id,
+                "operation": decision.operation,
+                "echo_reason": decision.reason,
+                "echo_stats": ECHO_SUPPRESSION_STATS.snapshot(),
+            },
+        )
+    return decision.echo
+
+
+def _slim_payload(message_envelope: EventEnvelope) -> None:
+    """Drop fields the pipeline never reads; claim-check oversized payloads."""
+    if not slimming_enabled():
+        return
+    try:
+        prepared = prepare_payload(message_envelope.payload, store=_payload_store())
+    except Exception:
+        LOGGER.exception(
+            "ingress.payload_slim_failed",
+            extra={"event_id": message_envelope.event_id},
+        )
+        return
+    message_envelope.payload = prepared.payload
+    if prepared.store_error:
+        LOGGER.warning(
+            "ingress.claim_check_failed",
+            extra={
+                "event_id": message_envelope.event_id,
+                "error_class": prepared.store_error,
+                "truncated_paths": list(prepared.truncated_paths),
+            },
+        )
+    if prepared.offloaded or prepared.truncated_paths:
+        LOGGER.info(
+            "ingress.payload_offloaded" if prepared.offloaded else "ingress.payload_truncated",
+            extra={
+                "event_id": message_envelope.event_id,
+                "original_bytes": prepared.original_bytes,
+                "queued_bytes": prepared.queued_bytes,
+                "dropped_key_count": len(prepared.dropped_keys),
+                "truncated_paths": list(prepared.truncated_paths),
+            },
+        )
+
+
 def _load_expected_token() -> str:
     now = time.time()
     cached = _TOKEN_CACHE.get("token")
@@ -148,6 +295,38 @@ def _secrets_client():
     return _SECRETS_CLIENT
 
 
+def _lane_pin_store() -> LanePinStore:
+    global _LANE_PIN_STORE
+    if _LANE_PIN_STORE is None:
+        if LANE_PIN_TABLE_NAME and boto3 is not None:
+            _LANE_PIN_STORE = DynamoLanePinStore(
+                boto3.resource("dynamodb").Table(LANE_PIN_TABLE_NAME),
+                ttl_seconds=LANE_PIN_TTL_SECONDS,
+            )
+        else:
+            _LANE_PIN_STORE = InMemoryLanePinStore(ttl_seconds=LANE_PIN_TTL_SECONDS)
+    return _LANE_PIN_STORE
+
+
+def _payload_store() -> PayloadStore | None:
+    if not _PAYLOAD_STORE["loaded"]:
+        _PAYLOAD_STORE["store"] = payload_store_from_env(
+            s3_client_factory=(lambda: boto3.client("s3")) if boto3 is not None else None
+        )
+        _PAYLOAD_STORE["loaded"] = True
+    return _PAYLOAD_STORE["store"]
+
+
+def _write_journal() -> WriteJournal | None:
+    global _WRITE_JOURNAL
+    if _WRITE_JOURNAL is None and WRITE_JOURNAL_TABLE_NAME and boto3 is not None:
+        _WRITE_JOURNAL = DynamoWriteJournal(
+            boto3.resource("dynamodb").Table(WRITE_JOURNAL_TABLE_NAME),
+            ttl_seconds=WRITE_JOURNAL_TTL_SECONDS,
+        )
+    return _WRITE_JOURNAL
+
+
 def _sqs_client():
     global _SQS_CLIENT
     if _SQS_CLIENT is None:
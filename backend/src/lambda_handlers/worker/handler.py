@@ -3,6 +3,7 @@ import json
 import logging
 import math
 import os
+import threading
 import time
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -27,6 +28,8 @@ else:  # pragma: no cover
     ServiceResource = Any
 
 from richpanel_middleware.automation.pipeline import (
+    AUTO_REPLY_MARKER_ATTR,
+    RESOLVED_ORDER_ATTR,
     ActionPlan,
     ExecutionResult,
     execute_order_status_reply,
@@ -35,7 +38,29 @@ from richpanel_middleware.automation.pipeline import (
     normalize_event,
     plan_actions,
 )
+from richpanel_middleware.ingest.claim_check import (
+    CLAIM_CHECK_KEY,
+    PayloadStore,
+    hydrate_payload,
+    payload_store_from_env,
+)
 from richpanel_middleware.ingest.envelope import EventEnvelope
+from richpanel_middleware.integrations.richpanel.write_journal import (
+    DEFAULT_WRITE_JOURNAL_TTL_SECONDS,
+    DynamoWriteJournal,
+    WriteJournal,
+    classify_echo,
+    echo_suppression_enabled,
+    set_write_journal,
+)
+from richpanel_middleware.observability.metrics import (
+    CACHE_LOOKUPS,
+    QUEUE_WAIT,
+    count,
+    metrics_scope,
+    put_metric,
+)
+from richpanel_middleware.observability.tracing import span, start_trace
 
 LOGGER = logging.getLogger()
 LOGGER.setLevel(logging.INFO)
@@ -44,6 +69,10 @@ IDEMPOTENCY_TABLE_NAME = os.environ["IDEMPOTENCY_TABLE_NAME"]
 SAFE_MODE_PARAM = os.environ["SAFE_MODE_PARAM"]
 AUTOMATION_ENABLED_PARAM = os.environ["AUTOMATION_ENABLED_PARAM"]
 FLAG_CACHE_TTL_SECONDS = int(os.environ.get("FLAG_CACHE_TTL_SECONDS", "30"))
+# Past FLAG_CACHE_TTL_SECONDS the cached kill switches are still served while a
+# background refresh runs; past this hard TTL the request path waits for SSM
+# and fails closed when it cannot read them.
+FLAG_CACHE_HARD_TTL_SECONDS = int(os.environ.get("FLAG_CACHE_HARD_TTL_SECONDS", "120"))
 IDEMPOTENCY_TTL_SECONDS = int(
     os.environ.get("IDEMPOTENCY_TTL_SECONDS", str(30 * 24 * 60 * 60))
 )
@@ -51,14 +80,29 @@ CONVERSATION_STATE_TABLE_NAME = os.environ.get("CONVERSATION_STATE_TABLE_NAME")
 CONVERSATION_STATE_TTL_SECONDS = int(
     os.environ.get("CONVERSATION_STATE_TTL_SECONDS", str(90 * 24 * 60 * 60))
 )
+# UTC hour bucket ("YYYY-MM-DDTHH") that partitions the updated_hour-index GSI,
+# so monitors can query recent state items instead of scanning the table.
+CONVERSATION_STATE_UPDATED_BUCKET_ATTR = "updated_hour"
 AUDIT_TRAIL_TABLE_NAME = os.environ.get("AUDIT_TRAIL_TABLE_NAME")
 AUDIT_TRAIL_TTL_SECONDS = int(
     os.environ.get("AUDIT_TRAIL_TTL_SECONDS", str(60 * 24 * 60 * 60))
 )
+WRITE_JOURNAL_TABLE_NAME = os.environ.get("WRITE_JOURNAL_TABLE_NAME")
+WRITE_JOURNAL_TTL_SECONDS = int(
+    os.environ.get("MW_WRITE_JOURNAL_TTL_SECONDS", str(DEFAULT_WRITE_JOURNAL_TTL_SECONDS))
+)
 
 MW_ALLOW_ENV_FLAG_OVERRIDE = "MW_ALLOW_ENV_FLAG_OVERRIDE"
 MW_SAFE_MODE_OVERRIDE = "MW_SAFE_MODE_OVERRIDE"
 MW_AUTOMATION_ENABLED_OVERRIDE = "MW_AUTOMATION_ENABLED_OVERRIDE"
+MW_CONVERSATION_MARKER_ENABLED = "MW_CONVERSATION_MARKER_ENABLED"
+MW_ORDER_RESOLUTION_REUSE_ENABLED = "MW_ORDER_RESOLUTION_REUSE_ENABLED"
+# Outbound outcomes that mean this conversation has been auto-replied/closed.
+_AUTO_REPLY_MARKER_REASONS = {
+    "sent",
+    "closed_after_existing_operator_reply",
+    "followup_after_auto_reply",
+}
 
 _SSM_CLIENT: BaseClient | None = None
 _DDB_RESOURCE: ServiceResource | None = None
@@ -67,12 +111,28 @@ _FLAG_CACHE: Dict[str, Any] = {
     "automation_enabled": False,
     "expires_at": 0.0,
 }
+# Guards _FLAG_CACHE; callers past the hard TTL wait on it for an in-flight refresh.
+_FLAG_REFRESH = threading.Condition()
+_FLAG_REFRESHING = False
+_FLAG_REFRESH_WAIT_SECONDS = 10.0
 _TABLE_CACHE: Dict[str, Any] = {}
+_PAYLOAD_STORE: Dict[str, Any] = {"loaded": False, "store": None}
+_WRITE_JOURNAL: WriteJournal | None = None
 
 
 def lambda_handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
+    # Hot-path metrics are buffered for the invocation and flushed as EMF.
+    with metrics_scope():
+        return _process_records(event)
+
+
+def _process_records(event: Dict[str, Any]) -> Dict[str, Any]:
     failures: List[Dict[str, str]] = []
+    kill_switch_started = time.perf_counter()
     safe_mode, automation_enabled = _load_kill_switches()
+    kill_switch_ms = (time.perf_counter() - kill_switch_started) * 1000
+    # Installs the journal RichpanelExecutor records our ticket writes into.
+    write_journal = _write_journal()
     outbound_enabled = _to_bool(
         os.environ.get("RICHPANEL_OUTBOUND_ENABLED"), default=False
     )
@@ -91,74 +151,270 @@ def lambda_handler(event: Dict[str, Any], _context: Any) -> Dict[str, Any]:
             failures.append({"itemIdentifier": message_id})
             continue
 
-        try:
-            envelope = normalize_event(body)
-            plan = plan_actions(
-                envelope,
-                safe_mode=safe_mode,
-                automation_enabled=automation_enabled,
-                allow_network=allow_network,
-                outbound_enabled=outbound_enabled,
-            )
-            _persist_idempotency(envelope, plan)
-            execution = _execute_and_record(envelope, plan)
-            outbound_result = _maybe_execute_outbound_reply(
-                envelope,
-                plan,
-                safe_mode=safe_mode,
-                automation_enabled=automation_enabled,
-                allow_network=allow_network,
-                outbound_enabled=outbound_enabled,
-            )
-            _record_openai_rewrite_evidence(
-                envelope, execution, outbound_result=outbound_result
-            )
-            _record_outbound_evidence(
-                envelope, execution, outbound_result=outbound_result
-            )
-            LOGGER.info(
-                "worker.processed",
-                extra={
-                    "event_id": envelope.event_id,
-                    "conversation_id": envelope.conversation_id,
-                    "safe_mode": plan.safe_mode,
-                    "automation_enabled": plan.automation_enabled,
-                    "mode": plan.mode,
-                    "actions": [a.get("type") for a in plan.actions],
-                    "dry_run": execution.dry_run,
-                    "outbound_sent": outbound_result.get("sent"),
-                    "outbound_reason": outbound_result.get("reason"),
-                },
-            )
-        except ClientError as exc:
-            code = getattr(exc, "response", {}).get("Error", {}).get("Code")
-            if code == "ConditionalCheckFailedException":
+        with start_trace(
+            "worker.event", logger=LOGGER, message_id=message_id
+        ) as trace:
+            trace.add_stage("kill_switches", kill_switch_ms)
+            try:
+                with span("claim_check"):
+                    _hydrate_claim_check(body)
+                with span("normalize_event"):
+                    envelope = normalize_event(body)
+                trace.set_attribute("event_id", envelope.event_id)
+                trace.set_attribute("conversation_id", envelope.conversation_id)
+                queue_wait_ms = _queue_wait_ms(record)
+                lane = envelope.lane or os.environ.get("MW_WORKER_LANE")
+                if queue_wait_ms is not None:
+                    put_metric(QUEUE_WAIT, queue_wait_ms, lane=lane)
+                with span("echo_check"):
+                    if _is_echo(envelope, write_journal):
+                        continue
+                with span("conversation_state"):
+                    conversation_state = _load_conversation_state(envelope)
+                with span("plan"):
+                    plan = plan_actions(
+                        envelope,
+                        safe_mode=safe_mode,
+                        automation_enabled=automation_enabled,
+                        allow_network=allow_network,
+                        outbound_enabled=outbound_enabled,
+                        auto_reply_marker=conversation_state.get(AUTO_REPLY_MARKER_ATTR),
+                        resolved_order=conversation_state.get(RESOLVED_ORDER_ATTR),
+                    )
+                with span("persist_idempotency"):
+                    _persist_idempotency(envelope, plan)
+                with span("execute_and_record"):
+                    execution = _execute_and_record(envelope, plan)
+                with span("outbound_reply"):
+                    outbound_result = _maybe_execute_outbound_reply(
+                        envelope,
+                        plan,
+                        safe_mode=safe_mode,
+                        automation_enabled=automation_enabled,
+                        allow_network=allow_network,
+                        outbound_enabled=outbound_enabled,
+                    )
+                with span("evidence"):
+                    _record_openai_rewrite_evidence(
+                        envelope, execution, outbound_result=outbound_result
+                    )
+                    _record_outbound_evidence(
+                        envelope, execution, outbound_result=outbound_result
+                    )
+                    _record_auto_reply_marker(
+                        envelope, plan, outbound_result=outbound_result
+                    )
                 LOGGER.info(
-                    "worker.duplicate_event",
+                    "worker.processed",
+                    extra={
+                        "event_id": envelope.event_id,
+                        "conversation_id": envelope.conversation_id,
+                        "safe_mode": plan.safe_mode,
+                        "automation_enabled": plan.automation_enabled,
+                        "mode": plan.mode,
+                        "actions": [a.get("type") for a in plan.actions],
+                        "dry_run": execution.dry_run,
+                        "outbound_sent": outbound_result.get("sent"),
+                        "outbound_reason": outbound_result.get("reason"),
+                        "lane": lane,
+                        "queue_wait_ms": queue_wait_ms,
+                    },
+                )
+            except ClientError as exc:
+                code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+                if code == "ConditionalCheckFailedException":
+                    LOGGER.info(
+                        "worker.duplicate_event",
+                        extra={"event_id": body.get("event_id")},
+                    )
+                else:
+                    LOGGER.exception(
+                        "worker.ddb_error",
+                        extra={"event_id": body.get("event_id")},
+                    )
+                    failures.append({"itemIdentifier": message_id})
+            except BotoCoreError:
+                LOGGER.exception(
+                    "worker.aws_core_error",
                     extra={"event_id": body.get("event_id")},
                 )
-            else:
+                failures.append({"itemIdentifier": message_id})
+            except Exception:
                 LOGGER.exception(
-                    "worker.ddb_error",
+                    "worker.unexpected_failure",
                     extra={"event_id": body.get("event_id")},
                 )
                 failures.append({"itemIdentifier": message_id})
-        except BotoCoreError:
-            LOGGER.exception(
-                "worker.aws_core_error",
-                extra={"event_id": body.get("event_id")},
-            )
-            failures.append({"itemIdentifier": message_id})
-        except Exception:
-            LOGGER.exception(
-                "worker.unexpected_failure",
-                extra={"event_id": body.get("event_id")},
-            )
-            failures.append({"itemIdentifier": message_id})
 
     return {"batchItemFailures": failures}
 
 
+def _hydrate_claim_check(body: Dict[str, Any]) -> None:
+    """Fetch an offloaded payload, but only if ingress had to cap pipeline fields."""
+    payload = body.get("payload") if isinstance(body, dict) else None
+    if not isinstance(payload, dict) or CLAIM_CHECK_KEY not in payload:
+        return
+    hydrated, fetched = hydrate_payload(payload, store=_payload_store())
+    if fetched:
+        body["payload"] = hydrated
+        LOGGER.info(
+            "worker.claim_check_hydrated",
+            extra={
+                "event_id": body.get("event_id"),
+                "bytes": payload[CLAIM_CHECK_KEY].get("bytes"),
+            },
+        )
+
+
+def _payload_store() -> PayloadStore | None:
+    if not _PAYLOAD_STORE["loaded"]:
+        _PAYLOAD_STORE["store"] = payload_store_from_env(
+            s3_client_factory=(lambda: boto3.client("s3")) if boto3 is not None else None
+        )
+        _PAYLOAD_STORE["loaded"] = True
+    return _PAYLOAD_STORE["store"]
+
+
+def _write_journal() -> WriteJournal | None:
+    global _WRITE_JOURNAL
+    if _WRITE_JOURNAL is None and WRITE_JOURNAL_TABLE_NAME:
+        _WRITE_JOURNAL = DynamoWriteJournal(
+            _table(WRITE_JOURNAL_TABLE_NAME), ttl_seconds=WRITE_JOURNAL_TTL_SECONDS
+        )
+        set_write_journal(_WRITE_JOURNAL)
+    return _WRITE_JOURNAL
+
+
+def _is_echo(envelope: EventEnvelope, journal: WriteJournal | None) -> bool:
+    """Drop queued events that only reflect a write made before they arrived."""
+    if journal is None or not echo_suppression_enabled():
+        return False
+    try:
+        received_at = datetime.fromisoformat(
+            str(envelope.received_at).replace("Z", "+00:00")
+        ).timestamp()
+    except ValueError:
+        return False
+    try:
+        decision = classify_echo(envelope.payload, journal=journal, received_at=received_at)
+    except Exception:
+        LOGGER.warning(
+            "worker.echo_check_failed",
+            extra={"event_id": envelope.event_id},
+            exc_info=True,
+        )
+        return False
+    if decision.echo:
+        LOGGER.info(
+            "worker.echo_suppressed",
+            extra={
+                "event_id": envelope.event_id,
+                "conversation_id": envelope.conversation_id,
+                "operation": decision.operation,
+                "echo_reason": decision.reason,
+            },
+        )
+    return decision.echo
+
+
+def _conversation_markers_enabled() -> bool:
+    return bool(CONVERSATION_STATE_TABLE_NAME) and _to_bool(
+        os.environ.get(MW_CONVERSATION_MARKER_ENABLED), default=True
+    )
+
+
+def _order_resolution_reuse_enabled() -> bool:
+    return bool(CONVERSATION_STATE_TABLE_NAME) and _to_bool(
+        os.environ.get(MW_ORDER_RESOLUTION_REUSE_ENABLED), default=True
+    )
+
+
+def _load_conversation_state(envelope: EventEnvelope) -> Dict[str, Any]:
+    """
+    One get_item for the attributes carried between events on a conversation
+    (auto-reply marker, resolved order); failures fall back to the full pipeline.
+    """
+    attributes = []
+    if _conversation_markers_enabled():
+        attributes.append(AUTO_REPLY_MARKER_ATTR)
+    if _order_resolution_reuse_enabled():
+        attributes.append(RESOLVED_ORDER_ATTR)
+    table_name = CONVERSATION_STATE_TABLE_NAME
+    if not attributes or not table_name:
+        return {}
+    conversation_id = _safe_str(envelope.conversation_id or envelope.group_id or "unknown")
+    try:
+        response = _table(table_name).get_item(
+            Key={"conversation_id": conversation_id},
+            ProjectionExpression=", ".join(attributes),
+        )
+    except Exception:
+        LOGGER.warning(
+            "worker.conversation_state_read_failed",
+            extra={"event_id": envelope.event_id},
+            exc_info=True,
+        )
+        return {}
+    item = (response or {}).get("Item") or {}
+    return {
+        name: item[name]
+        for name in attributes
+        if isinstance(item.get(name), dict) and item[name]
+    }
+
+
+def _record_auto_reply_marker(
+    envelope: EventEnvelope,
+    plan: ActionPlan,
+    *,
+    outbound_result: Dict[str, Any],
+) -> None:
+    table_name = CONVERSATION_STATE_TABLE_NAME
+    if not table_name or not _conversation_markers_enabled() or plan.auto_reply_marker:
+        return
+    if not isinstance(outbound_result, dict):
+        return
+    reason = outbound_result.get("reason")
+    if reason not in _AUTO_REPLY_MARKER_REASONS:
+        return
+    if reason != "followup_after_auto_reply" and outbound_result.get("sent") is not True:
+        return
+    if any(
+        isinstance(entry, dict) and entry.get("dry_run")
+        for entry in outbound_result.get("responses") or []
+    ):
+        return
+    conversation_id = _safe_str(envelope.conversation_id or envelope.group_id or "unknown")
+    marker = {
+        "reason": str(reason),
+        "event_id": _safe_str(envelope.event_id),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _table(table_name).update_item(
+        Key={"conversation_id": conversation_id},
+        UpdateExpression=f"SET {AUTO_REPLY_MARKER_ATTR} = :val",
+        ExpressionAttributeValues={":val": _ddb_sanitize(marker)},
+    )
+    LOGGER.info(
+        "worker.auto_reply_marker.recorded",
+        extra={
+            "event_id": envelope.event_id,
+            "conversation_id": conversation_id,
+            "reason": reason,
+        },
+    )
+
+
+def _queue_wait_ms(record: Dict[str, Any]) -> Optional[int]:
+    """Milliseconds the message sat in SQS before this delivery (head-of-line wait)."""
+    attributes = record.get("attributes") or {}
+    try:
+        sent = int(attributes["SentTimestamp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return max(0, int(time.time() * 1000) - sent)
+
+
 def _maybe_execute_outbound_reply(
     envelope: EventEnvelope,
     plan: ActionPlan,
@@ -437,6 +693,9 @@ def _execute_and_record(envelope: EventEnvelope, plan: ActionPlan) -> ExecutionR
         item["expires_at"] = _now_epoch_seconds() + max(
             CONVERSATION_STATE_TTL_SECONDS, 0
         )
+        item[CONVERSATION_STATE_UPDATED_BUCKET_ATTR] = _updated_hour_bucket(
+            record.get("updated_at")
+        )
         item = _ddb_sanitize(item)
         _table(CONVERSATION_STATE_TABLE_NAME).put_item(Item=item)
 
@@ -505,7 +764,18 @@ def _now_epoch_seconds() -> int:
     return int(time.time())
 
 
+def _updated_hour_bucket(updated_at: Any) -> str:
+    try:
+        parsed = datetime.fromisoformat(str(updated_at or "").replace("Z", "+00:00"))
+    except ValueError:
+        parsed = datetime.now(timezone.utc)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m-%dT%H")
+
+
 def _load_kill_switches() -> tuple[bool, bool]:
+    global _FLAG_REFRESHING
     override = _load_kill_switches_from_env_override()
     if override is not None:
         safe_mode, automation_enabled = override
@@ -514,9 +784,66 @@ def _load_kill_switches() -> tuple[bool, bool]:
         return safe_mode, automation_enabled
 
     now = time.time()
-    if now < _FLAG_CACHE.get("expires_at", 0):
+    with _FLAG_REFRESH:
+        cached = (_FLAG_CACHE["safe_mode"], _FLAG_CACHE["automation_enabled"])
+        expires_at = _FLAG_CACHE.get("expires_at", 0.0)
+        if now < expires_at:
+            count(CACHE_LOOKUPS, stage="kill_switches", outcome="hit")
+            return cached
+        grace = max(FLAG_CACHE_HARD_TTL_SECONDS - FLAG_CACHE_TTL_SECONDS, 0)
+        if now < expires_at + grace:
+            count(CACHE_LOOKUPS, stage="kill_switches", outcome="stale")
+            if not _FLAG_REFRESHING and now >= _FLAG_CACHE.get("retry_at", 0.0):
+                _FLAG_REFRESHING = True
+                threading.Thread(
+                    target=_refresh_kill_switches,
+                    kwargs={"blocking": False},
+                    name="kill-switch-refresh",
+                    daemon=True,
+                ).start()
+            return cached
+        count(CACHE_LOOKUPS, stage="kill_switches", outcome="miss")
+        if _FLAG_REFRESHING:
+            # Single flight: wait for the read already in progress.
+            if _FLAG_REFRESH.wait_for(
+                lambda: not _FLAG_REFRESHING, timeout=_FLAG_REFRESH_WAIT_SECONDS
+            ):
+                return _FLAG_CACHE["safe_mode"], _FLAG_CACHE["automation_enabled"]
+            LOGGER.warning("worker.flag_refresh_wait_timeout")
+            return True, False
+        _FLAG_REFRESHING = True
+    return _refresh_kill_switches(blocking=True)
+
+
+def _refresh_kill_switches(*, blocking: bool) -> tuple[bool, bool]:
+    """Reload the kill switches into _FLAG_CACHE; the caller has claimed the refresh."""
+    global _FLAG_REFRESHING
+    flags: Optional[Dict[str, Any]]
+    try:
+        flags = _read_kill_switches()
+    except Exception:
+        if blocking:
+            LOGGER.exception("worker.flag_load_failed")
+            flags = {"safe_mode": True, "automation_enabled": False, "versions": None}
+        else:
+            # Keep serving the stale flags until the hard TTL, retrying each soft TTL.
+            LOGGER.warning("worker.flag_refresh_failed", exc_info=True)
+            flags = None
+
+    now = time.time()
+    with _FLAG_REFRESH:
+        if flags is None:
+            _FLAG_CACHE["retry_at"] = now + FLAG_CACHE_TTL_SECONDS
+        else:
+            _FLAG_CACHE.update(flags)
+            _FLAG_CACHE.update({"expires_at": now + FLAG_CACHE_TTL_SECONDS, "retry_at": 0.0})
+        _FLAG_REFRESHING = False
+        _FLAG_REFRESH.notify_all()
         return _FLAG_CACHE["safe_mode"], _FLAG_CACHE["automation_enabled"]
 
+
+def _read_kill_switches() -> Dict[str, Any]:
+    """Read both flags from SSM; an empty dict means the cached flags still hold."""
     if boto3 is None:
         LOGGER.info(
             "worker.flags_offline_default",
@@ -525,44 +852,36 @@ def _load_kill_switches() -> tuple[bool, bool]:
                 "automation_enabled": _FLAG_CACHE["automation_enabled"],
             },
         )
-        _FLAG_CACHE["expires_at"] = now + FLAG_CACHE_TTL_SECONDS
-        return _FLAG_CACHE["safe_mode"], _FLAG_CACHE["automation_enabled"]
-
-    try:
-        response = _ssm_client().get_parameters(
-            Names=[SAFE_MODE_PARAM, AUTOMATION_ENABLED_PARAM], WithDecryption=False
-        )
-        values = {
-            param["Name"]: param.get("Value")
-            for param in response.get("Parameters", [])
-        }
-        if response.get("InvalidParameters"):
-            LOGGER.warning(
-                "worker.flag_missing",
-                extra={"invalid": response.get("InvalidParameters")},
-            )
+        return {}
 
-        safe_mode = _to_bool(values.get(SAFE_MODE_PARAM), default=False)
-        automation_enabled = _to_bool(
-            values.get(AUTOMATION_ENABLED_PARAM), default=True
+    response = _ssm_client().get_parameters(
+        Names=[SAFE_MODE_PARAM, AUTOMATION_ENABLED_PARAM], WithDecryption=False
+    )
+    parameters = response.get("Parameters", [])
+    if response.get("InvalidParameters"):
+        LOGGER.warning(
+            "worker.flag_missing",
+            extra={"invalid": response.get("InvalidParameters")},
         )
-    except Exception:
-        LOGGER.exception("worker.flag_load_failed")
-        safe_mode = True
-        automation_enabled = False
-
+    versions = {param["Name"]: param.get("Version") for param in parameters}
+    if (
+        versions
+        and None not in versions.values()
+        and versions == _FLAG_CACHE.get("versions")
+    ):
+        # Neither parameter changed since the last read.
+        return {}
+
+    values = {param["Name"]: param.get("Value") for param in parameters}
+    safe_mode = _to_bool(values.get(SAFE_MODE_PARAM), default=False)
+    automation_enabled = _to_bool(values.get(AUTOMATION_ENABLED_PARAM), default=True)
     if safe_mode:
         automation_enabled = False
-
-    _FLAG_CACHE.update(
-        {
-            "safe_mode": safe_mode,
-            "automation_enabled": automation_enabled,
-            "expires_at": now + FLAG_CACHE_TTL_SECONDS,
-        }
-    )
-
-    return safe_mode, automation_enabled
+    return {
+        "safe_mode": safe_mode,
+        "automation_enabled": automation_enabled,
+        "versions": versions,
+    }
 
 
 def _load_kill_switches_from_env_override() -> Optional[tuple[bool, bool]]:
@@ -681,6 +1000,21 @@ def _dynamodb_resource():
                                 target[attr] = ExpressionAttributeValues[token]
                     return {"ResponseMetadata": {"HTTPStatusCode": 200}}
 
+                def get_item(  # type: ignore[no-untyped-def]
+                    self,
+                    Key: Dict[str, Any],
+                    ProjectionExpression: Optional[str] = None,
+                    ConsistentRead: bool = False,
+                ):
+                    for item in reversed(self.items):
+                        if all(item.get(k) == v for k, v in Key.items()):
+                            found = dict(item)
+                            if ProjectionExpression:
+                                names = [n.strip() for n in ProjectionExpression.split(",")]
+                                found = {n: found[n] for n in names if n in found}
+                            return {"Item": found}
+                    return {}
+
             class _InMemoryDynamo:
                 def __init__(self):
                     self.tables: Dict[str, _InMemoryTable] = {}
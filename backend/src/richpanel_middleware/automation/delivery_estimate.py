@@ -4,9 +4,11 @@ import json
 import logging
 import os
 import re
+import threading
+from functools import lru_cache
 from urllib.parse import quote
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
@@ -170,49 +172,166 @@ def _coerce_date(value: Any) -> date:
     raise ValueError(f"unsupported date value: {value!r}")
 
 
-def business_days_between(a: Any, b: Any) -> int:
-    """Count business days between two dates (excludes the start date)."""
-    start = _coerce_date(a)
-    end = _coerce_date(b)
-    if start == end:
-        return 0
+_CALENDAR_PAD_DAYS = 366
+
+
+class BusinessDayCalendar:
+    """
+    Weekday calendar (Mon–Fri minus optional holidays) with O(1) lookups.
+
+    The calendar keeps a cumulative business-day count per date plus the inverse
+    index (n-th business day -> date) over a contiguous ordinal span. The span is
+    grown lazily when a date outside it is requested, so each lookup after warm-up
+    is a couple of list indexes.
+    """
+
+    def __init__(self, holidays: Any = None) -> None:
+        self.holidays: frozenset[date] = frozenset(
+            _coerce_date(value) for value in (holidays or ())
+        )
+        self._lock = threading.Lock()
+        # (origin ordinal, cumulative, business offsets) where cumulative[i] is the
+        # business-day count in [origin, origin + i] and offsets[k] is the offset of
+        # the (k + 1)-th business day. Swapped as one tuple so readers never mix
+        # an origin with arrays from a different build.
+        self._span: Tuple[int, List[int], List[int]] = (0, [], [])
+
+    def is_business_day(self, value: Any) -> bool:
+        current = _coerce_date(value)
+        return current.weekday() < 5 and current not in self.holidays
+
+    def _ensure(self, low: int, high: int) -> Tuple[int, List[int], List[int]]:
+        span = self._span
+        origin, cumulative, _ = span
+        if origin <= low and high < origin + len(cumulative):
+            return span
+        with self._lock:
+            span = self._span
+            origin, cumulative, _ = span
+            if origin <= low and high < origin + len(cumulative):
+                return span
+            if cumulative:
+                low = min(low, origin)
+                high = max(high, origin + len(cumulative) - 1)
+            new_origin = low - _CALENDAR_PAD_DAYS
+            new_cumulative: List[int] = []
+            new_offsets: List[int] = []
+            count = 0
+            for offset in range(high - new_origin + 1 + _CALENDAR_PAD_DAYS):
+                current = date.fromordinal(new_origin + offset)
+                if current.weekday() < 5 and current not in self.holidays:
+                    count += 1
+                    new_offsets.append(offset)
+                new_cumulative.append(count)
+            self._span = (new_origin, new_cumulative, new_offsets)
+            return self._span
+
+    def business_days_between(self, a: Any, b: Any) -> int:
+        """Count business days between two dates (excludes the start date)."""
+        start = _coerce_date(a).toordinal()
+        end = _coerce_date(b).toordinal()
+        if start == end:
+            return 0
+        sign = 1
+        if start > end:
+            start, end = end, start
+            sign = -1
+        origin, cumulative, _ = self._ensure(start, end)
+        return (cumulative[end - origin] - cumulative[start - origin]) * sign
+
+    def add_business_days(self, value: Any, days: int) -> date:
+        """Move forward/backward by N business days from a given date."""
+        current = _coerce_date(value)
+        if days == 0:
+            return current
+        ordinal = current.toordinal()
+        # Weekends alone stretch N business days to at most ~1.4N calendar days;
+        # the loop widens the span when holidays push the target further out.
+        reach = abs(days) * 2 + 14
+        while True:
+            if days > 0:
+                origin, cumulative, offsets = self._ensure(ordinal, ordinal + reach)
+                target = cumulative[ordinal - origin] + days
+            else:
+                origin, cumulative, offsets = self._ensure(ordinal - reach, ordinal)
+                target = cumulative[ordinal - 1 - origin] + days + 1
+            if 1 <= target <= len(offsets):
+                return date.fromordinal(origin + offsets[target - 1])
+            reach *= 2
+
+
+def _parse_holidays(raw: Optional[str]) -> List[date]:
+    if not raw:
+        return []
+    text = raw.strip()
+    values: Any
+    if text.startswith("["):
+        try:
+            values = json.loads(text)
+        except json.JSONDecodeError as exc:
+            LOGGER.error(
+                "Invalid DELIVERY_ESTIMATE_HOLIDAYS_JSON; ignoring holidays. error=%s",
+                exc,
+            )
+            return []
+    else:
+        values = [item for item in text.split(",") if item.strip()]
+    if not isinstance(values, list):
+        return []
+
+    holidays: List[date] = []
+    for value in values:
+        try:
+            holidays.append(_coerce_date(value))
+        except ValueError:
+            LOGGER.warning(
+                "Invalid holiday '%s' in DELIVERY_ESTIMATE_HOLIDAYS_JSON; skipping.",
+                value,
+            )
+    return holidays
 
-    sign = 1
-    if start > end:
-        start, end = end, start
-        sign = -1
 
-    days = 0
-    cursor = start
-    while cursor < end:
-        cursor += timedelta(days=1)
-        if cursor.weekday() < 5:
-            days += 1
-    return days * sign
+_CALENDAR_LOCK = threading.Lock()
+_DEFAULT_CALENDAR: Optional[Tuple[Optional[str], BusinessDayCalendar]] = None
+
+
+def get_business_day_calendar() -> BusinessDayCalendar:
+    """Return the shared calendar, rebuilding only when the holiday env changes."""
+    global _DEFAULT_CALENDAR
+    raw = os.getenv("DELIVERY_ESTIMATE_HOLIDAYS_JSON")
+    cached = _DEFAULT_CALENDAR
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+    with _CALENDAR_LOCK:
+        cached = _DEFAULT_CALENDAR
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        calendar = BusinessDayCalendar(_parse_holidays(raw))
+        _DEFAULT_CALENDAR = (raw, calendar)
+        return calendar
+
+
+def business_days_between(a: Any, b: Any) -> int:
+    """Count business days between two dates (excludes the start date)."""
+    return get_business_day_calendar().business_days_between(a, b)
 
 
 def add_business_days(value: Any, days: int) -> date:
     """Move forward/backward by N business days from a given date."""
-    current = _coerce_date(value)
-    if days == 0:
-        return current
+    return get_business_day_calendar().add_business_days(value, days)
 
-    remaining = abs(days)
-    step = 1 if days > 0 else -1
-    while remaining > 0:
-        current += timedelta(days=step)
-        if current.weekday() < 5:
-            remaining -= 1
-    return current
+
+_NUMERIC_RANGE_RE = re.compile(r"(\d+)\s*(?:-|\u2013|to)\s*(\d+)")
+_NUMERIC_SINGLE_RE = re.compile(r"(\d+)\s*(?:business\s+days?|bd|days?)")
 
 
 def _parse_numeric_window(text: str) -> Optional[tuple[int, int]]:
-    range_match = re.search(r"(\d+)\s*(?:-|\u2013|to)\s*(\d+)", text)
+    range_match = _NUMERIC_RANGE_RE.search(text)
     if range_match:
         first, second = int(range_match.group(1)), int(range_match.group(2))
         return (first, second) if first <= second else (second, first)
 
-    single_match = re.search(r"(\d+)\s*(?:business\s+days?|bd|days?)", text)
+    single_match = _NUMERIC_SINGLE_RE.search(text)
     if single_match:
         number = int(single_match.group(1))
         return number, number
@@ -274,8 +393,11 @@ def _normalize_transit_window(value: Any) -> Optional[tuple[int, int]]:
     return (low, high) if low <= high else (high, low)
 
 
-def _load_shipping_method_transit_map() -> Dict[str, tuple[int, int]]:
-    raw = os.getenv("SHIPPING_METHOD_TRANSIT_MAP_JSON")
+def _load_shipping_method_transit_map(
+    raw: Optional[str] = None,
+) -> Dict[str, tuple[int, int]]:
+    if raw is None:
+        raw = os.getenv("SHIPPING_METHOD_TRANSIT_MAP_JSON")
     if not raw:
         return DEFAULT_SHIPPING_METHOD_TRANSIT_MAP
 
@@ -317,31 +439,66 @@ def _load_shipping_method_transit_map() -> Dict[str, tuple[int, int]]:
     return normalized
 
 
-def _match_transit_window(
-    lowered_method: str, transit_map: Dict[str, tuple[int, int]]
-) -> Optional[tuple[int, int]]:
-    matches: list[tuple[str, tuple[int, int]]] = []
-    for key, window in transit_map.items():
-        if key and key in lowered_method:
-            matches.append((key, window))
+def _transit_sort_key(item: Tuple[str, tuple[int, int]]) -> tuple:
+    key, window = item
+    return (-len(key), window[1], window[0], key)
+
+
+TRANSIT_MATCH_CACHE_SIZE = 4096
 
-    if not matches:
+
+class _CompiledTransitMap:
+    """
+    Pre-sorted transit map with an LRU over lowered method strings.
+
+    Entries are ordered by match precedence (longest key, then fastest window,
+    then key), so the first substring hit is the winner. Keys containing digits
+    are indexed separately so digit-bearing methods can prefer them without
+    re-filtering the matches on every call.
+    """
+
+    def __init__(self, transit_map: Dict[str, tuple[int, int]]) -> None:
+        ordered = sorted(
+            ((key, window) for key, window in transit_map.items() if key),
+            key=_transit_sort_key,
+        )
+        self.entries: Tuple[Tuple[str, tuple[int, int]], ...] = tuple(ordered)
+        self.digit_entries: Tuple[Tuple[str, tuple[int, int]], ...] = tuple(
+            item for item in ordered if any(char.isdigit() for char in item[0])
+        )
+        self.match: Callable[[str], Optional[tuple[int, int]]] = lru_cache(
+            maxsize=TRANSIT_MATCH_CACHE_SIZE
+        )(self._match)
+
+    def _match(self, lowered_method: str) -> Optional[tuple[int, int]]:
+        if self.digit_entries and any(char.isdigit() for char in lowered_method):
+            for key, window in self.digit_entries:
+                if key in lowered_method:
+                    return window
+        for key, window in self.entries:
+            if key in lowered_method:
+                return window
         return None
 
-    if any(char.isdigit() for char in lowered_method):
-        digit_matches = [
-            match
-            for match in matches
-            if any(char.isdigit() for char in match[0])
-        ]
-        if digit_matches:
-            matches = digit_matches
 
-    best_key, best_window = sorted(
-        matches,
-        key=lambda item: (-len(item[0]), item[1][1], item[1][0], item[0]),
-    )[0]
-    return best_window
+_TRANSIT_MAP_LOCK = threading.Lock()
+_COMPILED_TRANSIT_MAP: Optional[Tuple[Optional[str], _CompiledTransitMap]] = None
+
+
+def _get_compiled_transit_map() -> _CompiledTransitMap:
+    """Return the compiled transit map, rebuilding only when the env value changes."""
+    global _COMPILED_TRANSIT_MAP
+    raw = os.getenv("SHIPPING_METHOD_TRANSIT_MAP_JSON")
+    cached = _COMPILED_TRANSIT_MAP
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+    with _TRANSIT_MAP_LOCK:
+        cached = _COMPILED_TRANSIT_MAP
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        compiled = _CompiledTransitMap(_load_shipping_method_transit_map(raw))
+        _COMPILED_TRANSIT_MAP = (raw, compiled)
+        return compiled
 
 
 def normalize_shipping_method(raw: Optional[str]) -> Optional[Dict[str, Any]]:
@@ -372,8 +529,7 @@ def normalize_shipping_method(raw: Optional[str]) -> Optional[Dict[str, Any]]:
             "normalized_method": normalized_method,
         }
 
-    transit_map = _load_shipping_method_transit_map()
-    mapped_window = _match_transit_window(lowered, transit_map)
+    mapped_window = _get_compiled_transit_map().match(lowered)
     if mapped_window:
         min_days, max_days = mapped_window
         bucket = "Priority" if max_days <= 2 else "Standard"
@@ -726,8 +882,10 @@ __all__ = [
     "build_tracking_reply",
     "build_no_tracking_reply",
     "business_days_between",
+    "BusinessDayCalendar",
     "compute_preorder_delivery_estimate",
     "compute_delivery_estimate",
+    "get_business_day_calendar",
     "has_preorder_tag",
     "parse_transit_days",
     "format_eta_window",
@@ -5,17 +5,26 @@ import json
 import logging
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from urllib.parse import parse_qs, urlparse
-from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
 
+from richpanel_middleware.automation.order_status_prompts import (
+    REPLY_TEMPLATE_PROMPT_VERSION,
+    build_order_status_reply_template_prompt,
+)
 from richpanel_middleware.automation.pii_sanitizer import sanitize_for_openai
+from richpanel_middleware.observability.metrics import LLM_GATED, count
 from richpanel_middleware.integrations.openai import (
     ChatCompletionRequest,
     ChatCompletionResponse,
     ChatMessage,
     OpenAIClient,
     OpenAIRequestError,
+    latency_budget_from_env,
 )
 
 LOGGER = logging.getLogger(__name__)
@@ -30,6 +39,15 @@ DEFAULT_CONFIDENCE_THRESHOLD = float(
 )
 DEFAULT_MAX_CHARS = int(os.environ.get("OPENAI_REPLY_REWRITE_MAX_CHARS", 1000))
 DEFAULT_ENABLED = False
+REWRITE_CALL_TYPE = "reply_rewrite"
+REWRITE_LATENCY_BUDGET_ENV = "OPENAI_REPLY_REWRITE_LATENCY_BUDGET_SECONDS"
+TEMPLATE_CACHE_TTL_SECONDS = int(
+    os.environ.get("OPENAI_REPLY_REWRITE_TEMPLATE_CACHE_TTL_SECONDS", 3600)
+)
+TEMPLATE_CACHE_MAX_ENTRIES = 256
+# Values shorter than this are left in the template text; substituting them
+# would fragment templates on incidental matches.
+_TEMPLATE_MIN_VALUE_CHARS = 3
 
 SUSPICIOUS_PATTERNS = [
     r"password",
@@ -50,6 +68,7 @@ _ETA_SINGLE_REGEX = re.compile(
     r"\b(\d+)\s*(business\s+days?|bd|days?)\b", flags=re.IGNORECASE
 )
 _INTERNAL_TAG_REGEX = re.compile(r"(?i)\b(?:mw-[a-z0-9-]+|route-[a-z0-9-]+)\b")
+_PLACEHOLDER_REGEX = re.compile(r"\{\{([a-z_]+)\}\}")
 
 
 def _to_bool(value: Optional[str], default: bool = False) -> bool:
@@ -58,6 +77,12 @@ def _to_bool(value: Optional[str], default: bool = False) -> bool:
     return str(value).strip().lower() in {"1", "true", "yes", "on"}
 
 
+def template_cache_enabled() -> bool:
+    return _to_bool(
+        os.environ.get("OPENAI_REPLY_REWRITE_TEMPLATE_CACHE_ENABLED"), default=False
+    )
+
+
 def _openai_shadow_enabled() -> bool:
     return _to_bool(os.environ.get("MW_OPENAI_SHADOW_ENABLED"), default=False)
 
@@ -122,27 +147,63 @@ def _gating_reason(
     return None
 
 
+REWRITE_SYSTEM_PROMPT = (
+    "You rewrite Richpanel customer replies. Preserve facts and promises, "
+    "avoid new commitments, keep it concise and professional. "
+    "Do not add new promises. Do not remove compliance or safety language. "
+    "If the input includes any URLs, they must appear verbatim in the output. "
+    "If the input includes tracking numbers, they must appear verbatim in the output. "
+    "If the input includes an ETA window (for example, '1-3 business days'), "
+    "preserve the numbers and units exactly. "
+    "Return strict JSON ONLY (no commentary, no code fences) with keys "
+    "body (string <= 1000 chars), confidence (0-1 float), "
+    "risk_flags (list of strings). "
+    "If the input seems risky or contains sensitive data, add 'suspicious_content' "
+    "to risk_flags and keep the original tone."
+)
+
+# (reply, rewritten reply) turns kept after the system prompt so the whole
+# prefix is byte-stable and cacheable by the provider; only the last user
+# message changes per call.
+REWRITE_FEW_SHOT_EXAMPLES: Tuple[Tuple[str, str], ...] = (
+    (
+        "hi, ur order shipped w/ USPS, tracking 9400111899223100000000 "
+        "https://tools.usps.com/go/TrackConfirmAction?tLabels=9400111899223100000000",
+        "Hi! Your order has shipped with USPS. Tracking number: "
+        "9400111899223100000000 - "
+        "https://tools.usps.com/go/TrackConfirmAction?tLabels=9400111899223100000000",
+    ),
+    (
+        "Order is processing, should arrive in 2-4 business days, we will email tracking.",
+        "Your order is being processed and should arrive in 2-4 business days. "
+        "We'll email you tracking as soon as it ships.",
+    ),
+)
+
+REWRITE_PROMPT_PREFIX: Tuple[ChatMessage, ...] = (
+    ChatMessage(role="system", content=REWRITE_SYSTEM_PROMPT),
+) + tuple(
+    message
+    for original, rewritten in REWRITE_FEW_SHOT_EXAMPLES
+    for message in (
+        ChatMessage(role="user", content=f"Rewrite this reply safely:\n\n{original}"),
+        ChatMessage(
+            role="assistant",
+            content=json.dumps(
+                {"body": rewritten, "confidence": 0.95, "risk_flags": []}
+            ),
+        ),
+    )
+)
+
+
 def _build_prompt(reply_body: str) -> List[ChatMessage]:
     trimmed = sanitize_for_openai(
         reply_body or "", max_chars=DEFAULT_MAX_CHARS * 2
     )
-    system = (
-        "You rewrite Richpanel customer replies. Preserve facts and promises, "
-        "avoid new commitments, keep it concise and professional. "
-        "Do not add new promises. Do not remove compliance or safety language. "
-        "If the input includes any URLs, they must appear verbatim in the output. "
-        "If the input includes tracking numbers, they must appear verbatim in the output. "
-        "If the input includes an ETA window (for example, '1-3 business days'), "
-        "preserve the numbers and units exactly. "
-        "Return strict JSON ONLY (no commentary, no code fences) with keys "
-        "body (string <= 1000 chars), confidence (0-1 float), "
-        "risk_flags (list of strings). "
-        "If the input seems risky or contains sensitive data, add 'suspicious_content' "
-        "to risk_flags and keep the original tone."
-    )
     user = f"Rewrite this reply safely:\n\n{trimmed}"
     return [
-        ChatMessage(role="system", content=system),
+        *REWRITE_PROMPT_PREFIX,
         ChatMessage(role="user", content=user),
     ]
 
@@ -409,6 +470,7 @@ class ReplyRewriteResult:
     error_class: Optional[str] = None
     risk_flags: List[str] = field(default_factory=list)
     gated_reason: Optional[str] = None
+    template_cache: Optional[str] = None
 
 
 def rewrite_reply(
@@ -442,6 +504,7 @@ def rewrite_reply(
         reply_body=reply_body or "",
     )
     if gating_reason:
+        count(LLM_GATED, stage="rewrite", outcome=gating_reason)
         LOGGER.info(
             "reply_rewrite.gated",
             extra={
@@ -476,6 +539,8 @@ def rewrite_reply(
         temperature=DEFAULT_TEMPERATURE,
         max_tokens=DEFAULT_MAX_TOKENS,
         metadata={"conversation_id": conversation_id, "event_id": event_id},
+        call_type=REWRITE_CALL_TYPE,
+        latency_budget_seconds=latency_budget_from_env(REWRITE_LATENCY_BUDGET_ENV),
     )
     openai_client = client or OpenAIClient(allow_network=allow_network)
 
@@ -709,4 +774,255 @@ def rewrite_reply(
     )
 
 
-__all__ = ["rewrite_reply", "ReplyRewriteResult"]
+@dataclass(frozen=True)
+class ReplyTemplate:
+    """A deterministic reply with its per-ticket values swapped for placeholders."""
+
+    template_id: str
+    text: str
+    values: Dict[str, str]
+
+    @property
+    def placeholders(self) -> List[str]:
+        return sorted(self.values)
+
+    def fill(self, text: str) -> str:
+        return _PLACEHOLDER_REGEX.sub(
+            lambda match: self.values.get(match.group(1), match.group(0)), text
+        )
+
+
+def extract_reply_template(
+    reply_body: str, values: Mapping[str, Optional[str]]
+) -> Optional[ReplyTemplate]:
+    """
+    Replace whole-word occurrences of `values` in `reply_body` with {{name}}.
+
+    Longer values are substituted first so a shipping method that contains the
+    carrier name stays one placeholder. Returns None when the body cannot be
+    round-tripped exactly.
+    """
+    if not reply_body or "{{" in reply_body:
+        return None
+    candidates = sorted(
+        (
+            (name, str(value).strip())
+            for name, value in values.items()
+            if value is not None and len(str(value).strip()) >= _TEMPLATE_MIN_VALUE_CHARS
+        ),
+        key=lambda item: (-len(item[1]), item[0]),
+    )
+    text = reply_body
+    used: Dict[str, str] = {}
+    for name, value in candidates:
+        if not _PLACEHOLDER_REGEX.fullmatch("{{" + name + "}}"):
+            continue
+        pattern = re.compile(rf"(?<!\w){re.escape(value)}(?!\w)")
+        text, count = pattern.subn(lambda _match: "{{" + name + "}}", text)
+        if count:
+            used[name] = value
+    template = ReplyTemplate(
+        template_id=f"tpl-{_fingerprint(text, length=16)}", text=text, values=used
+    )
+    if template.fill(text) != reply_body:
+        return None
+    return template
+
+
+@dataclass
+class _CachedTemplateRewrite:
+    expires_at: float
+    result: ReplyRewriteResult
+
+
+_TEMPLATE_CACHE: "OrderedDict[Tuple[str, str, str, str], _CachedTemplateRewrite]" = (
+    OrderedDict()
+)
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+
+# Failures worth caching: the model answered and the answer was unusable.
+# Transport errors and dry runs are retried on the next ticket instead.
+_UNCACHEABLE_TEMPLATE_REASONS = {"request_failed", "no_response", "dry_run"}
+
+
+def clear_template_cache() -> None:
+    with _TEMPLATE_CACHE_LOCK:
+        _TEMPLATE_CACHE.clear()
+
+
+def _template_placeholder_reason(template: ReplyTemplate, body: str) -> Optional[str]:
+    found = _PLACEHOLDER_REGEX.findall(body or "")
+    if set(found) - set(template.placeholders):
+        return "unexpected_placeholders"
+    if set(template.placeholders) - set(found):
+        return "missing_placeholders"
+    return None
+
+
+def _filled_validation_reason(original: str, filled: str) -> Optional[str]:
+    missing_urls, missing_tracking, missing_eta = _missing_required_tokens(
+        original, filled
+    )
+    if missing_urls or missing_tracking or missing_eta:
+        return "missing_required_tokens"
+    unexpected_urls, unexpected_tracking, unexpected_eta = _unexpected_tokens(
+        original, filled
+    )
+    if unexpected_urls or unexpected_tracking or unexpected_eta:
+        return "unexpected_tokens"
+    if _contains_internal_tags(filled):
+        return "contains_internal_tags"
+    return None
+
+
+def rewrite_reply_template(
+    reply_body: str,
+    template: ReplyTemplate,
+    *,
+    conversation_id: str,
+    event_id: str,
+    safe_mode: bool,
+    automation_enabled: bool,
+    allow_network: bool,
+    outbound_enabled: bool,
+    language: Optional[str] = None,
+    rewrite_enabled: Optional[bool] = None,
+    client: Optional[OpenAIClient] = None,
+    clock: Callable[[], float] = time.monotonic,
+) -> ReplyRewriteResult:
+    """
+    Rewrite `template` once per (template id, model, prompt version, language)
+    and fill the cached rewrite with this ticket's values locally.
+
+    The cached rewrite must keep every placeholder, and the filled reply goes
+    through the same URL/tracking/ETA/internal-tag checks as `rewrite_reply`;
+    any failure returns the deterministic reply untouched.
+    """
+    fingerprint = _fingerprint(reply_body or "")
+    if _gating_reason(
+        rewrite_enabled=_resolve_rewrite_enabled(rewrite_enabled),
+        shadow_enabled=_openai_shadow_enabled(),
+        safe_mode=safe_mode,
+        automation_enabled=automation_enabled,
+        allow_network=allow_network,
+        outbound_enabled=outbound_enabled,
+        reply_body=reply_body or "",
+    ):
+        return rewrite_reply(
+            reply_body,
+            conversation_id=conversation_id,
+            event_id=event_id,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+            allow_network=allow_network,
+            outbound_enabled=outbound_enabled,
+            rewrite_enabled=rewrite_enabled,
+        )
+
+    key = (template.template_id, DEFAULT_MODEL, REPLY_TEMPLATE_PROMPT_VERSION, language or "")
+    now = clock()
+    with _TEMPLATE_CACHE_LOCK:
+        cached = _TEMPLATE_CACHE.get(key)
+        if cached is not None and cached.expires_at <= now:
+            _TEMPLATE_CACHE.pop(key, None)
+            cached = None
+        if cached is not None:
+            _TEMPLATE_CACHE.move_to_end(key)
+    cache_state = "hit" if cached is not None else "miss"
+
+    if cached is None:
+        template_result = rewrite_reply(
+            template.text,
+            conversation_id=conversation_id,
+            event_id=event_id,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+            allow_network=allow_network,
+            outbound_enabled=outbound_enabled,
+            rewrite_enabled=rewrite_enabled,
+            client=client,
+            prompt_messages=build_order_status_reply_template_prompt(
+                template=template.text,
+                placeholders=template.placeholders,
+                language=language,
+            ),
+        )
+        if template_result.rewritten:
+            placeholder_reason = _template_placeholder_reason(
+                template, template_result.body
+            )
+            if placeholder_reason:
+                template_result = replace(
+                    template_result,
+                    body=template.text,
+                    rewritten=False,
+                    reason=placeholder_reason,
+                )
+        cached = _CachedTemplateRewrite(
+            expires_at=now + max(TEMPLATE_CACHE_TTL_SECONDS, 0),
+            result=template_result,
+        )
+        if (
+            not template_result.dry_run
+            and template_result.reason not in _UNCACHEABLE_TEMPLATE_REASONS
+        ):
+            with _TEMPLATE_CACHE_LOCK:
+                _TEMPLATE_CACHE[key] = cached
+                _TEMPLATE_CACHE.move_to_end(key)
+                while len(_TEMPLATE_CACHE) > TEMPLATE_CACHE_MAX_ENTRIES:
+                    _TEMPLATE_CACHE.popitem(last=False)
+
+    cached_result = cached.result
+    result = replace(
+        cached_result,
+        body=reply_body,
+        rewritten=False,
+        fingerprint=fingerprint,
+        template_cache=cache_state,
+    )
+    if cache_state == "hit":
+        result = replace(
+            result,
+            llm_called=False,
+            response_id=None,
+            response_id_unavailable_reason="template_cache_hit",
+        )
+    if not cached_result.rewritten:
+        return result
+
+    filled = template.fill(cached_result.body)
+    validation_reason = _filled_validation_reason(reply_body, filled)
+    if validation_reason:
+        LOGGER.info(
+            "reply_rewrite.validation_failed",
+            extra={
+                "conversation_id": conversation_id,
+                "event_id": event_id,
+                "fingerprint": fingerprint,
+                "reason": validation_reason,
+                "template_id": template.template_id,
+            },
+        )
+        return replace(result, reason=validation_reason)
+    LOGGER.info(
+        "reply_rewrite.template_applied",
+        extra={
+            "conversation_id": conversation_id,
+            "event_id": event_id,
+            "fingerprint": fingerprint,
+            "template_id": template.template_id,
+            "template_cache": cache_state,
+        },
+    )
+    return replace(result, body=filled, rewritten=True, reason="applied")
+
+
+__all__ = [
+    "ReplyRewriteResult",
+    "ReplyTemplate",
+    "clear_template_cache",
+    "extract_reply_template",
+    "rewrite_reply",
+    "rewrite_reply_template",
+    "template_cache_enabled",
+]
@@ -25,19 +25,26 @@ from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
+from richpanel_middleware.automation.local_intent_model import (
+    LocalIntentPrediction,
+    confident_local_prediction,
+)
 from richpanel_middleware.automation.pii_sanitizer import sanitize_for_openai
+from richpanel_middleware.automation.prompt_compaction import compact_for_llm
 from richpanel_middleware.automation.router import (
     DEPARTMENTS,
     INTENT_TO_DEPARTMENT,
     RoutingDecision,
     classify_routing,
 )
+from richpanel_middleware.observability.metrics import LLM_GATED, count
 from richpanel_middleware.integrations.openai import (
     ChatCompletionRequest,
     ChatCompletionResponse,
     ChatMessage,
     OpenAIClient,
     OpenAIRequestError,
+    latency_budget_from_env,
 )
 
 LOGGER = logging.getLogger(__name__)
@@ -50,6 +57,8 @@ DEFAULT_ROUTING_MODEL = "gpt-5.2-chat-latest"
 DEFAULT_ROUTING_TEMPERATURE = 0.0
 DEFAULT_ROUTING_MAX_TOKENS = 256
 DEFAULT_CONFIDENCE_THRESHOLD = 0.85
+ROUTING_CALL_TYPE = "routing"
+ROUTING_LATENCY_BUDGET_ENV = "OPENAI_ROUTING_LATENCY_BUDGET_SECONDS"
 
 # Roadmap flag: when True, use LLM routing as primary (if confidence passes)
 # OFF by default -- enable only for evaluation/dev environments
@@ -193,21 +202,86 @@ Rules:
 - Do NOT include any personal data, order numbers, or customer details in your response"""
 
 
-def _build_routing_prompt(customer_message: str) -> List[ChatMessage]:
-    """Build the routing prompt messages."""
-    intents_str = ", ".join(sorted(VALID_INTENTS))
-    departments_str = ", ".join(sorted(DEPARTMENTS))
+# (customer message, intent, confidence, reasoning) shown to the model as
+# prior turns. They never contain real customer data.
+ROUTING_FEW_SHOT_EXAMPLES: Tuple[Tuple[str, str, float, str], ...] = (
+    (
+        "Hi, where is my order? It was supposed to arrive last week.",
+        "order_status_tracking",
+        0.92,
+        "Customer asks for the status of an order in transit.",
+    ),
+    (
+        "My package says delivered but nothing is at my door.",
+        "delivered_not_received",
+        0.9,
+        "Carrier shows delivered but the customer has not received it.",
+    ),
+    (
+        "Please cancel my order, I placed it by mistake an hour ago.",
+        "cancel_order",
+        0.9,
+        "Customer wants to cancel a recently placed order.",
+    ),
+    (
+        "The blender arrived with a cracked jar. Can you send a replacement?",
+        "damaged_item",
+        0.88,
+        "Item arrived damaged and the customer asks for a replacement.",
+    ),
+    (
+        "Does this come in a larger size before I buy it?",
+        "pre_purchase_question",
+        0.85,
+        "Product question before purchase.",
+    ),
+    (
+        "Hello",
+        "unknown_other",
+        0.3,
+        "Greeting only; no actionable request.",
+    ),
+)
 
-    system_content = ROUTING_SYSTEM_PROMPT.format(
-        intents=intents_str,
-        departments=departments_str,
+# Rendered once: the system prompt and few-shot turns are a byte-stable prefix
+# shared by every routing call, which lets the provider's prompt cache reuse
+# it. Only the final user message varies per ticket.
+ROUTING_SYSTEM_CONTENT = ROUTING_SYSTEM_PROMPT.format(
+    intents=", ".join(sorted(VALID_INTENTS)),
+    departments=", ".join(sorted(DEPARTMENTS)),
+)
+ROUTING_PROMPT_PREFIX: Tuple[ChatMessage, ...] = (
+    ChatMessage(role="system", content=ROUTING_SYSTEM_CONTENT),
+) + tuple(
+    message
+    for text, intent, confidence, reasoning in ROUTING_FEW_SHOT_EXAMPLES
+    for message in (
+        ChatMessage(role="user", content=text),
+        ChatMessage(
+            role="assistant",
+            content=json.dumps(
+                {
+                    "intent": intent,
+                    "department": INTENT_TO_DEPARTMENT[intent],
+                    "confidence": confidence,
+                    "reasoning": reasoning,
+                    "secondary_intents": [],
+                }
+            ),
+        ),
     )
+)
 
-    # Sanitize and truncate customer message to reduce PII exposure and tokens
-    sanitized_message = sanitize_for_openai(customer_message, max_chars=2000)
+
+def _build_routing_prompt(customer_message: str) -> List[ChatMessage]:
+    """Build the routing prompt messages (static prefix + the customer message)."""
+    # Drop quoted history/signatures within the token budget, then sanitize
+    # and truncate to reduce PII exposure and tokens
+    compacted = compact_for_llm(customer_message, call_type=ROUTING_CALL_TYPE).text
+    sanitized_message = sanitize_for_openai(compacted, max_chars=2000)
 
     return [
-        ChatMessage(role="system", content=system_content),
+        *ROUTING_PROMPT_PREFIX,
         ChatMessage(role="user", content=sanitized_message),
     ]
 
@@ -218,7 +292,7 @@ def _compute_prompt_fingerprint(messages: List[ChatMessage], model: str) -> str:
         "model": model,
         "message_count": len(messages),
         "system_length": len(messages[0].content) if messages else 0,
-        "user_length": len(messages[1].content) if len(messages) > 1 else 0,
+        "user_length": len(messages[-1].content) if len(messages) > 1 else 0,
     }
     serialized = json.dumps(payload, sort_keys=True).encode("utf-8")
     return hashlib.sha256(serialized).hexdigest()[:16]
@@ -425,6 +499,7 @@ def suggest_llm_routing(
     )
 
     if gated_reason:
+        count(LLM_GATED, stage="routing", outcome=gated_reason)
         LOGGER.info(
             "llm_routing.gated",
             extra={
@@ -462,6 +537,8 @@ def suggest_llm_routing(
         temperature=DEFAULT_ROUTING_TEMPERATURE,
         max_tokens=DEFAULT_ROUTING_MAX_TOKENS,
         metadata={"conversation_id": conversation_id, "event_id": event_id},
+        call_type=ROUTING_CALL_TYPE,
+        latency_budget_seconds=latency_budget_from_env(ROUTING_LATENCY_BUDGET_ENV),
     )
 
     try:
@@ -566,6 +643,64 @@ def suggest_llm_routing(
 # Dual Routing (Deterministic + LLM Advisory)
 # ============================================================================
 
+# Deterministic intents the local order-status model can vouch for.
+_LOCAL_ORDER_STATUS_INTENTS = {"order_status_tracking", "shipping_delay_not_shipped"}
+
+
+def _local_routing_prediction(
+    customer_message: str,
+    deterministic: RoutingDecision,
+    *,
+    safe_mode: bool,
+    automation_enabled: bool,
+    allow_network: bool,
+    outbound_enabled: bool,
+) -> Optional[LocalIntentPrediction]:
+    """
+    Confident local prediction that agrees with the deterministic router.
+
+    Only consulted when the LLM call would otherwise be made; a disagreement
+    is exactly the ambiguous case the LLM is for.
+    """
+    if _llm_routing_gating_check(
+        safe_mode=safe_mode,
+        automation_enabled=automation_enabled,
+        allow_network=allow_network,
+        outbound_enabled=outbound_enabled,
+    ):
+        return None
+    return agreeing_local_prediction(customer_message, deterministic.intent)
+
+
+def agreeing_local_prediction(
+    customer_message: str, deterministic_intent: Optional[str]
+) -> Optional[LocalIntentPrediction]:
+    """Confident local prediction, or None when the deterministic router disagrees."""
+    prediction = confident_local_prediction(customer_message)
+    if prediction is None:
+        return None
+    deterministic_order_status = deterministic_intent in _LOCAL_ORDER_STATUS_INTENTS
+    if prediction.is_order_status != deterministic_order_status:
+        return None
+    return prediction
+
+
+def _local_routing_suggestion(
+    prediction: LocalIntentPrediction, deterministic: RoutingDecision
+) -> LLMRoutingSuggestion:
+    return LLMRoutingSuggestion(
+        intent=deterministic.intent or "unknown",
+        department=deterministic.department,
+        confidence=prediction.confidence,
+        reasoning="local_model",
+        model=prediction.model_version,
+        llm_called=False,
+        response_id=None,
+        response_id_unavailable_reason="local_model",
+        dry_run=False,
+    )
+
+
 
 def compute_dual_routing(
     payload: Dict[str, Any],
@@ -600,23 +735,45 @@ def compute_dual_routing(
     from richpanel_middleware.automation.router import extract_customer_message
     customer_message = extract_customer_message(payload, default="")
 
-    # Step 2: LLM routing suggestion
-    llm_suggestion = suggest_llm_routing(
+    # Step 2: LLM routing suggestion, unless the local model already agrees
+    # with the deterministic router (then the LLM call adds nothing).
+    local_prediction = _local_routing_prediction(
         customer_message,
-        conversation_id=conversation_id,
-        event_id=event_id,
+        deterministic,
         safe_mode=safe_mode,
         automation_enabled=automation_enabled,
         allow_network=allow_network,
         outbound_enabled=outbound_enabled,
-        client=client,
     )
+    if local_prediction is not None:
+        LOGGER.info(
+            "llm_routing.local_model",
+            extra={
+                "event_id": event_id,
+                "conversation_id": conversation_id,
+                "model_version": local_prediction.model_version,
+                "is_order_status": local_prediction.is_order_status,
+                "confidence": round(local_prediction.confidence, 4),
+            },
+        )
+        llm_suggestion = _local_routing_suggestion(local_prediction, deterministic)
+    else:
+        llm_suggestion = suggest_llm_routing(
+            customer_message,
+            conversation_id=conversation_id,
+            event_id=event_id,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+            allow_network=allow_network,
+            outbound_enabled=outbound_enabled,
+            client=client,
+        )
 
     # Step 3: Decide primary source
     primary_source = "deterministic"
     final_routing = deterministic
 
-    if get_openai_routing_primary() or force_primary:
+    if (get_openai_routing_primary() or force_primary) and local_prediction is None:
         threshold = get_confidence_threshold()
         if llm_suggestion.passes_threshold(threshold):
             primary_source = "llm"
@@ -669,6 +826,9 @@ def compute_dual_routing(
         "force_openai_routing_primary": force_primary,
         "confidence_threshold": get_confidence_threshold(),
         "llm_gated_reason": llm_suggestion.gated_reason,
+        "local_model_version": (
+            local_prediction.model_version if local_prediction else None
+        ),
     }
 
     artifact = RoutingArtifact(
@@ -688,6 +848,7 @@ def compute_dual_routing(
             "dry_run": llm_suggestion.dry_run,
             "fingerprint": llm_suggestion.fingerprint,
             "gated_reason": llm_suggestion.gated_reason,
+            "source": "local_model" if local_prediction else "openai",
         },
         primary_source=primary_source,
         final_routing=asdict(final_routing),
@@ -701,6 +862,7 @@ __all__ = [
     "OPENAI_ROUTING_PRIMARY_DEFAULT",
     "LLMRoutingSuggestion",
     "RoutingArtifact",
+    "agreeing_local_prediction",
     "compute_dual_routing",
     "get_confidence_threshold",
     "get_openai_routing_enabled",
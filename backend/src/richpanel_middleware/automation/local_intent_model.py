@@ -0,0 +1,255 @@
+"""
+Local order-status intent tier: hashed n-gram logistic regression.
+
+Runs before the OpenAI routing/intent calls. Only predictions at or above
+MW_LOCAL_INTENT_MIN_CONFIDENCE are used; everything else falls through to
+the LLM. The trained artifact is a JSON file (see
+scripts/train_local_intent_model.py) whose version is a hash of its weights.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+MW_LOCAL_INTENT_MODEL_ENV = "MW_LOCAL_INTENT_MODEL_ENABLED"
+MW_LOCAL_INTENT_MODEL_PATH_ENV = "MW_LOCAL_INTENT_MODEL_PATH"
+MW_LOCAL_INTENT_MIN_CONFIDENCE_ENV = "MW_LOCAL_INTENT_MIN_CONFIDENCE"
+
+DEFAULT_MODEL_PATH = (
+    Path(__file__).resolve().parent / "models" / "order_status_intent_local.json"
+)
+DEFAULT_MIN_CONFIDENCE = 0.9
+DEFAULT_BUCKETS = 4096
+FEATURE_VERSION = 1
+
+_TOKEN_REGEX = re.compile(r"[a-z0-9']+")
+_DIGITS_REGEX = re.compile(r"\d+")
+
+
+def _to_bool(value: Optional[str], default: bool = False) -> bool:
+    if value is None:
+        return default
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _tokens(text: str) -> List[str]:
+    # Collapse digit runs so order numbers share one feature.
+    return _TOKEN_REGEX.findall(_DIGITS_REGEX.sub("0", (text or "").lower()))
+
+
+def _features(text: str, buckets: int) -> Dict[int, float]:
+    tokens = _tokens(text)
+    grams = [f"u:{token}" for token in tokens]
+    grams.extend(f"b:{left} {right}" for left, right in zip(tokens, tokens[1:]))
+    features: Dict[int, float] = {}
+    for gram in grams:
+        index = zlib.crc32(gram.encode("utf-8")) % buckets
+        features[index] = features.get(index, 0.0) + 1.0
+    if features:
+        norm = math.sqrt(sum(value * value for value in features.values()))
+        features = {index: value / norm for index, value in features.items()}
+    return features
+
+
+def _sigmoid(value: float) -> float:
+    if value >= 0:
+        return 1.0 / (1.0 + math.exp(-value))
+    exp = math.exp(value)
+    return exp / (1.0 + exp)
+
+
+@dataclass(frozen=True)
+class LocalIntentPrediction:
+    is_order_status: bool
+    probability: float
+    confidence: float
+    model_version: str
+
+
+@dataclass
+class LocalIntentModel:
+    """Binary order-status classifier over hashed unigram/bigram features."""
+
+    weights: Dict[int, float]
+    bias: float
+    buckets: int = DEFAULT_BUCKETS
+    feature_version: int = FEATURE_VERSION
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @cached_property
+    def version(self) -> str:
+        payload = json.dumps(
+            {
+                "feature_version": self.feature_version,
+                "buckets": self.buckets,
+                "bias": round(self.bias, 8),
+                "weights": sorted(
+                    (index, round(weight, 8)) for index, weight in self.weights.items()
+                ),
+            },
+            separators=(",", ":"),
+        )
+        return "local-intent-" + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+    def predict_proba(self, text: str) -> float:
+        score = self.bias
+        for index, value in _features(text, self.buckets).items():
+            score += self.weights.get(index, 0.0) * value
+        return _sigmoid(score)
+
+    def predict(self, text: str) -> LocalIntentPrediction:
+        probability = self.predict_proba(text)
+        return LocalIntentPrediction(
+            is_order_status=probability >= 0.5,
+            probability=probability,
+            confidence=max(probability, 1.0 - probability),
+            model_version=self.version,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "feature_version": self.feature_version,
+            "buckets": self.buckets,
+            "bias": round(self.bias, 8),
+            "weights": {
+                str(index): round(weight, 8)
+                for index, weight in sorted(self.weights.items())
+            },
+            "metadata": self.metadata,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "LocalIntentModel":
+        feature_version = int(payload.get("feature_version", 0))
+        if feature_version != FEATURE_VERSION:
+            raise ValueError(f"unsupported feature_version {feature_version}")
+        model = cls(
+            weights={int(k): float(v) for k, v in (payload.get("weights") or {}).items()},
+            bias=float(payload.get("bias", 0.0)),
+            buckets=int(payload.get("buckets", DEFAULT_BUCKETS)),
+            feature_version=feature_version,
+            metadata=dict(payload.get("metadata") or {}),
+        )
+        declared = payload.get("version")
+        if declared and declared != model.version:
+            raise ValueError("artifact version does not match its weights")
+        return model
+
+
+def train_local_intent_model(
+    examples: Sequence[Tuple[str, bool]],
+    *,
+    buckets: int = DEFAULT_BUCKETS,
+    epochs: int = 50,
+    learning_rate: float = 0.2,
+    l2: float = 3e-3,
+    seed: int = 7,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> LocalIntentModel:
+    """Fit the classifier with plain SGD; deterministic for a given seed."""
+    rows = [(_features(text, buckets), 1.0 if label else 0.0) for text, label in examples]
+    weights: Dict[int, float] = {}
+    bias = 0.0
+    rng = random.Random(seed)
+    order = list(range(len(rows)))
+    for _ in range(max(1, epochs)):
+        rng.shuffle(order)
+        for position in order:
+            features, target = rows[position]
+            score = bias + sum(weights.get(i, 0.0) * v for i, v in features.items())
+            gradient = _sigmoid(score) - target
+            bias -= learning_rate * gradient
+            for index, value in features.items():
+                current = weights.get(index, 0.0)
+                weights[index] = current - learning_rate * (gradient * value + l2 * current)
+    pruned = {index: weight for index, weight in weights.items() if abs(weight) >= 1e-6}
+    return LocalIntentModel(
+        weights=pruned, bias=bias, buckets=buckets, metadata=dict(metadata or {})
+    )
+
+
+_MODEL_CACHE: Dict[str, Optional[LocalIntentModel]] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+
+def load_local_intent_model(path: Optional[Path] = None) -> Optional[LocalIntentModel]:
+    """Load (once per path) the model artifact; None if missing or invalid."""
+    resolved = Path(
+        path or os.environ.get(MW_LOCAL_INTENT_MODEL_PATH_ENV) or DEFAULT_MODEL_PATH
+    )
+    key = str(resolved)
+    if key in _MODEL_CACHE:
+        return _MODEL_CACHE[key]
+    with _MODEL_CACHE_LOCK:
+        if key not in _MODEL_CACHE:
+            model: Optional[LocalIntentModel] = None
+            try:
+                model = LocalIntentModel.from_dict(
+                    json.loads(resolved.read_text(encoding="utf-8"))
+                )
+            except (OSError, ValueError, TypeError) as exc:
+                LOGGER.warning(
+                    "local_intent_model.load_failed",
+                    extra={"path": key, "error": exc.__class__.__name__},
+                )
+            _MODEL_CACHE[key] = model
+        return _MODEL_CACHE[key]
+
+
+def clear_local_intent_model_cache() -> None:
+    with _MODEL_CACHE_LOCK:
+        _MODEL_CACHE.clear()
+
+
+def local_intent_enabled() -> bool:
+    return _to_bool(os.environ.get(MW_LOCAL_INTENT_MODEL_ENV), default=False)
+
+
+def get_local_min_confidence() -> float:
+    raw = os.environ.get(MW_LOCAL_INTENT_MIN_CONFIDENCE_ENV)
+    try:
+        value = float(raw) if raw not in (None, "") else DEFAULT_MIN_CONFIDENCE
+    except (TypeError, ValueError):
+        return DEFAULT_MIN_CONFIDENCE
+    return value if 0.5 <= value <= 1.0 else DEFAULT_MIN_CONFIDENCE
+
+
+def confident_local_prediction(text: str) -> Optional[LocalIntentPrediction]:
+    """Prediction to use instead of the LLM, or None to fall through to it."""
+    if not text or not local_intent_enabled():
+        return None
+    model = load_local_intent_model()
+    if model is None:
+        return None
+    prediction = model.predict(text)
+    if prediction.confidence < get_local_min_confidence():
+        return None
+    return prediction
+
+
+__all__ = [
+    "DEFAULT_MODEL_PATH",
+    "LocalIntentModel",
+    "LocalIntentPrediction",
+    "clear_local_intent_model_cache",
+    "confident_local_prediction",
+    "get_local_min_confidence",
+    "load_local_intent_model",
+    "local_intent_enabled",
+    "train_local_intent_model",
+]
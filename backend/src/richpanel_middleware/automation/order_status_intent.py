@@ -8,17 +8,25 @@ import re
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, Optional, Tuple
 
-from richpanel_middleware.automation.llm_routing import get_confidence_threshold
+from richpanel_middleware.automation.llm_routing import (
+    agreeing_local_prediction,
+    get_confidence_threshold,
+)
 from richpanel_middleware.automation.pii_sanitizer import sanitize_for_openai
+from richpanel_middleware.automation.prompt_compaction import compact_for_llm
 from richpanel_middleware.automation.order_status_prompts import (
     build_order_status_intent_prompt,
 )
 from richpanel_middleware.commerce.order_lookup import _match_order_number_from_text
+from richpanel_middleware.automation.local_intent_model import local_intent_enabled
+from richpanel_middleware.automation.router import classify_routing
+from richpanel_middleware.observability.metrics import LLM_GATED, count
 from richpanel_middleware.integrations.openai import (
     ChatCompletionRequest,
     ChatCompletionResponse,
     OpenAIClient,
     OpenAIRequestError,
+    latency_budget_from_env,
 )
 
 LOGGER = logging.getLogger(__name__)
@@ -29,6 +37,8 @@ DEFAULT_MODEL = os.environ.get("OPENAI_ORDER_STATUS_INTENT_MODEL") or os.environ
 DEFAULT_TEMPERATURE = 0.0
 DEFAULT_MAX_TOKENS = 256
 MAX_REASON_CHARS = 200
+INTENT_CALL_TYPE = "order_status_intent"
+INTENT_LATENCY_BUDGET_ENV = "OPENAI_ORDER_STATUS_INTENT_LATENCY_BUDGET_SECONDS"
 
 OPENAI_INTENT_ENABLED_DEFAULT = False
 OPENAI_SHADOW_ENABLED_DEFAULT = False
@@ -302,8 +312,9 @@ def classify_order_status_intent(
     metadata: Optional[Dict[str, str]] = None,
 ) -> OrderStatusIntentArtifact:
     model = DEFAULT_MODEL
-    messages = build_order_status_intent_prompt(ticket_text, metadata=metadata)
-    user_length = len(messages[1].content) if len(messages) > 1 else 0
+    prompt_text = compact_for_llm(ticket_text, call_type=INTENT_CALL_TYPE).text
+    messages = build_order_status_intent_prompt(prompt_text, metadata=metadata)
+    user_length = len(messages[-1].content) if len(messages) > 1 else 0
     fingerprint = _prompt_fingerprint(model, len(messages), user_length)
     threshold = get_confidence_threshold()
     gated_reason = _intent_gating_check(
@@ -313,6 +324,7 @@ def classify_order_status_intent(
         outbound_enabled=outbound_enabled,
     )
     if gated_reason:
+        count(LLM_GATED, stage="intent", outcome=gated_reason)
         LOGGER.info(
             "order_status_intent.gated",
             extra={
@@ -343,12 +355,56 @@ def classify_order_status_intent(
     excerpt = redact_ticket_text(ticket_text)
     excerpt_fingerprint = _fingerprint(excerpt) if excerpt else None
 
+    # The local model only stands in for the LLM when the deterministic router
+    # agrees with it; a disagreement is the ambiguous case the LLM is for.
+    local = None
+    if local_intent_enabled():
+        deterministic = classify_routing({"customer_message": ticket_text})
+        local = agreeing_local_prediction(prompt_text, deterministic.intent)
+    if local is not None:
+        LOGGER.info(
+            "order_status_intent.local_model",
+            extra={
+                "event_id": event_id,
+                "conversation_id": conversation_id,
+                "model_version": local.model_version,
+                "is_order_status": local.is_order_status,
+                "confidence": round(local.confidence, 4),
+            },
+        )
+        local_result = OrderStatusIntentResult(
+            is_order_status=local.is_order_status,
+            confidence=local.confidence,
+            reason="local_model",
+            extracted_order_number=extract_order_number_from_text(ticket_text),
+            language=None,
+        )
+        return OrderStatusIntentArtifact(
+            result=local_result,
+            llm_called=False,
+            model=local.model_version,
+            response_id=None,
+            response_id_unavailable_reason="local_model",
+            confidence_threshold=threshold,
+            accepted=bool(
+                local_result.is_order_status and local_result.confidence >= threshold
+            ),
+            parse_error=None,
+            gated_reason=None,
+            prompt_fingerprint=fingerprint,
+            ticket_excerpt_redacted=excerpt,
+            ticket_excerpt_fingerprint=excerpt_fingerprint,
+            dry_run=False,
+        )
+
     request = ChatCompletionRequest(
         model=model,
         messages=messages,
         temperature=DEFAULT_TEMPERATURE,
         max_tokens=DEFAULT_MAX_TOKENS,
         metadata={"conversation_id": conversation_id, "event_id": event_id},
+        call_type=INTENT_CALL_TYPE,
+        latency_budget_seconds=latency_budget_from_env(INTENT_LATENCY_BUDGET_ENV),
     )
     openai_client = client or OpenAIClient(allow_network=allow_network)
 
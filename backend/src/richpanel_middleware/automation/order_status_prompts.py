@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from richpanel_middleware.integrations.openai import ChatMessage
 
@@ -48,6 +49,132 @@ Return strict JSON ONLY with:
 }
 """
 
+# Few-shot turns sent after each system prompt. Together with it they form a
+# byte-stable prefix that the provider's prompt cache can reuse across calls;
+# per-ticket content only ever appears in the final user message. None of the
+# examples contain real customer data.
+INTENT_FEW_SHOT_EXAMPLES: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    (
+        "Where is my order #10452? It still hasn't arrived.",
+        {
+            "is_order_status": True,
+            "confidence": 0.95,
+            "reason": "asks where an order is",
+            "extracted_order_number": "10452",
+            "language": "en",
+        },
+    ),
+    (
+        "Can you send me the tracking link for my package?",
+        {
+            "is_order_status": True,
+            "confidence": 0.9,
+            "reason": "asks for tracking",
+            "extracted_order_number": None,
+            "language": "en",
+        },
+    ),
+    (
+        "¿Cuándo llega mi pedido? Lo compré hace una semana.",
+        {
+            "is_order_status": True,
+            "confidence": 0.88,
+            "reason": "asks when the order arrives",
+            "extracted_order_number": None,
+            "language": "es",
+        },
+    ),
+    (
+        "I want a refund, the shirt is too small.",
+        {
+            "is_order_status": False,
+            "confidence": 0.1,
+            "reason": "refund request, not status",
+            "extracted_order_number": None,
+            "language": "en",
+        },
+    ),
+    (
+        "Do you ship to Canada?",
+        {
+            "is_order_status": False,
+            "confidence": 0.2,
+            "reason": "pre-purchase shipping question",
+            "extracted_order_number": None,
+            "language": "en",
+        },
+    ),
+)
+
+REPLY_FEW_SHOT_EXAMPLES: Tuple[Tuple[Dict[str, Optional[str]], str, Dict[str, Any]], ...] = (
+    (
+        {
+            "carrier": "UPS",
+            "eta_window": None,
+            "shipping_method": "Standard",
+            "tracking_number": "1Z999AA10123456784",
+            "tracking_url": "https://www.ups.com/track?tracknum=1Z999AA10123456784",
+        },
+        "Your order shipped via UPS (Standard). Tracking: 1Z999AA10123456784 "
+        "https://www.ups.com/track?tracknum=1Z999AA10123456784",
+        {
+            "body": "Good news - your order is on its way with UPS (Standard shipping). "
+            "You can follow it with tracking number 1Z999AA10123456784 here: "
+            "https://www.ups.com/track?tracknum=1Z999AA10123456784",
+            "confidence": 0.95,
+            "risk_flags": [],
+        },
+    ),
+    (
+        {
+            "carrier": None,
+            "eta_window": "3-5 business days",
+            "shipping_method": "Standard",
+            "tracking_number": None,
+            "tracking_url": None,
+        },
+        "Your order is being prepared. Estimated delivery: 3-5 business days.",
+        {
+            "body": "Thanks for checking in! Your order is being prepared and should "
+            "arrive in 3-5 business days with Standard shipping. We'll email tracking "
+            "as soon as it ships.",
+            "confidence": 0.9,
+            "risk_flags": [],
+        },
+    ),
+)
+
+REPLY_TEMPLATE_FEW_SHOT_EXAMPLES: Tuple[Tuple[List[str], str, Dict[str, Any]], ...] = (
+    (
+        ["carrier", "tracking_number", "tracking_url"],
+        "Your order shipped via {{carrier}}. Tracking: {{tracking_number}} {{tracking_url}}",
+        {
+            "body": "Good news - your order is on its way with {{carrier}}. "
+            "You can follow it with tracking number {{tracking_number}} here: "
+            "{{tracking_url}}",
+            "confidence": 0.95,
+            "risk_flags": [],
+        },
+    ),
+)
+
+REPLY_TEMPLATE_RULES = """
+Template mode:
+- The draft reply contains placeholders such as {{tracking_number}}; each stands for a per-customer value.
+- Copy every placeholder exactly as written (same name, double braces) and keep each one.
+- Do NOT add new placeholders and do NOT replace placeholders with example values.
+"""
+
+# Changes whenever the template prompt text changes, so cached template
+# rewrites are invalidated automatically.
+REPLY_TEMPLATE_PROMPT_VERSION = hashlib.sha256(
+    (
+        REPLY_SYSTEM_PROMPT
+        + REPLY_TEMPLATE_RULES
+        + json.dumps(REPLY_TEMPLATE_FEW_SHOT_EXAMPLES, sort_keys=True)
+    ).encode("utf-8")
+).hexdigest()[:12]
+
 _MAX_TICKET_CHARS = 2000
 _MAX_DRAFT_CHARS = 2000
 
@@ -61,21 +188,91 @@ class OrderStatusReplyContext:
     carrier: Optional[str] = None
 
 
-def build_order_status_intent_prompt(
-    ticket_text: str, *, metadata: Optional[Dict[str, str]] = None
-) -> List[ChatMessage]:
-    trimmed = ticket_text[:_MAX_TICKET_CHARS] if ticket_text else ""
-    meta = metadata or {}
-    meta_json = json.dumps(meta, sort_keys=True, separators=(",", ":"))
-    user_content = (
+def _few_shot_prefix(
+    system_prompt: str, turns: List[Tuple[str, Dict[str, Any]]]
+) -> Tuple[ChatMessage, ...]:
+    messages = [ChatMessage(role="system", content=system_prompt)]
+    for user_content, answer in turns:
+        messages.append(ChatMessage(role="user", content=user_content))
+        messages.append(
+            ChatMessage(role="assistant", content=json.dumps(answer, ensure_ascii=False))
+        )
+    return tuple(messages)
+
+
+def _intent_user_content(ticket_text: str, metadata: Dict[str, str]) -> str:
+    meta_json = json.dumps(metadata, sort_keys=True, separators=(",", ":"))
+    return (
         "Ticket message:\n"
-        f"{trimmed}\n\n"
+        f"{ticket_text}\n\n"
         "Metadata (non-PII):\n"
         f"{meta_json}"
     )
+
+
+def _reply_user_content(
+    context: Dict[str, Optional[str]], draft_reply: str, language: Optional[str]
+) -> str:
+    context_json = json.dumps(context, sort_keys=True, separators=(",", ":"))
+    language_hint = (
+        f"Write the reply in language: {language}.\n\n" if language else ""
+    )
+    return (
+        f"{language_hint}"
+        "Context (use only these facts):\n"
+        f"{context_json}\n\n"
+        "Draft reply (facts to preserve):\n"
+        f"{draft_reply}"
+    )
+
+
+def _reply_template_user_content(
+    placeholders: List[str], template: str, language: Optional[str]
+) -> str:
+    context = {name: "{{" + name + "}}" for name in sorted(placeholders)}
+    context_json = json.dumps(context, sort_keys=True, separators=(",", ":"))
+    language_hint = (
+        f"Write the reply in language: {language}.\n\n" if language else ""
+    )
+    return (
+        f"{language_hint}"
+        "Placeholders (keep verbatim):\n"
+        f"{context_json}\n\n"
+        "Draft reply template:\n"
+        f"{template}"
+    )
+
+
+INTENT_PROMPT_PREFIX = _few_shot_prefix(
+    INTENT_SYSTEM_PROMPT,
+    [
+        (_intent_user_content(text, {"ticket_channel": "email"}), answer)
+        for text, answer in INTENT_FEW_SHOT_EXAMPLES
+    ],
+)
+REPLY_PROMPT_PREFIX = _few_shot_prefix(
+    REPLY_SYSTEM_PROMPT,
+    [
+        (_reply_user_content(context, draft, None), answer)
+        for context, draft, answer in REPLY_FEW_SHOT_EXAMPLES
+    ],
+)
+REPLY_TEMPLATE_PROMPT_PREFIX = _few_shot_prefix(
+    REPLY_SYSTEM_PROMPT + REPLY_TEMPLATE_RULES,
+    [
+        (_reply_template_user_content(placeholders, template, None), answer)
+        for placeholders, template, answer in REPLY_TEMPLATE_FEW_SHOT_EXAMPLES
+    ],
+)
+
+
+def build_order_status_intent_prompt(
+    ticket_text: str, *, metadata: Optional[Dict[str, str]] = None
+) -> List[ChatMessage]:
+    trimmed = ticket_text[:_MAX_TICKET_CHARS] if ticket_text else ""
     return [
-        ChatMessage(role="system", content=INTENT_SYSTEM_PROMPT),
-        ChatMessage(role="user", content=user_content),
+        *INTENT_PROMPT_PREFIX,
+        ChatMessage(role="user", content=_intent_user_content(trimmed, metadata or {})),
     ]
 
 
@@ -92,26 +289,39 @@ def build_order_status_reply_prompt(
         "shipping_method": context.shipping_method,
         "carrier": context.carrier,
     }
-    context_json = json.dumps(safe_context, sort_keys=True, separators=(",", ":"))
     trimmed_draft = draft_reply[:_MAX_DRAFT_CHARS] if draft_reply else ""
-    language_hint = (
-        f"Write the reply in language: {language}.\n\n" if language else ""
-    )
-    user_content = (
-        f"{language_hint}"
-        "Context (use only these facts):\n"
-        f"{context_json}\n\n"
-        "Draft reply (facts to preserve):\n"
-        f"{trimmed_draft}"
-    )
     return [
-        ChatMessage(role="system", content=REPLY_SYSTEM_PROMPT),
-        ChatMessage(role="user", content=user_content),
+        *REPLY_PROMPT_PREFIX,
+        ChatMessage(
+            role="user",
+            content=_reply_user_content(safe_context, trimmed_draft, language),
+        ),
+    ]
+
+
+def build_order_status_reply_template_prompt(
+    *,
+    template: str,
+    placeholders: List[str],
+    language: Optional[str] = None,
+) -> List[ChatMessage]:
+    trimmed_template = template[:_MAX_DRAFT_CHARS] if template else ""
+    return [
+        *REPLY_TEMPLATE_PROMPT_PREFIX,
+        ChatMessage(
+            role="user",
+            content=_reply_template_user_content(placeholders, trimmed_template, language),
+        ),
     ]
 
 
 __all__ = [
+    "INTENT_PROMPT_PREFIX",
     "OrderStatusReplyContext",
+    "REPLY_PROMPT_PREFIX",
+    "REPLY_TEMPLATE_PROMPT_PREFIX",
+    "REPLY_TEMPLATE_PROMPT_VERSION",
     "build_order_status_intent_prompt",
     "build_order_status_reply_prompt",
+    "build_order_status_reply_template_prompt",
 ]
@@ -1,8 +1,23 @@
+"""
+PII redaction for text sent to OpenAI.
+
+sanitize_for_openai decodes entities, strips tags and then recognizes every
+PII class (order numbers, URLs, emails, phones, addresses, names) in one scan
+of a combined pattern, writing the output once. The original multi-pass
+implementation is kept as _sanitize_multi_pass: its passes rewrite the text
+between patterns, so whenever a match sits where that rewriting could change
+what a later pattern sees (including a match running into an "@" that the
+email pattern would then swallow), the single pass defers to it.
+scripts/test_pii_sanitizer.py fuzzes both implementations against each
+other.
+"""
+
 from __future__ import annotations
 
 import html
 import re
-from typing import List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 _HTML_TAG_REGEX = re.compile(r"<[^>]+>")
 _EMAIL_REGEX = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
@@ -59,7 +74,8 @@ def _redact_names(text: str) -> str:
     return redacted
 
 
-def sanitize_for_openai(text: str, *, max_chars: Optional[int] = 2000) -> str:
+def _sanitize_multi_pass(text: str, *, max_chars: Optional[int] = 2000) -> str:
+    """Reference implementation: one regex pass (and string copy) per PII class."""
     if not text:
         return ""
     sanitized = html.unescape(str(text))
@@ -78,4 +94,175 @@ def sanitize_for_openai(text: str, *, max_chars: Optional[int] = 2000) -> str:
     return sanitized
 
 
+_TAG_OR_ANGLE_REGEX = re.compile(r"<[^>]+>|[<>]")
+_ORDER_TOKEN_PREFIX = "__ORDER_TOKEN_"
+_REDACTED = "<redacted>"
+
+# Each branch of the combined pattern starts with a plain character class so
+# the regex engine can reject it with one lookup; the leading \b / ^ of the
+# original patterns becomes a lookbehind after that first character. The
+# case-insensitive first letters include the non-ASCII characters re.I folds
+# onto them (e.g. "ı" for i, "ſ" for s).
+_AFTER_NON_WORD = r"(?<!\w.)"
+_AFTER_NEWLINE = r"(?<![^\n].)"
+_NAME = r"[A-Z][a-z]+(?:\s+[A-Z][a-z]+){0,2}\b"
+_PHONE_SEP = r"[\s\-.]?"
+_PHONE_TAIL = rf"\d{{3}}{_PHONE_SEP}\d{{4}}\b"
+_EMAIL_LOCAL = "A-Za-z0-9._%+-"
+
+# (class, first character, rest of pattern, has phrase group), in the order
+# the multi-pass implementation applies them.
+_BRANCHES: List[Tuple[str, str, str, bool]] = [
+    ("order", "[oO]", _AFTER_NON_WORD + r"(?i:rder(?:\s*(?:number|no\.?))?\s*[:#]?\s*\d{3,20})\b", False),
+    ("order", "#", r"(?<=\w#)\d{3,20}\b", False),
+    ("url", "h", r"ttps?://\S+", False),
+    (
+        "email",
+        f"[{_EMAIL_LOCAL}]",
+        rf"(?<![{_EMAIL_LOCAL}].)[{_EMAIL_LOCAL}]*@[A-Za-z0-9.-]+\.[A-Za-z]{{2,}}",
+        False,
+    ),
+    ("phone", r"\+", rf"(?<=\w\+)\d{{1,3}}{_PHONE_SEP}\(?\d{{2,4}}\)?{_PHONE_SEP}{_PHONE_TAIL}", False),
+    ("phone", r"\(", rf"(?<=\w\()\d{{2,4}}\)?{_PHONE_SEP}{_PHONE_TAIL}", False),
+    (
+        "phone",
+        r"\d",
+        _AFTER_NON_WORD
+        + rf"(?:\d{{0,2}}{_PHONE_SEP}\(?\d{{2,4}}\)?{_PHONE_SEP}{_PHONE_TAIL}"
+        + rf"|\d{{1,3}}\)?{_PHONE_SEP}{_PHONE_TAIL})",
+        False,
+    ),
+    (
+        "address",
+        r"\d",
+        _AFTER_NON_WORD
+        + r"(?i:\d{0,5}\s+[A-Za-z0-9.'\- ]{2,40}\s+"
+        r"(?:st|street|ave|avenue|rd|road|blvd|boulevard|ln|lane|dr|drive|ct|court|"
+        r"pl|place|pkwy|parkway|cir|circle|ter|terrace|way)\b\.?)",
+        False,
+    ),
+    ("intro_name", "[mM]", _AFTER_NON_WORD + rf"(?i:(?P<p>y name is)\s+{_NAME})", True),
+    ("intro_name", "[tT]", _AFTER_NON_WORD + rf"(?i:(?P<p>his is)\s+{_NAME})", True),
+    ("intro_name", "[iIİı]", _AFTER_NON_WORD + rf"(?i:(?P<p> am|'m)\s+{_NAME})", True),
+    ("greeting_name", "[hH]", _AFTER_NON_WORD + rf"(?i:(?P<p>i|ello)\s+{_NAME})", True),
+    ("greeting_name", "[dD]", _AFTER_NON_WORD + rf"(?i:(?P<p>ear)\s+{_NAME})", True),
+    ("signoff_name", "[tT]", _AFTER_NEWLINE + rf"(?i:(?P<p>hanks|hank you)[, ]+\s*{_NAME})", True),
+    ("signoff_name", "[cC]", _AFTER_NEWLINE + rf"(?i:(?P<p>heers)[, ]+\s*{_NAME})", True),
+    ("signoff_name", "[rR]", _AFTER_NEWLINE + rf"(?i:(?P<p>egards)[, ]+\s*{_NAME})", True),
+    ("signoff_name", "[sSſ]", _AFTER_NEWLINE + rf"(?i:(?P<p>incerely)[, ]+\s*{_NAME})", True),
+    ("signoff_name", "[bB]", _AFTER_NEWLINE + rf"(?i:(?P<p>est)[, ]+\s*{_NAME})", True),
+]
+_CLASS_RANKS = {
+    name: rank
+    for rank, name in enumerate(
+        ("order", "url", "email", "phone", "address", "intro_name", "greeting_name", "signoff_name")
+    )
+}
+
+
+@lru_cache(maxsize=1)
+def _compile_combined() -> Tuple["re.Pattern[str]", Dict[str, Tuple[int, Optional[str]]]]:
+    # Compiled on first use: the alternation costs more than everything else
+    # the worker imports, and route-only events never sanitize anything.
+    parts: List[str] = []
+    branches: Dict[str, Tuple[int, Optional[str]]] = {}
+    for index, (kind, first, rest, has_phrase) in enumerate(_BRANCHES):
+        phrase = f"p{index}" if has_phrase else None
+        if phrase:
+            rest = rest.replace("(?P<p>", f"(?P<{phrase}>")
+        parts.append(f"{first}(?P<b{index}>{rest})")
+        branches[f"b{index}"] = (_CLASS_RANKS[kind], phrase)
+    return re.compile("|".join(parts)), branches
+
+
+_WHITESPACE_REGEX = re.compile(r"\s")
+_INTRO_NAME_START_REGEX = re.compile(r"(?i)\b(?:my name is|this is|i am|i'm)\s")
+_GREETING_NAME_START_REGEX = re.compile(r"(?i)\b(?:hi|hello|dear)\s")
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _earlier_class_overlaps(text: str, rank: int, start: int, end: int) -> bool:
+    """Could a class applied earlier by the multi-pass code start inside this match?"""
+    if rank > _CLASS_RANKS["order"] and (
+        "#" in text[start:end] or "order" in text[start : end + 4].lower()
+    ):
+        return True
+    if rank > _CLASS_RANKS["url"] and "http" in text[start : end + 3]:
+        return True
+    if rank > _CLASS_RANKS["email"]:
+        space = _WHITESPACE_REGEX.search(text, end)
+        if "@" in text[start : space.start() if space else len(text)]:
+            return True
+    if rank == _CLASS_RANKS["address"]:
+        phone = _PHONE_REGEX.search(text, start, min(len(text), end + 24))
+        if phone and phone.start() < end:
+            return True
+    if rank > _CLASS_RANKS["intro_name"]:
+        intro = _INTRO_NAME_START_REGEX.search(text, start, min(len(text), end + 12))
+        if intro and intro.start() < end:
+            return True
+    if rank == _CLASS_RANKS["signoff_name"]:
+        greeting = _GREETING_NAME_START_REGEX.search(text, start, min(len(text), end + 7))
+        if greeting and greeting.start() < end:
+            return True
+    return False
+
+
+def _redact_single_pass(text: str) -> Optional[str]:
+    """Redact every class in one scan; None when the multi-pass result could differ.
+
+    The multi-pass code replaces each class before matching the next, so a match
+    touching another match, a word character, or text an earlier class could
+    claim may come out differently there. Those inputs are rare in real mail.
+    """
+    if _ORDER_TOKEN_PREFIX in text:
+        return None
+    length = len(text)
+    pieces: List[str] = []
+    position = 0
+    previous_end = -1
+    combined, branch_info = _compile_combined()
+    for match in combined.finditer(text):
+        rank, phrase = branch_info[match.lastgroup or ""]
+        start, end = match.span()
+        if (
+            start == previous_end
+            or (start > 0 and (_is_word_char(text[start - 1]) or text[start - 1] == "."))
+            or (
+                end < length
+                and (
+                    _is_word_char(text[end])
+                    or text[end] in "+(@"
+                    or (text[end] in ".%-" and _EMAIL_REGEX.match(text, end))
+                )
+            )
+            or _earlier_class_overlaps(text, rank, start, end)
+        ):
+            return None
+        previous_end = end
+        if rank == _CLASS_RANKS["order"]:
+            # Order numbers are kept verbatim.
+            continue
+        pieces.append(text[position:start])
+        pieces.append(f"{text[start:match.end(phrase)]} {_REDACTED}" if phrase else _REDACTED)
+        position = end
+    pieces.append(text[position:])
+    return " ".join("".join(pieces).split())
+
+
+def sanitize_for_openai(text: str, *, max_chars: Optional[int] = 2000) -> str:
+    if not text:
+        return ""
+    stripped = _TAG_OR_ANGLE_REGEX.sub(" ", html.unescape(str(text)))
+    sanitized = _redact_single_pass(stripped)
+    if sanitized is None:
+        return _sanitize_multi_pass(text, max_chars=max_chars)
+    if max_chars is not None and len(sanitized) > max_chars:
+        sanitized = sanitized[:max_chars].rstrip() + "..."
+    return sanitized
+
+
 __all__ = ["sanitize_for_openai"]
@@ -1,25 +1,22 @@
 from __future__ import annotations
 
 import base64
+import contextvars
+import functools
 import hashlib
+import importlib
 import json
 import logging
 import os
+import threading
 import time
 import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, dataclass, field, replace
 from datetime import datetime, timezone
-from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, cast
 
 from integrations.common import PRODUCTION_ENVIRONMENTS, resolve_env_name, _to_bool
-from richpanel_middleware.automation.delivery_estimate import (
-    build_no_tracking_reply,
-    build_tracking_reply,
-    compute_preorder_delivery_estimate,
-    compute_delivery_estimate,
-    normalize_shipping_method,
-    normalize_shipping_method_for_carrier,
-)
 from richpanel_middleware.automation.router import (
     RoutingDecision,
     extract_customer_message,
@@ -28,10 +25,6 @@ from richpanel_middleware.automation.llm_routing import (
     RoutingArtifact,
     compute_dual_routing,
 )
-from richpanel_middleware.automation.llm_reply_rewriter import (
-    ReplyRewriteResult,
-    rewrite_reply,
-)
 from richpanel_middleware.automation.order_status_intent import (
     OrderStatusIntentArtifact,
     classify_order_status_intent,
@@ -43,6 +36,7 @@ from richpanel_middleware.automation.order_status_prompts import (
 from richpanel_middleware.commerce.order_lookup import (
     extract_order_number_from_payload,
     lookup_order_summary,
+    resolved_order_for_state,
 )
 from richpanel_middleware.integrations.richpanel.client import (
     RichpanelExecutor,
@@ -55,12 +49,13 @@ from richpanel_middleware.integrations.richpanel.tickets import (
     dedupe_tags,
     get_ticket_metadata,
 )
-from richpanel_middleware.automation.prompts import (
-    OrderStatusPromptInput,
-    build_order_status_contract,
-    prompt_fingerprint,
+from richpanel_middleware.automation.ticket_fetch import (
+    TICKET_FETCH_STATS,
+    TicketFetchDecision,
+    decide_ticket_fetch,
 )
 from richpanel_middleware.ingest.envelope import EventEnvelope, normalize_envelope
+from richpanel_middleware.observability.tracing import span
 
 try:
     import boto3  # type: ignore
@@ -73,6 +68,49 @@ except ImportError:  # pragma: no cover
 
     BotoCoreError = ClientError = _FallbackBotoError  # type: ignore
 
+if TYPE_CHECKING:  # pragma: no cover
+    from richpanel_middleware.automation.llm_reply_rewriter import (
+        ReplyRewriteResult,
+        ReplyTemplate,
+    )
+
+
+def _deferred(module: str, name: str) -> Callable[..., Any]:
+    """Stand-in for ``module.name`` that imports ``module`` on first call.
+
+    Only the order-status reply path needs the reply rewriter, delivery
+    estimates and the reply prompt contract; route-only events never load
+    them. The stand-ins are module attributes, so patching them still works.
+    """
+
+    def call(*args: Any, **kwargs: Any) -> Any:
+        return getattr(importlib.import_module(module), name)(*args, **kwargs)
+
+    call.__name__ = call.__qualname__ = name
+    return call
+
+
+_DELIVERY_ESTIMATE = "richpanel_middleware.automation.delivery_estimate"
+_REPLY_REWRITER = "richpanel_middleware.automation.llm_reply_rewriter"
+_PROMPTS = "richpanel_middleware.automation.prompts"
+build_no_tracking_reply = _deferred(_DELIVERY_ESTIMATE, "build_no_tracking_reply")
+build_tracking_reply = _deferred(_DELIVERY_ESTIMATE, "build_tracking_reply")
+compute_preorder_delivery_estimate = _deferred(
+    _DELIVERY_ESTIMATE, "compute_preorder_delivery_estimate"
+)
+compute_delivery_estimate = _deferred(_DELIVERY_ESTIMATE, "compute_delivery_estimate")
+normalize_shipping_method = _deferred(_DELIVERY_ESTIMATE, "normalize_shipping_method")
+normalize_shipping_method_for_carrier = _deferred(
+    _DELIVERY_ESTIMATE, "normalize_shipping_method_for_carrier"
+)
+extract_reply_template = _deferred(_REPLY_REWRITER, "extract_reply_template")
+rewrite_reply = _deferred(_REPLY_REWRITER, "rewrite_reply")
+rewrite_reply_template = _deferred(_REPLY_REWRITER, "rewrite_reply_template")
+template_cache_enabled = _deferred(_REPLY_REWRITER, "template_cache_enabled")
+OrderStatusPromptInput = _deferred(_PROMPTS, "OrderStatusPromptInput")
+build_order_status_contract = _deferred(_PROMPTS, "build_order_status_contract")
+prompt_fingerprint = _deferred(_PROMPTS, "prompt_fingerprint")
+
 LOGGER = logging.getLogger(__name__)
 LOOP_PREVENTION_TAG = "mw-auto-replied"
 ORDER_STATUS_REPLY_TAG = "mw-order-status-answered"
@@ -92,6 +130,12 @@ MW_OUTBOUND_ALLOWLIST_DOMAINS_ENV = "MW_OUTBOUND_ALLOWLIST_DOMAINS"
 MW_OUTBOUND_REQUIRE_ALLOWLIST_ENV = "MW_OUTBOUND_REQUIRE_ALLOWLIST"
 SKIP_RESOLVED_TAG = "mw-skip-order-status-closed"
 SKIP_FOLLOWUP_TAG = "mw-skip-followup-after-auto-reply"
+# Conversation-state attribute written once we auto-replied to (or closed) a
+# ticket; later events on the conversation skip straight to support routing.
+AUTO_REPLY_MARKER_ATTR = "auto_reply_marker"
+# Conversation-state attribute holding the order a conversation resolved to, so
+# follow-up messages skip the Shopify identity lookups.
+RESOLVED_ORDER_ATTR = "resolved_order"
 SKIP_STATUS_READ_FAILED_TAG = "mw-skip-status-read-failed"
 ORDER_LOOKUP_FAILED_TAG = "mw-order-lookup-failed"
 ORDER_STATUS_SUPPRESSED_TAG = "mw-order-status-suppressed"
@@ -110,6 +154,8 @@ _SKIP_REASON_TAGS = {
 }
 _READ_ONLY_ENVIRONMENTS = {"prod", "production", "staging"}
 _SECRET_VALUE_CACHE_TTL_SECONDS = 900
+MW_SPECULATIVE_REWRITE_ENV = "MW_SPECULATIVE_REWRITE_ENABLED"
+_SPECULATIVE_REWRITE_WORKERS = 2
 _SECRET_VALUE_CACHE: Dict[str, Dict[str, Any]] = {}
 
 
@@ -514,6 +560,15 @@ class ActionPlan:
     routing: RoutingDecision | None = None
     routing_artifact: RoutingArtifact | None = None
     order_status_intent: OrderStatusIntentArtifact | None = None
+    # Marker loaded from conversation state (carried into the next state record).
+    auto_reply_marker: Dict[str, Any] | None = None
+    # Order resolution loaded from (or newly made for) the conversation state.
+    resolved_order: Dict[str, Any] | None = None
+    # Whether the Richpanel ticket snapshot was fetched or skipped (audit only).
+    ticket_fetch: Dict[str, Any] | None = None
+    speculative_rewrite: SpeculativeRewrite | None = field(
+        default=None, repr=False, compare=False
+    )
 
 
 @dataclass
@@ -791,6 +846,59 @@ def _resolve_target_ticket_id(
     return str(envelope.conversation_id)
 
 
+def _plan_known_followup(
+    envelope: EventEnvelope,
+    payload: Dict[str, Any],
+    *,
+    auto_reply_marker: Dict[str, Any],
+    resolved_order: Optional[Dict[str, Any]],
+    safe_mode: bool,
+    automation_enabled: bool,
+) -> ActionPlan:
+    """Deterministic Email Support route for a conversation we already answered."""
+    routing, routing_artifact = compute_dual_routing(
+        payload,
+        conversation_id=envelope.conversation_id,
+        event_id=envelope.event_id,
+        safe_mode=safe_mode,
+        automation_enabled=automation_enabled,
+        allow_network=False,
+        outbound_enabled=False,
+    )
+    routing.tags = sorted(
+        dedupe_tags((routing.tags or []) + [EMAIL_SUPPORT_ROUTE_TAG, SKIP_FOLLOWUP_TAG])
+    )
+    reasons = ["followup_after_auto_reply", routing.reason]
+    LOGGER.info(
+        "automation.known_followup",
+        extra={
+            "event_id": envelope.event_id,
+            "conversation_id": envelope.conversation_id,
+            "marker_reason": auto_reply_marker.get("reason"),
+        },
+    )
+    return ActionPlan(
+        event_id=envelope.event_id,
+        mode="automation_candidate",
+        safe_mode=safe_mode,
+        automation_enabled=automation_enabled,
+        actions=[
+            {
+                "type": "analyze",
+                "conversation_id": envelope.conversation_id,
+                "note": "follow-up after auto-reply; routed to support",
+                "reasons": reasons,
+                "routing": asdict(routing),
+            }
+        ],
+        reasons=reasons,
+        routing=routing,
+        routing_artifact=routing_artifact,
+        auto_reply_marker=auto_reply_marker,
+        resolved_order=resolved_order,
+    )
+
+
 def plan_actions(
     envelope: EventEnvelope,
     *,
@@ -798,6 +906,8 @@ def plan_actions(
     automation_enabled: bool,
     allow_network: bool = False,
     outbound_enabled: bool = False,
+    auto_reply_marker: Optional[Dict[str, Any]] = None,
+    resolved_order: Optional[Dict[str, Any]] = None,
 ) -> ActionPlan:
     """
     Build a minimal action plan from the normalized envelope.
@@ -809,8 +919,24 @@ def plan_actions(
     - Computes LLM routing suggestion (dry-run artifact if gated)
     - Persists both into routing_artifact for audit/analysis
     - Uses OPENAI_ROUTING_PRIMARY flag to determine final routing source
+
+    With an auto_reply_marker (we already auto-replied on this conversation)
+    and automation active, the plan is a deterministic follow-up route to
+    Email Support: no OpenAI, Richpanel or Shopify calls.
+
+    resolved_order is the order this conversation already resolved to; the
+    order lookup reuses it instead of repeating the identity search.
     """
     payload = envelope.payload if isinstance(envelope.payload, dict) else {}
+    if auto_reply_marker and automation_enabled and not safe_mode:
+        return _plan_known_followup(
+            envelope,
+            payload,
+            auto_reply_marker=auto_reply_marker,
+            resolved_order=resolved_order,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+        )
 
     # Compute dual routing (deterministic + LLM advisory)
     force_openai_primary = bool(
@@ -818,32 +944,34 @@ def plan_actions(
         if isinstance(payload, dict) and payload.get("source") == "dev_e2e_smoke"
         else False
     )
-    routing, routing_artifact = compute_dual_routing(
-        payload,
-        conversation_id=envelope.conversation_id,
-        event_id=envelope.event_id,
-        safe_mode=safe_mode,
-        automation_enabled=automation_enabled,
-        allow_network=allow_network,
-        outbound_enabled=outbound_enabled,
-        force_primary=force_openai_primary,
-    )
+    with span("routing"):
+        routing, routing_artifact = compute_dual_routing(
+            payload,
+            conversation_id=envelope.conversation_id,
+            event_id=envelope.event_id,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+            allow_network=allow_network,
+            outbound_enabled=outbound_enabled,
+            force_primary=force_openai_primary,
+        )
 
     customer_message = extract_customer_message(payload, default="")
     intent_metadata: Dict[str, str] = {}
     ticket_channel = _extract_ticket_channel_from_payload(payload)
     if ticket_channel:
         intent_metadata["ticket_channel"] = ticket_channel
-    order_status_intent = classify_order_status_intent(
-        customer_message,
-        conversation_id=envelope.conversation_id,
-        event_id=envelope.event_id,
-        safe_mode=safe_mode,
-        automation_enabled=automation_enabled,
-        allow_network=allow_network,
-        outbound_enabled=outbound_enabled,
-        metadata=intent_metadata or None,
-    )
+    with span("intent"):
+        order_status_intent = classify_order_status_intent(
+            customer_message,
+            conversation_id=envelope.conversation_id,
+            event_id=envelope.event_id,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+            allow_network=allow_network,
+            outbound_enabled=outbound_enabled,
+            metadata=intent_metadata or None,
+        )
     reasons: List[str] = []
     routing = _maybe_apply_order_status_intent_override(
         routing,
@@ -862,6 +990,7 @@ def plan_actions(
     reasons.append(routing.reason)
 
     actions: List[Dict[str, Any]] = []
+    ticket_fetch: Optional[Dict[str, Any]] = None
     routing_payload = asdict(routing) if routing else None
     if mode == "route_only":
         actions.append(
@@ -905,42 +1034,63 @@ def plan_actions(
                     routing=routing,
                     routing_artifact=routing_artifact,
                     order_status_intent=order_status_intent,
+                    auto_reply_marker=auto_reply_marker,
+                    resolved_order=resolved_order,
                 )
             lookup_envelope = envelope
-            if allow_network and not safe_mode and automation_enabled and isinstance(payload, dict):
-                executor = RichpanelExecutor(outbound_enabled=allow_network)
-                target_id = _resolve_target_ticket_id(
-                    envelope, executor=executor, allow_network=allow_network
-                )
-                _, _, ticket_customer_email, ticket_payload = _safe_ticket_snapshot_fetch(
-                    target_id,
-                    executor=executor,
+            fetch_decision: Optional[TicketFetchDecision] = None
+            with span("ticket_fetch"):
+                if allow_network and not safe_mode and automation_enabled and isinstance(payload, dict):
+                    fetch_decision = decide_ticket_fetch(payload, resolved_order=resolved_order)
+                    TICKET_FETCH_STATS.record(_classify_channel(ticket_channel), fetch_decision)
+                    if not fetch_decision.fetch:
+                        LOGGER.info(
+                            "automation.ticket_fetch_skipped",
+                            extra={
+                                "event_id": envelope.event_id,
+                                "conversation_id": envelope.conversation_id,
+                                "policy": fetch_decision.policy,
+                                "ticket_fetch_stats": TICKET_FETCH_STATS.snapshot(),
+                            },
+                        )
+                if fetch_decision is not None and fetch_decision.fetch:
+                    executor = RichpanelExecutor(outbound_enabled=allow_network)
+                    target_id = _resolve_target_ticket_id(
+                        envelope, executor=executor, allow_network=allow_network
+                    )
+                    _, _, ticket_customer_email, ticket_payload = _safe_ticket_snapshot_fetch(
+                        target_id,
+                        executor=executor,
+                        allow_network=allow_network,
+                    )
+                    if isinstance(ticket_payload, dict):
+                        lookup_payload = dict(payload)
+                        for key in ("subject", "body", "text", "message", "customer_message"):
+                            if key not in lookup_payload and ticket_payload.get(key):
+                                lookup_payload[key] = ticket_payload.get(key)
+                        extracted_order_number = extract_order_number_from_payload(ticket_payload)
+                        if extracted_order_number and not (
+                            lookup_payload.get("order_number")
+                            or lookup_payload.get("orderNumber")
+                        ):
+                            lookup_payload["order_number"] = extracted_order_number
+                        if ticket_customer_email and not (
+                            lookup_payload.get("email")
+                            or lookup_payload.get("customer_email")
+                        ):
+                            lookup_payload["email"] = ticket_customer_email
+                        lookup_envelope = replace(envelope, payload=lookup_payload)
+
+            with span("order_lookup"):
+                order_summary = lookup_order_summary(
+                    lookup_envelope,
+                    safe_mode=safe_mode,
+                    automation_enabled=automation_enabled,
                     allow_network=allow_network,
+                    resolved_order=resolved_order,
                 )
-                if isinstance(ticket_payload, dict):
-                    lookup_payload = dict(payload)
-                    for key in ("subject", "body", "text", "message", "customer_message"):
-                        if key not in lookup_payload and ticket_payload.get(key):
-                            lookup_payload[key] = ticket_payload.get(key)
-                    extracted_order_number = extract_order_number_from_payload(ticket_payload)
-                    if extracted_order_number and not (
-                        lookup_payload.get("order_number")
-                        or lookup_payload.get("orderNumber")
-                    ):
-                        lookup_payload["order_number"] = extracted_order_number
-                    if ticket_customer_email and not (
-                        lookup_payload.get("email")
-                        or lookup_payload.get("customer_email")
-                    ):
-                        lookup_payload["email"] = ticket_customer_email
-                    lookup_envelope = replace(envelope, payload=lookup_payload)
-
-            order_summary = lookup_order_summary(
-                lookup_envelope,
-                safe_mode=safe_mode,
-                automation_enabled=automation_enabled,
-                allow_network=allow_network,
-            )
+            resolved_order = resolved_order_for_state(order_summary) or resolved_order
+            ticket_fetch = fetch_decision.to_dict() if fetch_decision else None
             missing_fields = _missing_order_context(order_summary, envelope, payload)
             if missing_fields:
                 reasons.append("order_context_missing")
@@ -982,47 +1132,51 @@ def plan_actions(
                     routing=routing,
                     routing_artifact=routing_artifact,
                     order_status_intent=order_status_intent,
+                    auto_reply_marker=auto_reply_marker,
+                    resolved_order=resolved_order,
+                    ticket_fetch=ticket_fetch,
                 )
             ticket_created_at = (
                 payload.get("ticket_created_at")
                 or payload.get("created_at")
                 or envelope.received_at
             )
-            delivery_estimate = None
-            draft_reply = build_tracking_reply(order_summary)
-            if not draft_reply:
-                order_created_at = (
-                    order_summary.get("created_at")
-                    or order_summary.get("order_created_at")
-                    or payload.get("order_created_at")
-                    or payload.get("created_at")
-                )
-                shipping_method = (
-                    order_summary.get("shipping_method")
-                    or order_summary.get("shipping_method_name")
-                    or payload.get("shipping_method")
-                    or payload.get("shipping_method_name")
-                )
-                order_tags = order_summary.get("order_tags")
-                order_tags_raw = order_summary.get("order_tags_raw") or order_summary.get(
-                    "tags"
-                )
-                delivery_estimate = compute_preorder_delivery_estimate(
-                    order_created_at,
-                    shipping_method,
-                    ticket_created_at,
-                    order_tags,
-                    order_tags_raw,
-                ) or compute_delivery_estimate(
-                    order_created_at, shipping_method, ticket_created_at
-                )
-                if delivery_estimate:
-                    order_summary["delivery_estimate"] = delivery_estimate
-                draft_reply = build_no_tracking_reply(
-                    order_summary,
-                    inquiry_date=ticket_created_at,
-                    delivery_estimate=delivery_estimate,
-                )
+            with span("delivery_estimate"):
+                delivery_estimate = None
+                draft_reply = build_tracking_reply(order_summary)
+                if not draft_reply:
+                    order_created_at = (
+                        order_summary.get("created_at")
+                        or order_summary.get("order_created_at")
+                        or payload.get("order_created_at")
+                        or payload.get("created_at")
+                    )
+                    shipping_method = (
+                        order_summary.get("shipping_method")
+                        or order_summary.get("shipping_method_name")
+                        or payload.get("shipping_method")
+                        or payload.get("shipping_method_name")
+                    )
+                    order_tags = order_summary.get("order_tags")
+                    order_tags_raw = order_summary.get("order_tags_raw") or order_summary.get(
+                        "tags"
+                    )
+                    delivery_estimate = compute_preorder_delivery_estimate(
+                        order_created_at,
+                        shipping_method,
+                        ticket_created_at,
+                        order_tags,
+                        order_tags_raw,
+                    ) or compute_delivery_estimate(
+                        order_created_at, shipping_method, ticket_created_at
+                    )
+                    if delivery_estimate:
+                        order_summary["delivery_estimate"] = delivery_estimate
+                    draft_reply = build_no_tracking_reply(
+                        order_summary,
+                        inquiry_date=ticket_created_at,
+                        delivery_estimate=delivery_estimate,
+                    )
             prompt_input = OrderStatusPromptInput(
                 name="order_status_draft_reply",
                 conversation_id=envelope.conversation_id,
@@ -1054,7 +1208,7 @@ def plan_actions(
                 }
             )
 
-    return ActionPlan(
+    plan = ActionPlan(
         event_id=envelope.event_id,
         mode=mode,
         safe_mode=safe_mode,
@@ -1064,7 +1218,19 @@ def plan_actions(
         routing=routing,
         routing_artifact=routing_artifact,
         order_status_intent=order_status_intent,
+        auto_reply_marker=auto_reply_marker,
+        resolved_order=resolved_order,
+        ticket_fetch=ticket_fetch,
     )
+    plan.speculative_rewrite = _start_speculative_rewrite(
+        envelope,
+        plan,
+        safe_mode=safe_mode,
+        automation_enabled=automation_enabled,
+        allow_network=allow_network,
+        outbound_enabled=outbound_enabled,
+    )
+    return plan
 
 
 def execute_plan(
@@ -1124,6 +1290,13 @@ def execute_plan(
         state_record["order_status_intent"] = intent_dict
         audit_record["order_status_intent"] = intent_dict
 
+    if plan.auto_reply_marker:
+        state_record[AUTO_REPLY_MARKER_ATTR] = plan.auto_reply_marker
+    if plan.resolved_order:
+        state_record[RESOLVED_ORDER_ATTR] = plan.resolved_order
+    if plan.ticket_fetch:
+        audit_record["ticket_fetch"] = plan.ticket_fetch
+
     if state_writer:
         state_writer(state_record)
     if audit_writer:
@@ -1157,6 +1330,276 @@ def _find_order_status_action(plan: ActionPlan) -> Optional[Dict[str, Any]]:
     return None
 
 
+def _build_rewrite_prompt(
+    parameters: Dict[str, Any],
+    draft_reply: Dict[str, Any],
+    reply_body: str,
+    order_status_intent: Optional[OrderStatusIntentArtifact],
+) -> List[Any]:
+    order_summary = parameters.get("order_summary") or {}
+    delivery_estimate = parameters.get("delivery_estimate") or order_summary.get(
+        "delivery_estimate"
+    )
+    if not isinstance(delivery_estimate, dict):
+        delivery_estimate = {}
+    eta_window = delivery_estimate.get("eta_human") or draft_reply.get("eta_human")
+    shipping_method = (
+        delivery_estimate.get("normalized_method")
+        or order_summary.get("shipping_method_name")
+        or order_summary.get("shipping_method")
+    )
+    shipping_method = normalize_shipping_method_for_carrier(
+        shipping_method, draft_reply.get("carrier") if isinstance(draft_reply, dict) else None
+    )
+    reply_context = OrderStatusReplyContext(
+        tracking_number=draft_reply.get("tracking_number"),
+        tracking_url=draft_reply.get("tracking_url"),
+        eta_window=eta_window,
+        shipping_method=shipping_method,
+        carrier=draft_reply.get("carrier"),
+    )
+    return build_order_status_reply_prompt(
+        context=reply_context,
+        draft_reply=reply_body,
+        language=_intent_language(order_status_intent),
+    )
+
+
+def _intent_language(
+    order_status_intent: Optional[OrderStatusIntentArtifact],
+) -> Optional[str]:
+    if isinstance(order_status_intent, OrderStatusIntentArtifact):
+        intent_result = order_status_intent.result
+        if intent_result and intent_result.language:
+            return intent_result.language
+    return None
+
+
+_TEMPLATE_DRAFT_FIELDS = ("tracking_url", "tracking_number", "carrier", "shipping_method")
+_TEMPLATE_ESTIMATE_FIELDS = (
+    "eta_human",
+    "order_created_date",
+    "preorder_ship_date_human",
+    "delivery_window_human",
+    "days_from_inquiry_human",
+    "ship_days_from_inquiry_human",
+)
+
+
+def _reply_template(
+    parameters: Dict[str, Any], draft_reply: Dict[str, Any], reply_body: str
+) -> Optional[ReplyTemplate]:
+    """Placeholder template for the draft reply when template caching is on."""
+    if not template_cache_enabled():
+        return None
+    order_summary = parameters.get("order_summary") or {}
+    delivery_estimate = parameters.get("delivery_estimate") or order_summary.get(
+        "delivery_estimate"
+    )
+    if not isinstance(delivery_estimate, dict):
+        delivery_estimate = {}
+    values: Dict[str, Optional[str]] = {
+        name: draft_reply.get(name) for name in _TEMPLATE_DRAFT_FIELDS
+    }
+    for name in _TEMPLATE_ESTIMATE_FIELDS:
+        values[name] = delivery_estimate.get(name)
+    values["eta_human"] = values["eta_human"] or draft_reply.get("eta_human")
+    values["method_label"] = delivery_estimate.get(
+        "normalized_method"
+    ) or delivery_estimate.get("raw_method")
+    order_id = order_summary.get("order_id") or order_summary.get("id")
+    values["order_id"] = str(order_id) if order_id is not None else None
+    return extract_reply_template(
+        reply_body,
+        {name: value for name, value in values.items() if isinstance(value, str)},
+    )
+
+
+def _rewrite_draft_reply(
+    reply_body: str,
+    prompt_messages: List[Any],
+    template: Optional[ReplyTemplate],
+    *,
+    language: Optional[str],
+    conversation_id: str,
+    event_id: str,
+    safe_mode: bool,
+    automation_enabled: bool,
+    allow_network: bool,
+    outbound_enabled: bool,
+) -> ReplyRewriteResult:
+    if template is not None:
+        return rewrite_reply_template(
+            reply_body,
+            template,
+            conversation_id=conversation_id,
+            event_id=event_id,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+            allow_network=allow_network,
+            outbound_enabled=outbound_enabled,
+            language=language,
+        )
+    return rewrite_reply(
+        reply_body,
+        conversation_id=conversation_id,
+        event_id=event_id,
+        safe_mode=safe_mode,
+        automation_enabled=automation_enabled,
+        allow_network=allow_network,
+        outbound_enabled=outbound_enabled,
+        prompt_messages=prompt_messages,
+    )
+
+
+def _rewrite_key(
+    reply_body: str,
+    prompt_messages: List[Any],
+    *,
+    conversation_id: str,
+    event_id: str,
+    safe_mode: bool,
+    automation_enabled: bool,
+    allow_network: bool,
+    outbound_enabled: bool,
+) -> Tuple[Any, ...]:
+    return (
+        reply_body,
+        tuple((message.role, message.content) for message in prompt_messages),
+        conversation_id,
+        event_id,
+        safe_mode,
+        automation_enabled,
+        allow_network,
+        outbound_enabled,
+    )
+
+
+class SpeculativeRewrite:
+    """
+    Reply rewrite started in the background as soon as the draft reply exists.
+
+    The execute phase adopts the result only when its own rewrite inputs match
+    the ones the rewrite was started with; otherwise (or when a gate stops the
+    send first) the result is discarded.
+
+    The rewrite runs in a copy of the caller's context, so its upstream calls
+    and metrics land in the event's trace and metrics scope. Discarding does
+    not make it free: a rewrite that has already started still pays for the
+    OpenAI call, and that spend shows up in the event's upstream totals.
+    """
+
+    def __init__(self, key: Tuple[Any, ...], future: "Future[ReplyRewriteResult]") -> None:
+        self.key = key
+        self._future = future
+
+    def matches(self, key: Tuple[Any, ...]) -> bool:
+        return self.key == key
+
+    def result(self) -> ReplyRewriteResult:
+        return self._future.result()
+
+    def discard(self) -> None:
+        """Drop the result; only a rewrite still waiting for a worker is cancelled."""
+        self._future.cancel()
+
+
+_SPECULATIVE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_SPECULATIVE_EXECUTOR_LOCK = threading.Lock()
+
+
+def _speculative_executor() -> ThreadPoolExecutor:
+    global _SPECULATIVE_EXECUTOR
+    if _SPECULATIVE_EXECUTOR is None:
+        with _SPECULATIVE_EXECUTOR_LOCK:
+            if _SPECULATIVE_EXECUTOR is None:
+                _SPECULATIVE_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=_SPECULATIVE_REWRITE_WORKERS,
+                    thread_name_prefix="speculative-rewrite",
+                )
+    return _SPECULATIVE_EXECUTOR
+
+
+def _start_speculative_rewrite(
+    envelope: EventEnvelope,
+    plan: ActionPlan,
+    *,
+    safe_mode: bool,
+    automation_enabled: bool,
+    allow_network: bool,
+    outbound_enabled: bool,
+) -> Optional[SpeculativeRewrite]:
+    """Kick off rewrite_reply for the draft reply when speculative mode is on."""
+    if not _to_bool(os.environ.get(MW_SPECULATIVE_REWRITE_ENV)):
+        return None
+    order_action = _find_order_status_action(plan)
+    env_name, _ = resolve_env_name()
+    if _outbound_block_reason(
+        outbound_enabled=outbound_enabled,
+        safe_mode=safe_mode,
+        automation_enabled=automation_enabled,
+        allow_network=allow_network,
+        has_action=bool(order_action),
+        read_only_guard_active=_read_only_guard_active(env_name),
+    ):
+        return None
+    parameters = (order_action or {}).get("parameters") or {}
+    draft_reply = parameters.get("draft_reply") or {}
+    reply_body = draft_reply.get("body") if isinstance(draft_reply, dict) else None
+    if not reply_body:
+        return None
+    try:
+        prompt_messages = _build_rewrite_prompt(
+            parameters, draft_reply, reply_body, plan.order_status_intent
+        )
+        key = _rewrite_key(
+            reply_body,
+            prompt_messages,
+            conversation_id=envelope.conversation_id,
+            event_id=envelope.event_id,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+            allow_network=allow_network,
+            outbound_enabled=outbound_enabled,
+        )
+        gate_kwargs = dict(
+            conversation_id=envelope.conversation_id,
+            event_id=envelope.event_id,
+            safe_mode=safe_mode,
+            automation_enabled=automation_enabled,
+            allow_network=allow_network,
+            outbound_enabled=outbound_enabled,
+        )
+        template = _reply_template(parameters, draft_reply, reply_body)
+        call: Callable[[], ReplyRewriteResult]
+        if template is not None:
+            call = functools.partial(
+                rewrite_reply_template,
+                reply_body,
+                template,
+                language=_intent_language(plan.order_status_intent),
+                **gate_kwargs,
+            )
+        else:
+            call = functools.partial(
+                rewrite_reply,
+                reply_body,
+                prompt_messages=prompt_messages,
+                **gate_kwargs,
+            )
+        future = _speculative_executor().submit(contextvars.copy_context().run, call)
+    except Exception:
+        LOGGER.exception(
+            "automation.order_status_reply.speculative_rewrite_start_failed",
+            extra={
+                "event_id": envelope.event_id,
+                "conversation_id": envelope.conversation_id,
+            },
+        )
+        return None
+    return SpeculativeRewrite(key, future)
+
+
 _REWRITE_REASON_ERROR_CLASS = {
     "request_failed": "OpenAIRequestError",
     "invalid_json": "OpenAIResponseParseError",
@@ -1174,6 +1617,8 @@ _REWRITE_REASON_ERROR_CLASS = {
     "unexpected_tracking": "OpenAIInvariantViolation",
     "unexpected_eta": "OpenAIInvariantViolation",
     "contains_internal_tags": "OpenAIInvariantViolation",
+    "missing_placeholders": "OpenAIInvariantViolation",
+    "unexpected_placeholders": "OpenAIInvariantViolation",
 }
 
 
@@ -1213,7 +1658,7 @@ def _build_openai_rewrite_evidence(
             if fallback_used
             else None
         )
-        return {
+        evidence = {
             "rewrite_attempted": rewrite_attempted,
             "rewrite_applied": rewrite_applied,
             "model": rewrite_result.model,
@@ -1223,6 +1668,9 @@ def _build_openai_rewrite_evidence(
             "reason": rewrite_reason,
             "error_class": final_error_class,
         }
+        if rewrite_result.template_cache:
+            evidence["template_cache"] = rewrite_result.template_cache
+        return evidence
     return {
         "rewrite_attempted": False,
         "rewrite_applied": False,
@@ -1277,7 +1725,38 @@ def execute_order_status_reply(
     - defaults to outbound disabled (env RICHPANEL_OUTBOUND_ENABLED)
     - requires safe_mode == False, automation_enabled == True, allow_network == True
     - requires a draft reply payload on the action plan
+
+    A speculative rewrite started during planning is adopted when its inputs
+    still match and discarded otherwise.
     """
+    try:
+        with span("order_status_reply"):
+            return _execute_order_status_reply(
+                envelope,
+                plan,
+                safe_mode=safe_mode,
+                automation_enabled=automation_enabled,
+                allow_network=allow_network,
+                outbound_enabled=outbound_enabled,
+                richpanel_executor=richpanel_executor,
+                loop_prevention_tag=loop_prevention_tag,
+            )
+    finally:
+        if plan.speculative_rewrite is not None:
+            plan.speculative_rewrite.discard()
+
+
+def _execute_order_status_reply(
+    envelope: EventEnvelope,
+    plan: ActionPlan,
+    *,
+    safe_mode: bool,
+    automation_enabled: bool,
+    allow_network: bool,
+    outbound_enabled: bool,
+    richpanel_executor: Optional[RichpanelExecutor],
+    loop_prevention_tag: str,
+) -> Dict[str, Any]:
     order_action = _find_order_status_action(plan)
     payload = envelope.payload if isinstance(envelope.payload, dict) else {}
     env_name, _ = resolve_env_name()
@@ -1330,6 +1809,25 @@ def execute_order_status_reply(
             **_metadata(),
         }
 
+    if plan.auto_reply_marker:
+        # Conversation state says we already replied; execute_routing_tags has
+        # applied the Email Support route, so skip the ticket reads entirely.
+        LOGGER.info(
+            "automation.order_status_reply.skip",
+            extra={
+                "event_id": envelope.event_id,
+                "conversation_id": envelope.conversation_id,
+                "reason": "followup_after_auto_reply",
+                "marker_source": "conversation_state",
+            },
+        )
+        return {
+            "sent": False,
+            "reason": "followup_after_auto_reply",
+            "marker_source": "conversation_state",
+            **_metadata(),
+        }
+
     executor = richpanel_executor or RichpanelExecutor(
         outbound_enabled=outbound_enabled
         and allow_network
@@ -1352,11 +1850,12 @@ def execute_order_status_reply(
             f"{ORDER_STATUS_REPLY_TAG}:{run_id}" if run_id else ORDER_STATUS_REPLY_TAG
         )
 
-        ticket_metadata, ticket_channel, ticket_customer_email, _ = _safe_ticket_snapshot_fetch(
-            target_id,
-            executor=executor,
-            allow_network=allow_network,
-        )
+        with span("ticket_snapshot"):
+            ticket_metadata, ticket_channel, ticket_customer_email, _ = _safe_ticket_snapshot_fetch(
+                target_id,
+                executor=executor,
+                allow_network=allow_network,
+            )
         resolved_channel = payload_channel or ticket_channel
         channel_detected = _classify_channel(resolved_channel)
         if payload_channel:
@@ -1564,53 +2063,43 @@ def execute_order_status_reply(
             )
             return {"sent": False, "reason": "missing_draft_reply", **_metadata()}
 
-        order_summary = parameters.get("order_summary") or {}
-        delivery_estimate = parameters.get("delivery_estimate") or order_summary.get(
-            "delivery_estimate"
-        )
-        if not isinstance(delivery_estimate, dict):
-            delivery_estimate = {}
-        eta_window = delivery_estimate.get("eta_human") or draft_reply.get("eta_human")
-        shipping_method = (
-            delivery_estimate.get("normalized_method")
-            or order_summary.get("shipping_method_name")
-            or order_summary.get("shipping_method")
-        )
-        shipping_method = normalize_shipping_method_for_carrier(
-            shipping_method, draft_reply.get("carrier") if isinstance(draft_reply, dict) else None
-        )
-        reply_context = OrderStatusReplyContext(
-            tracking_number=draft_reply.get("tracking_number"),
-            tracking_url=draft_reply.get("tracking_url"),
-            eta_window=eta_window,
-            shipping_method=shipping_method,
-            carrier=draft_reply.get("carrier"),
+        prompt_messages = _build_rewrite_prompt(
+            parameters, draft_reply, reply_body, plan.order_status_intent
         )
-        intent_language = None
-        if isinstance(plan.order_status_intent, OrderStatusIntentArtifact):
-            intent_result = plan.order_status_intent.result
-            if intent_result and intent_result.language:
-                intent_language = intent_result.language
-        prompt_messages = build_order_status_reply_prompt(
-            context=reply_context,
-            draft_reply=reply_body,
-            language=intent_language,
-        )
-
-        original_hash = _fingerprint_reply_body(reply_body)
-        rewrite_result: ReplyRewriteResult | None = None
-        openai_rewrite = {}
-        try:
-            rewrite_result = rewrite_reply(
+        speculative = plan.speculative_rewrite
+        use_speculative = speculative is not None and speculative.matches(
+            _rewrite_key(
                 reply_body,
+                prompt_messages,
                 conversation_id=envelope.conversation_id,
                 event_id=envelope.event_id,
                 safe_mode=safe_mode,
                 automation_enabled=automation_enabled,
                 allow_network=allow_network,
                 outbound_enabled=outbound_enabled,
-                prompt_messages=prompt_messages,
             )
+        )
+
+        original_hash = _fingerprint_reply_body(reply_body)
+        rewrite_result: ReplyRewriteResult | None = None
+        openai_rewrite = {}
+        try:
+            with span("rewrite"):
+                if use_speculative and speculative is not None:
+                    rewrite_result = speculative.result()
+                else:
+                    rewrite_result = _rewrite_draft_reply(
+                        reply_body,
+                        prompt_messages,
+                        _reply_template(parameters, draft_reply, reply_body),
+                        language=_intent_language(plan.order_status_intent),
+                        conversation_id=envelope.conversation_id,
+                        event_id=envelope.event_id,
+                        safe_mode=safe_mode,
+                        automation_enabled=automation_enabled,
+                        allow_network=allow_network,
+                        outbound_enabled=outbound_enabled,
+                    )
             if rewrite_result.rewritten and rewrite_result.body:
                 reply_body = rewrite_result.body
             openai_rewrite = _build_openai_rewrite_evidence(rewrite_result)
@@ -0,0 +1,270 @@
+"""
+Token-budget compaction for customer text sent to the LLM.
+
+Email bodies routinely carry the whole quoted thread, a signature and a legal
+footer. compact_for_llm keeps the newest customer text (everything above the
+first quoted-reply marker), drops quoted lines, signatures and footers,
+collapses whitespace and finally trims to a per-call-type token budget. It
+runs before sanitize_for_openai, which still owns PII redaction.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+MW_PROMPT_COMPACTION_ENV = "MW_PROMPT_COMPACTION_ENABLED"
+TOKEN_BUDGET_ENV_PREFIX = "MW_PROMPT_TOKEN_BUDGET_"
+
+# Roughly the previous 2000-character cap, expressed in tokens.
+DEFAULT_TOKEN_BUDGET = 500
+DEFAULT_TOKEN_BUDGETS: Dict[str, int] = {
+    "routing": 500,
+    "order_status_intent": 500,
+}
+# Heuristic used for budgeting; close enough for English chat/email text and
+# avoids shipping a tokenizer with the Lambda.
+CHARS_PER_TOKEN = 4
+
+_HTML_TAG_REGEX = re.compile(r"<[^>]+>")
+_HTML_QUOTE_START_REGEX = re.compile(
+    r"(?i)<(?:blockquote\b|div\b[^>]*\b(?:gmail_quote|moz-cite-prefix|"
+    r"OutlookMessageHeader|divRplyFwdMsg)\b)"
+)
+_HTML_BREAK_REGEX = re.compile(r"(?i)<br\s*/?>|</(?:p|div|li|tr|h[1-6])\s*>")
+
+_REPLY_HEADER_REGEX = re.compile(r"(?i)^\s*on\b.{0,300}\bwrote:\s*$")
+_SEPARATOR_REGEX = re.compile(
+    r"(?i)^\s*(?:-{2,}\s*(?:original message|forwarded message)\s*-{2,}|_{10,})\s*$"
+)
+_FROM_HEADER_REGEX = re.compile(r"(?i)^\s*from:\s+\S")
+_HEADER_FIELD_REGEX = re.compile(r"(?i)^\s*(?:sent|date|to|subject|cc):\s")
+_SIGNATURE_REGEX = re.compile(
+    r"(?i)^\s*(?:--\s*|sent from my \w[\w ]*|get outlook for \w+.*|"
+    r"sent from (?:yahoo )?mail for \w+.*)$"
+)
+_FOOTER_REGEX = re.compile(
+    r"(?i)^\s*(?:this (?:e-?mail|message)\b.{0,80}\b(?:confidential|intended (?:solely|only))|"
+    r"confidentiality notice|disclaimer:|to unsubscribe|unsubscribe\b)"
+)
+_INLINE_SPACE_REGEX = re.compile(r"[ \t\u00a0\f\v]+")
+_BLANK_LINES_REGEX = re.compile(r"\n{3,}")
+
+
+def _to_bool(value: Optional[str], default: bool = False) -> bool:
+    if value is None:
+        return default
+    return str(value).strip().lower() in {"1", "true", "yes", "on"}
+
+
+def compaction_enabled() -> bool:
+    return _to_bool(os.environ.get(MW_PROMPT_COMPACTION_ENV), default=True)
+
+
+def get_token_budget(call_type: Optional[str]) -> int:
+    """Token budget for a call type; MW_PROMPT_TOKEN_BUDGET_<CALL_TYPE> overrides."""
+    default = DEFAULT_TOKEN_BUDGETS.get(call_type or "", DEFAULT_TOKEN_BUDGET)
+    if not call_type:
+        return default
+    raw = os.environ.get(TOKEN_BUDGET_ENV_PREFIX + call_type.upper())
+    try:
+        value = int(raw) if raw not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    text: str
+    tokens_before: int
+    tokens_after: int
+    # Which parts were dropped, in order: html_quote, quoted_reply,
+    # quoted_lines, signature, footer, truncated.
+    removed: Tuple[str, ...] = ()
+
+    @property
+    def tokens_removed(self) -> int:
+        return max(0, self.tokens_before - self.tokens_after)
+
+
+def _strip_html(text: str, removed: List[str]) -> str:
+    if not _HTML_TAG_REGEX.search(text):
+        return text
+    match = _HTML_QUOTE_START_REGEX.search(text)
+    if match and match.start() > 0:
+        text = text[: match.start()]
+        removed.append("html_quote")
+    text = _HTML_BREAK_REGEX.sub("\n", text)
+    return _HTML_TAG_REGEX.sub(" ", text)
+
+
+def _reply_cut(lines: List[str]) -> Optional[int]:
+    """Index of the first line of quoted history, if any."""
+    for index, line in enumerate(lines):
+        if _SEPARATOR_REGEX.match(line) or _REPLY_HEADER_REGEX.match(line):
+            return index
+        # "On <date>, <name> <email>" often wraps before "wrote:".
+        if index + 1 < len(lines) and _REPLY_HEADER_REGEX.match(
+            f"{line} {lines[index + 1].strip()}"
+        ):
+            return index
+        if _FROM_HEADER_REGEX.match(line) and any(
+            _HEADER_FIELD_REGEX.match(following) for following in lines[index + 1 : index + 4]
+        ):
+            return index
+    return None
+
+
+def _first_match(lines: List[str], pattern: "re.Pattern[str]") -> Optional[int]:
+    for index, line in enumerate(lines):
+        if pattern.match(line):
+            return index
+    return None
+
+
+def _has_text(lines: List[str]) -> bool:
+    return any(line.strip() for line in lines)
+
+
+def _truncate_to_budget(text: str, budget_tokens: int) -> str:
+    limit = budget_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    boundary = max(cut.rfind(" "), cut.rfind("\n"))
+    if boundary > limit // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "..."
+
+
+def compact_text(text: str, *, budget_tokens: int) -> CompactionResult:
+    """Compact one message; never returns empty text for non-empty input."""
+    original = str(text or "")
+    tokens_before = estimate_tokens(original)
+    removed: List[str] = []
+
+    working = _strip_html(original.replace("\r\n", "\n").replace("\r", "\n"), removed)
+    lines = working.split("\n")
+
+    cut = _reply_cut(lines)
+    if cut is not None and _has_text(lines[:cut]):
+        lines = lines[:cut]
+        removed.append("quoted_reply")
+
+    unquoted = [line for line in lines if not line.lstrip().startswith(">")]
+    if len(unquoted) != len(lines) and _has_text(unquoted):
+        lines = unquoted
+        removed.append("quoted_lines")
+
+    for label, pattern in (("signature", _SIGNATURE_REGEX), ("footer", _FOOTER_REGEX)):
+        index = _first_match(lines, pattern)
+        if index is not None and _has_text(lines[:index]):
+            lines = lines[:index]
+            removed.append(label)
+
+    collapsed = "\n".join(_INLINE_SPACE_REGEX.sub(" ", line).strip() for line in lines)
+    compacted = _BLANK_LINES_REGEX.sub("\n\n", collapsed).strip()
+    if not compacted:
+        compacted = _INLINE_SPACE_REGEX.sub(" ", original).strip()
+
+    truncated = _truncate_to_budget(compacted, budget_tokens)
+    if truncated != compacted:
+        removed.append("truncated")
+
+    return CompactionResult(
+        text=truncated,
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(truncated),
+        removed=tuple(removed),
+    )
+
+
+class CompactionStats:
+    """Per-call-type totals of estimated tokens before/after compaction."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_type: Optional[str], result: CompactionResult) -> None:
+        key = call_type or "unspecified"
+        with self._lock:
+            totals = self._totals.setdefault(
+                key, {"calls": 0, "compacted_calls": 0, "tokens_before": 0, "tokens_after": 0}
+            )
+            totals["calls"] += 1
+            totals["compacted_calls"] += 1 if result.removed else 0
+            totals["tokens_before"] += result.tokens_before
+            totals["tokens_after"] += result.tokens_after
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items = [(key, dict(totals)) for key, totals in self._totals.items()]
+        summary: Dict[str, Dict[str, Any]] = {}
+        for key, totals in sorted(items):
+            removed = totals["tokens_before"] - totals["tokens_after"]
+            summary[key] = {
+                **totals,
+                "tokens_removed": removed,
+                "tokens_removed_ratio": round(removed / totals["tokens_before"], 4)
+                if totals["tokens_before"]
+                else 0.0,
+            }
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+COMPACTION_STATS = CompactionStats()
+
+
+def compact_for_llm(
+    text: str,
+    *,
+    call_type: Optional[str],
+    budget_tokens: Optional[int] = None,
+) -> CompactionResult:
+    """Compact text bound for an LLM call of the given type and record the savings."""
+    if not text or not compaction_enabled():
+        tokens = estimate_tokens(text or "")
+        return CompactionResult(text=text or "", tokens_before=tokens, tokens_after=tokens)
+
+    result = compact_text(text, budget_tokens=budget_tokens or get_token_budget(call_type))
+    COMPACTION_STATS.record(call_type, result)
+    if result.removed:
+        LOGGER.info(
+            "prompt_compaction.applied",
+            extra={
+                "call_type": call_type,
+                "tokens_before": result.tokens_before,
+                "tokens_after": result.tokens_after,
+                "removed": list(result.removed),
+            },
+        )
+    return result
+
+
+__all__ = [
+    "COMPACTION_STATS",
+    "CompactionResult",
+    "CompactionStats",
+    "compact_for_llm",
+    "compact_text",
+    "compaction_enabled",
+    "estimate_tokens",
+    "get_token_budget",
+]
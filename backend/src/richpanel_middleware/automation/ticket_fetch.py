@@ -0,0 +1,138 @@
+"""
+Decides whether plan_actions needs the Richpanel ticket snapshot.
+
+The snapshot (GET /v1/tickets/{id}, preceded by a ticket-number resolve when
+the webhook only carries a number) is only used to backfill what
+lookup_order_summary reads from the payload: an order number and the
+customer email for the identity fallback. When the webhook already carries
+them the reads are skipped. The outbound reply path does its own ticket
+status reads and is unaffected.
+
+Policies (MW_TICKET_FETCH_POLICY):
+- "complete_payload" (default): skip when the payload has an order identity
+  and a customer email.
+- "order_identity": skip whenever the payload has an order identity (the
+  email is only needed if the order-number lookup misses).
+- "always": always fetch (previous behaviour).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from richpanel_middleware.commerce.order_lookup import missing_lookup_inputs
+
+TICKET_FETCH_POLICY_ENV = "MW_TICKET_FETCH_POLICY"
+POLICY_ALWAYS = "always"
+POLICY_COMPLETE_PAYLOAD = "complete_payload"
+POLICY_ORDER_IDENTITY = "order_identity"
+DEFAULT_TICKET_FETCH_POLICY = POLICY_COMPLETE_PAYLOAD
+
+_REQUIRED_INPUTS: Dict[str, Tuple[str, ...]] = {
+    POLICY_COMPLETE_PAYLOAD: ("order_identity", "customer_email"),
+    POLICY_ORDER_IDENTITY: ("order_identity",),
+}
+
+
+@dataclass(frozen=True)
+class TicketFetchDecision:
+    fetch: bool
+    policy: str
+    reason: str
+    missing: Tuple[str, ...] = field(default_factory=tuple)
+    # Richpanel reads the fetch costs (ticket-number resolve + ticket GET).
+    reads: int = 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "fetched": self.fetch,
+            "skipped": not self.fetch,
+            "policy": self.policy,
+            "reason": self.reason,
+            "missing": list(self.missing),
+        }
+
+
+def ticket_fetch_policy() -> str:
+    value = (os.environ.get(TICKET_FETCH_POLICY_ENV) or "").strip().lower()
+    if value == POLICY_ALWAYS or value in _REQUIRED_INPUTS:
+        return value
+    return DEFAULT_TICKET_FETCH_POLICY
+
+
+def decide_ticket_fetch(
+    payload: Dict[str, Any],
+    *,
+    resolved_order: Optional[Dict[str, Any]] = None,
+    policy: Optional[str] = None,
+) -> TicketFetchDecision:
+    policy = policy or ticket_fetch_policy()
+    reads = 2 if isinstance(payload, dict) and (
+        payload.get("ticket_number") or payload.get("conversation_no")
+    ) else 1
+    if policy not in _REQUIRED_INPUTS:
+        return TicketFetchDecision(True, POLICY_ALWAYS, "policy_always", reads=reads)
+    missing = tuple(
+        name
+        for name in missing_lookup_inputs(payload, resolved_order=resolved_order)
+        if name in _REQUIRED_INPUTS[policy]
+    )
+    if missing:
+        return TicketFetchDecision(True, policy, "payload_incomplete", missing, reads)
+    return TicketFetchDecision(False, policy, "payload_sufficient", reads=reads)
+
+
+class TicketFetchStats:
+    """Per-channel counts of ticket snapshots fetched vs skipped (and reads saved)."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, channel: Optional[str], decision: TicketFetchDecision) -> None:
+        key = channel or "unknown"
+        with self._lock:
+            totals = self._totals.setdefault(
+                key, {"checked": 0, "fetched": 0, "skipped": 0, "reads_saved": 0}
+            )
+            totals["checked"] += 1
+            if decision.fetch:
+                totals["fetched"] += 1
+            else:
+                totals["skipped"] += 1
+                totals["reads_saved"] += decision.reads
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items: List[Tuple[str, Dict[str, Any]]] = [
+                (key, dict(totals)) for key, totals in self._totals.items()
+            ]
+        summary: Dict[str, Dict[str, Any]] = {}
+        for key, totals in items:
+            checked = totals["checked"]
+            totals["skip_ratio"] = round(totals["skipped"] / checked, 4) if checked else 0.0
+            summary[key] = totals
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+
+TICKET_FETCH_STATS = TicketFetchStats()
+
+__all__ = [
+    "DEFAULT_TICKET_FETCH_POLICY",
+    "POLICY_ALWAYS",
+    "POLICY_COMPLETE_PAYLOAD",
+    "POLICY_ORDER_IDENTITY",
+    "TICKET_FETCH_POLICY_ENV",
+    "TICKET_FETCH_STATS",
+    "TicketFetchDecision",
+    "TicketFetchStats",
+    "decide_ticket_fetch",
+    "ticket_fetch_policy",
+]
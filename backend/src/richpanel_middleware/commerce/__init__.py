@@ -2,6 +2,14 @@ from .order_lookup import (
     OrderSummary,
     extract_order_number_from_payload,
     lookup_order_summary,
+    missing_lookup_inputs,
+    resolved_order_for_state,
 )
 
-__all__ = ["OrderSummary", "extract_order_number_from_payload", "lookup_order_summary"]
+__all__ = [
+    "OrderSummary",
+    "extract_order_number_from_payload",
+    "lookup_order_summary",
+    "missing_lookup_inputs",
+    "resolved_order_for_state",
+]
@@ -4,16 +4,19 @@ import logging
 import datetime
 import html
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from richpanel_middleware.ingest.envelope import EventEnvelope
-from richpanel_middleware.integrations import (
-    ShopifyClient,
-    ShopifyRequestError,
-    ShopifyResponse,
-    ShipStationClient,
-)
 from integrations.common import get_header_value
+from richpanel_middleware.observability.metrics import CACHE_LOOKUPS, count
+from richpanel_middleware.observability.tracing import span
+
+if TYPE_CHECKING:  # pragma: no cover
+    from richpanel_middleware.integrations import (
+        ShipStationClient,
+        ShopifyClient,
+        ShopifyResponse,
+    )
 
 LOGGER = logging.getLogger(__name__)
 
@@ -50,8 +53,20 @@ SHOPIFY_ORDER_FIELDS_WITH_CUSTOMER = SHOPIFY_ORDER_FIELDS + [
     "id",
 ]
 
+# Refresh of an already-resolved order: fulfillment/tracking state only, no
+# customer identity fields.
+SHOPIFY_ORDER_FIELDS_REFRESH = SHOPIFY_ORDER_FIELDS + [
+    "order_number",
+    "name",
+    "id",
+]
+
 MAX_EMAIL_ORDER_RESULTS = 50
 
+# Only unambiguous resolutions are reused on follow-up messages; anything
+# weaker is re-resolved so a better match can win.
+REUSABLE_RESOLUTION_CONFIDENCE = frozenset({"high"})
+
 SHOPIFY_REQUEST_ID_HEADERS = (
     "x-request-id",
     "x-shopify-request-id",
@@ -163,6 +178,20 @@ def _shopify_diagnostics(
     }
 
 
+# The router parses order numbers with this module on every event, so the
+# commerce clients are imported on the first actual lookup instead.
+def _shopify_client(allow_network: bool) -> "ShopifyClient":
+    from richpanel_middleware.integrations.shopify import ShopifyClient
+
+    return ShopifyClient(allow_network=allow_network)
+
+
+def _shipstation_client(allow_network: bool) -> "ShipStationClient":
+    from richpanel_middleware.integrations.shipstation import ShipStationClient
+
+    return ShipStationClient(allow_network=allow_network)
+
+
 def _diagnostics_from_shopify_response(
     response: ShopifyResponse,
 ) -> Optional[Dict[str, Any]]:
@@ -185,6 +214,8 @@ def _diagnostics_from_shopify_response(
 def _diagnostics_from_shopify_exception(
     exc: Exception,
 ) -> Dict[str, Any]:
+    from richpanel_middleware.integrations.shopify import ShopifyRequestError
+
     status_code: Optional[int] = None
     request_id: Optional[str] = None
     if isinstance(exc, ShopifyRequestError) and exc.response:
@@ -221,12 +252,17 @@ def lookup_order_summary(
     require_line_item_product_ids: bool = False,
     shopify_client: Optional[ShopifyClient] = None,
     shipstation_client: Optional[ShipStationClient] = None,
+    resolved_order: Optional[Dict[str, Any]] = None,
 ) -> OrderSummary:
     """
     Best-effort order lookup that stays deterministic offline.
 
     - Uses Shopify + ShipStation clients behind dry-run gates (network disabled by default).
     - Returns a stable OrderSummary dict even when outbound calls are skipped.
+    - resolved_order (see resolved_order_for_state) is a resolution persisted by an
+      earlier message on the conversation; unless the customer now mentions a
+      different order number it replaces the name/email identity lookups and
+      only the order's fulfillment fields are fetched.
     """
     summary = _baseline_summary(envelope)
 
@@ -256,15 +292,56 @@ def lookup_order_summary(
     shopify_lookup_done = False
 
     order_number, order_number_source = _extract_order_number_from_payload(payload_dict)
+    reusable = _reusable_resolved_order(resolved_order, order_number)
+    # The baseline order_id is either unknown or the number the message mentions.
+    order_id_from_text = bool(order_number) and str(order_id).lstrip("#") == order_number
+    if (
+        reusable
+        and (order_id == "unknown" or order_id_from_text)
+        and allow_network
+        and not safe_mode
+        and automation_enabled
+    ):
+        with span("shopify_refresh"):
+            payload, _ = _lookup_shopify_by_name(
+                order_name=str(reusable["order_number"]),
+                allow_network=allow_network,
+                safe_mode=safe_mode,
+                automation_enabled=automation_enabled,
+                client=shopify_client or _shopify_client(allow_network),
+                fields=SHOPIFY_ORDER_FIELDS_REFRESH,
+            )
+        count(CACHE_LOOKUPS, stage="resolved_order", outcome="hit" if payload else "miss")
+        if payload:
+            shopify_lookup_done = True
+            summary = _merge_summary(summary, _extract_shopify_fields(payload))
+            order_id = str(reusable["order_id"])
+            summary["order_id"] = order_id
+            summary["id"] = order_id
+            resolution = {
+                "resolvedBy": str(reusable.get("resolvedBy") or "conversation_state"),
+                "confidence": str(reusable.get("confidence") or "high"),
+                "reason": str(reusable.get("reason") or "reused_resolution"),
+                "reused_from": "conversation_state",
+            }
+            # The mentioned number (if any) is the resolved order; skip the name search.
+            order_number = ""
+        else:
+            LOGGER.info(
+                "order_lookup.resolved_order_refresh_missed",
+                extra={"order_id": reusable.get("order_id")},
+            )
+
     if order_number and allow_network and not safe_mode and automation_enabled:
-        client = shopify_client or ShopifyClient(allow_network=allow_network)
-        payload, name_diagnostics = _lookup_shopify_by_name(
-            order_name=order_number,
-            allow_network=allow_network,
-            safe_mode=safe_mode,
-            automation_enabled=automation_enabled,
-            client=client,
-        )
+        client = shopify_client or _shopify_client(allow_network)
+        with span("shopify_by_name"):
+            payload, name_diagnostics = _lookup_shopify_by_name(
+                order_name=order_number,
+                allow_network=allow_network,
+                safe_mode=safe_mode,
+                automation_enabled=automation_enabled,
+                client=client,
+            )
         if payload:
             shopify_lookup_done = True
             summary = _merge_summary(summary, _extract_shopify_fields(payload))
@@ -286,7 +363,7 @@ def lookup_order_summary(
     if order_id == "unknown" or order_number_name_failed:
         if allow_network and not safe_mode and automation_enabled:
             email, name = _extract_customer_identity(payload_dict)
-            client = shopify_client or ShopifyClient(allow_network=allow_network)
+            client = shopify_client or _shopify_client(allow_network)
             if not email:
                 resolution = {
                     "resolvedBy": "no_match",
@@ -294,13 +371,14 @@ def lookup_order_summary(
                     "reason": "no_email_available",
                 }
             else:
-                orders, diagnostics = _list_shopify_orders_by_email(
-                    email=email,
-                    allow_network=allow_network,
-                    safe_mode=safe_mode,
-                    automation_enabled=automation_enabled,
-                    client=client,
-                )
+                with span("shopify_by_email"):
+                    orders, diagnostics = _list_shopify_orders_by_email(
+                        email=email,
+                        allow_network=allow_network,
+                        safe_mode=safe_mode,
+                        automation_enabled=automation_enabled,
+                        client=client,
+                    )
                 payload, identity_resolution = _resolve_orders_by_identity(
                     orders, email=email, name=name, diagnostics=diagnostics
                 )
@@ -343,16 +421,17 @@ def lookup_order_summary(
 
     if not shopify_lookup_done:
         try:
-            summary = _merge_summary(
-                summary,
-                _lookup_shopify(
-                    order_id,
-                    safe_mode=safe_mode,
-                    automation_enabled=automation_enabled,
-                    allow_network=allow_network,
-                    client=shopify_client,
-                ),
-            )
+            with span("shopify_order"):
+                summary = _merge_summary(
+                    summary,
+                    _lookup_shopify(
+                        order_id,
+                        safe_mode=safe_mode,
+                        automation_enabled=automation_enabled,
+                        allow_network=allow_network,
+                        client=shopify_client,
+                    ),
+                )
         except Exception:
             # Stay deterministic; fall back to the baseline summary.
             pass
@@ -372,16 +451,17 @@ def lookup_order_summary(
         return summary
 
     try:
-        summary = _merge_summary(
-            summary,
-            _lookup_shipstation(
-                order_id,
-                safe_mode=safe_mode,
-                automation_enabled=automation_enabled,
-                allow_network=allow_network,
-                client=shipstation_client,
-            ),
-        )
+        with span("shipstation"):
+            summary = _merge_summary(
+                summary,
+                _lookup_shipstation(
+                    order_id,
+                    safe_mode=safe_mode,
+                    automation_enabled=automation_enabled,
+                    allow_network=allow_network,
+                    client=shipstation_client,
+                ),
+            )
     except Exception:
         pass
 
@@ -390,6 +470,53 @@ def lookup_order_summary(
     return summary
 
 
+def _reusable_resolved_order(
+    resolved_order: Optional[Dict[str, Any]], order_number: str
+) -> Optional[Dict[str, Any]]:
+    """resolved_order unless it is incomplete or the customer names another order."""
+    if not isinstance(resolved_order, dict):
+        return None
+    stored_number = _coerce_str(resolved_order.get("order_number"))
+    stored_id = _coerce_str(resolved_order.get("order_id"))
+    if not stored_number or not stored_id:
+        return None
+    if order_number and order_number.strip().lstrip("#") not in {
+        stored_number.lstrip("#"),
+        stored_id.lstrip("#"),
+    }:
+        return None
+    return resolved_order
+
+
+def resolved_order_for_state(summary: OrderSummary) -> Optional[Dict[str, str]]:
+    """
+    The order identity worth persisting on the conversation state, if any.
+
+    Only confident Shopify resolutions qualify; orders carried in the payload
+    are cheap to re-read and low-confidence matches are re-resolved next time.
+    """
+    if not isinstance(summary, dict):
+        return None
+    resolution = summary.get("order_resolution")
+    if not isinstance(resolution, dict):
+        return None
+    if resolution.get("resolvedBy") in (None, "no_match"):
+        return None
+    if resolution.get("confidence") not in REUSABLE_RESOLUTION_CONFIDENCE:
+        return None
+    order_id = _coerce_str(summary.get("order_id"))
+    if not order_id or order_id == "unknown":
+        return None
+    order_number = _coerce_str(summary.get("order_number")) or order_id
+    return {
+        "order_id": order_id,
+        "order_number": order_number.lstrip("#"),
+        "resolvedBy": str(resolution.get("resolvedBy")),
+        "confidence": str(resolution.get("confidence")),
+        "reason": str(resolution.get("reason") or ""),
+    }
+
+
 def _should_enrich(
     order_id: str, allow_network: bool, safe_mode: bool, automation_enabled: bool
 ) -> bool:
@@ -496,9 +623,11 @@ def _lookup_shopify_by_name(
     safe_mode: bool,
     automation_enabled: bool,
     client: ShopifyClient,
+    fields: Optional[List[str]] = None,
 ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
     if not order_name:
         return {}, None
+    from richpanel_middleware.integrations.shopify import ShopifyRequestError
 
     normalized = f"#{str(order_name).strip().lstrip('#')}"
     candidates = [normalized]
@@ -507,7 +636,7 @@ def _lookup_shopify_by_name(
         try:
             response = client.find_orders_by_name(
                 candidate,
-                fields=SHOPIFY_ORDER_FIELDS_WITH_CUSTOMER,
+                fields=fields or SHOPIFY_ORDER_FIELDS_WITH_CUSTOMER,
                 status="any",
                 limit=5,
                 safe_mode=safe_mode,
@@ -643,6 +772,8 @@ def _list_shopify_orders_by_email(
 ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
     if not allow_network:
         return [], None
+    from richpanel_middleware.integrations.shopify import ShopifyRequestError
+
     try:
         response = client.list_orders_by_email(
             email,
@@ -701,7 +832,7 @@ def _lookup_shopify(
     if not allow_network:
         return {}
 
-    client = client or ShopifyClient(allow_network=allow_network)
+    client = client or _shopify_client(allow_network)
     response = client.get_order(
         order_id,
         fields=SHOPIFY_ORDER_FIELDS,
@@ -733,7 +864,7 @@ def _fetch_shopify_line_item_product_ids(
 ) -> List[str]:
     if not allow_network:
         return []
-    client = client or ShopifyClient(allow_network=allow_network)
+    client = client or _shopify_client(allow_network)
     response = client.get_order(
         order_id,
         fields=SHOPIFY_ORDER_FIELDS_LINE_ITEM_IDS,
@@ -919,7 +1050,7 @@ def _lookup_shipstation(
     if not allow_network:
         return {}
 
-    client = client or ShipStationClient(allow_network=allow_network)
+    client = client or _shipstation_client(allow_network)
     response = client.list_shipments(
         params={"orderNumber": str(order_id)},
         safe_mode=safe_mode,
@@ -1629,3 +1760,31 @@ def _first_str(values: Any) -> Optional[str]:
 def extract_order_number_from_payload(payload: Dict[str, Any]) -> str:
     order_number, _ = _extract_order_number_from_payload(payload)
     return order_number
+
+
+def missing_lookup_inputs(
+    payload: Dict[str, Any],
+    *,
+    resolved_order: Optional[Dict[str, Any]] = None,
+) -> Tuple[str, ...]:
+    """
+    Which identity inputs lookup_order_summary would lack for this payload.
+
+    "order_identity": no order id/number in the payload and no reusable
+    resolved order; "customer_email": no email for the identity fallback.
+    """
+    if not isinstance(payload, dict):
+        return ("order_identity", "customer_email")
+    missing: List[str] = []
+    order_number, _ = _extract_order_number_from_payload(payload)
+    has_order = (
+        bool(order_number)
+        or _extract_order_id(payload) != "unknown"
+        or _reusable_resolved_order(resolved_order, order_number) is not None
+    )
+    if not has_order:
+        missing.append("order_identity")
+    email, _ = _extract_customer_identity(payload)
+    if not email:
+        missing.append("customer_email")
+    return tuple(missing)
@@ -0,0 +1,486 @@
+"""
+Payload slimming and claim-check offload for webhook events.
+
+Richpanel webhooks can carry whole ticket histories, attachments metadata and
+order blobs, while the pipeline reads a known set of top-level fields. Ingress
+keeps only PIPELINE_PAYLOAD_FIELDS; when those alone are still larger than
+MW_CLAIM_CHECK_THRESHOLD_BYTES, long strings/lists are capped and the full
+original payload is written to a PayloadStore (S3 in AWS, a local directory
+in tests). The queued payload then carries a "_claim_check" reference the
+worker follows only if capping actually removed pipeline data.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Protocol, Tuple
+
+CLAIM_CHECK_KEY = "_claim_check"
+
+CLAIM_CHECK_BUCKET_ENV = "CLAIM_CHECK_BUCKET"
+CLAIM_CHECK_LOCAL_DIR_ENV = "MW_CLAIM_CHECK_LOCAL_DIR"
+CLAIM_CHECK_THRESHOLD_ENV = "MW_CLAIM_CHECK_THRESHOLD_BYTES"
+PAYLOAD_SLIMMING_ENABLED_ENV = "MW_PAYLOAD_SLIMMING_ENABLED"
+
+# Well under the 256 KiB SQS message limit, leaving room for the envelope.
+DEFAULT_CLAIM_CHECK_THRESHOLD_BYTES = 64 * 1024
+SQS_MAX_MESSAGE_BYTES = 256 * 1024
+DEFAULT_MAX_STRING_CHARS = 8_000
+DEFAULT_MAX_LIST_ITEMS = 20
+
+# Top-level payload fields read anywhere in the pipeline (envelope, routing,
+# order-number extraction, payload-embedded order summaries, channel and
+# customer resolution, echo checks, the idempotency record). Nested values
+# under these keys are kept as-is. scripts/test_claim_check.py derives the
+# reads from the source and fails when a new one is missing here.
+PIPELINE_PAYLOAD_FIELDS = frozenset(
+    {
+        # envelope / transport
+        "event_id",
+        "received_at",
+        "conversation_id",
+        "conversation_no",
+        "ticket_id",
+        "ticket_number",
+        "group_id",
+        "message_id",
+        "source_message_id",
+        "dedupe_id",
+        "source",
+        "lane",
+        "id",
+        "data",
+        "raw_body",
+        "run_id",
+        "RUN_ID",
+        # nested order candidate (order_lookup)
+        "payload",
+        # ticket and message content
+        "ticket",
+        "status",
+        "state",
+        "channel",
+        "via",
+        "tags",
+        "custom_fields",
+        "metadata",
+        "subject",
+        "title",
+        "customer_message",
+        "customer_note",
+        "message",
+        "messages",
+        "conversation_messages",
+        "body",
+        "plain_body",
+        "text",
+        "content",
+        "comment",
+        "comments",
+        "from",
+        "force_openai_routing_primary",
+        # echo classification (write_journal) and the idempotency record
+        "trigger",
+        "intent",
+        "created_at",
+        "updated_at",
+        "updatedAt",
+        "ticket_created_at",
+        # customer
+        "customer",
+        "customer_profile",
+        "customer_name",
+        "customer_email",
+        "customerEmail",
+        "email",
+        "from_email",
+        "fromEmail",
+        "name",
+        "requester",
+        "sender",
+        "user",
+        # order
+        "order",
+        "orders",
+        "order_id",
+        "orderId",
+        "order_number",
+        "orderNumber",
+        "order_no",
+        "orderNo",
+        "order_status",
+        "orderStatus",
+        "orderStatusName",
+        "order_created_at",
+        "order_date",
+        "orderDate",
+        "ordered_at",
+        "createDate",
+        "updateDate",
+        "modifiedAt",
+        "modifyDate",
+        "processed_at",
+        "processedAt",
+        "financial_status",
+        "financialStatus",
+        "items",
+        "items_count",
+        "itemsCount",
+        "line_items",
+        "line_items_count",
+        "total_price",
+        "current_total_price",
+        "price",
+        "orderTotal",
+        "amount",
+        "amountPaid",
+        # fulfillment / shipping
+        "fulfillment_status",
+        "fulfillmentStatus",
+        "fulfillments",
+        "fulfillment_updated_at",
+        "tracking",
+        "tracking_number",
+        "trackingNumber",
+        "tracking_numbers",
+        "trackingNumbers",
+        "tracking_number_id",
+        "tracking_url",
+        "trackingUrl",
+        "tracking_link",
+        "tracking_company",
+        "status_url",
+        "statusUrl",
+        "carrier",
+        "carrierCode",
+        "carrier_code",
+        "shipping_carrier",
+        "shippingCarrier",
+        "shipping_company",
+        "shipping_method",
+        "shipping_method_name",
+        "shippingMethod",
+        "shipping_service",
+        "shippingService",
+        "shipping_option",
+        "shipping_line",
+        "shipping_lines",
+        "shipment",
+        "shipments",
+        "shipmentCost",
+        "shipDate",
+        "serviceCode",
+        "service_name",
+    }
+)
+
+
+class ClaimCheckError(RuntimeError):
+    """Raised when an offloaded payload cannot be stored, found or verified."""
+
+
+def _to_bool(value: Optional[str], *, default: bool) -> bool:
+    if value is None:
+        return default
+    normalized = str(value).strip().lower()
+    if normalized in {"1", "true", "yes", "on"}:
+        return True
+    if normalized in {"0", "false", "no", "off"}:
+        return False
+    return default
+
+
+def slimming_enabled() -> bool:
+    return _to_bool(os.environ.get(PAYLOAD_SLIMMING_ENABLED_ENV), default=True)
+
+
+def get_claim_check_threshold_bytes() -> int:
+    raw = os.environ.get(CLAIM_CHECK_THRESHOLD_ENV)
+    try:
+        value = int(raw) if raw not in (None, "") else DEFAULT_CLAIM_CHECK_THRESHOLD_BYTES
+    except (TypeError, ValueError):
+        return DEFAULT_CLAIM_CHECK_THRESHOLD_BYTES
+    return value if value > 0 else DEFAULT_CLAIM_CHECK_THRESHOLD_BYTES
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def payload_size(payload: Any) -> int:
+    """Serialized (compact JSON) size in bytes."""
+    return len(_encode(payload))
+
+
+@dataclass(frozen=True)
+class SlimResult:
+    payload: Dict[str, Any]
+    dropped_keys: Tuple[str, ...] = ()
+    # JSON-ish paths ("ticket.messages", "customer_message") whose value was capped.
+    truncated_paths: Tuple[str, ...] = ()
+
+    @property
+    def truncated(self) -> bool:
+        return bool(self.truncated_paths)
+
+
+def _cap(
+    value: Any, path: str, max_string_chars: int, max_list_items: int, capped: List[str]
+) -> Any:
+    if isinstance(value, str):
+        if len(value) > max_string_chars:
+            capped.append(path)
+            return value[:max_string_chars]
+        return value
+    if isinstance(value, dict):
+        return {
+            key: _cap(item, f"{path}.{key}", max_string_chars, max_list_items, capped)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        items = value
+        if len(items) > max_list_items:
+            capped.append(path)
+            # Keep the first item (thread opener) and the newest ones, which is
+            # where routing and order-number extraction look.
+            items = items[:1] + items[len(items) - (max_list_items - 1) :]
+        return [
+            _cap(item, f"{path}[]", max_string_chars, max_list_items, capped)
+            for item in items
+        ]
+    return value
+
+
+def slim_payload(
+    payload: Dict[str, Any],
+    *,
+    cap_values: bool = False,
+    max_string_chars: int = DEFAULT_MAX_STRING_CHARS,
+    max_list_items: int = DEFAULT_MAX_LIST_ITEMS,
+) -> SlimResult:
+    """
+    Keep only PIPELINE_PAYLOAD_FIELDS; with cap_values also trim long strings
+    and lists (recursively) so the result fits a queue message.
+    """
+    if not isinstance(payload, dict):
+        return SlimResult(payload={})
+    kept: Dict[str, Any] = {}
+    dropped: List[str] = []
+    for key, value in payload.items():
+        if key in PIPELINE_PAYLOAD_FIELDS:
+            kept[key] = value
+        else:
+            dropped.append(str(key))
+    capped: List[str] = []
+    if cap_values:
+        kept = {
+            key: _cap(value, key, max_string_chars, max(1, max_list_items), capped)
+            for key, value in kept.items()
+        }
+    return SlimResult(
+        payload=kept,
+        dropped_keys=tuple(sorted(dropped)),
+        truncated_paths=tuple(dict.fromkeys(capped)),
+    )
+
+
+class PayloadStore(Protocol):
+    def put(self, key: str, body: bytes) -> str:
+        """Store body under key and return the reference the worker passes to get()."""
+        ...
+
+    def get(self, ref: str) -> bytes:
+        ...
+
+
+class LocalPayloadStore:
+    """Filesystem stand-in for S3 (local runs and tests)."""
+
+    def __init__(self, root_dir: str | Path) -> None:
+        self._root = Path(root_dir).resolve()
+
+    def _path(self, key: str) -> Path:
+        path = (self._root / key).resolve()
+        if self._root not in path.parents:
+            raise ClaimCheckError("claim_check_ref_outside_store")
+        return path
+
+    def put(self, key: str, body: bytes) -> str:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        return key
+
+    def get(self, ref: str) -> bytes:
+        try:
+            return self._path(ref).read_bytes()
+        except FileNotFoundError as exc:
+            raise ClaimCheckError("claim_check_payload_missing") from exc
+
+
+class S3PayloadStore:
+    def __init__(self, bucket: str, client: Any, *, prefix: str = "payloads/") -> None:
+        self._bucket = bucket
+        self._client = client
+        self._prefix = prefix
+
+    def put(self, key: str, body: bytes) -> str:
+        object_key = f"{self._prefix}{key}"
+        self._client.put_object(
+            Bucket=self._bucket,
+            Key=object_key,
+            Body=body,
+            ContentType="application/json",
+        )
+        return f"s3://{self._bucket}/{object_key}"
+
+    def get(self, ref: str) -> bytes:
+        expected = f"s3://{self._bucket}/{self._prefix}"
+        if not ref.startswith(expected):
+            # Only follow references this store wrote (never a webhook-supplied bucket).
+            raise ClaimCheckError("claim_check_ref_outside_store")
+        response = self._client.get_object(
+            Bucket=self._bucket, Key=ref[len(f"s3://{self._bucket}/") :]
+        )
+        return response["Body"].read()
+
+
+def payload_store_from_env(
+    *, s3_client_factory: Optional[Callable[[], Any]] = None
+) -> Optional[PayloadStore]:
+    """MW_CLAIM_CHECK_LOCAL_DIR wins over CLAIM_CHECK_BUCKET; None when neither is set."""
+    local_dir = os.environ.get(CLAIM_CHECK_LOCAL_DIR_ENV)
+    if local_dir:
+        return LocalPayloadStore(local_dir)
+    bucket = os.environ.get(CLAIM_CHECK_BUCKET_ENV)
+    if bucket and s3_client_factory is not None:
+        return S3PayloadStore(bucket, s3_client_factory())
+    return None
+
+
+@dataclass
+class PreparedPayload:
+    payload: Dict[str, Any]
+    original_bytes: int
+    queued_bytes: int
+    dropped_keys: Tuple[str, ...] = ()
+    truncated_paths: Tuple[str, ...] = ()
+    claim_ref: Optional[str] = None
+    store_error: Optional[str] = field(default=None)
+
+    @property
+    def offloaded(self) -> bool:
+        return self.claim_ref is not None
+
+
+def prepare_payload(
+    payload: Dict[str, Any],
+    *,
+    store: Optional[PayloadStore],
+    threshold_bytes: Optional[int] = None,
+) -> PreparedPayload:
+    """
+    Slim a webhook payload for the queue; offload the original when the
+    allowlisted fields alone exceed threshold_bytes.
+
+    Without a store, values are capped only when the slim payload would not
+    fit in an SQS message at all.
+    """
+    threshold = threshold_bytes if threshold_bytes is not None else get_claim_check_threshold_bytes()
+    original_bytes = payload_size(payload)
+    slim = slim_payload(payload)
+    slim_bytes = payload_size(slim.payload)
+    limit = threshold if store is not None else SQS_MAX_MESSAGE_BYTES - 16 * 1024
+    if slim_bytes <= limit:
+        return PreparedPayload(
+            payload=slim.payload,
+            original_bytes=original_bytes,
+            queued_bytes=slim_bytes,
+            dropped_keys=slim.dropped_keys,
+        )
+
+    capped = slim_payload(payload, cap_values=True)
+    queued = capped.payload
+    prepared = PreparedPayload(
+        payload=queued,
+        original_bytes=original_bytes,
+        queued_bytes=0,
+        dropped_keys=capped.dropped_keys,
+        truncated_paths=capped.truncated_paths,
+    )
+    if store is not None:
+        body = _encode(payload)
+        digest = hashlib.sha256(body).hexdigest()
+        try:
+            # Content-addressed, so webhook retries overwrite the same object.
+            prepared.claim_ref = store.put(f"{digest}.json", body)
+        except Exception as exc:
+            prepared.store_error = exc.__class__.__name__
+        else:
+            queued[CLAIM_CHECK_KEY] = {
+                "ref": prepared.claim_ref,
+                "bytes": len(body),
+                "sha256": digest,
+                "truncated": capped.truncated,
+            }
+    prepared.queued_bytes = payload_size(queued)
+    return prepared
+
+
+def load_claimed_payload(payload: Mapping[str, Any], store: PayloadStore) -> Dict[str, Any]:
+    """Fetch and verify the original payload referenced by payload["_claim_check"]."""
+    claim = payload.get(CLAIM_CHECK_KEY)
+    if not isinstance(claim, dict) or not isinstance(claim.get("ref"), str):
+        raise ClaimCheckError("claim_check_missing")
+    body = store.get(claim["ref"])
+    if hashlib.sha256(body).hexdigest() != claim.get("sha256"):
+        raise ClaimCheckError("claim_check_digest_mismatch")
+    full = json.loads(body.decode("utf-8"))
+    if not isinstance(full, dict):
+        raise ClaimCheckError("claim_check_payload_invalid")
+    return full
+
+
+def hydrate_payload(
+    payload: Dict[str, Any], *, store: Optional[PayloadStore]
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Worker side: swap in the original payload only when capping removed
+    pipeline data. Returns (payload, fetched).
+    """
+    if not isinstance(payload, dict):
+        return payload, False
+    claim = payload.get(CLAIM_CHECK_KEY)
+    if store is None or not isinstance(claim, dict) or not claim.get("truncated"):
+        return payload, False
+    full = load_claimed_payload(payload, store)
+    return slim_payload(full).payload, True
+
+
+__all__ = [
+    "CLAIM_CHECK_BUCKET_ENV",
+    "CLAIM_CHECK_KEY",
+    "CLAIM_CHECK_LOCAL_DIR_ENV",
+    "CLAIM_CHECK_THRESHOLD_ENV",
+    "ClaimCheckError",
+    "DEFAULT_CLAIM_CHECK_THRESHOLD_BYTES",
+    "LocalPayloadStore",
+    "PAYLOAD_SLIMMING_ENABLED_ENV",
+    "PIPELINE_PAYLOAD_FIELDS",
+    "PayloadStore",
+    "PreparedPayload",
+    "S3PayloadStore",
+    "SlimResult",
+    "get_claim_check_threshold_bytes",
+    "hydrate_payload",
+    "load_claimed_payload",
+    "payload_size",
+    "payload_store_from_env",
+    "prepare_payload",
+    "slim_payload",
+    "slimming_enabled",
+]
@@ -2,11 +2,17 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import os
 import uuid
 
 DEFAULT_MESSAGE_GROUP_ID = "rp-mw-default"
 MAX_DEDUPE_ID_LENGTH = 128
+# Events with no conversation/ticket/group id are spread over this many FIFO
+# groups instead of all serializing behind one; 1 restores the single group.
+DEFAULT_GROUP_SHARDS_ENV = "MW_DEFAULT_GROUP_SHARDS"
+DEFAULT_GROUP_SHARDS = 8
 
 
 def _iso_now() -> str:
@@ -34,6 +40,45 @@ def _sanitize_group_id(value: str, default_group_id: str) -> str:
     return _shorten(cleaned, MAX_DEDUPE_ID_LENGTH)
 
 
+def get_default_group_shards() -> int:
+    raw = os.environ.get(DEFAULT_GROUP_SHARDS_ENV)
+    try:
+        value = int(raw) if raw not in (None, "") else DEFAULT_GROUP_SHARDS
+    except (TypeError, ValueError):
+        return DEFAULT_GROUP_SHARDS
+    return value if value >= 1 else DEFAULT_GROUP_SHARDS
+
+
+def _shard_key(payload: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    """Stable attribute tying related unidentified events together: (source, value)."""
+    customer = payload.get("customer")
+    candidates = (
+        ("customer_email", payload.get("customer_email")),
+        ("customer_email", payload.get("email")),
+        ("customer_email", customer.get("email") if isinstance(customer, dict) else None),
+        ("ticket_number", payload.get("ticket_number")),
+        ("ticket_number", payload.get("conversation_no")),
+        ("message_id", payload.get("source_message_id")),
+        ("message_id", payload.get("message_id")),
+    )
+    for source, value in candidates:
+        text = (_coerce_str(value) or "").strip().lower()
+        if text:
+            return source, text
+    return "unkeyed", None
+
+
+def _default_group_shard(
+    payload: Dict[str, Any], event_id: str, default_group_id: str, shards: int
+) -> Tuple[str, str]:
+    source, key = _shard_key(payload)
+    if shards <= 1:
+        return default_group_id, source
+    digest = hashlib.sha256((key or event_id).encode("utf-8")).digest()
+    shard = int.from_bytes(digest[:8], "big") % shards
+    return f"{default_group_id}-{shard}", source
+
+
 @dataclass
 class EventEnvelope:
     """Canonical event envelope shared across ingress and worker."""
@@ -46,6 +91,11 @@ class EventEnvelope:
     source: str
     conversation_id: str
     message_id: Optional[str] = None
+    # Queue lane chosen at ingress ("fast" / "heavy"); None when lanes are off.
+    lane: Optional[str] = None
+    # Set by build_event_envelope when no id was present and group_id is a
+    # default-group shard: which attribute picked the shard (not transported).
+    group_fallback: Optional[str] = None
 
     def to_message(self) -> Dict[str, Any]:
         """Return a dict suitable for transport (e.g., SQS body)."""
@@ -60,6 +110,8 @@ class EventEnvelope:
         }
         if self.message_id:
             body["message_id"] = self.message_id
+        if self.lane:
+            body["lane"] = self.lane
         return body
 
 
@@ -68,12 +120,15 @@ def build_event_envelope(
     *,
     default_group_id: str = DEFAULT_MESSAGE_GROUP_ID,
     source: str = "richpanel_http_target",
+    default_group_shards: Optional[int] = None,
 ) -> EventEnvelope:
     """
     Build a canonical envelope from an ingress payload.
 
     This is used by ingress before enqueueing, and provides the
-    canonical shape the worker expects to consume.
+    canonical shape the worker expects to consume. Payloads without a
+    conversation/ticket/group id get a default-group shard picked from the
+    customer email, ticket number or source message id (in that order).
     """
 
     payload = payload or {}
@@ -97,10 +152,20 @@ def build_event_envelope(
         or event_id
     )
     dedupe_id = _shorten(message_id or event_id, MAX_DEDUPE_ID_LENGTH)
-    group_id = _sanitize_group_id(
-        _coerce_str(cleaned_payload.get("group_id")) or conversation_id,
-        default_group_id,
+    explicit_group = _coerce_str(cleaned_payload.get("group_id")) or (
+        conversation_id if conversation_id != default_group_id else None
     )
+    group_fallback: Optional[str] = None
+    if not explicit_group:
+        shards = (
+            default_group_shards
+            if default_group_shards is not None
+            else get_default_group_shards()
+        )
+        explicit_group, group_fallback = _default_group_shard(
+            cleaned_payload, event_id, default_group_id, shards
+        )
+    group_id = _sanitize_group_id(explicit_group, default_group_id)
     source_value = _coerce_str(cleaned_payload.get("source")) or source
 
     return EventEnvelope(
@@ -112,6 +177,7 @@ def build_event_envelope(
         source=source_value,
         conversation_id=conversation_id,
         message_id=message_id,
+        group_fallback=group_fallback,
     )
 
 
@@ -181,4 +247,5 @@ def normalize_envelope(
         source=source_value,
         conversation_id=conversation_id,
         message_id=message_id,
+        lane=_coerce_str(data.get("lane")),
     )
@@ -0,0 +1,174 @@
+"""
+Queue lanes for ingress: cheap route-only events vs. expensive automation candidates.
+
+Ingress pre-classifies each event with the deterministic router and sends it
+to the "fast" or "heavy" FIFO queue, each drained by its own worker. Order
+within a conversation only holds inside one FIFO queue, so the first lane
+chosen for a message group is pinned (LanePinStore) and later events of that
+group follow it. Every claim slides the pin's expiry to
+MW_LANE_PIN_TTL_SECONDS from now, so the pin only lapses after the group has
+been quiet for that long.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+from richpanel_middleware.automation.router import (
+    _has_order_number,
+    classify_routing,
+)
+
+LANE_FAST = "fast"
+LANE_HEAVY = "heavy"
+LANES = (LANE_FAST, LANE_HEAVY)
+
+# Intents the pipeline sends through the order-status automation path
+# (OpenAI intent/rewrite, Shopify lookup, Richpanel reply).
+HEAVY_INTENTS = frozenset({"order_status_tracking", "shipping_delay_not_shipped"})
+
+# Longer than an event can stay in flight (90s visibility x 5 receives) plus
+# typical queue time, so a group never has events queued in both lanes.
+DEFAULT_LANE_PIN_TTL_SECONDS = 900
+
+
+@dataclass(frozen=True)
+class LaneDecision:
+    lane: str
+    intent: str
+    reason: str
+
+
+def classify_lane(payload: Dict[str, Any]) -> LaneDecision:
+    """Pick a lane from deterministic routing only (no network, no LLM)."""
+    payload = payload if isinstance(payload, dict) else {}
+    routing = classify_routing(payload)
+    if routing.intent in HEAVY_INTENTS:
+        return LaneDecision(LANE_HEAVY, routing.intent, "order_status_intent")
+    # The LLM intent tier can still promote these to order status.
+    if _has_order_number(payload):
+        return LaneDecision(LANE_HEAVY, routing.intent, "order_number_present")
+    return LaneDecision(LANE_FAST, routing.intent, "route_only_intent")
+
+
+class LanePinStore(Protocol):
+    def claim(self, group_id: str, lane: str) -> str:
+        """Pin group_id to lane unless already pinned; return the pinned lane.
+
+        Either way the pin's expiry is pushed out to a full TTL from now.
+        """
+        ...
+
+
+class InMemoryLanePinStore:
+    """Process-local pins; used when no pin table is configured (and in tests)."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int = DEFAULT_LANE_PIN_TTL_SECONDS,
+        clock: Any = time.time,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._pins: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, group_id: str, lane: str) -> str:
+        now = self._clock()
+        with self._lock:
+            pinned = self._pins.get(group_id)
+            if pinned and pinned[1] > now:
+                lane = pinned[0]
+            elif len(self._pins) > 10_000:
+                self._pins = {k: v for k, v in self._pins.items() if v[1] > now}
+            self._pins[group_id] = (lane, now + self._ttl_seconds)
+            return lane
+
+
+class DynamoLanePinStore:
+    """Pins shared by all ingress instances; first writer wins until the pin expires."""
+
+    def __init__(
+        self,
+        table: Any,
+        *,
+        ttl_seconds: int = DEFAULT_LANE_PIN_TTL_SECONDS,
+        clock: Any = time.time,
+    ) -> None:
+        self._table = table
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+
+    def claim(self, group_id: str, lane: str) -> str:
+        now = int(self._clock())
+        expires_at = now + self._ttl_seconds
+        # Two rounds cover a racing writer replacing the same expired pin.
+        for _ in range(2):
+            try:
+                item = self._table.update_item(
+                    Key={"group_id": group_id},
+                    UpdateExpression=(
+                        "SET lane = if_not_exists(lane, :lane), expires_at = :expires_at"
+                    ),
+                    ConditionExpression="attribute_not_exists(group_id) OR expires_at >= :now",
+                    ExpressionAttributeValues={
+                        ":lane": lane,
+                        ":expires_at": expires_at,
+                        ":now": now,
+                    },
+                    ReturnValues="ALL_NEW",
+                ).get("Attributes")
+                pinned = (item or {}).get("lane")
+                return pinned if pinned in LANES else lane
+            except Exception as exc:
+                if not _is_conditional_check_failure(exc):
+                    raise
+            # The stored pin has expired (TTL deletion lags): replace it.
+            try:
+                self._table.put_item(
+                    Item={"group_id": group_id, "lane": lane, "expires_at": expires_at},
+                    ConditionExpression="attribute_not_exists(group_id) OR expires_at < :now",
+                    ExpressionAttributeValues={":now": now},
+                )
+                return lane
+            except Exception as exc:
+                if not _is_conditional_check_failure(exc):
+                    raise
+        return lane
+
+
+def _is_conditional_check_failure(exc: Exception) -> bool:
+    code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+    return code == "ConditionalCheckFailedException"
+
+
+def resolve_lane(
+    payload: Dict[str, Any],
+    group_id: str,
+    *,
+    pin_store: Optional[LanePinStore],
+) -> Tuple[LaneDecision, str]:
+    """Return the classification and the lane to enqueue on (after pinning)."""
+    decision = classify_lane(payload)
+    if pin_store is None:
+        return decision, decision.lane
+    return decision, pin_store.claim(group_id, decision.lane)
+
+
+__all__ = [
+    "DEFAULT_LANE_PIN_TTL_SECONDS",
+    "DynamoLanePinStore",
+    "HEAVY_INTENTS",
+    "InMemoryLanePinStore",
+    "LANES",
+    "LANE_FAST",
+    "LANE_HEAVY",
+    "LaneDecision",
+    "LanePinStore",
+    "classify_lane",
+    "resolve_lane",
+]
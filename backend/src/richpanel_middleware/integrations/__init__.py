@@ -1,53 +1,101 @@
-from .richpanel import (
-    HttpTransport,
-    RichpanelExecutor,
-    RichpanelClient,
-    RichpanelRequestError,
-    RichpanelResponse,
-    SecretLoadError,
-    Transport,
-    TransportError,
-)
-from .openai import (
-    ChatCompletionRequest,
-    ChatCompletionResponse,
-    ChatMessage,
-    OpenAIClient,
-    OpenAIConfigError,
-    OpenAIRequestError,
-)
-from .shopify import (
-    ShopifyClient,
-    ShopifyRequestError,
-    ShopifyResponse,
-)
-from .shipstation import (
-    ShipStationClient,
-    ShipStationExecutor,
-    ShipStationRequestError,
-    ShipStationResponse,
-)
+"""Upstream API clients.
 
+The re-exports below resolve on first attribute access: importing one client
+subpackage (say ``integrations.richpanel.client`` from the worker) should not
+load the other three along with it.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .openai import (
+        ChatCompletionRequest,
+        ChatCompletionResponse,
+        ChatMessage,
+        OpenAIClient,
+        OpenAIConfigError,
+        OpenAIRequestError,
+    )
+    from .richpanel import (
+        HttpTransport,
+        RichpanelClient,
+        RichpanelExecutor,
+        RichpanelRequestError,
+        RichpanelResponse,
+        SecretLoadError,
+        Transport,
+        TransportError,
+    )
+    from .shipstation import (
+        ShipStationClient,
+        ShipStationExecutor,
+        ShipStationRequestError,
+        ShipStationResponse,
+    )
+    from .shopify import ShopifyClient, ShopifyRequestError, ShopifyResponse
+
+_EXPORTS = {
+    "RichpanelClient": "richpanel",
+    "RichpanelExecutor": "richpanel",
+    "RichpanelResponse": "richpanel",
+    "RichpanelRequestError": "richpanel",
+    "SecretLoadError": "richpanel",
+    "Transport": "richpanel",
+    "TransportError": "richpanel",
+    "HttpTransport": "richpanel",
+    "OpenAIClient": "openai",
+    "OpenAIConfigError": "openai",
+    "OpenAIRequestError": "openai",
+    "ChatCompletionRequest": "openai",
+    "ChatCompletionResponse": "openai",
+    "ChatMessage": "openai",
+    "ShopifyClient": "shopify",
+    "ShopifyRequestError": "shopify",
+    "ShopifyResponse": "shopify",
+    "ShipStationClient": "shipstation",
+    "ShipStationExecutor": "shipstation",
+    "ShipStationRequestError": "shipstation",
+    "ShipStationResponse": "shipstation",
+}
+
+# Spelled out (not list(_EXPORTS)) so linters see the TYPE_CHECKING
+# imports above as re-exports.
 __all__ = [
-    "RichpanelClient",
-    "RichpanelExecutor",
-    "RichpanelResponse",
-    "RichpanelRequestError",
-    "SecretLoadError",
-    "Transport",
-    "TransportError",
+    "ChatCompletionRequest",
+    "ChatCompletionResponse",
+    "ChatMessage",
     "HttpTransport",
     "OpenAIClient",
     "OpenAIConfigError",
     "OpenAIRequestError",
-    "ChatCompletionRequest",
-    "ChatCompletionResponse",
-    "ChatMessage",
-    "ShopifyClient",
-    "ShopifyRequestError",
-    "ShopifyResponse",
+    "RichpanelClient",
+    "RichpanelExecutor",
+    "RichpanelRequestError",
+    "RichpanelResponse",
+    "SecretLoadError",
     "ShipStationClient",
     "ShipStationExecutor",
     "ShipStationRequestError",
     "ShipStationResponse",
+    "ShopifyClient",
+    "ShopifyRequestError",
+    "ShopifyResponse",
+    "Transport",
+    "TransportError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    subpackage = _EXPORTS.get(name)
+    if subpackage is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{subpackage}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -8,27 +8,41 @@ from __future__ import annotations
 from integrations.openai.client import (  # noqa: F401
     ChatCompletionRequest,
     ChatCompletionResponse,
+    ChatCompletionUsage,
     ChatMessage,
     HttpTransport,
+    LATENCY_HISTOGRAM,
+    LatencyHistogram,
     OpenAIClient,
     OpenAIConfigError,
     OpenAIRequestError,
+    PROMPT_CACHE_STATS,
+    PromptCacheStats,
     Transport,
     TransportError,
     TransportRequest,
     TransportResponse,
+    latency_budget_from_env,
+    reset_fast_model_fallbacks,
 )
 
 __all__ = [
     "ChatCompletionRequest",
     "ChatCompletionResponse",
+    "ChatCompletionUsage",
     "ChatMessage",
     "HttpTransport",
+    "LATENCY_HISTOGRAM",
+    "LatencyHistogram",
     "OpenAIClient",
     "OpenAIConfigError",
     "OpenAIRequestError",
+    "PROMPT_CACHE_STATS",
+    "PromptCacheStats",
     "Transport",
     "TransportError",
     "TransportRequest",
     "TransportResponse",
+    "latency_budget_from_env",
+    "reset_fast_model_fallbacks",
 ]
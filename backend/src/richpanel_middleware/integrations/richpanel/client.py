@@ -6,11 +6,8 @@ import logging
 import os
 import random
 import time
-import email.utils
 import threading
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple
 
@@ -18,11 +15,17 @@ from integrations.common import (
     PROD_WRITE_ACK_ENV,
     PRODUCTION_ENVIRONMENTS,
     compute_retry_backoff,
+    default_transport,
     get_header_value,
     log_env_resolution_warning,
+    notify_upstream_attempt,
     prod_write_acknowledged,
     resolve_env_name,
 )
+from richpanel_middleware.observability.metrics import RATE_LIMITER_WAIT, put_metric
+from richpanel_middleware.integrations.richpanel.write_journal import (
+    record_ticket_write,
+)
 
 try:
     import boto3  # type: ignore
@@ -154,6 +157,8 @@ def _parse_retry_after(value: Optional[str]) -> Optional[float]:
     except (TypeError, ValueError):
         pass
     try:
+        import email.utils
+
         parsed = email.utils.parsedate_to_datetime(value)
         if parsed is None:
             return None
@@ -227,6 +232,10 @@ class HttpTransport:
     """Minimal urllib-based transport to avoid external dependencies."""
 
     def send(self, request: TransportRequest) -> TransportResponse:
+        # urllib.request drags in http.client and ssl; only a live call needs them.
+        import urllib.error
+        import urllib.request
+
         req = urllib.request.Request(
             request.url,
             data=request.body,
@@ -468,7 +477,7 @@ class RichpanelClient:
         self.backoff_max_seconds = float(
             os.environ.get("RICHPANEL_HTTP_BACKOFF_MAX_SECONDS", backoff_max_seconds)
         )
-        self.transport = transport or HttpTransport()
+        self.transport = transport or default_transport("richpanel", HttpTransport)
         self._logger = logger or logging.getLogger(__name__)
         log_env_resolution_warning(
             self._logger,
@@ -562,7 +571,15 @@ class RichpanelClient:
         )
         rate_limiter = _get_global_rate_limiter()
         if rate_limiter is not None:
-            if not rate_limiter.acquire(timeout=60.0):
+            wait_started = time.monotonic()
+            acquired = rate_limiter.acquire(timeout=60.0)
+            put_metric(
+                RATE_LIMITER_WAIT,
+                (time.monotonic() - wait_started) * 1000,
+                upstream="richpanel",
+                outcome="acquired" if acquired else "timeout",
+            )
+            if not acquired:
                 raise RichpanelRequestError(
                     "Rate limiter timeout: unable to acquire token within 60s"
                 )
@@ -583,6 +600,12 @@ class RichpanelClient:
                     )
                 )
             except TransportError as exc:
+                notify_upstream_attempt(
+                    "richpanel",
+                    attempt=attempt,
+                    status_code=None,
+                    latency_ms=int((time.monotonic() - start) * 1000),
+                )
                 self._logger.warning(
                     "richpanel.transport_error",
                     extra={"method": method.upper(), "url": url, "attempt": attempt},
@@ -608,6 +631,12 @@ class RichpanelClient:
 
             latency_ms = int((time.monotonic() - start) * 1000)
             response = self._to_response(transport_response, url)
+            notify_upstream_attempt(
+                "richpanel",
+                attempt=attempt,
+                status_code=response.status_code,
+                latency_ms=latency_ms,
+            )
             last_response = response
 
             should_retry, delay = self._should_retry(response, attempt)
@@ -1037,6 +1066,10 @@ class RichpanelExecutor:
             if requested_dry_run is None
             else bool(requested_dry_run)
         )
+        if not effective_dry_run:
+            # Journal before dispatch: the webhook our write triggers can reach
+            # ingress before the response does.
+            record_ticket_write(method, path, json_body=kwargs.get("json_body"))
         return self._client.request(
             method,
             path,
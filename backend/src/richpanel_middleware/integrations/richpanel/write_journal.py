@@ -0,0 +1,349 @@
+"""
+Short-TTL journal of the ticket mutations the middleware makes in Richpanel.
+
+Every tag write, reply/close update and send-message can make Richpanel fire
+the HTTP target again. RichpanelExecutor records each non-dry-run write here
+(before dispatching, so the echo cannot outrun the journal entry), and
+ingress/worker use classify_echo() to drop webhooks that only reflect our
+own change. A webhook is an echo when the ticket was written within the TTL
+and either its message text is the reply we just posted, or it carries no
+customer message at all and is not flagged as a customer-message trigger.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import html
+import os
+import re
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+from integrations.common import _to_bool
+
+DEFAULT_WRITE_JOURNAL_TTL_SECONDS = 300
+ECHO_SUPPRESSION_ENABLED_ENV = "MW_ECHO_SUPPRESSION_ENABLED"
+
+_TICKET_PATH_REGEX = re.compile(r"^/v1/tickets/(?P<ticket_id>[^/?]+)(?:/(?P<action>[^/?]+))?")
+_TAG_REGEX = re.compile(r"<[^>]+>")
+_NON_WORD_REGEX = re.compile(r"[\W_]+")
+_CUSTOMER_TRIGGERS = {"customer_message", "new_message", "customer_reply"}
+_MESSAGE_KEYS = ("customer_message", "message", "text", "body", "comment")
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    ticket_id: str
+    operation: str
+    written_at: float
+    reply_fingerprint: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class EchoDecision:
+    echo: bool
+    reason: str
+    ticket_id: Optional[str] = None
+    operation: Optional[str] = None
+
+
+class WriteJournal(Protocol):
+    def record(self, entry: JournalEntry) -> None:
+        ...
+
+    def latest(self, ticket_id: str) -> Optional[JournalEntry]:
+        """Most recent write for ticket_id still inside the TTL, if any."""
+        ...
+
+
+def echo_suppression_enabled() -> bool:
+    return _to_bool(os.environ.get(ECHO_SUPPRESSION_ENABLED_ENV, "true"))
+
+
+def fingerprint_text(value: Any) -> Optional[str]:
+    """Stable hash of message text, ignoring markup, case and punctuation."""
+    if not isinstance(value, str):
+        return None
+    text = _TAG_REGEX.sub(" ", html.unescape(value)).lower()
+    normalized = " ".join(_NON_WORD_REGEX.sub(" ", text).split())
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_ticket_write(method: str, path: str) -> Optional[Tuple[str, str]]:
+    """(ticket_id, operation) for a mutating /v1/tickets/{id} request, else None."""
+    if (method or "").upper() in {"GET", "HEAD", "OPTIONS"}:
+        return None
+    match = _TICKET_PATH_REGEX.match(path or "")
+    if not match:
+        return None
+    ticket_id = urllib.parse.unquote(match.group("ticket_id"))
+    action = match.group("action")
+    operation = action.replace("-", "_") if action else "update_ticket"
+    return ticket_id, operation
+
+
+def _reply_text(json_body: Any) -> Optional[str]:
+    if not isinstance(json_body, dict):
+        return None
+    ticket = json_body.get("ticket")
+    if isinstance(ticket, dict) and isinstance(ticket.get("comment"), dict):
+        return ticket["comment"].get("body")
+    if isinstance(json_body.get("comment"), dict):
+        return json_body["comment"].get("body")
+    body = json_body.get("body")
+    return body if isinstance(body, str) else None
+
+
+class InMemoryWriteJournal:
+    """Process-local journal; used in tests and when no table is configured."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int = DEFAULT_WRITE_JOURNAL_TTL_SECONDS,
+        clock: Any = time.time,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: Dict[str, JournalEntry] = {}
+        self._lock = threading.Lock()
+
+    def record(self, entry: JournalEntry) -> None:
+        with self._lock:
+            previous = self._entries.get(entry.ticket_id)
+            if entry.reply_fingerprint is None and previous is not None:
+                # A tag write after a reply must not hide the reply fingerprint.
+                entry = JournalEntry(
+                    entry.ticket_id,
+                    entry.operation,
+                    entry.written_at,
+                    previous.reply_fingerprint,
+                )
+            self._entries[entry.ticket_id] = entry
+
+    def latest(self, ticket_id: str) -> Optional[JournalEntry]:
+        with self._lock:
+            entry = self._entries.get(ticket_id)
+        if entry is None or entry.written_at + self._ttl_seconds < self._clock():
+            return None
+        return entry
+
+
+class DynamoWriteJournal:
+    """One item per ticket, shared by ingress and workers; expires via table TTL."""
+
+    def __init__(
+        self,
+        table: Any,
+        *,
+        ttl_seconds: int = DEFAULT_WRITE_JOURNAL_TTL_SECONDS,
+        clock: Any = time.time,
+    ) -> None:
+        self._table = table
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+
+    def record(self, entry: JournalEntry) -> None:
+        assignments = [
+            "last_operation = :op",
+            "written_at = :written_at",
+            "expires_at = :expires_at",
+        ]
+        values: Dict[str, Any] = {
+            ":op": entry.operation,
+            ":written_at": int(entry.written_at * 1000),
+            ":expires_at": int(entry.written_at) + self._ttl_seconds,
+        }
+        if entry.reply_fingerprint:
+            assignments.append("reply_fingerprint = :fp")
+            values[":fp"] = entry.reply_fingerprint
+        self._table.update_item(
+            Key={"ticket_id": entry.ticket_id},
+            UpdateExpression="SET " + ", ".join(assignments),
+            ExpressionAttributeValues=values,
+        )
+
+    def latest(self, ticket_id: str) -> Optional[JournalEntry]:
+        item = self._table.get_item(Key={"ticket_id": ticket_id}).get("Item")
+        if not item:
+            return None
+        written_at = int(item.get("written_at") or 0) / 1000.0
+        # Table TTL deletion lags by hours; enforce the window here.
+        if written_at + self._ttl_seconds < self._clock():
+            return None
+        return JournalEntry(
+            ticket_id=ticket_id,
+            operation=str(item.get("last_operation") or "unknown"),
+            written_at=written_at,
+            reply_fingerprint=item.get("reply_fingerprint"),
+        )
+
+
+class EchoSuppressionStats:
+    """Counts of webhooks checked/suppressed, per suppression reason."""
+
+    def __init__(self) -> None:
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, decision: EchoDecision) -> None:
+        with self._lock:
+            self._counts["checked"] = self._counts.get("checked", 0) + 1
+            if decision.echo:
+                self._counts["suppressed"] = self._counts.get("suppressed", 0) + 1
+                key = f"suppressed:{decision.reason}"
+                self._counts[key] = self._counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, Any] = dict(self._counts)
+        checked = counts.get("checked", 0)
+        counts["suppressed_ratio"] = (
+            round(counts.get("suppressed", 0) / checked, 4) if checked else 0.0
+        )
+        return counts
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+ECHO_SUPPRESSION_STATS = EchoSuppressionStats()
+
+_JOURNAL: Dict[str, Optional[WriteJournal]] = {"journal": None}
+
+
+def set_write_journal(journal: Optional[WriteJournal]) -> None:
+    """Install the journal RichpanelExecutor records writes into (None disables)."""
+    _JOURNAL["journal"] = journal
+
+
+def get_write_journal() -> Optional[WriteJournal]:
+    return _JOURNAL["journal"]
+
+
+def record_ticket_write(
+    method: str,
+    path: str,
+    *,
+    json_body: Any = None,
+    journal: Optional[WriteJournal] = None,
+    clock: Any = time.time,
+) -> Optional[JournalEntry]:
+    """Journal a mutating ticket request; never raises (journaling is best-effort)."""
+    journal = journal or get_write_journal()
+    if journal is None:
+        return None
+    parsed = parse_ticket_write(method, path)
+    if parsed is None:
+        return None
+    entry = JournalEntry(
+        ticket_id=parsed[0],
+        operation=parsed[1],
+        written_at=clock(),
+        reply_fingerprint=fingerprint_text(_reply_text(json_body)),
+    )
+    try:
+        journal.record(entry)
+    except Exception:
+        return None
+    return entry
+
+
+def _webhook_ticket_ids(payload: Dict[str, Any]) -> Tuple[str, ...]:
+    ticket = payload.get("ticket")
+    if not isinstance(ticket, dict):
+        ticket = {}
+    candidates = (
+        payload.get("ticket_id"),
+        payload.get("conversation_id"),
+        ticket.get("id"),
+        payload.get("id"),
+    )
+    ids = []
+    for value in candidates:
+        if value is None:
+            continue
+        text = str(value).strip()
+        if text and text not in ids:
+            ids.append(text)
+    return tuple(ids)
+
+
+def _webhook_message(payload: Dict[str, Any]) -> Optional[str]:
+    for key in _MESSAGE_KEYS:
+        value = payload.get(key)
+        if isinstance(value, dict):
+            value = value.get("body") or value.get("text")
+        if isinstance(value, str) and value.strip():
+            return value
+    return None
+
+
+def classify_echo(
+    payload: Any,
+    *,
+    journal: Optional[WriteJournal],
+    received_at: Optional[float] = None,
+    stats: Optional[EchoSuppressionStats] = ECHO_SUPPRESSION_STATS,
+) -> EchoDecision:
+    """
+    received_at (epoch seconds) is when the webhook reached ingress; writes made
+    after that cannot have caused it (the worker checks queued events with it).
+    """
+    decision = _classify_echo(payload, journal, received_at)
+    if stats is not None:
+        stats.record(decision)
+    return decision
+
+
+def _classify_echo(
+    payload: Any, journal: Optional[WriteJournal], received_at: Optional[float]
+) -> EchoDecision:
+    if journal is None or not isinstance(payload, dict):
+        return EchoDecision(False, "journal_unavailable")
+    entry = None
+    for ticket_id in _webhook_ticket_ids(payload):
+        entry = journal.latest(ticket_id)
+        if entry is not None:
+            break
+    if entry is None:
+        return EchoDecision(False, "no_recent_write")
+    if received_at is not None and entry.written_at > received_at:
+        return EchoDecision(False, "write_after_event", entry.ticket_id, entry.operation)
+
+    message = _webhook_message(payload)
+    if message is not None:
+        if entry.reply_fingerprint and fingerprint_text(message) == entry.reply_fingerprint:
+            return EchoDecision(True, "own_reply", entry.ticket_id, entry.operation)
+        return EchoDecision(False, "customer_content", entry.ticket_id, entry.operation)
+
+    trigger = str(payload.get("trigger") or "").strip().lower()
+    if trigger in _CUSTOMER_TRIGGERS:
+        return EchoDecision(False, "customer_trigger", entry.ticket_id, entry.operation)
+    return EchoDecision(True, "recent_write_no_message", entry.ticket_id, entry.operation)
+
+
+__all__ = [
+    "DEFAULT_WRITE_JOURNAL_TTL_SECONDS",
+    "DynamoWriteJournal",
+    "ECHO_SUPPRESSION_ENABLED_ENV",
+    "ECHO_SUPPRESSION_STATS",
+    "EchoDecision",
+    "EchoSuppressionStats",
+    "InMemoryWriteJournal",
+    "JournalEntry",
+    "WriteJournal",
+    "classify_echo",
+    "echo_suppression_enabled",
+    "fingerprint_text",
+    "get_write_journal",
+    "parse_ticket_write",
+    "record_ticket_write",
+    "set_write_journal",
+]
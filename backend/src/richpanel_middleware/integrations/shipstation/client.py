@@ -6,13 +6,15 @@ import logging
 import os
 import random
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from typing import Any, Callable, Dict, Optional, Protocol, Tuple
 
-from integrations.common import compute_retry_backoff
+from integrations.common import (
+    compute_retry_backoff,
+    default_transport,
+    notify_upstream_attempt,
+)
 
 try:
     import boto3  # type: ignore
@@ -111,6 +113,9 @@ class HttpTransport:
     """Minimal urllib-based transport to avoid extra dependencies."""
 
     def send(self, request: TransportRequest) -> TransportResponse:
+        import urllib.error
+        import urllib.request
+
         req = urllib.request.Request(
             request.url,
             data=request.body,
@@ -207,7 +212,7 @@ class ShipStationClient:
         self.backoff_max_seconds = float(
             os.environ.get("SHIPSTATION_HTTP_BACKOFF_MAX_SECONDS", backoff_max_seconds)
         )
-        self.transport = transport or HttpTransport()
+        self.transport = transport or default_transport("shipstation", HttpTransport)
         self._logger = logger or logging.getLogger(__name__)
         self._api_key = api_key or os.environ.get("SHIPSTATION_API_KEY_OVERRIDE")
         self._api_secret = api_secret or os.environ.get(
@@ -275,6 +280,12 @@ class ShipStationClient:
                     )
                 )
             except TransportError as exc:
+                notify_upstream_attempt(
+                    "shipstation",
+                    attempt=attempt,
+                    status_code=None,
+                    latency_ms=int((time.monotonic() - start) * 1000),
+                )
                 self._logger.warning(
                     "shipstation.transport_error",
                     extra={"method": method.upper(), "url": url, "attempt": attempt},
@@ -290,6 +301,12 @@ class ShipStationClient:
 
             latency_ms = int((time.monotonic() - start) * 1000)
             response = self._to_response(transport_response, url)
+            notify_upstream_attempt(
+                "shipstation",
+                attempt=attempt,
+                status_code=response.status_code,
+                latency_ms=latency_ms,
+            )
             last_response = response
 
             should_retry, delay = self._should_retry(response, attempt)
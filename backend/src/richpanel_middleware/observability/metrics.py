@@ -0,0 +1,210 @@
+"""
+Buffered CloudWatch Embedded Metric Format (EMF) metrics for the hot path.
+
+Metrics are collected in memory for the length of one handler invocation
+(``metrics_scope``) and written to stdout when it ends; CloudWatch extracts
+them from the log stream, so no PutMetricData calls are made. Samples that
+share a dimension set are packed into one EMF document as a value array
+(capped at 100 per metric, the EMF limit), which keeps the flush to one line
+per dimension set and lets CloudWatch compute p95/p99.
+
+Dimensions are restricted to a small, low-cardinality vocabulary (stage,
+upstream, outcome, lane); anything else is dropped rather than creating a
+new metric series.
+
+Outside a scope (scripts, tests, the ingress path) ``put_metric`` is a no-op.
+Scopes only collect when ``MW_METRICS_ENABLED`` says so or, when it is unset,
+inside Lambda or with ``MW_METRICS_NAMESPACE`` configured (the stack sets
+both); local runs and tests keep stdout free of EMF lines.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from integrations.common import _to_bool, register_upstream_observer
+
+METRICS_ENABLED_ENV = "MW_METRICS_ENABLED"
+METRICS_NAMESPACE_ENV = "MW_METRICS_NAMESPACE"
+DEFAULT_METRICS_NAMESPACE = "rp-mw/local"
+
+DIMENSION_KEYS = ("stage", "upstream", "outcome", "lane")
+MAX_VALUES_PER_METRIC = 100
+
+UNIT_MILLISECONDS = "Milliseconds"
+UNIT_COUNT = "Count"
+
+STAGE_LATENCY = "StageLatency"
+UPSTREAM_LATENCY = "UpstreamLatency"
+UPSTREAM_RETRIES = "UpstreamRetries"
+RATE_LIMITER_WAIT = "RateLimiterWait"
+CACHE_LOOKUPS = "CacheLookups"
+LLM_GATED = "LLMGated"
+QUEUE_WAIT = "QueueWait"
+
+_DimensionKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsBuffer:
+    """Samples for one invocation, grouped by dimension set."""
+
+    def __init__(self, namespace: str) -> None:
+        self.namespace = namespace
+        self._groups: Dict[_DimensionKey, Dict[str, Tuple[str, List[float]]]] = {}
+
+    def put(
+        self, name: str, value: float, unit: str = UNIT_MILLISECONDS, **dimensions: Any
+    ) -> None:
+        key = tuple(
+            sorted(
+                (dimension, str(dimensions[dimension]))
+                for dimension in DIMENSION_KEYS
+                if dimensions.get(dimension) not in (None, "")
+            )
+        )
+        metrics = self._groups.setdefault(key, {})
+        _, values = metrics.setdefault(name, (unit, []))
+        values.append(round(float(value), 3))
+
+    def documents(self, *, timestamp_ms: Optional[int] = None) -> List[Dict[str, Any]]:
+        timestamp_ms = timestamp_ms if timestamp_ms is not None else int(time.time() * 1000)
+        documents: List[Dict[str, Any]] = []
+        for key, metrics in self._groups.items():
+            longest = max(len(values) for _, values in metrics.values())
+            for offset in range(0, longest, MAX_VALUES_PER_METRIC):
+                document: Dict[str, Any] = dict(key)
+                definitions = []
+                for name, (unit, values) in sorted(metrics.items()):
+                    chunk = values[offset : offset + MAX_VALUES_PER_METRIC]
+                    if not chunk:
+                        continue
+                    definitions.append({"Name": name, "Unit": unit})
+                    document[name] = chunk[0] if len(chunk) == 1 else chunk
+                document["_aws"] = {
+                    "Timestamp": timestamp_ms,
+                    "CloudWatchMetrics": [
+                        {
+                            "Namespace": self.namespace,
+                            "Dimensions": [[dimension for dimension, _ in key]],
+                            "Metrics": definitions,
+                        }
+                    ],
+                }
+                documents.append(document)
+        return documents
+
+    def flush(self, emit: Optional[Callable[[str], None]] = None) -> int:
+        emit = emit or print
+        documents = self.documents()
+        for document in documents:
+            emit(json.dumps(document, separators=(",", ":"), sort_keys=True))
+        self._groups.clear()
+        return len(documents)
+
+
+_ACTIVE_BUFFER: contextvars.ContextVar[Optional[MetricsBuffer]] = contextvars.ContextVar(
+    "richpanel_middleware_metrics", default=None
+)
+
+
+def metrics_enabled() -> bool:
+    explicit = os.environ.get(METRICS_ENABLED_ENV)
+    if explicit is not None:
+        return _to_bool(explicit)
+    return bool(
+        os.environ.get(METRICS_NAMESPACE_ENV) or os.environ.get("AWS_LAMBDA_FUNCTION_NAME")
+    )
+
+
+def metrics_namespace() -> str:
+    return os.environ.get(METRICS_NAMESPACE_ENV) or DEFAULT_METRICS_NAMESPACE
+
+
+@contextmanager
+def metrics_scope(
+    emit: Optional[Callable[[str], None]] = None,
+) -> Iterator[Optional[MetricsBuffer]]:
+    """Collect metrics for one handler invocation and flush them on exit."""
+    if not metrics_enabled():
+        yield None
+        return
+    buffer = MetricsBuffer(metrics_namespace())
+    token = _ACTIVE_BUFFER.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _ACTIVE_BUFFER.reset(token)
+        try:
+            buffer.flush(emit)
+        except Exception:
+            # Metrics are best-effort; never fail the batch over them.
+            pass
+
+
+def put_metric(
+    name: str, value: float, unit: str = UNIT_MILLISECONDS, **dimensions: Any
+) -> None:
+    buffer = _ACTIVE_BUFFER.get()
+    if buffer is not None:
+        buffer.put(name, value, unit, **dimensions)
+
+
+def count(name: str, **dimensions: Any) -> None:
+    put_metric(name, 1, UNIT_COUNT, **dimensions)
+
+
+def upstream_outcome(status_code: Optional[int]) -> str:
+    if status_code is None:
+        return "transport_error"
+    if status_code == 429:
+        return "throttled"
+    if status_code >= 500:
+        return "server_error"
+    if status_code >= 400:
+        return "client_error"
+    return "ok"
+
+
+def _observe_upstream_attempt(
+    service: str,
+    *,
+    attempt: int,
+    status_code: Optional[int],
+    latency_ms: Optional[int] = None,
+) -> None:
+    if _ACTIVE_BUFFER.get() is None:
+        return
+    outcome = upstream_outcome(status_code)
+    if latency_ms is not None:
+        put_metric(UPSTREAM_LATENCY, latency_ms, upstream=service, outcome=outcome)
+    if attempt > 1:
+        count(UPSTREAM_RETRIES, upstream=service)
+
+
+register_upstream_observer(_observe_upstream_attempt)
+
+__all__ = [
+    "CACHE_LOOKUPS",
+    "DEFAULT_METRICS_NAMESPACE",
+    "DIMENSION_KEYS",
+    "LLM_GATED",
+    "METRICS_ENABLED_ENV",
+    "METRICS_NAMESPACE_ENV",
+    "MetricsBuffer",
+    "QUEUE_WAIT",
+    "RATE_LIMITER_WAIT",
+    "STAGE_LATENCY",
+    "UPSTREAM_LATENCY",
+    "UPSTREAM_RETRIES",
+    "count",
+    "metrics_enabled",
+    "metrics_scope",
+    "metrics_namespace",
+    "put_metric",
+    "upstream_outcome",
+]
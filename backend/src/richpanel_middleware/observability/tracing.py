@@ -0,0 +1,273 @@
+"""
+Per-event stage timing for the worker pipeline.
+
+A trace covers one event; spans opened inside it nest by call structure
+(``plan/order_lookup/shopify_by_name``) and pick up the upstream HTTP
+attempts made while they are the innermost open span. Each trace emits one
+``worker.timing`` log line on exit:
+
+    {"trace": "worker.event", "event_id": "...", "total_ms": 812.4,
+     "stages": {"plan": {"ms": 640.1, "count": 1},
+                "plan/order_lookup": {"ms": 402.7, "count": 1,
+                                      "upstream": {"shopify": {"calls": 2, ...}}}},
+     "upstream": {"shopify": {"calls": 2, "retries": 1, "errors": 0, "ms": 390}}}
+
+When no trace is active (tracing disabled via MW_TRACING_ENABLED, or code
+running outside the worker) ``span`` returns a shared no-op object, so the
+instrumentation costs one context-variable read. Stage durations are also
+fed to the StageLatency EMF metric (see observability.metrics).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from integrations.common import _to_bool, register_upstream_observer
+from richpanel_middleware.observability.metrics import STAGE_LATENCY, put_metric
+
+TRACING_ENABLED_ENV = "MW_TRACING_ENABLED"
+TIMING_LOG_EVENT = "worker.timing"
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _new_upstream_totals() -> Dict[str, int]:
+    return {"calls": 0, "retries": 0, "errors": 0, "ms": 0}
+
+
+def _add_upstream(
+    totals: Dict[str, Dict[str, int]],
+    service: str,
+    *,
+    attempt: int,
+    status_code: Optional[int],
+    latency_ms: Optional[int],
+) -> None:
+    entry = totals.setdefault(service, _new_upstream_totals())
+    entry["calls"] += 1
+    if attempt > 1:
+        entry["retries"] += 1
+    if status_code is None or status_code >= 500 or status_code == 429:
+        entry["errors"] += 1
+    if latency_ms:
+        entry["ms"] += int(latency_ms)
+
+
+class Span:
+    """One timed stage; use as a context manager via ``span()``."""
+
+    __slots__ = ("trace", "name", "path", "attributes", "upstream", "_started")
+
+    def __init__(self, trace: "Trace", name: str, path: str) -> None:
+        self.trace = trace
+        self.name = name
+        self.path = path
+        self.attributes: Dict[str, Any] = {}
+        self.upstream: Dict[str, Dict[str, int]] = {}
+        self._started = 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.trace._stack.append(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        stack = self.trace._stack
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.trace._finish(self, elapsed_ms)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        return None
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Stage timings and upstream call counts for one event."""
+
+    def __init__(self, name: str, **attributes: Any) -> None:
+        self.name = name
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.upstream: Dict[str, Dict[str, int]] = {}
+        self._stack: List[Span] = []
+        self._started = time.perf_counter()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def span(self, name: str) -> Span:
+        parent = self._stack[-1].path + "/" if self._stack else ""
+        return Span(self, name, parent + name)
+
+    def add_stage(self, name: str, elapsed_ms: float) -> None:
+        """Record a stage timed outside the trace (e.g. shared per batch)."""
+        self._merge(name, elapsed_ms, {}, {})
+
+    def record_upstream(
+        self,
+        service: str,
+        *,
+        attempt: int,
+        status_code: Optional[int],
+        latency_ms: Optional[int] = None,
+    ) -> None:
+        targets = [self.upstream]
+        if self._stack:
+            targets.append(self._stack[-1].upstream)
+        for totals in targets:
+            _add_upstream(
+                totals,
+                service,
+                attempt=attempt,
+                status_code=status_code,
+                latency_ms=latency_ms,
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {"trace": self.name}
+        summary.update(self.attributes)
+        summary["total_ms"] = round((time.perf_counter() - self._started) * 1000, 1)
+        summary["stages"] = {
+            path: dict(stage, ms=round(stage["ms"], 1))
+            for path, stage in self.stages.items()
+        }
+        summary["upstream"] = {
+            service: dict(totals) for service, totals in self.upstream.items()
+        }
+        return summary
+
+    def _finish(self, span: Span, elapsed_ms: float) -> None:
+        self._merge(span.path, elapsed_ms, span.upstream, span.attributes)
+
+    def _merge(
+        self,
+        path: str,
+        elapsed_ms: float,
+        upstream: Dict[str, Dict[str, int]],
+        attributes: Dict[str, Any],
+    ) -> None:
+        stage = self.stages.get(path)
+        if stage is None:
+            stage = self.stages[path] = {"ms": 0.0, "count": 0}
+        stage["ms"] += elapsed_ms
+        stage["count"] += 1
+        for service, totals in upstream.items():
+            merged = stage.setdefault("upstream", {}).setdefault(
+                service, _new_upstream_totals()
+            )
+            for key, value in totals.items():
+                merged[key] += value
+        if attributes:
+            stage.update(attributes)
+
+
+class _NoopTrace:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+    def add_stage(self, name: str, elapsed_ms: float) -> None:
+        return None
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        return None
+
+
+_NOOP_TRACE = _NoopTrace()
+
+_ACTIVE_TRACE: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar(
+    "richpanel_middleware_trace", default=None
+)
+
+
+def tracing_enabled() -> bool:
+    return _to_bool(os.environ.get(TRACING_ENABLED_ENV, "true"))
+
+
+@contextmanager
+def start_trace(
+    name: str,
+    *,
+    logger: Optional[logging.Logger] = None,
+    **attributes: Any,
+) -> Iterator[Union[Trace, _NoopTrace]]:
+    """Open a trace for one event and log its timing summary when it closes."""
+    if not tracing_enabled():
+        yield _NOOP_TRACE
+        return
+    trace = Trace(name, **attributes)
+    token = _ACTIVE_TRACE.set(trace)
+    try:
+        yield trace
+    finally:
+        _ACTIVE_TRACE.reset(token)
+        summary = trace.summary()
+        (logger or LOGGER).info(TIMING_LOG_EVENT, extra={"timing": summary})
+        put_metric(STAGE_LATENCY, summary["total_ms"], stage="total")
+        for path, stage in summary["stages"].items():
+            put_metric(STAGE_LATENCY, stage["ms"], stage=path)
+
+
+def current_trace() -> Optional[Trace]:
+    return _ACTIVE_TRACE.get()
+
+
+def span(name: str) -> Union[Span, _NoopSpan]:
+    """Time a stage under the active trace; a no-op when there is none."""
+    trace = _ACTIVE_TRACE.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return trace.span(name)
+
+
+def _observe_upstream_attempt(
+    service: str,
+    *,
+    attempt: int,
+    status_code: Optional[int],
+    latency_ms: Optional[int] = None,
+) -> None:
+    trace = _ACTIVE_TRACE.get()
+    if trace is not None:
+        trace.record_upstream(
+            service, attempt=attempt, status_code=status_code, latency_ms=latency_ms
+        )
+
+
+register_upstream_observer(_observe_upstream_attempt)
+
+__all__ = [
+    "Span",
+    "TIMING_LOG_EVENT",
+    "TRACING_ENABLED_ENV",
+    "Trace",
+    "current_trace",
+    "span",
+    "start_trace",
+    "tracing_enabled",
+]
@@ -17,6 +17,10 @@ export interface EnvironmentSettings {
   readonly openaiShadowEnabled?: boolean;
   readonly openaiReplyRewriteEnabled?: boolean;
   readonly richpanelBotAuthorId?: string;
+  /** Reserved concurrency for the worker draining the heavy (order-status) lane. */
+  readonly heavyWorkerConcurrency?: number;
+  /** Reserved concurrency for the worker draining the fast (route-only) lane. */
+  readonly fastWorkerConcurrency?: number;
 }
 
 export interface EnvironmentConfig extends EnvironmentSettings {
@@ -17,6 +17,7 @@ import * as lambda from "aws-cdk-lib/aws-lambda";
 import { SqsEventSource } from "aws-cdk-lib/aws-lambda-event-sources";
 import * as logs from "aws-cdk-lib/aws-logs";
 import { ISecret, Secret } from "aws-cdk-lib/aws-secretsmanager";
+import * as s3 from "aws-cdk-lib/aws-s3";
 import { IStringParameter, StringParameter } from "aws-cdk-lib/aws-ssm";
 import * as sqs from "aws-cdk-lib/aws-sqs";
 import { Construct } from "constructs";
@@ -45,12 +46,18 @@ export interface SecretReferences {
 
 interface EventPipelineResources {
   readonly eventsQueue: sqs.Queue;
+  readonly fastEventsQueue: sqs.Queue;
   readonly httpApiEndpoint: string;
 
   readonly idempotencyTable: dynamodb.Table;
   readonly conversationStateTable: dynamodb.Table;
   readonly auditTrailTable: dynamodb.Table;
+  readonly lanePinTable: dynamodb.Table;
+  readonly claimCheckBucket: s3.Bucket;
+  readonly writeJournalTable: dynamodb.Table;
+  readonly ingressFunction: lambda.Function;
   readonly workerFunction: lambda.Function;
+  readonly fastWorkerFunction: lambda.Function;
   readonly shopifyRefreshFunction?: lambda.Function;
 }
 
@@ -60,8 +67,9 @@ interface EventPipelineResources {
  * Wave B2 delivers the first runnable pipeline:
  * - HTTP API Gateway ingress endpoint (public)
  * - Ingress Lambda (token validation + enqueue)
- * - SQS FIFO queue (+ DLQ) for serialized events
- * - Worker Lambda subscribed to the queue
+ * - SQS FIFO queues (+ DLQ): a heavy lane for order-status automation
+ *   candidates and a fast lane for route-only events
+ * - One worker Lambda per lane, each with its own reserved concurrency
  * - DynamoDB idempotency table
  * - DynamoDB conversation state + audit trail tables (for smoke tests + run evidence)
  *
@@ -187,6 +195,7 @@ export class RichpanelMiddlewareStack extends Stack {
       retentionPeriod: Duration.days(4),
     });
 
+    // Heavy lane: order-status automation candidates (OpenAI/Shopify/Richpanel).
     const eventsQueue = new sqs.Queue(this, "EventsQueue", {
       queueName: this.naming.queueName("events", { fifo: true }),
       fifo: true,
@@ -198,6 +207,55 @@ export class RichpanelMiddlewareStack extends Stack {
       },
     });
 
+    // Fast lane: route-only events (deterministic routing + tag write), so they
+    // never wait behind order-status automation. Ingress pins each message
+    // group to one lane (LanePinTable) to keep per-conversation ordering.
+    const fastEventsQueue = new sqs.Queue(this, "FastEventsQueue", {
+      queueName: this.naming.queueName("events-fast", { fifo: true }),
+      fifo: true,
+      contentBasedDeduplication: true,
+      visibilityTimeout: Duration.seconds(90),
+      deadLetterQueue: {
+        queue: deadLetterQueue,
+        maxReceiveCount: 5,
+      },
+    });
+
+    const lanePinTable = new dynamodb.Table(this, "LanePinTable", {
+      tableName: this.naming.tableName("lane_pins"),
+      partitionKey: {
+        name: "group_id",
+        type: dynamodb.AttributeType.STRING,
+      },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: RemovalPolicy.DESTROY,
+      timeToLiveAttribute: "expires_at",
+    });
+
+    // Claim-check store: ingress keeps the full webhook payload here when the
+    // allowlisted fields alone are too large for a queue message.
+    const claimCheckBucket = new s3.Bucket(this, "ClaimCheckBucket", {
+      encryption: s3.BucketEncryption.S3_MANAGED,
+      blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+      enforceSSL: true,
+      removalPolicy: RemovalPolicy.DESTROY,
+      autoDeleteObjects: true,
+      lifecycleRules: [{ expiration: Duration.days(7) }],
+    });
+
+    // Short-TTL journal of the middleware's own Richpanel ticket writes, so
+    // webhooks that only echo those writes are dropped at ingress.
+    const writeJournalTable = new dynamodb.Table(this, "WriteJournalTable", {
+      tableName: this.naming.tableName("write_journal"),
+      partitionKey: {
+        name: "ticket_id",
+        type: dynamodb.AttributeType.STRING,
+      },
+      billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+      removalPolicy: RemovalPolicy.DESTROY,
+      timeToLiveAttribute: "expires_at",
+    });
+
     const idempotencyTable = new dynamodb.Table(this, "IdempotencyTable", {
       tableName: this.naming.tableName("idempotency"),
       partitionKey: {
@@ -228,6 +286,20 @@ export class RichpanelMiddlewareStack extends Stack {
         timeToLiveAttribute: "expires_at",
       }
     );
+    // Hour-bucketed index so monitors query a time window instead of scanning.
+    conversationStateTable.addGlobalSecondaryIndex({
+      indexName: "updated_hour-index",
+      partitionKey: {
+        name: "updated_hour",
+        type: dynamodb.AttributeType.STRING,
+      },
+      sortKey: {
+        name: "updated_at",
+        type: dynamodb.AttributeType.STRING,
+      },
+      projectionType: dynamodb.ProjectionType.INCLUDE,
+      nonKeyAttributes: ["routing", "outbound_result", "order_status_intent"],
+    });
 
     const auditTrailTable = new dynamodb.Table(this, "AuditTrailTable", {
       tableName: this.naming.tableName("audit_trail"),
@@ -260,6 +332,11 @@ export class RichpanelMiddlewareStack extends Stack {
       environment: {
         EVENT_SOURCE: "richpanel_http_target",
         QUEUE_URL: eventsQueue.queueUrl,
+        FAST_QUEUE_URL: fastEventsQueue.queueUrl,
+        LANE_PIN_TABLE_NAME: lanePinTable.tableName,
+        CLAIM_CHECK_BUCKET: claimCheckBucket.bucketName,
+        MW_CLAIM_CHECK_THRESHOLD_BYTES: "65536",
+        WRITE_JOURNAL_TABLE_NAME: writeJournalTable.tableName,
 
         /**
          * Handler expects a Secret identifier it can resolve via Secrets Manager.
@@ -268,6 +345,8 @@ export class RichpanelMiddlewareStack extends Stack {
         WEBHOOK_SECRET_ARN: this.naming.secretPath("richpanel", "webhook_token"),
 
         DEFAULT_MESSAGE_GROUP_ID: `${this.naming.resourcePrefix()}-default`,
+        // Unidentified events are hashed over this many default groups.
+        MW_DEFAULT_GROUP_SHARDS: "8",
       },
 
       // IMPORTANT: package backend/src (not just the ingress folder)
@@ -275,8 +354,130 @@ export class RichpanelMiddlewareStack extends Stack {
     });
 
     eventsQueue.grantSendMessages(ingressFunction);
+    fastEventsQueue.grantSendMessages(ingressFunction);
+    lanePinTable.grantReadWriteData(ingressFunction);
+    claimCheckBucket.grantPut(ingressFunction);
+    writeJournalTable.grantReadData(ingressFunction);
     this.secrets.richpanelWebhookToken.grantRead(ingressFunction);
 
+    // The Richpanel budget (0.5 rps) is enforced by a token bucket in each
+    // worker process, so it is split between the lanes and then across each
+    // lane's reserved concurrency; the shares sum to the budget.
+    const heavyWorkerConcurrency =
+      this.environmentConfig.heavyWorkerConcurrency ?? 1;
+    const fastWorkerConcurrency =
+      this.environmentConfig.fastWorkerConcurrency ?? 1;
+    const richpanelLaneRps = { heavy: 0.3, fast: 0.2 };
+    const richpanelProcessRps = (laneRps: number, concurrency: number) =>
+      String(Math.floor((laneRps / concurrency) * 1000) / 1000);
+
+    const workerEnvironment: Record<string, string> = {
+      IDEMPOTENCY_TABLE_NAME: idempotencyTable.tableName,
+      CONVERSATION_STATE_TABLE_NAME: conversationStateTable.tableName,
+      AUDIT_TRAIL_TABLE_NAME: auditTrailTable.tableName,
+      CLAIM_CHECK_BUCKET: claimCheckBucket.bucketName,
+      WRITE_JOURNAL_TABLE_NAME: writeJournalTable.tableName,
+
+      SAFE_MODE_PARAM: this.runtimeFlags.safeMode.parameterName,
+      AUTOMATION_ENABLED_PARAM: this.runtimeFlags.automationEnabled.parameterName,
+      MW_ENV: this.environmentConfig.name,
+      MW_METRICS_NAMESPACE: this.naming.metricNamespace(),
+      MW_ALLOW_ENV_FLAG_OVERRIDE: this.environmentConfig.name === "dev" ? "true" : "false",
+      RICHPANEL_API_KEY_SECRET_ARN: this.secrets.richpanelApiKey.secretArn,
+      RICHPANEL_HTTP_MAX_ATTEMPTS: "6",
+      RICHPANEL_429_COOLDOWN_MULTIPLIER: "3.0",
+      RICHPANEL_OUTBOUND_ENABLED:
+        this.environmentConfig.richpanelOutboundEnabled !== undefined
+          ? this.environmentConfig.richpanelOutboundEnabled
+            ? "true"
+            : "false"
+          : this.environmentConfig.name === "dev"
+            ? "true"
+            : "false",
+      RICHPANEL_TOKEN_POOL_ENABLED: "false",
+      RICHPANEL_TOKEN_POOL_SECRET_IDS: "",
+      SHOPIFY_SHOP_DOMAIN: "scentimen-t.myshopify.com",
+      SHOPIFY_OUTBOUND_ENABLED:
+        this.environmentConfig.shopifyOutboundEnabled !== undefined
+          ? this.environmentConfig.shopifyOutboundEnabled
+            ? "true"
+            : "false"
+          : this.environmentConfig.name === "dev"
+            ? "true"
+            : "false",
+      MW_PROD_WRITES_ACK:
+        this.environmentConfig.name === "prod"
+          ? "I_UNDERSTAND_PROD_WRITES"
+          : "",
+      RICHPANEL_READ_ONLY: "false",
+      RICHPANEL_WRITE_DISABLED: "false",
+      SHOPIFY_WRITE_DISABLED: "true",
+      MW_OUTBOUND_ALLOWLIST_EMAILS:
+        this.environmentConfig.outboundAllowlistEmails ?? "",
+      MW_OUTBOUND_ALLOWLIST_DOMAINS:
+        this.environmentConfig.outboundAllowlistDomains ?? "",
+      MW_OUTBOUND_REQUIRE_ALLOWLIST:
+        this.environmentConfig.outboundRequireAllowlist !== undefined
+          ? this.environmentConfig.outboundRequireAllowlist
+            ? "true"
+            : "false"
+          : this.environmentConfig.name === "prod"
+            ? "true"
+            : "false",
+      MW_SAFE_MODE_OVERRIDE:
+        this.environmentConfig.name === "dev" ? "false" : "",
+      MW_AUTOMATION_ENABLED_OVERRIDE:
+        this.environmentConfig.name === "dev" ? "true" : "",
+      MW_OPENAI_INTENT_ENABLED:
+        this.environmentConfig.openaiIntentEnabled !== undefined
+          ? this.environmentConfig.openaiIntentEnabled
+            ? "true"
+            : ""
+          : this.environmentConfig.name === "dev"
+            ? "true"
+            : "",
+      MW_OPENAI_ROUTING_ENABLED:
+        this.environmentConfig.openaiRoutingEnabled !== undefined
+          ? this.environmentConfig.openaiRoutingEnabled
+            ? "true"
+            : ""
+          : this.environmentConfig.name === "dev"
+            ? "true"
+            : "",
+      MW_OPENAI_REWRITE_ENABLED:
+        this.environmentConfig.openaiRewriteEnabled !== undefined
+          ? this.environmentConfig.openaiRewriteEnabled
+            ? "true"
+            : ""
+          : this.environmentConfig.name === "dev"
+            ? "true"
+            : "",
+      MW_OPENAI_SHADOW_ENABLED:
+        this.environmentConfig.openaiShadowEnabled !== undefined
+          ? this.environmentConfig.openaiShadowEnabled
+            ? "true"
+            : ""
+          : this.environmentConfig.name === "dev"
+            ? "true"
+            : "",
+      OPENAI_REPLY_REWRITE_ENABLED:
+        this.environmentConfig.openaiReplyRewriteEnabled !== undefined
+          ? this.environmentConfig.openaiReplyRewriteEnabled
+            ? "true"
+            : ""
+          : this.environmentConfig.name === "dev"
+            ? "true"
+            : "",
+      ...(this.environmentConfig.name === "dev"
+        ? { OPENAI_REPLY_REWRITE_CONFIDENCE_THRESHOLD: "0.7" }
+        : {}),
+      OPENAI_ROUTING_PRIMARY: "false",
+      RICHPANEL_BOT_AGENT_ID:
+        this.environmentConfig.richpanelBotAuthorId ?? "",
+      RICHPANEL_BOT_AUTHOR_ID:
+        this.environmentConfig.richpanelBotAuthorId ?? "",
+    };
+
     const workerFunction = new lambda.Function(this, "WorkerLambda", {
       functionName: this.naming.lambdaFunctionName("worker"),
       runtime: lambda.Runtime.PYTHON_3_11,
@@ -288,135 +489,67 @@ export class RichpanelMiddlewareStack extends Stack {
         "SQS worker that logs events, enforces kill switches, and writes idempotency records.",
       timeout: Duration.seconds(60),
       memorySize: 512,
-      reservedConcurrentExecutions: 1,
+      reservedConcurrentExecutions: heavyWorkerConcurrency,
       environment: {
-        IDEMPOTENCY_TABLE_NAME: idempotencyTable.tableName,
-        CONVERSATION_STATE_TABLE_NAME: conversationStateTable.tableName,
-        AUDIT_TRAIL_TABLE_NAME: auditTrailTable.tableName,
-
-        SAFE_MODE_PARAM: this.runtimeFlags.safeMode.parameterName,
-        AUTOMATION_ENABLED_PARAM: this.runtimeFlags.automationEnabled.parameterName,
-        MW_ENV: this.environmentConfig.name,
-        MW_ALLOW_ENV_FLAG_OVERRIDE: this.environmentConfig.name === "dev" ? "true" : "false",
-        RICHPANEL_API_KEY_SECRET_ARN: this.secrets.richpanelApiKey.secretArn,
-        RICHPANEL_RATE_LIMIT_RPS: "0.5",
-        RICHPANEL_HTTP_MAX_ATTEMPTS: "6",
-        RICHPANEL_429_COOLDOWN_MULTIPLIER: "3.0",
-        RICHPANEL_OUTBOUND_ENABLED:
-          this.environmentConfig.richpanelOutboundEnabled !== undefined
-            ? this.environmentConfig.richpanelOutboundEnabled
-              ? "true"
-              : "false"
-            : this.environmentConfig.name === "dev"
-              ? "true"
-              : "false",
-        RICHPANEL_TOKEN_POOL_ENABLED: "false",
-        RICHPANEL_TOKEN_POOL_SECRET_IDS: "",
-        SHOPIFY_SHOP_DOMAIN: "scentimen-t.myshopify.com",
-        SHOPIFY_OUTBOUND_ENABLED:
-          this.environmentConfig.shopifyOutboundEnabled !== undefined
-            ? this.environmentConfig.shopifyOutboundEnabled
-              ? "true"
-              : "false"
-            : this.environmentConfig.name === "dev"
-              ? "true"
-              : "false",
-        MW_PROD_WRITES_ACK:
-          this.environmentConfig.name === "prod"
-            ? "I_UNDERSTAND_PROD_WRITES"
-            : "",
-        RICHPANEL_READ_ONLY: "false",
-        RICHPANEL_WRITE_DISABLED: "false",
-        SHOPIFY_WRITE_DISABLED: "true",
-        MW_OUTBOUND_ALLOWLIST_EMAILS:
-          this.environmentConfig.outboundAllowlistEmails ?? "",
-        MW_OUTBOUND_ALLOWLIST_DOMAINS:
-          this.environmentConfig.outboundAllowlistDomains ?? "",
-        MW_OUTBOUND_REQUIRE_ALLOWLIST:
-          this.environmentConfig.outboundRequireAllowlist !== undefined
-            ? this.environmentConfig.outboundRequireAllowlist
-              ? "true"
-              : "false"
-            : this.environmentConfig.name === "prod"
-              ? "true"
-              : "false",
-        MW_SAFE_MODE_OVERRIDE:
-          this.environmentConfig.name === "dev" ? "false" : "",
-        MW_AUTOMATION_ENABLED_OVERRIDE:
-          this.environmentConfig.name === "dev" ? "true" : "",
-        MW_OPENAI_INTENT_ENABLED:
-          this.environmentConfig.openaiIntentEnabled !== undefined
-            ? this.environmentConfig.openaiIntentEnabled
-              ? "true"
-              : ""
-            : this.environmentConfig.name === "dev"
-              ? "true"
-              : "",
-        MW_OPENAI_ROUTING_ENABLED:
-          this.environmentConfig.openaiRoutingEnabled !== undefined
-            ? this.environmentConfig.openaiRoutingEnabled
-              ? "true"
-              : ""
-            : this.environmentConfig.name === "dev"
-              ? "true"
-              : "",
-        MW_OPENAI_REWRITE_ENABLED:
-          this.environmentConfig.openaiRewriteEnabled !== undefined
-            ? this.environmentConfig.openaiRewriteEnabled
-              ? "true"
-              : ""
-            : this.environmentConfig.name === "dev"
-              ? "true"
-              : "",
-        MW_OPENAI_SHADOW_ENABLED:
-          this.environmentConfig.openaiShadowEnabled !== undefined
-            ? this.environmentConfig.openaiShadowEnabled
-              ? "true"
-              : ""
-            : this.environmentConfig.name === "dev"
-              ? "true"
-              : "",
-        OPENAI_REPLY_REWRITE_ENABLED:
-          this.environmentConfig.openaiReplyRewriteEnabled !== undefined
-            ? this.environmentConfig.openaiReplyRewriteEnabled
-              ? "true"
-              : ""
-            : this.environmentConfig.name === "dev"
-              ? "true"
-              : "",
-        ...(this.environmentConfig.name === "dev"
-          ? { OPENAI_REPLY_REWRITE_CONFIDENCE_THRESHOLD: "0.7" }
-          : {}),
-        OPENAI_ROUTING_PRIMARY: "false",
-        RICHPANEL_BOT_AGENT_ID:
-          this.environmentConfig.richpanelBotAuthorId ?? "",
-        RICHPANEL_BOT_AUTHOR_ID:
-          this.environmentConfig.richpanelBotAuthorId ?? "",
+        ...workerEnvironment,
+        MW_WORKER_LANE: "heavy",
+        RICHPANEL_RATE_LIMIT_RPS: richpanelProcessRps(
+          richpanelLaneRps.heavy,
+          heavyWorkerConcurrency,
+        ),
       },
 
       // IMPORTANT: package backend/src (not just the worker folder)
       code: lambda.Code.fromAsset(lambdaSourceRoot),
     });
 
-    idempotencyTable.grantReadWriteData(workerFunction);
-    conversationStateTable.grantReadWriteData(workerFunction);
-    auditTrailTable.grantReadWriteData(workerFunction);
-
-    this.runtimeFlags.safeMode.grantRead(workerFunction);
-    this.runtimeFlags.automationEnabled.grantRead(workerFunction);
-    this.secrets.richpanelApiKey.grantRead(workerFunction);
-    this.secrets.openaiApiKey.grantRead(workerFunction);
-    this.secrets.shopifyAdminApiToken.grantRead(workerFunction);
-    this.secrets.shopifyClientId.grantRead(workerFunction);
-    this.secrets.shopifyClientSecret.grantRead(workerFunction);
-    this.secrets.shopifyRefreshToken.grantRead(workerFunction);
+    const fastWorkerFunction = new lambda.Function(this, "FastWorkerLambda", {
+      functionName: this.naming.lambdaFunctionName("worker-fast"),
+      runtime: lambda.Runtime.PYTHON_3_11,
+      handler: "lambda_handlers.worker.handler.lambda_handler",
+      description:
+        "SQS worker for the fast lane (route-only events); same code as WorkerLambda.",
+      timeout: Duration.seconds(60),
+      memorySize: 512,
+      reservedConcurrentExecutions: fastWorkerConcurrency,
+      environment: {
+        ...workerEnvironment,
+        MW_WORKER_LANE: "fast",
+        RICHPANEL_RATE_LIMIT_RPS: richpanelProcessRps(
+          richpanelLaneRps.fast,
+          fastWorkerConcurrency,
+        ),
+      },
+      code: lambda.Code.fromAsset(lambdaSourceRoot),
+    });
 
-    workerFunction.addEventSource(
-      new SqsEventSource(eventsQueue, {
-        batchSize: 1,
-        reportBatchItemFailures: true,
-      })
-    );
+    const laneWorkers: Array<[lambda.Function, sqs.Queue]> = [
+      [workerFunction, eventsQueue],
+      [fastWorkerFunction, fastEventsQueue],
+    ];
+    for (const [fn, queue] of laneWorkers) {
+      idempotencyTable.grantReadWriteData(fn);
+      conversationStateTable.grantReadWriteData(fn);
+      auditTrailTable.grantReadWriteData(fn);
+      claimCheckBucket.grantRead(fn);
+      writeJournalTable.grantReadWriteData(fn);
+
+      this.runtimeFlags.safeMode.grantRead(fn);
+      this.runtimeFlags.automationEnabled.grantRead(fn);
+      this.secrets.richpanelApiKey.grantRead(fn);
+      this.secrets.openaiApiKey.grantRead(fn);
+      this.secrets.shopifyAdminApiToken.grantRead(fn);
+      this.secrets.shopifyClientId.grantRead(fn);
+      this.secrets.shopifyClientSecret.grantRead(fn);
+      this.secrets.shopifyRefreshToken.grantRead(fn);
+
+      fn.addEventSource(
+        new SqsEventSource(queue, {
+          batchSize: 1,
+          reportBatchItemFailures: true,
+        })
+      );
+    }
 
     let shopifyRefreshFunction: lambda.Function | undefined;
     if (["prod", "dev"].includes(this.environmentConfig.name)) {
@@ -479,11 +612,17 @@ export class RichpanelMiddlewareStack extends Stack {
 
     return {
       eventsQueue,
+      fastEventsQueue,
       httpApiEndpoint: httpApi.attrApiEndpoint,
       idempotencyTable,
       conversationStateTable,
       auditTrailTable,
+      lanePinTable,
+      claimCheckBucket,
+      writeJournalTable,
+      ingressFunction,
       workerFunction,
+      fastWorkerFunction,
       shopifyRefreshFunction,
     };
   }
@@ -494,8 +633,86 @@ export class RichpanelMiddlewareStack extends Stack {
       retention: logs.RetentionDays.ONE_MONTH,
       removalPolicy: RemovalPolicy.RETAIN,
     });
+    const fastWorkerLogGroup = new logs.LogGroup(this, "FastWorkerLogGroup", {
+      logGroupName: `/aws/lambda/${pipeline.fastWorkerFunction.functionName}`,
+      retention: logs.RetentionDays.ONE_MONTH,
+      removalPolicy: RemovalPolicy.RETAIN,
+    });
     const metricNamespace = this.naming.metricNamespace();
 
+    // Events with no conversation/ticket/group id (sharded default group).
+    const defaultGroupFallbackMetric = new cloudwatch.Metric({
+      namespace: metricNamespace,
+      metricName: "IngressDefaultGroupFallback",
+      statistic: "sum",
+      period: Duration.minutes(5),
+    });
+    // Function.logGroup pre-creates the log group if it does not exist yet.
+    new logs.MetricFilter(this, "IngressDefaultGroupFallbackMetricFilter", {
+      logGroup: pipeline.ingressFunction.logGroup,
+      metricNamespace,
+      metricName: "IngressDefaultGroupFallback",
+      filterPattern: logs.FilterPattern.allTerms("ingress.default_group_fallback"),
+      metricValue: "1",
+    });
+
+    // Webhooks dropped as echoes of the middleware's own ticket writes.
+    const ingressEchoSuppressedMetric = new cloudwatch.Metric({
+      namespace: metricNamespace,
+      metricName: "IngressEchoSuppressed",
+      statistic: "sum",
+      period: Duration.minutes(5),
+    });
+    new logs.MetricFilter(this, "IngressEchoSuppressedMetricFilter", {
+      logGroup: pipeline.ingressFunction.logGroup,
+      metricNamespace,
+      metricName: "IngressEchoSuppressed",
+      filterPattern: logs.FilterPattern.allTerms("ingress.echo_suppressed"),
+      metricValue: "1",
+    });
+    const workerEchoSuppressedMetric = new cloudwatch.Metric({
+      namespace: metricNamespace,
+      metricName: "WorkerEchoSuppressed",
+      statistic: "sum",
+      period: Duration.minutes(5),
+    });
+    for (const [id, logGroup] of [
+      ["WorkerEchoSuppressedMetricFilter", workerLogGroup],
+      ["FastWorkerEchoSuppressedMetricFilter", fastWorkerLogGroup],
+    ] as const) {
+      new logs.MetricFilter(this, id, {
+        logGroup,
+        metricNamespace,
+        metricName: "WorkerEchoSuppressed",
+        filterPattern: logs.FilterPattern.allTerms("worker.echo_suppressed"),
+        metricValue: "1",
+      });
+    }
+
+    // Head-of-line blocking shows up as queue age; one series per lane.
+    const heavyQueueAge = pipeline.eventsQueue.metricApproximateAgeOfOldestMessage({
+      period: Duration.minutes(1),
+      statistic: "Maximum",
+      label: "heavy lane",
+    });
+    const fastQueueAge = pipeline.fastEventsQueue.metricApproximateAgeOfOldestMessage({
+      period: Duration.minutes(1),
+      statistic: "Maximum",
+      label: "fast lane",
+    });
+    new cloudwatch.Alarm(this, "FastLaneQueueAgeAlarm", {
+      alarmName: `${this.naming.resourcePrefix()}-fast-lane-queue-age`,
+      alarmDescription:
+        "Route-only events waiting more than 2 minutes in the fast lane.",
+      metric: fastQueueAge,
+      threshold: 120,
+      evaluationPeriods: 5,
+      datapointsToAlarm: 3,
+      comparisonOperator:
+        cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+      treatMissingData: cloudwatch.TreatMissingData.NOT_BREACHING,
+    });
+
     const workerErrors = pipeline.workerFunction.metricErrors({
       period: Duration.minutes(5),
     });
@@ -623,6 +840,74 @@ export class RichpanelMiddlewareStack extends Stack {
       });
     }
 
+    // Hot-path latency from the worker's EMF output (observability/metrics.py).
+    const stageLatency = (stage: string, statistic: string): cloudwatch.Metric =>
+      new cloudwatch.Metric({
+        namespace: metricNamespace,
+        metricName: "StageLatency",
+        dimensionsMap: { stage },
+        statistic,
+        period: Duration.minutes(5),
+        label: `${stage} ${statistic}`,
+      });
+    const latencyStages = [
+      "total",
+      "plan",
+      "plan/routing",
+      "plan/intent",
+      "plan/order_lookup",
+      "outbound_reply",
+    ];
+    const upstreamLatency = (upstream: string): cloudwatch.Metric =>
+      new cloudwatch.Metric({
+        namespace: metricNamespace,
+        metricName: "UpstreamLatency",
+        dimensionsMap: { upstream, outcome: "ok" },
+        statistic: "p95",
+        period: Duration.minutes(5),
+        label: `${upstream} p95`,
+      });
+    const queueWait = (lane: string): cloudwatch.Metric =>
+      new cloudwatch.Metric({
+        namespace: metricNamespace,
+        metricName: "QueueWait",
+        dimensionsMap: { lane },
+        statistic: "p95",
+        period: Duration.minutes(5),
+        label: `${lane} lane p95`,
+      });
+    const emfSearch = (query: string, label: string): cloudwatch.MathExpression =>
+      new cloudwatch.MathExpression({
+        expression: `SEARCH('{${metricNamespace},${query}', 'Sum', 300)`,
+        label,
+        period: Duration.minutes(5),
+      });
+
+    new cloudwatch.Alarm(this, "WorkerEventLatencyP99Alarm", {
+      alarmName: `${this.naming.resourcePrefix()}-worker-event-latency-p99`,
+      alarmDescription:
+        "p99 worker time per event above 20s; worker.timing logs show the slow stage.",
+      metric: stageLatency("total", "p99"),
+      threshold: 20000,
+      evaluationPeriods: 3,
+      datapointsToAlarm: 3,
+      comparisonOperator:
+        cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+      treatMissingData: cloudwatch.TreatMissingData.NOT_BREACHING,
+    });
+    new cloudwatch.Alarm(this, "OrderLookupLatencyP95Alarm", {
+      alarmName: `${this.naming.resourcePrefix()}-order-lookup-latency-p95`,
+      alarmDescription:
+        "p95 order lookup (Shopify/ShipStation) above 8s for 15 minutes.",
+      metric: stageLatency("plan/order_lookup", "p95"),
+      threshold: 8000,
+      evaluationPeriods: 3,
+      datapointsToAlarm: 3,
+      comparisonOperator:
+        cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+      treatMissingData: cloudwatch.TreatMissingData.NOT_BREACHING,
+    });
+
     const dashboard = new cloudwatch.Dashboard(
       this,
       "OrderStatusMonitoringDashboard",
@@ -643,6 +928,53 @@ export class RichpanelMiddlewareStack extends Stack {
         title: "OpenAI Order Status Failures",
         left: [openaiFailureMetric],
       }),
+      new cloudwatch.GraphWidget({
+        title: "Queue Age by Lane (s)",
+        left: [fastQueueAge, heavyQueueAge],
+      }),
+      new cloudwatch.GraphWidget({
+        title: "Default Message Group Fallbacks",
+        left: [defaultGroupFallbackMetric],
+      }),
+      new cloudwatch.GraphWidget({
+        title: "Self-Triggered Webhooks Suppressed",
+        left: [ingressEchoSuppressedMetric, workerEchoSuppressedMetric],
+      }),
+      new cloudwatch.GraphWidget({
+        title: "Stage Latency p95 (ms)",
+        left: latencyStages.map((stage) => stageLatency(stage, "p95")),
+      }),
+      new cloudwatch.GraphWidget({
+        title: "Stage Latency p99 (ms)",
+        left: latencyStages.map((stage) => stageLatency(stage, "p99")),
+      }),
+      new cloudwatch.GraphWidget({
+        title: "Upstream Latency p95 (ms)",
+        left: ["richpanel", "shopify", "shipstation", "openai"].map(upstreamLatency),
+      }),
+      new cloudwatch.GraphWidget({
+        title: "Queue-to-Process Delay p95 (ms)",
+        left: [queueWait("fast"), queueWait("heavy")],
+      }),
+      new cloudwatch.GraphWidget({
+        title: "Upstream Retries and Rate-Limiter Wait",
+        left: [emfSearch('upstream} MetricName="UpstreamRetries"', "retries")],
+        right: [
+          new cloudwatch.Metric({
+            namespace: metricNamespace,
+            metricName: "RateLimiterWait",
+            dimensionsMap: { upstream: "richpanel", outcome: "acquired" },
+            statistic: "p95",
+            period: Duration.minutes(5),
+            label: "Richpanel limiter wait p95 (ms)",
+          }),
+        ],
+      }),
+      new cloudwatch.GraphWidget({
+        title: "LLM Calls Gated and Cache Lookups",
+        left: [emfSearch('stage,outcome} MetricName="LLMGated"', "gated")],
+        right: [emfSearch('stage,outcome} MetricName="CacheLookups"', "cache")],
+      }),
       new cloudwatch.TextWidget({
         markdown:
           "TODO: Wire order_status_true_rate metric once shadow job is scheduled.",
@@ -713,6 +1045,16 @@ export class RichpanelMiddlewareStack extends Stack {
       description: "Queue URL for diagnostics and smoke tests.",
     });
 
+    new CfnOutput(this, "FastEventsQueueName", {
+      value: pipeline.fastEventsQueue.queueName,
+      description: "FIFO queue for route-only events (fast lane).",
+    });
+
+    new CfnOutput(this, "FastEventsQueueUrl", {
+      value: pipeline.fastEventsQueue.queueUrl,
+      description: "Fast-lane queue URL for diagnostics and smoke tests.",
+    });
+
     new CfnOutput(this, "IdempotencyTableName", {
       value: pipeline.idempotencyTable.tableName,
       description: "DynamoDB table name for idempotency records.",
@@ -727,6 +1069,16 @@ export class RichpanelMiddlewareStack extends Stack {
       value: pipeline.auditTrailTable.tableName,
       description: "DynamoDB table name for audit trail records.",
     });
+
+    new CfnOutput(this, "WriteJournalTableName", {
+      value: pipeline.writeJournalTable.tableName,
+      description: "DynamoDB table journaling the middleware's own Richpanel writes.",
+    });
+
+    new CfnOutput(this, "ClaimCheckBucketName", {
+      value: pipeline.claimCheckBucket.bucketName,
+      description: "S3 bucket holding offloaded (claim-check) webhook payloads.",
+    });
   }
 
   private resolveRepoPath(...segments: string[]): string {
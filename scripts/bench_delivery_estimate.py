@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for delivery estimate helpers (offline, PII-free).
+
+Builds a corpus of shipping-method strings from the repo fixtures plus
+synthetic variants of the transit-map keys, then times
+`normalize_shipping_method`, `compute_delivery_estimate`, and
+`compute_preorder_delivery_estimate` over it. Reports the cold pass (transit
+map compile + LRU misses) separately from warm passes.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from richpanel_middleware.automation import delivery_estimate  # type: ignore  # noqa: E402
+from richpanel_middleware.automation.delivery_estimate import (  # type: ignore  # noqa: E402
+    DEFAULT_SHIPPING_METHOD_TRANSIT_MAP,
+    compute_delivery_estimate,
+    compute_preorder_delivery_estimate,
+    normalize_shipping_method,
+)
+
+_FIXTURE_GLOBS = ("*.json", "*.jsonl")
+_METHOD_RE = re.compile(r'"shipping_method[a-z_]*"\s*:\s*"([^"]+)"')
+_CARRIERS = ("", "USPS ", "UPS ", "FedEx ", "DHL ", "USPS/UPS® ")
+_SUFFIXES = ("", " Shipping", " (Free)", " - Insured", " Delivery", " 48 States")
+
+
+def _fixture_methods() -> List[str]:
+    methods: List[str] = []
+    for base in (ROOT / "scripts" / "fixtures", ROOT / "backend" / "tests" / "fixtures"):
+        for pattern in _FIXTURE_GLOBS:
+            for path in sorted(base.rglob(pattern)):
+                try:
+                    text = path.read_text(encoding="utf-8")
+                except (OSError, UnicodeDecodeError):
+                    continue
+                for match in _METHOD_RE.finditer(text):
+                    methods.append(json.loads(f'"{match.group(1)}"'))
+    return methods
+
+
+def build_corpus(size: int, *, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    seeds = _fixture_methods()
+    keys = list(DEFAULT_SHIPPING_METHOD_TRANSIT_MAP.keys())
+    corpus: List[str] = []
+    while len(corpus) < size:
+        if seeds and rng.random() < 0.3:
+            corpus.append(rng.choice(seeds))
+            continue
+        key = rng.choice(keys)
+        label = f"{rng.choice(_CARRIERS)}{key.title()}{rng.choice(_SUFFIXES)}"
+        if rng.random() < 0.1:
+            low = rng.randint(1, 5)
+            label = f"{label} ({low}-{low + rng.randint(0, 4)} business days)"
+        corpus.append(label)
+    return corpus
+
+
+def _time_pass(corpus: List[str], order_dates: List[date], inquiry: date) -> float:
+    start = time.perf_counter()
+    for method, order_date in zip(corpus, order_dates):
+        normalize_shipping_method(method)
+        compute_delivery_estimate(order_date, method, inquiry)
+        compute_preorder_delivery_estimate(
+            order_date, method, inquiry, order_tags=["preorder"]
+        )
+    return time.perf_counter() - start
+
+
+def run_benchmark(size: int, passes: int) -> Dict[str, Any]:
+    corpus = build_corpus(size)
+    inquiry = date(2025, 3, 14)
+    order_dates = [inquiry - timedelta(days=i % 45) for i in range(len(corpus))]
+
+    delivery_estimate._COMPILED_TRANSIT_MAP = None
+    cold = _time_pass(corpus, order_dates, inquiry)
+    warm = [_time_pass(corpus, order_dates, inquiry) for _ in range(max(1, passes))]
+    best_warm = min(warm)
+    return {
+        "tickets": len(corpus),
+        "distinct_methods": len(set(corpus)),
+        "cold_seconds": round(cold, 4),
+        "warm_seconds_best": round(best_warm, 4),
+        "cold_us_per_ticket": round(cold / len(corpus) * 1e6, 2),
+        "warm_us_per_ticket": round(best_warm / len(corpus) * 1e6, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=5000, help="Corpus size.")
+    parser.add_argument("--passes", type=int, default=3, help="Warm passes.")
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.size, args.passes), indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for sanitize_for_openai on HTML customer emails (offline, PII-free).
+
+Builds synthetic multi-KB HTML emails from a fixed set of sentences (order
+numbers, emails, phones, addresses, URLs, names, entities) and times the
+single-pass sanitizer against the multi-pass reference implementation,
+checking that both produce identical output for every document.
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from richpanel_middleware.automation import pii_sanitizer  # type: ignore  # noqa: E402
+from richpanel_middleware.automation.pii_sanitizer import (  # type: ignore  # noqa: E402
+    _sanitize_multi_pass,
+    sanitize_for_openai,
+)
+
+_SENTENCES = (
+    "Hi Sarah,",
+    "Where is my order #10452?",
+    "I placed it two weeks ago and still have no tracking.",
+    "You can reach me at sarah.jones@example.com or 555-201-3344.",
+    "Ship it to 1200 Market Street please.",
+    "Thanks for your help with this.",
+    "The package was supposed to arrive on Monday.",
+    "Please advise &amp; let me know.",
+    "Visit https://shop.example.com/account for details.",
+    "Order number 99812 was also delayed.",
+)
+_PARAGRAPH = '<p style="font-family:Arial,sans-serif;font-size:14px;color:#222">{}</p>\n'
+
+
+def build_corpus(count: int, *, seed: int = 7, sizes_kb: Sequence[int] = (2, 4, 8, 16)) -> List[str]:
+    rng = random.Random(seed)
+    corpus: List[str] = []
+    for index in range(count):
+        target = sizes_kb[index % len(sizes_kb)] * 1024
+        parts = ['<html><head><style>p{margin:0}</style></head><body><div dir="ltr">']
+        size = len(parts[0])
+        while size < target:
+            parts.append(_PARAGRAPH.format(" ".join(rng.sample(_SENTENCES, 3))))
+            size += len(parts[-1])
+        parts.append("<p>Regards,<br>Sarah Jones</p></div></body></html>")
+        corpus.append("".join(parts))
+    return corpus
+
+
+def _best_of(fn: Callable[[str], str], corpus: List[str], passes: int) -> float:
+    timings = []
+    for _ in range(max(1, passes)):
+        start = time.perf_counter()
+        for text in corpus:
+            fn(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(count: int, passes: int) -> Dict[str, Any]:
+    corpus = build_corpus(count)
+    single = _best_of(lambda text: sanitize_for_openai(text, max_chars=None), corpus, passes)
+    multi = _best_of(lambda text: _sanitize_multi_pass(text, max_chars=None), corpus, passes)
+    fallbacks = sum(
+        1
+        for text in corpus
+        if pii_sanitizer._redact_single_pass(
+            pii_sanitizer._TAG_OR_ANGLE_REGEX.sub(" ", html.unescape(text))
+        )
+        is None
+    )
+    mismatches = sum(
+        1
+        for text in corpus
+        if sanitize_for_openai(text, max_chars=None) != _sanitize_multi_pass(text, max_chars=None)
+    )
+    total_kb = sum(len(text) for text in corpus) / 1024
+    return {
+        "documents": len(corpus),
+        "total_kb": round(total_kb, 1),
+        "multi_pass_ms_per_doc": round(multi / len(corpus) * 1e3, 4),
+        "single_pass_ms_per_doc": round(single / len(corpus) * 1e3, 4),
+        "speedup": round(multi / single, 2) if single else None,
+        "single_pass_fallbacks": fallbacks,
+        "output_mismatches": mismatches,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200, help="Number of emails.")
+    parser.add_argument("--passes", type=int, default=5, help="Timed passes (best is reported).")
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.count, args.passes), indent=2))
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
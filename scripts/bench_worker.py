@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the worker Lambda, replaying a recorded cassette.
+
+Events from the cassette (or cycled from it up to --events) are pushed
+through the real ``lambda_handlers.worker.handler.lambda_handler`` in SQS
+batches. Upstream HTTP calls are served from the cassette with their
+recorded latencies (see upstream_cassettes.py); DynamoDB uses the worker's
+in-memory tables, SSM an in-memory parameter store and SQS an in-memory
+queue, so nothing leaves the process.
+
+Per-event latency and upstream call counts come from the worker's own
+``worker.timing`` log lines. The JSON report carries the commit, config and
+cassette fingerprint so runs can be compared across commits:
+
+    python scripts/bench_worker.py --events 2000 --output before.json
+    python scripts/bench_worker.py --events 2000 --baseline before.json
+
+Record a cassette with ``shadow_order_status.py --record-cassette PATH``.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+DEFAULT_CASSETTE = ROOT / "scripts" / "fixtures" / "cassettes" / "worker_order_status.json"
+
+# The worker reads these at import time.
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+os.environ.setdefault("CONVERSATION_STATE_TABLE_NAME", "local-conversation-state")
+os.environ.setdefault("AUDIT_TRAIL_TABLE_NAME", "local-audit-trail")
+
+# Replay configuration mirrors the shadow harness (read-only network paths and
+# OpenAI shadow routing on, outbound writes off). Credentials are dummies: the
+# clients only need them to build requests, which the cassette answers.
+REPLAY_ENV = {
+    "RICHPANEL_ENV": "dev",
+    "MW_ALLOW_NETWORK_READS": "true",
+    "RICHPANEL_OUTBOUND_ENABLED": "false",
+    "MW_OPENAI_ROUTING_ENABLED": "true",
+    "MW_OPENAI_INTENT_ENABLED": "true",
+    "MW_OPENAI_SHADOW_ENABLED": "true",
+    "OPENAI_ALLOW_NETWORK": "true",
+    "RICHPANEL_API_KEY_OVERRIDE": "bench-richpanel-key",
+    "SHOPIFY_ACCESS_TOKEN_OVERRIDE": "bench-shopify-token",
+    "SHIPSTATION_API_KEY_OVERRIDE": "bench-shipstation-key",
+    "SHIPSTATION_API_SECRET_OVERRIDE": "bench-shipstation-secret",
+    "OPENAI_API_KEY": "bench-openai-key",
+}
+
+from lambda_handlers.worker import handler as worker  # noqa: E402
+from richpanel_middleware.ingest.envelope import build_event_envelope  # noqa: E402
+from richpanel_middleware.observability.tracing import TIMING_LOG_EVENT  # noqa: E402
+from upstream_cassettes import SERVICES, Cassette, replaying  # noqa: E402
+
+
+class InMemoryParameterStore:
+    """SSM stand-in answering the worker's kill-switch get_parameters call."""
+
+    def __init__(self, values: Dict[str, str]) -> None:
+        self.values = dict(values)
+        self.calls = 0
+
+    def get_parameters(self, Names: List[str], WithDecryption: bool = False) -> Dict[str, Any]:
+        self.calls += 1
+        return {
+            "Parameters": [
+                {"Name": name, "Value": self.values[name]}
+                for name in Names
+                if name in self.values
+            ],
+            "InvalidParameters": [name for name in Names if name not in self.values],
+        }
+
+
+class _Boto3StandIn:
+    """Non-None ``boto3`` so the worker takes its SSM path; never reached for AWS."""
+
+    def __init__(self, ssm: InMemoryParameterStore) -> None:
+        self._ssm = ssm
+
+    def client(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        if name == "ssm":
+            return self._ssm
+        raise RuntimeError(f"bench_worker has no in-memory stand-in for {name}")
+
+    def resource(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        raise RuntimeError(f"bench_worker has no in-memory stand-in for {name}")
+
+
+class InMemoryQueue:
+    """SQS stand-in producing Lambda event-source records."""
+
+    def __init__(self) -> None:
+        self._messages: Deque[Dict[str, Any]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def send(self, body: Dict[str, Any], *, sent_at: Optional[float] = None) -> None:
+        sent_ms = int((sent_at if sent_at is not None else time.time()) * 1000)
+        self._messages.append(
+            {
+                "messageId": str(uuid.uuid4()),
+                "body": json.dumps(body),
+                "attributes": {
+                    "SentTimestamp": str(sent_ms),
+                    "ApproximateReceiveCount": "1",
+                },
+            }
+        )
+
+    def receive(self, max_messages: int) -> List[Dict[str, Any]]:
+        batch: List[Dict[str, Any]] = []
+        while self._messages and len(batch) < max_messages:
+            batch.append(self._messages.popleft())
+        return batch
+
+
+class _TimingCollector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(level=logging.INFO)
+        self.timings: List[Dict[str, Any]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.getMessage() == TIMING_LOG_EVENT:
+            timing = getattr(record, "timing", None)
+            if isinstance(timing, dict):
+                self.timings.append(timing)
+
+
+def build_events(cassette: Cassette, count: int, *, seed: int) -> List[Dict[str, Any]]:
+    """Cycle the cassette's payloads with fresh ids (shuffled per cycle)."""
+    if not cassette.events:
+        raise SystemExit("Cassette has no recorded events to replay")
+    rng = random.Random(seed)
+    events: List[Dict[str, Any]] = []
+    order = list(range(len(cassette.events)))
+    while len(events) < count:
+        rng.shuffle(order)
+        for index in order:
+            if len(events) >= count:
+                break
+            payload = json.loads(json.dumps(cassette.events[index]))
+            # Fresh, digit-bearing ids keep events independent (idempotency,
+            # conversation state) while still matching the {id} routes.
+            synthetic_id = f"bench{seed}{len(events):07d}"
+            payload["ticket_id"] = synthetic_id
+            payload["conversation_id"] = synthetic_id
+            events.append(build_event_envelope(payload).to_message())
+    return events
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return round(ordered[index], 2)
+
+
+def _git_revision() -> Dict[str, Any]:
+    try:
+        sha = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return {"sha": None, "dirty": None}
+    return {"sha": sha, "dirty": dirty}
+
+
+@contextlib.contextmanager
+def replay_environment(overrides: Optional[Dict[str, str]] = None) -> Iterator[None]:
+    values = dict(REPLAY_ENV, **(overrides or {}))
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextlib.contextmanager
+def worker_stand_ins() -> Iterator[InMemoryParameterStore]:
+    """Point the worker's AWS dependencies at in-memory stand-ins."""
+    ssm = InMemoryParameterStore(
+        {worker.SAFE_MODE_PARAM: "false", worker.AUTOMATION_ENABLED_PARAM: "true"}
+    )
+    saved = {
+        name: getattr(worker, name)
+        for name in ("boto3", "_SSM_CLIENT", "_DDB_RESOURCE", "_TABLE_CACHE", "_WRITE_JOURNAL")
+    }
+    saved_flags = dict(worker._FLAG_CACHE)
+    saved_payload_store = dict(worker._PAYLOAD_STORE)
+    try:
+        # Build the worker's in-memory DynamoDB first (it only does so when
+        # boto3 is missing), then expose the SSM stand-in.
+        worker.boto3 = None
+        worker._DDB_RESOURCE = None
+        worker._TABLE_CACHE = {}
+        worker._WRITE_JOURNAL = None
+        worker._dynamodb_resource()
+        worker.boto3 = _Boto3StandIn(ssm)
+        worker._SSM_CLIENT = ssm
+        worker._FLAG_CACHE.update({"expires_at": 0.0})
+        worker._PAYLOAD_STORE.update({"loaded": True, "store": None})
+        yield ssm
+    finally:
+        for name, value in saved.items():
+            setattr(worker, name, value)
+        worker._FLAG_CACHE.clear()
+        worker._FLAG_CACHE.update(saved_flags)
+        worker._PAYLOAD_STORE.clear()
+        worker._PAYLOAD_STORE.update(saved_payload_store)
+
+
+def run_benchmark(
+    cassette: Cassette,
+    *,
+    events: int,
+    batch_size: int,
+    latency_scale: float,
+    seed: int,
+) -> Dict[str, Any]:
+    messages = build_events(cassette, events, seed=seed)
+    queue = InMemoryQueue()
+    collector = _TimingCollector()
+    worker_logger = worker.LOGGER
+    previous_level = worker_logger.level
+    previous_propagate = worker_logger.propagate
+    worker_logger.addHandler(collector)
+    worker_logger.setLevel(logging.INFO)
+    worker_logger.propagate = False
+    failures = 0
+    batches = 0
+    try:
+        with replay_environment(), worker_stand_ins() as ssm, replaying(
+            cassette, latency_scale=latency_scale
+        ) as replay_stats, open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+            devnull
+        ):
+            for message in messages:
+                queue.send(message)
+            started = time.perf_counter()
+            while len(queue):
+                batch = queue.receive(batch_size)
+                result = worker.lambda_handler({"Records": batch}, None)
+                failures += len(result.get("batchItemFailures") or [])
+                batches += 1
+            wall_s = time.perf_counter() - started
+    finally:
+        worker_logger.removeHandler(collector)
+        worker_logger.setLevel(previous_level)
+        worker_logger.propagate = previous_propagate
+
+    totals = [float(t.get("total_ms") or 0.0) for t in collector.timings]
+    processed = len(collector.timings)
+    upstream_calls: Dict[str, float] = {}
+    for service in SERVICES:
+        calls = sum(
+            int((t.get("upstream") or {}).get(service, {}).get("calls", 0))
+            for t in collector.timings
+        )
+        if calls:
+            upstream_calls[service] = round(calls / max(processed, 1), 3)
+    stage_p95: Dict[str, Optional[float]] = {}
+    for stage in sorted({path for t in collector.timings for path in t.get("stages", {})}):
+        samples = [
+            float(t["stages"][stage]["ms"]) for t in collector.timings if stage in t["stages"]
+        ]
+        stage_p95[stage] = _percentile(samples, 95)
+
+    replay = replay_stats.snapshot()
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "config": {
+            "events": events,
+            "batch_size": batch_size,
+            "latency_scale": latency_scale,
+            "seed": seed,
+        },
+        "cassette": {
+            "fingerprint": cassette.fingerprint(),
+            "events": len(cassette.events),
+            "exchanges": len(cassette.exchanges),
+        },
+        "results": {
+            "events_processed": processed,
+            "batches": batches,
+            "failures": failures,
+            "wall_s": round(wall_s, 3),
+            "throughput_eps": round(processed / wall_s, 2) if wall_s > 0 else None,
+            "latency_ms": {
+                "p50": _percentile(totals, 50),
+                "p95": _percentile(totals, 95),
+                "p99": _percentile(totals, 99),
+                "max": round(max(totals), 2) if totals else None,
+            },
+            "upstream_calls_per_event": upstream_calls,
+            "stage_p95_ms": stage_p95,
+            "ssm_calls": ssm.calls,
+            "cassette_misses": replay["misses"],
+        },
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """Deltas against a baseline report; flags runs that aren't comparable."""
+    warnings = []
+    for key in ("config", "cassette"):
+        if report.get(key) != baseline.get(key):
+            warnings.append(f"{key} differs from baseline")
+    current, previous = report["results"], baseline.get("results", {})
+    deltas: Dict[str, Any] = {}
+    for key in ("throughput_eps", "wall_s"):
+        deltas[key] = _delta(current.get(key), previous.get(key))
+    for key in ("p50", "p95", "p99", "max"):
+        deltas[f"latency_{key}_ms"] = _delta(
+            current["latency_ms"].get(key), (previous.get("latency_ms") or {}).get(key)
+        )
+    for service in sorted(
+        set(current["upstream_calls_per_event"]) | set(previous.get("upstream_calls_per_event") or {})
+    ):
+        deltas[f"upstream_calls_{service}"] = _delta(
+            current["upstream_calls_per_event"].get(service, 0.0),
+            (previous.get("upstream_calls_per_event") or {}).get(service, 0.0),
+        )
+    return {
+        "baseline_revision": baseline.get("revision"),
+        "warnings": warnings,
+        "deltas": deltas,
+    }
+
+
+def _delta(current: Optional[float], previous: Optional[float]) -> Dict[str, Any]:
+    if current is None or previous is None:
+        return {"current": current, "baseline": previous, "change_pct": None}
+    change = round((current - previous) / previous * 100, 1) if previous else None
+    return {"current": current, "baseline": previous, "change_pct": change}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--cassette", default=str(DEFAULT_CASSETTE), help="Cassette JSON path")
+    parser.add_argument("--events", type=int, default=500, help="Events to push through")
+    parser.add_argument("--batch-size", type=int, default=10, help="SQS batch size")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="Multiplier for recorded upstream latency (0 = no sleeping)",
+    )
+    parser.add_argument("--seed", type=int, default=7, help="Event order seed")
+    parser.add_argument("--output", help="Write the JSON report here as well")
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    args = parser.parse_args()
+    if args.events < 1 or args.batch_size < 1:
+        raise SystemExit("--events and --batch-size must be >= 1")
+
+    logging.getLogger("richpanel_middleware").setLevel(logging.ERROR)
+    logging.getLogger("integrations").setLevel(logging.ERROR)
+
+    cassette = Cassette.load(Path(args.cassette))
+    report = run_benchmark(
+        cassette,
+        events=args.events,
+        batch_size=args.batch_size,
+        latency_scale=args.latency_scale,
+        seed=args.seed,
+    )
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        report["comparison"] = compare(report, baseline)
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -32,6 +32,10 @@ from richpanel_middleware.automation.llm_routing import (  # type: ignore
 from richpanel_middleware.automation.pii_sanitizer import (  # type: ignore
     sanitize_for_openai,
 )
+from richpanel_middleware.automation.prompt_compaction import (  # type: ignore
+    compact_text,
+    get_token_budget,
+)
 from richpanel_middleware.automation.router import (  # type: ignore
     classify_routing,
     extract_customer_message,
@@ -341,12 +345,22 @@ def _evaluate_examples(
 ) -> Dict[str, Any]:
     results: List[Dict[str, Any]] = []
     deterministic_pairs: List[Tuple[str, str]] = []
+    compacted_pairs: List[Tuple[str, str]] = []
     llm_pairs: List[Tuple[str, str]] = []
     llm_called_count = 0
+    tokens_before = tokens_after = 0
+    budget = get_token_budget("routing")
 
     for example in examples:
         deterministic = classify_routing({"customer_message": example.text})
         deterministic_label = _label_from_intent(deterministic.intent)
+        # Same text the LLM prompts now see; accuracy must not drop on it.
+        compacted = compact_text(example.text, budget_tokens=budget)
+        tokens_before += compacted.tokens_before
+        tokens_after += compacted.tokens_after
+        compacted_label = _label_from_intent(
+            classify_routing({"customer_message": compacted.text}).intent
+        )
 
         llm_label: Optional[str] = None
         llm_called = False
@@ -383,6 +397,7 @@ def _evaluate_examples(
 
         if example.expected in VALID_LABELS:
             deterministic_pairs.append((example.expected, deterministic_label))
+            compacted_pairs.append((example.expected, compacted_label))
             if llm_called and llm_label is not None:
                 llm_pairs.append((example.expected, llm_label))
 
@@ -399,7 +414,10 @@ def _evaluate_examples(
             }
         )
 
-    metrics = {"deterministic": _compute_metrics(deterministic_pairs)}
+    metrics = {
+        "deterministic": _compute_metrics(deterministic_pairs),
+        "deterministic_compacted": _compute_metrics(compacted_pairs),
+    }
     if llm_pairs:
         metrics["llm"] = _compute_metrics(llm_pairs)
     else:
@@ -411,6 +429,8 @@ def _evaluate_examples(
             "total": len(examples),
             "with_expected": len(deterministic_pairs),
             "llm_called": llm_called_count,
+            "compaction_tokens_before": tokens_before,
+            "compaction_tokens_removed": tokens_before - tokens_after,
         },
         "metrics": metrics,
         "results": results,
@@ -614,6 +634,10 @@ def main() -> int:
 
     LOGGER.info("Saved summary to %s", output_path)
     _print_metrics("Deterministic", summary["metrics"]["deterministic"])
+    _print_metrics(
+        "Deterministic (compacted)",
+        summary["metrics"].get("deterministic_compacted") or {},
+    )
     _print_metrics("LLM", summary["metrics"]["llm"])
     if use_openai and not allow_network:
         LOGGER.info("OpenAI disabled (set OPENAI_ALLOW_NETWORK=true to enable calls).")
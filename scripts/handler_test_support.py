@@ -0,0 +1,72 @@
+"""
+Shared doubles and patch setup for tests that drive the ingress and worker
+Lambda handlers in-process.
+
+Test modules still set their environment defaults and import the handlers
+themselves (the handlers read env vars at import time); the helpers here take
+the imported handler module as an argument.
+"""
+from __future__ import annotations
+
+import json
+import unittest
+from types import ModuleType
+from typing import Any, Dict, Iterable, List
+from unittest import mock
+
+WEBHOOK_TOKEN = "secret"
+
+
+class Clock:
+    """Settable stand-in for time.time / time.monotonic."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingSqs:
+    """SQS client double that keeps every send_message call."""
+
+    def __init__(self) -> None:
+        self.sent: List[Dict[str, Any]] = []
+
+    def send_message(self, **kwargs: Any) -> Dict[str, Any]:
+        self.sent.append(kwargs)
+        return {"MessageId": str(len(self.sent))}
+
+
+def start_patches(test: unittest.TestCase, patches: Iterable[Any]) -> None:
+    """Start each patcher now and stop it when the test finishes."""
+    for patcher in patches:
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
+def local_worker_patches(worker: ModuleType) -> List[Any]:
+    """Point the worker at in-memory DynamoDB tables (no boto3, empty cache)."""
+    return [
+        mock.patch.object(worker, "boto3", None),
+        mock.patch.object(worker, "_DDB_RESOURCE", None),
+        mock.patch.object(worker, "_TABLE_CACHE", {}),
+    ]
+
+
+def ingress_patches(ingress: ModuleType, sqs: Any = None) -> List[Any]:
+    """Accept WEBHOOK_TOKEN and, when given, send to `sqs` instead of AWS."""
+    patches: List[Any] = [
+        mock.patch.object(ingress, "_load_expected_token", return_value=WEBHOOK_TOKEN),
+    ]
+    if sqs is not None:
+        patches.append(mock.patch.object(ingress, "_sqs_client", return_value=sqs))
+    return patches
+
+
+def webhook_event(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """API Gateway event carrying `payload` with a valid webhook token."""
+    return {
+        "headers": {"X-Richpanel-Webhook-Token": WEBHOOK_TOKEN},
+        "body": json.dumps(payload),
+    }
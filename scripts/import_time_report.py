@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Import-time report and budget check for the worker Lambda's cold path.
+
+Each run imports the worker handler in a fresh interpreter with
+``python -X importtime`` and also times the import with perf_counter, which
+is the part of a Lambda cold start the code controls. Per-module cumulative
+times are the median over --runs so one noisy run does not fail the check.
+
+The budget (scripts/fixtures/import_time_budget.json) has two parts:
+
+* ``forbidden_modules``: modules the handler import must not load at all.
+  These are loaded lazily on first use (order lookup, reply rewriting,
+  delivery estimates, the Shopify/ShipStation clients, urllib.request and
+  its ssl/http.client chain), so a route-only event never pays for them.
+  This check is deterministic.
+* ``max_total_ms`` and ``max_module_ms``: wall-clock ceilings with headroom
+  for slow CI machines.
+
+    python scripts/import_time_report.py --output after.json
+    python scripts/import_time_report.py --baseline before.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+DEFAULT_BUDGET = ROOT / "scripts" / "fixtures" / "import_time_budget.json"
+DEFAULT_MODULE = "lambda_handlers.worker.handler"
+
+# The worker reads these at import time.
+WORKER_ENV = {
+    "IDEMPOTENCY_TABLE_NAME": "local-idempotency",
+    "SAFE_MODE_PARAM": "/rp-mw/local/safe_mode",
+    "AUTOMATION_ENABLED_PARAM": "/rp-mw/local/automation_enabled",
+    "CONVERSATION_STATE_TABLE_NAME": "local-conversation-state",
+    "AUDIT_TRAIL_TABLE_NAME": "local-audit-trail",
+}
+
+_PROBE = (
+    "import json, sys, time\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'import_ms': elapsed * 1000, 'modules': sorted(sys.modules)}}))\n"
+)
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Map module name to (self_us, cumulative_us) from ``-X importtime`` output."""
+    timings: Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # Header row.
+            continue
+        name = fields[2].strip()
+        # A package whose __init__ imports the submodule being loaded reports
+        # that submodule twice: add up self time, keep the outer cumulative.
+        previous_self, previous_cumulative = timings.get(name, (0, 0))
+        timings[name] = (previous_self + self_us, max(previous_cumulative, cumulative_us))
+    return timings
+
+
+def _run_once(module: str) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env.update(WORKER_ENV)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=str(ROOT),
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"importing {module} failed:\n{completed.stderr[-2000:]}"
+        )
+    probe = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {
+        "import_ms": probe["import_ms"],
+        "modules": probe["modules"],
+        "timings": parse_importtime(completed.stderr),
+    }
+
+
+def measure(module: str = DEFAULT_MODULE, runs: int = 7) -> Dict[str, Any]:
+    """Import ``module`` in ``runs`` fresh interpreters; report medians."""
+    # Untimed warm-up so bytecode is cached, as it is in the Lambda package.
+    _run_once(module)
+    samples = [_run_once(module) for _ in range(max(1, runs))]
+    names = set().union(*(sample["timings"] for sample in samples))
+    cumulative_ms: Dict[str, float] = {}
+    self_ms: Dict[str, float] = {}
+    for name in names:
+        present = [sample["timings"][name] for sample in samples if name in sample["timings"]]
+        self_ms[name] = round(statistics.median(t[0] for t in present) / 1000, 2)
+        cumulative_ms[name] = round(statistics.median(t[1] for t in present) / 1000, 2)
+    wall = [sample["import_ms"] for sample in samples]
+    return {
+        "module": module,
+        "runs": len(samples),
+        "python": sys.version.split()[0],
+        "import_ms": {
+            "median": round(statistics.median(wall), 2),
+            "min": round(min(wall), 2),
+            "max": round(max(wall), 2),
+        },
+        "total_ms": cumulative_ms.get(module, 0.0),
+        "modules_loaded": samples[-1]["modules"],
+        "cumulative_ms": cumulative_ms,
+        "self_ms": self_ms,
+    }
+
+
+def top_modules(report: Dict[str, Any], key: str = "cumulative_ms", limit: int = 15) -> List[Tuple[str, float]]:
+    items = sorted(report[key].items(), key=lambda item: item[1], reverse=True)
+    return items[:limit]
+
+
+def load_budget(path: Path = DEFAULT_BUDGET) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def check_budget(report: Dict[str, Any], budget: Dict[str, Any]) -> List[str]:
+    """Return one message per budget violation (empty when within budget)."""
+    violations: List[str] = []
+    loaded = set(report["modules_loaded"])
+    for name in budget.get("forbidden_modules", []):
+        if name in loaded:
+            violations.append(f"{name} is loaded at import time")
+    max_total = budget.get("max_total_ms")
+    if max_total is not None and report["total_ms"] > max_total:
+        violations.append(
+            f"{report['module']} takes {report['total_ms']}ms to import (budget {max_total}ms)"
+        )
+    for name, limit in sorted(budget.get("max_module_ms", {}).items()):
+        spent = report["cumulative_ms"].get(name)
+        if spent is not None and spent > limit:
+            violations.append(f"{name} takes {spent}ms to import (budget {limit}ms)")
+    return violations
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    def _delta(before: Optional[float], after: Optional[float]) -> Dict[str, Any]:
+        change = None
+        if before and after is not None:
+            change = round((after - before) / before * 100, 1)
+        return {"before": before, "after": after, "change_pct": change}
+
+    before_loaded = set(baseline.get("modules_loaded", []))
+    after_loaded = set(current.get("modules_loaded", []))
+    return {
+        "import_ms_median": _delta(
+            baseline["import_ms"]["median"], current["import_ms"]["median"]
+        ),
+        "total_ms": _delta(baseline.get("total_ms"), current.get("total_ms")),
+        "modules_loaded": _delta(len(before_loaded), len(after_loaded)),
+        "no_longer_loaded": sorted(
+            name for name in before_loaded - after_loaded if not name.startswith("_")
+        ),
+    }
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    wall = report["import_ms"]
+    print(
+        f"{report['module']}: median {wall['median']}ms "
+        f"(min {wall['min']}, max {wall['max']}) over {report['runs']} runs, "
+        f"{len(report['modules_loaded'])} modules loaded"
+    )
+    for name, spent in top_modules(report):
+        print(f"  {spent:8.2f}ms  {name}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--budget", type=Path, default=DEFAULT_BUDGET)
+    parser.add_argument("--no-budget", action="store_true", help="Report only.")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here.")
+    parser.add_argument("--baseline", type=Path, help="Earlier report to compare against.")
+    args = parser.parse_args(argv)
+
+    report = measure(args.module, runs=args.runs)
+    _print_summary(report)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        report["comparison"] = compare(baseline, report)
+        print(json.dumps(report["comparison"], indent=2))
+
+    violations: List[str] = []
+    if not args.no_budget:
+        violations = check_budget(report, load_budget(args.budget))
+        report["budget_violations"] = violations
+        for message in violations:
+            print(f"BUDGET: {message}", file=sys.stderr)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,19 +9,23 @@ Produces PII-safe JSON + markdown artifacts under artifacts/.
 from __future__ import annotations
 
 import argparse
+import contextlib
 import hashlib
 import json
 import logging
 import os
 import sys
+import threading
 import time
 import urllib.parse
 import urllib.request
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 try:
     import boto3  # type: ignore
@@ -63,6 +67,7 @@ from readonly_shadow_utils import (
     fetch_recent_ticket_refs as _fetch_recent_ticket_refs,
     safe_error as _safe_error,
     summarize_comment_metadata,
+    ShadowRunCheckpoint,
 )
 LOGGER = logging.getLogger("readonly_shadow_eval")
 logging.basicConfig(
@@ -195,6 +200,11 @@ REQUIRED_FLAGS = {
 
 ALLOWED_PROD_ENVS = {"prod", "production"}
 DEFAULT_SAMPLE_SIZE = 10
+DEFAULT_STARTUP_WAIT_SECONDS = 5.0
+DEFAULT_CONCURRENT_RATE_LIMIT_RPS = 1.0
+DEFAULT_SHOPIFY_CONCURRENCY = 2
+DEFAULT_OPENAI_CONCURRENCY = 2
+SHADOW_STAGES = ("ticket_fetch", "conversation_fetch", "order_lookup", "pipeline")
 DRIFT_WARNING_THRESHOLD = 0.2
 SUMMARY_TOP_FAILURE_REASONS = 5
 SCHEMA_KEY_DEPTH_LIMIT = 5
@@ -668,11 +678,26 @@ def _percentile(values: List[float], pct: float) -> float:
     return sorted_values[index]
 
 
+def _summarize_durations(values: List[float]) -> Dict[str, Any]:
+    return {
+        "count": len(values),
+        "avg_seconds": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_seconds": round(_percentile(values, 50), 3),
+        "p95_seconds": round(_percentile(values, 95), 3),
+        "p99_seconds": round(_percentile(values, 99), 3),
+        "max_seconds": round(max(values), 3) if values else 0.0,
+    }
+
+
 def _summarize_timing(
-    ticket_durations: List[float], *, run_duration_seconds: float
+    ticket_durations: List[float],
+    *,
+    run_duration_seconds: float,
+    stage_durations: Optional[Dict[str, List[float]]] = None,
+    concurrency: int = 1,
 ) -> Dict[str, Any]:
     if not ticket_durations:
-        return {
+        summary: Dict[str, Any] = {
             "run_duration_seconds": round(run_duration_seconds, 3),
             "ticket_avg_seconds": 0.0,
             "ticket_p50_seconds": 0.0,
@@ -680,15 +705,23 @@ def _summarize_timing(
             "ticket_min_seconds": 0.0,
             "ticket_max_seconds": 0.0,
         }
-    avg = sum(ticket_durations) / len(ticket_durations)
-    return {
-        "run_duration_seconds": round(run_duration_seconds, 3),
-        "ticket_avg_seconds": round(avg, 3),
-        "ticket_p50_seconds": round(_percentile(ticket_durations, 50), 3),
-        "ticket_p95_seconds": round(_percentile(ticket_durations, 95), 3),
-        "ticket_min_seconds": round(min(ticket_durations), 3),
-        "ticket_max_seconds": round(max(ticket_durations), 3),
-    }
+    else:
+        avg = sum(ticket_durations) / len(ticket_durations)
+        summary = {
+            "run_duration_seconds": round(run_duration_seconds, 3),
+            "ticket_avg_seconds": round(avg, 3),
+            "ticket_p50_seconds": round(_percentile(ticket_durations, 50), 3),
+            "ticket_p95_seconds": round(_percentile(ticket_durations, 95), 3),
+            "ticket_min_seconds": round(min(ticket_durations), 3),
+            "ticket_max_seconds": round(max(ticket_durations), 3),
+        }
+    if stage_durations is not None:
+        summary["concurrency"] = concurrency
+        summary["stages"] = {
+            stage: _summarize_durations(stage_durations.get(stage, []))
+            for stage in SHADOW_STAGES
+        }
+    return summary
 
 
 def _is_timeout_error(exc: Exception) -> bool:
@@ -2214,6 +2247,438 @@ def _build_markdown_report(
     return md_lines
 
 
+@dataclass
+class _TicketEvalOptions:
+    shopify_client: Any
+    allow_ticket_fetch_failures: bool = False
+    skip_conversations: bool = False
+    trace_enabled: bool = False
+    shopify_gate: Optional[threading.BoundedSemaphore] = None
+    openai_gate: Optional[threading.BoundedSemaphore] = None
+
+
+@dataclass
+class _TicketOutcome:
+    result: Dict[str, Any]
+    elapsed: float = 0.0
+    had_error: bool = False
+    warnings: List[str] = field(default_factory=list)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    ticket_schema_keys: Counter[str] = field(default_factory=Counter)
+    ticket_schema_ignored: Counter[str] = field(default_factory=Counter)
+    shopify_schema_keys: Counter[str] = field(default_factory=Counter)
+    shopify_schema_ignored: Counter[str] = field(default_factory=Counter)
+    shopify_schema_recorded: bool = False
+    trace_entries: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@contextlib.contextmanager
+def _timed_stage(
+    outcome: _TicketOutcome,
+    stage: str,
+    gate: Optional[threading.BoundedSemaphore] = None,
+) -> Iterator[None]:
+    """Time one per-ticket stage; queueing on a concurrency gate is not counted."""
+    if gate is not None:
+        gate.acquire()
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        outcome.stage_seconds[stage] = outcome.stage_seconds.get(stage, 0.0) + (
+            time.monotonic() - started
+        )
+        if gate is not None:
+            gate.release()
+
+
+def _evaluate_ticket(
+    ticket_ref: str, rp_client: Any, options: _TicketEvalOptions
+) -> _TicketOutcome:
+    """
+    Evaluate one ticket and return its PII-safe result.
+
+    Aggregate state (schema drift counters, run warnings, durations) is returned
+    on the outcome rather than mutated here so callers can merge outcomes in
+    ticket order regardless of which worker produced them.
+    """
+    ticket_started = time.monotonic()
+    redacted = _redact_identifier(ticket_ref) or "redacted"
+    result: Dict[str, Any] = {"ticket_id_redacted": redacted}
+    outcome = _TicketOutcome(result=result)
+    shopify_lookup_ok = True
+    if options.trace_enabled:
+        rp_client.clear_request_trace()
+    try:
+        try:
+            with _timed_stage(outcome, "ticket_fetch"):
+                ticket_payload = _fetch_ticket(rp_client, ticket_ref)
+        except Exception as exc:
+            if not options.allow_ticket_fetch_failures:
+                raise
+            outcome.had_error = True
+            result["failure_reason"] = "richpanel_ticket_fetch_failed"
+            result["failure_source"] = "richpanel_ticket_fetch"
+            result["error"] = _safe_error(exc)
+            LOGGER.warning(
+                "Ticket fetch failed; continuing",
+                extra={"ticket_id_redacted": redacted},
+            )
+            return outcome
+
+        ticket_id = str(ticket_payload.get("id") or ticket_ref).strip()
+        if options.skip_conversations:
+            convo_payload = {}
+        else:
+            with _timed_stage(outcome, "conversation_fetch"):
+                convo_payload = _fetch_conversation(
+                    rp_client,
+                    ticket_id,
+                    conversation_id=ticket_payload.get("conversation_id"),
+                    conversation_no=ticket_payload.get("conversation_no"),
+                )
+        channel_value = _extract_channel(ticket_payload) or _extract_channel(
+            convo_payload
+        )
+        result["channel"] = _classify_channel(channel_value)
+
+        ticket_schema = _schema_fingerprint(
+            ticket_payload,
+            key_counter=outcome.ticket_schema_keys,
+            ignored_counter=outcome.ticket_schema_ignored,
+        )
+        if ticket_schema:
+            result["ticket_schema_fingerprint"] = ticket_schema
+
+        order_payload = _extract_order_payload(ticket_payload, convo_payload)
+        probe_summary: Dict[str, Any] = {}
+        try:
+            with _timed_stage(outcome, "order_lookup", options.shopify_gate):
+                probe_summary = lookup_order_summary(
+                    build_event_envelope(order_payload),
+                    safe_mode=False,
+                    automation_enabled=True,
+                    allow_network=True,
+                    shopify_client=options.shopify_client,
+                )
+        except (ShopifyRequestError, ShopifyTransportError) as exc:
+            shopify_lookup_ok = False
+            outcome.had_error = True
+            result["failure_reason"] = _classify_shopify_exception(exc)
+            result["failure_source"] = "shopify_fetch"
+            result["error"] = _safe_error(exc)
+
+        if isinstance(probe_summary, dict):
+            result["order_resolution"] = probe_summary.get("order_resolution")
+            if shopify_lookup_ok:
+                # Store tracking/shipping data from Shopify lookup (redacted for PII)
+                tracking_num = probe_summary.get("tracking_number")
+                result["shopify_tracking_number"] = bool(tracking_num)
+                result["shopify_tracking_redacted"] = _redact_tracking_number(
+                    tracking_num
+                )
+                result["shopify_carrier"] = probe_summary.get("carrier") or None
+                result["shopify_order_created_at"] = bool(
+                    probe_summary.get("created_at")
+                    or probe_summary.get("order_created_at")
+                )
+                result["shopify_shipping_method"] = (
+                    probe_summary.get("shipping_method")
+                    or probe_summary.get("shipping_method_name")
+                )
+                # Compute ETA from order date + shipping method + ticket date
+                ticket_created = ticket_payload.get("created_at")
+                eta_result = _compute_eta_for_ticket(probe_summary, ticket_created)
+                if eta_result:
+                    result["computed_eta"] = eta_result
+
+                shopify_schema = _schema_fingerprint(
+                    probe_summary,
+                    key_counter=outcome.shopify_schema_keys,
+                    ignored_counter=outcome.shopify_schema_ignored,
+                )
+                result["shopify_schema_fingerprint"] = shopify_schema
+                outcome.shopify_schema_recorded = True
+
+        raw_customer_message = _extract_latest_customer_message(
+            ticket_payload, convo_payload
+        )
+        customer_message = raw_customer_message or "(not provided)"
+        comment_metadata = summarize_comment_metadata(ticket_payload)
+        result.update(comment_metadata)
+        result["customer_message_present"] = bool(raw_customer_message)
+        event_payload = dict(order_payload)
+        event_payload.update(
+            {
+                "ticket_id": ticket_ref,
+                "conversation_id": ticket_payload.get("conversation_id") or ticket_id,
+                "customer_message": customer_message,
+            }
+        )
+
+        envelope = normalize_event({"payload": event_payload})
+        with _timed_stage(outcome, "pipeline", options.openai_gate):
+            plan = plan_actions(
+                envelope,
+                safe_mode=False,
+                automation_enabled=True,
+                allow_network=True,
+                outbound_enabled=False,
+            )
+
+        result["routing"] = _build_route_info(
+            getattr(plan, "routing", None),
+            getattr(plan, "routing_artifact", None),
+        )
+        result["would_reply_send"] = any(
+            isinstance(action, dict) and action.get("type") in SEND_ACTION_TYPES
+            for action in plan.actions
+        )
+
+        order_action = next(
+            (
+                a
+                for a in plan.actions
+                if isinstance(a, dict) and a.get("type") == "order_status_draft_reply"
+            ),
+            None,
+        )
+        parameters = (
+            order_action.get("parameters", {}) if isinstance(order_action, dict) else {}
+        )
+        order_summary = (
+            parameters.get("order_summary") if isinstance(parameters, dict) else {}
+        )
+        # Merge probe_summary into order_summary if we have it
+        # Use isinstance check for consistency with other defensive checks
+        effective_summary = (
+            dict(probe_summary) if isinstance(probe_summary, dict) else {}
+        )
+        if order_summary:
+            effective_summary.update(order_summary)
+
+        result.update(
+            _order_context_summary(
+                order_payload,
+                effective_summary,
+                conversation_id=str(ticket_payload.get("conversation_id") or ticket_id),
+            )
+        )
+        delivery_estimate = (
+            parameters.get("delivery_estimate") if isinstance(parameters, dict) else None
+        )
+        if order_action is not None:
+            result["preorder_proof"] = _extract_preorder_proof_signals(
+                parameters if isinstance(parameters, dict) else {}
+            )
+
+        # Use probe_summary (Shopify data) for tracking detection
+        tracking_found = _tracking_present(effective_summary)
+        # ETA is available if we have delivery_estimate OR order_created_at
+        has_order_date = bool(
+            effective_summary.get("created_at")
+            or effective_summary.get("order_created_at")
+            or order_payload.get("created_at")
+            or order_payload.get("order_created_at")
+        )
+        # Check both shipping_method and shipping_method_name for consistency
+        # with _compute_eta_for_ticket which uses either field
+        has_shipping_method = bool(
+            effective_summary.get("shipping_method")
+            or effective_summary.get("shipping_method_name")
+        )
+        eta_available = _delivery_estimate_present(delivery_estimate) or (
+            has_order_date and has_shipping_method
+        )
+
+        # order_matched should be true if we resolved an order (not just draft reply)
+        # Safely handle order_resolution being None (not just absent)
+        order_resolution = (
+            probe_summary.get("order_resolution")
+            if isinstance(probe_summary, dict)
+            else None
+        )
+        order_resolved = (
+            isinstance(order_resolution, dict)
+            and order_resolution.get("resolvedBy") not in (None, "no_match")
+            and _extract_shopify_diagnostics_category(order_resolution)
+            not in {"auth_fail", "rate_limited", "http_error"}
+        )
+
+        result.update(
+            {
+                "order_status_candidate": bool(order_action),
+                "order_matched": bool(order_summary) or order_resolved,
+                "tracking_found": tracking_found,
+                "eta_available": eta_available,
+            }
+        )
+        if "failure_reason" not in result:
+            match_failure = _classify_order_match_failure(result)
+            if match_failure:
+                result["failure_reason"] = match_failure
+                result["failure_source"] = "order_match"
+    except SystemExit as exc:
+        if options.allow_ticket_fetch_failures and "Ticket lookup failed" in str(exc):
+            result["failure_reason"] = "ticket_fetch_failed"
+            result["failure_source"] = "richpanel_fetch"
+            result["error"] = {"type": "richpanel_error"}
+            outcome.warnings.append("ticket_fetch_failed")
+        else:
+            raise
+    except (RichpanelRequestError, SecretLoadError, TransportError) as exc:
+        outcome.had_error = True
+        result["failure_reason"] = _classify_richpanel_exception(exc)
+        result["failure_source"] = "richpanel_fetch"
+        result["error"] = _safe_error(exc)
+    except Exception as exc:
+        outcome.had_error = True
+        result["failure_reason"] = "unexpected_error"
+        result["failure_source"] = "unknown"
+        result["error"] = _safe_error(exc)
+    finally:
+        outcome.elapsed = time.monotonic() - ticket_started
+        result["elapsed_seconds"] = round(outcome.elapsed, 3)
+        if options.trace_enabled:
+            ticket_trace = rp_client.get_request_trace()
+            outcome.trace_entries = list(ticket_trace)
+            result["richpanel_request_count"] = len(ticket_trace)
+            endpoint_counts: Counter[str] = Counter()
+            for entry in ticket_trace:
+                path = entry.get("path")
+                if path:
+                    endpoint_counts[path] += 1
+            result["richpanel_request_counts_by_endpoint"] = dict(endpoint_counts)
+    return outcome
+
+
+def _iter_ticket_outcomes(
+    ticket_refs: List[str],
+    *,
+    options: _TicketEvalOptions,
+    rp_client: Any,
+    client_factory: Callable[[], Any],
+    concurrency: int,
+) -> Iterator[_TicketOutcome]:
+    """
+    Yield ticket outcomes in `ticket_refs` order.
+
+    With concurrency > 1 tickets run on a thread pool. Richpanel calls from every
+    worker share the process-wide TokenBucketRateLimiter; each worker gets its own
+    client so per-ticket request traces do not interleave. Results are still
+    yielded in input order so reports match a serial run.
+    """
+    if concurrency <= 1 or len(ticket_refs) <= 1:
+        for ticket_ref in ticket_refs:
+            yield _evaluate_ticket(ticket_ref, rp_client, options)
+        return
+
+    local = threading.local()
+
+    def _run(ticket_ref: str) -> _TicketOutcome:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = client_factory()
+            local.client = client
+        return _evaluate_ticket(ticket_ref, client, options)
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(concurrency, len(ticket_refs)),
+        thread_name_prefix="shadow-eval",
+    )
+    try:
+        futures = [executor.submit(_run, ticket_ref) for ticket_ref in ticket_refs]
+        for future in futures:
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+@dataclass
+class _ShadowAggregate:
+    """Run-level rollups rebuilt from ticket outcomes in ticket order."""
+
+    ticket_results: List[Dict[str, Any]] = field(default_factory=list)
+    ticket_durations: List[float] = field(default_factory=list)
+    stage_durations: Dict[str, List[float]] = field(default_factory=dict)
+    trace_entries: List[Dict[str, Any]] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    had_errors: bool = False
+    ticket_schema_seen: set[str] = field(default_factory=set)
+    shopify_schema_seen: set[str] = field(default_factory=set)
+    ticket_schema_total: int = 0
+    ticket_schema_new: int = 0
+    shopify_schema_total: int = 0
+    shopify_schema_new: int = 0
+    ticket_schema_key_counts: Counter[str] = field(default_factory=Counter)
+    ticket_schema_ignored_counts: Counter[str] = field(default_factory=Counter)
+    shopify_schema_key_counts: Counter[str] = field(default_factory=Counter)
+    shopify_schema_ignored_counts: Counter[str] = field(default_factory=Counter)
+
+    def add(self, outcome: _TicketOutcome) -> None:
+        result = outcome.result
+        ticket_schema = result.get("ticket_schema_fingerprint")
+        if ticket_schema:
+            self.ticket_schema_total += 1
+            if ticket_schema not in self.ticket_schema_seen:
+                self.ticket_schema_seen.add(ticket_schema)
+                self.ticket_schema_new += 1
+        if outcome.shopify_schema_recorded:
+            shopify_schema = str(result.get("shopify_schema_fingerprint") or "")
+            self.shopify_schema_total += 1
+            if shopify_schema not in self.shopify_schema_seen:
+                self.shopify_schema_seen.add(shopify_schema)
+                self.shopify_schema_new += 1
+        self.ticket_schema_key_counts.update(outcome.ticket_schema_keys)
+        self.ticket_schema_ignored_counts.update(outcome.ticket_schema_ignored)
+        self.shopify_schema_key_counts.update(outcome.shopify_schema_keys)
+        self.shopify_schema_ignored_counts.update(outcome.shopify_schema_ignored)
+        if outcome.had_error:
+            self.had_errors = True
+        self.warnings.extend(outcome.warnings)
+        self.ticket_durations.append(outcome.elapsed)
+        for stage, seconds in outcome.stage_seconds.items():
+            self.stage_durations.setdefault(stage, []).append(seconds)
+        self.ticket_results.append(result)
+        self.trace_entries.extend(outcome.trace_entries)
+
+
+def _outcome_to_record(outcome: _TicketOutcome) -> Dict[str, Any]:
+    return {
+        "result": outcome.result,
+        "elapsed": outcome.elapsed,
+        "had_error": outcome.had_error,
+        "warnings": list(outcome.warnings),
+        "stage_seconds": dict(outcome.stage_seconds),
+        "ticket_schema_keys": dict(outcome.ticket_schema_keys),
+        "ticket_schema_ignored": dict(outcome.ticket_schema_ignored),
+        "shopify_schema_keys": dict(outcome.shopify_schema_keys),
+        "shopify_schema_ignored": dict(outcome.shopify_schema_ignored),
+        "shopify_schema_recorded": outcome.shopify_schema_recorded,
+        "trace_entries": list(outcome.trace_entries),
+    }
+
+
+def _outcome_from_record(record: Dict[str, Any]) -> _TicketOutcome:
+    return _TicketOutcome(
+        result=dict(record.get("result") or {}),
+        elapsed=float(record.get("elapsed") or 0.0),
+        had_error=bool(record.get("had_error")),
+        warnings=list(record.get("warnings") or []),
+        stage_seconds=dict(record.get("stage_seconds") or {}),
+        ticket_schema_keys=Counter(record.get("ticket_schema_keys") or {}),
+        ticket_schema_ignored=Counter(record.get("ticket_schema_ignored") or {}),
+        shopify_schema_keys=Counter(record.get("shopify_schema_keys") or {}),
+        shopify_schema_ignored=Counter(record.get("shopify_schema_ignored") or {}),
+        shopify_schema_recorded=bool(record.get("shopify_schema_recorded")),
+        trace_entries=list(record.get("trace_entries") or []),
+    )
+
+
+def _checkpoint_path(report_path: Path, run_id: str) -> Path:
+    return report_path.parent / f"live_readonly_shadow_eval_checkpoint_{run_id}.jsonl"
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Run live read-only shadow evaluation.")
     parser.add_argument(
@@ -2300,6 +2765,14 @@ def main() -> int:
         "--run-id",
         help="Optional run id override for artifact filenames",
     )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help=(
+            "Resume an interrupted run from its checkpoint; tickets already "
+            "evaluated are not fetched again"
+        ),
+    )
     parser.add_argument(
         "--out",
         help="Write JSON report to this path (file or directory).",
@@ -2346,9 +2819,52 @@ def main() -> int:
             "Reduces requests from 3/ticket to 1/ticket."
         ),
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help=(
+            "Evaluate up to N tickets in parallel (default: 1 = serial). Richpanel "
+            "calls share the process-wide token bucket; RICHPANEL_RATE_LIMIT_RPS "
+            f"defaults to {DEFAULT_CONCURRENT_RATE_LIMIT_RPS} when N > 1."
+        ),
+    )
+    parser.add_argument(
+        "--shopify-concurrency",
+        type=int,
+        default=DEFAULT_SHOPIFY_CONCURRENCY,
+        help="Max concurrent order lookups when --concurrency > 1.",
+    )
+    parser.add_argument(
+        "--openai-concurrency",
+        type=int,
+        default=DEFAULT_OPENAI_CONCURRENCY,
+        help="Max concurrent pipeline (OpenAI) calls when --concurrency > 1.",
+    )
+    parser.add_argument(
+        "--startup-wait-seconds",
+        type=float,
+        default=None,
+        help=(
+            "Pause before the first Richpanel call to let quota recover "
+            "(default: 5s serial, 0s with --concurrency > 1 since the rate "
+            "limiter paces requests)."
+        ),
+    )
     parser.set_defaults(preflight_secrets=True)
     args = parser.parse_args()
 
+    concurrency = max(1, int(args.concurrency or 1))
+    startup_wait_seconds = (
+        float(args.startup_wait_seconds)
+        if args.startup_wait_seconds is not None
+        else (DEFAULT_STARTUP_WAIT_SECONDS if concurrency == 1 else 0.0)
+    )
+    if concurrency > 1:
+        os.environ.setdefault(
+            "RICHPANEL_RATE_LIMIT_RPS", str(DEFAULT_CONCURRENT_RATE_LIMIT_RPS)
+        )
+
     if args.openai_shadow_eval:
         _apply_openai_shadow_eval_defaults()
 
@@ -2445,7 +2961,9 @@ def main() -> int:
         args.stack_name or os.environ.get("MW_STACK_NAME")
     )
 
-    run_id = args.run_id or _build_run_id()
+    if args.resume and args.run_id and args.run_id != args.resume:
+        raise SystemExit("--run-id and --resume must match when both are set")
+    run_id = args.resume or args.run_id or _build_run_id()
     report_path, summary_path, report_md_path, trace_path = _resolve_output_paths(
         run_id,
         out_path=args.out,
@@ -2455,34 +2973,27 @@ def main() -> int:
     started_at = datetime.now(timezone.utc)
     run_started = time.monotonic()
     run_warnings: List[str] = []
-    ticket_durations: List[float] = []
-    ticket_schema_seen: set[str] = set()
-    shopify_schema_seen: set[str] = set()
-    ticket_schema_total = 0
-    ticket_schema_new = 0
-    shopify_schema_total = 0
-    shopify_schema_new = 0
-    ticket_schema_key_counts: Counter[str] = Counter()
-    ticket_schema_ignored_counts: Counter[str] = Counter()
-    shopify_schema_key_counts: Counter[str] = Counter()
-    shopify_schema_ignored_counts: Counter[str] = Counter()
+    aggregate = _ShadowAggregate()
+    checkpoint = ShadowRunCheckpoint(_checkpoint_path(report_path, run_id))
+    if args.resume:
+        if not checkpoint.exists:
+            raise SystemExit(f"No checkpoint found for run {run_id}")
+        checkpoint.load()
 
     trace = _HttpTrace().capture()
-    had_errors = False
-    ticket_results: List[Dict[str, Any]] = []
     ticket_refs: List[str] = []
     sample_mode = "explicit"
     tickets_requested = 0
     shopify_probe: Dict[str, Any] = {"enabled": bool(args.shopify_probe)}
-    trace_entries: List[Dict[str, Any]] = []
     trace_enabled = _env_truthy(os.environ.get("RICHPANEL_TRACE_ENABLED"))
     try:
         rp_client = _build_richpanel_client(
             richpanel_secret=args.richpanel_secret_id,
             base_url=richpanel_base_url,
         )
-        LOGGER.info("Waiting for rate limit quota to clear...")
-        time.sleep(5)
+        if startup_wait_seconds > 0:
+            LOGGER.info("Waiting for rate limit quota to clear...")
+            time.sleep(startup_wait_seconds)
 
         if args.shopify_probe:
             try:
@@ -2507,315 +3018,102 @@ def main() -> int:
                     extra={"error_type": shopify_probe["error"]["type"]},
                 )
 
-        explicit_refs = [str(value).strip() for value in (args.ticket_id or [])]
-        explicit_refs = [value for value in dict.fromkeys(explicit_refs) if value]
-        if explicit_refs:
-            ticket_refs = explicit_refs
-            tickets_requested = len(explicit_refs)
-            sample_mode = "explicit"
+        if args.resume:
+            metadata = checkpoint.metadata
+            ticket_refs = list(checkpoint.ticket_refs)
+            tickets_requested = int(metadata.get("tickets_requested") or len(ticket_refs))
+            sample_mode = str(metadata.get("sample_mode") or sample_mode)
+            run_warnings.extend(metadata.get("listing_warnings") or [])
         else:
-            try:
-                ticket_refs = _fetch_recent_ticket_refs(
-                    rp_client,
-                    sample_size=sample_size,
-                    list_path=args.ticket_list_path,
-                )
-            except SystemExit as exc:
-                if args.allow_empty_sample:
-                    reason = (
-                        "ticket_listing_403"
-                        if "status 403" in str(exc)
-                        else "ticket_listing_failed"
-                    )
-                    run_warnings.append(reason)
-                    LOGGER.warning("Ticket listing failed; continuing with empty sample")
-                    ticket_refs = []
-                else:
-                    raise
-            tickets_requested = sample_size
-            sample_mode = "recent"
-
-        if not ticket_refs:
-            if args.allow_empty_sample and sample_mode == "recent":
-                LOGGER.warning("No tickets available for evaluation; continuing")
+            explicit_refs = [str(value).strip() for value in (args.ticket_id or [])]
+            explicit_refs = [value for value in dict.fromkeys(explicit_refs) if value]
+            if explicit_refs:
+                ticket_refs = explicit_refs
+                tickets_requested = len(explicit_refs)
+                sample_mode = "explicit"
             else:
-                raise SystemExit("No tickets available for evaluation")
-        if len(ticket_refs) < tickets_requested:
-            LOGGER.warning(
-                "Sample size reduced: requested %d got %d",
-                tickets_requested,
-                len(ticket_refs),
-            )
-
-        for ticket_ref in ticket_refs:
-            ticket_started = time.monotonic()
-            redacted = _redact_identifier(ticket_ref) or "redacted"
-            result: Dict[str, Any] = {"ticket_id_redacted": redacted}
-            shopify_lookup_ok = True
-            if trace_enabled:
-                rp_client.clear_request_trace()
-            try:
                 try:
-                    ticket_payload = _fetch_ticket(rp_client, ticket_ref)
-                except Exception as exc:
-                    if not args.allow_ticket_fetch_failures:
-                        raise
-                    had_errors = True
-                    result["failure_reason"] = "richpanel_ticket_fetch_failed"
-                    result["failure_source"] = "richpanel_ticket_fetch"
-                    result["error"] = _safe_error(exc)
-                    LOGGER.warning(
-                        "Ticket fetch failed; continuing",
-                        extra={"ticket_id_redacted": redacted},
-                    )
-                    continue
-
-                ticket_id = str(ticket_payload.get("id") or ticket_ref).strip()
-                if args.skip_conversations:
-                    convo_payload = {}
-                else:
-                    convo_payload = _fetch_conversation(
+                    ticket_refs = _fetch_recent_ticket_refs(
                         rp_client,
-                        ticket_id,
-                        conversation_id=ticket_payload.get("conversation_id"),
-                        conversation_no=ticket_payload.get("conversation_no"),
+                        sample_size=sample_size,
+                        list_path=args.ticket_list_path,
                     )
-                channel_value = _extract_channel(ticket_payload) or _extract_channel(
-                    convo_payload
-                )
-                result["channel"] = _classify_channel(channel_value)
-
-                ticket_schema = _schema_fingerprint(
-                    ticket_payload,
-                    key_counter=ticket_schema_key_counts,
-                    ignored_counter=ticket_schema_ignored_counts,
-                )
-                if ticket_schema:
-                    result["ticket_schema_fingerprint"] = ticket_schema
-                    ticket_schema_total += 1
-                    if ticket_schema not in ticket_schema_seen:
-                        ticket_schema_seen.add(ticket_schema)
-                        ticket_schema_new += 1
-
-                order_payload = _extract_order_payload(ticket_payload, convo_payload)
-                probe_summary: Dict[str, Any] = {}
-                try:
-                    probe_summary = lookup_order_summary(
-                        build_event_envelope(order_payload),
-                        safe_mode=False,
-                        automation_enabled=True,
-                        allow_network=True,
-                        shopify_client=shopify_client,
-                    )
-                except (ShopifyRequestError, ShopifyTransportError) as exc:
-                    shopify_lookup_ok = False
-                    had_errors = True
-                    result["failure_reason"] = _classify_shopify_exception(exc)
-                    result["failure_source"] = "shopify_fetch"
-                    result["error"] = _safe_error(exc)
-
-                if isinstance(probe_summary, dict):
-                    result["order_resolution"] = probe_summary.get("order_resolution")
-                    if shopify_lookup_ok:
-                        # Store tracking/shipping data from Shopify lookup (redacted for PII)
-                        tracking_num = probe_summary.get("tracking_number")
-                        result["shopify_tracking_number"] = bool(tracking_num)
-                        result["shopify_tracking_redacted"] = _redact_tracking_number(
-                            tracking_num
-                        )
-                        result["shopify_carrier"] = probe_summary.get("carrier") or None
-                        result["shopify_order_created_at"] = bool(
-                            probe_summary.get("created_at")
-                            or probe_summary.get("order_created_at")
+                except SystemExit as exc:
+                    if args.allow_empty_sample:
+                        reason = (
+                            "ticket_listing_403"
+                            if "status 403" in str(exc)
+                            else "ticket_listing_failed"
                         )
-                        result["shopify_shipping_method"] = (
-                            probe_summary.get("shipping_method")
-                            or probe_summary.get("shipping_method_name")
-                        )
-                        # Compute ETA from order date + shipping method + ticket date
-                        ticket_created = ticket_payload.get("created_at")
-                        eta_result = _compute_eta_for_ticket(
-                            probe_summary, ticket_created
-                        )
-                        if eta_result:
-                            result["computed_eta"] = eta_result
-
-                        shopify_schema = _schema_fingerprint(
-                            probe_summary,
-                            key_counter=shopify_schema_key_counts,
-                            ignored_counter=shopify_schema_ignored_counts,
-                        )
-                        result["shopify_schema_fingerprint"] = shopify_schema
-                        shopify_schema_total += 1
-                        if shopify_schema not in shopify_schema_seen:
-                            shopify_schema_seen.add(shopify_schema)
-                            shopify_schema_new += 1
-
-                raw_customer_message = _extract_latest_customer_message(
-                    ticket_payload, convo_payload
-                )
-                customer_message = raw_customer_message or "(not provided)"
-                comment_metadata = summarize_comment_metadata(ticket_payload)
-                result.update(comment_metadata)
-                result["customer_message_present"] = bool(raw_customer_message)
-                event_payload = dict(order_payload)
-                event_payload.update(
-                    {
-                        "ticket_id": ticket_ref,
-                        "conversation_id": ticket_payload.get("conversation_id")
-                        or ticket_id,
-                        "customer_message": customer_message,
-                    }
-                )
-
-                envelope = normalize_event({"payload": event_payload})
-                plan = plan_actions(
-                    envelope,
-                    safe_mode=False,
-                    automation_enabled=True,
-                    allow_network=True,
-                    outbound_enabled=False,
-                )
-
-                result["routing"] = _build_route_info(
-                    getattr(plan, "routing", None),
-                    getattr(plan, "routing_artifact", None),
-                )
-                result["would_reply_send"] = any(
-                    isinstance(action, dict)
-                    and action.get("type") in SEND_ACTION_TYPES
-                    for action in plan.actions
-                )
-
-                order_action = next(
-                    (
-                        a
-                        for a in plan.actions
-                        if isinstance(a, dict)
-                        and a.get("type") == "order_status_draft_reply"
-                    ),
-                    None,
-                )
-                parameters = (
-                    order_action.get("parameters", {})
-                    if isinstance(order_action, dict)
-                    else {}
-                )
-                order_summary = (
-                    parameters.get("order_summary")
-                    if isinstance(parameters, dict)
-                    else {}
-                )
-                # Merge probe_summary into order_summary if we have it
-                # Use isinstance check for consistency with other defensive checks
-                effective_summary = (
-                    dict(probe_summary) if isinstance(probe_summary, dict) else {}
-                )
-                if order_summary:
-                    effective_summary.update(order_summary)
-
-                result.update(
-                    _order_context_summary(
-                        order_payload,
-                        effective_summary,
-                        conversation_id=str(
-                            ticket_payload.get("conversation_id") or ticket_id
-                        ),
-                    )
-                )
-                delivery_estimate = (
-                    parameters.get("delivery_estimate")
-                    if isinstance(parameters, dict)
-                    else None
-                )
-                if order_action is not None:
-                    result["preorder_proof"] = _extract_preorder_proof_signals(
-                        parameters if isinstance(parameters, dict) else {}
-                    )
+                        run_warnings.append(reason)
+                        LOGGER.warning("Ticket listing failed; continuing with empty sample")
+                        ticket_refs = []
+                    else:
+                        raise
+                tickets_requested = sample_size
+                sample_mode = "recent"
 
-                # Use probe_summary (Shopify data) for tracking detection
-                tracking_found = _tracking_present(effective_summary)
-                # ETA is available if we have delivery_estimate OR order_created_at
-                has_order_date = bool(
-                    effective_summary.get("created_at")
-                    or effective_summary.get("order_created_at")
-                    or order_payload.get("created_at")
-                    or order_payload.get("order_created_at")
-                )
-                # Check both shipping_method and shipping_method_name for consistency
-                # with _compute_eta_for_ticket which uses either field
-                has_shipping_method = bool(
-                    effective_summary.get("shipping_method")
-                    or effective_summary.get("shipping_method_name")
-                )
-                eta_available = _delivery_estimate_present(delivery_estimate) or (
-                    has_order_date and has_shipping_method
+            if not ticket_refs:
+                if args.allow_empty_sample and sample_mode == "recent":
+                    LOGGER.warning("No tickets available for evaluation; continuing")
+                else:
+                    raise SystemExit("No tickets available for evaluation")
+            if len(ticket_refs) < tickets_requested:
+                LOGGER.warning(
+                    "Sample size reduced: requested %d got %d",
+                    tickets_requested,
+                    len(ticket_refs),
                 )
+            checkpoint.start(
+                run_id=run_id,
+                ticket_refs=ticket_refs,
+                metadata={
+                    "tickets_requested": tickets_requested,
+                    "sample_mode": sample_mode,
+                    "listing_warnings": list(run_warnings),
+                },
+            )
 
-                # order_matched should be true if we resolved an order (not just draft reply)
-                # Safely handle order_resolution being None (not just absent)
-                order_resolution = (
-                    probe_summary.get("order_resolution")
-                    if isinstance(probe_summary, dict)
-                    else None
-                )
-                order_resolved = (
-                    isinstance(order_resolution, dict)
-                    and order_resolution.get("resolvedBy") not in (None, "no_match")
-                    and _extract_shopify_diagnostics_category(order_resolution)
-                    not in {"auth_fail", "rate_limited", "http_error"}
-                )
+        options = _TicketEvalOptions(
+            shopify_client=shopify_client,
+            allow_ticket_fetch_failures=args.allow_ticket_fetch_failures,
+            skip_conversations=args.skip_conversations,
+            trace_enabled=trace_enabled,
+            shopify_gate=(
+                threading.BoundedSemaphore(max(1, args.shopify_concurrency))
+                if concurrency > 1
+                else None
+            ),
+            openai_gate=(
+                threading.BoundedSemaphore(max(1, args.openai_concurrency))
+                if concurrency > 1
+                else None
+            ),
+        )
+        pending_refs = checkpoint.pending(ticket_refs)
+        if len(pending_refs) < len(ticket_refs):
+            LOGGER.info(
+                "Resuming run %s: %d of %d tickets already checkpointed",
+                run_id,
+                len(ticket_refs) - len(pending_refs),
+                len(ticket_refs),
+            )
+        outcomes = _iter_ticket_outcomes(
+            pending_refs,
+            options=options,
+            rp_client=rp_client,
+            client_factory=lambda: _build_richpanel_client(
+                richpanel_secret=args.richpanel_secret_id,
+                base_url=richpanel_base_url,
+            ),
+            concurrency=concurrency,
+        )
+        for ticket_ref, outcome in zip(pending_refs, outcomes):
+            checkpoint.append(ticket_ref, _outcome_to_record(outcome))
 
-                result.update(
-                    {
-                        "order_status_candidate": bool(order_action),
-                        "order_matched": bool(order_summary) or order_resolved,
-                        "tracking_found": tracking_found,
-                        "eta_available": eta_available,
-                    }
-                )
-                if "failure_reason" not in result:
-                    match_failure = _classify_order_match_failure(result)
-                    if match_failure:
-                        result["failure_reason"] = match_failure
-                        result["failure_source"] = "order_match"
-            except SystemExit as exc:
-                if args.allow_ticket_fetch_failures and "Ticket lookup failed" in str(
-                    exc
-                ):
-                    result["failure_reason"] = "ticket_fetch_failed"
-                    result["failure_source"] = "richpanel_fetch"
-                    result["error"] = {"type": "richpanel_error"}
-                    run_warnings.append("ticket_fetch_failed")
-                else:
-                    raise
-            except (RichpanelRequestError, SecretLoadError, TransportError) as exc:
-                had_errors = True
-                result["failure_reason"] = _classify_richpanel_exception(exc)
-                result["failure_source"] = "richpanel_fetch"
-                result["error"] = _safe_error(exc)
-            except Exception as exc:
-                had_errors = True
-                result["failure_reason"] = "unexpected_error"
-                result["failure_source"] = "unknown"
-                result["error"] = _safe_error(exc)
-            finally:
-                elapsed = time.monotonic() - ticket_started
-                result["elapsed_seconds"] = round(elapsed, 3)
-                ticket_durations.append(elapsed)
-                ticket_results.append(result)
-                if trace_enabled:
-                    ticket_trace = rp_client.get_request_trace()
-                    trace_entries.extend(ticket_trace)
-                    result["richpanel_request_count"] = len(ticket_trace)
-                    endpoint_counts: Counter[str] = Counter()
-                    for entry in ticket_trace:
-                        path = entry.get("path")
-                        if path:
-                            endpoint_counts[path] += 1
-                    result["richpanel_request_counts_by_endpoint"] = dict(
-                        endpoint_counts
-                    )
+        for record in checkpoint.iter_records(ticket_refs):
+            aggregate.add(_outcome_from_record(record))
+        run_warnings.extend(aggregate.warnings)
 
     finally:
         trace.stop()
@@ -2836,63 +3134,66 @@ def main() -> int:
     counts = {
         "tickets_requested": tickets_requested,
         "tickets_selected": len(ticket_refs),
-        "tickets_scanned": len(ticket_results),
+        "tickets_scanned": len(aggregate.ticket_results),
         "order_status_candidates": sum(
-            1 for item in ticket_results if item.get("order_status_candidate")
+            1 for item in aggregate.ticket_results if item.get("order_status_candidate")
         ),
-        "orders_matched": sum(1 for item in ticket_results if item.get("order_matched")),
-        "tracking_found": sum(1 for item in ticket_results if item.get("tracking_found")),
-        "eta_available": sum(1 for item in ticket_results if item.get("eta_available")),
+        "orders_matched": sum(1 for item in aggregate.ticket_results if item.get("order_matched")),
+        "tracking_found": sum(1 for item in aggregate.ticket_results if item.get("tracking_found")),
+        "eta_available": sum(1 for item in aggregate.ticket_results if item.get("eta_available")),
         "tracking_or_eta_available": sum(
             1
-            for item in ticket_results
+            for item in aggregate.ticket_results
             if item.get("tracking_found") or item.get("eta_available")
         ),
-        "errors": sum(1 for item in ticket_results if item.get("error")),
+        "errors": sum(1 for item in aggregate.ticket_results if item.get("error")),
     }
-    request_burst = _summarize_request_burst(trace_entries)
-    retry_after_validation = _summarize_retry_after(trace_entries)
+    request_burst = _summarize_request_burst(aggregate.trace_entries)
+    retry_after_validation = _summarize_retry_after(aggregate.trace_entries)
 
     schema_key_stats: Optional[Dict[str, Any]] = None
     if (
-        ticket_schema_key_counts
-        or ticket_schema_ignored_counts
-        or shopify_schema_key_counts
-        or shopify_schema_ignored_counts
+        aggregate.ticket_schema_key_counts
+        or aggregate.ticket_schema_ignored_counts
+        or aggregate.shopify_schema_key_counts
+        or aggregate.shopify_schema_ignored_counts
     ):
         schema_key_stats = _build_schema_key_stats(
-            ticket_keys=ticket_schema_key_counts,
-            ticket_ignored=ticket_schema_ignored_counts,
-            shopify_keys=shopify_schema_key_counts,
-            shopify_ignored=shopify_schema_ignored_counts,
+            ticket_keys=aggregate.ticket_schema_key_counts,
+            ticket_ignored=aggregate.ticket_schema_ignored_counts,
+            shopify_keys=aggregate.shopify_schema_key_counts,
+            shopify_ignored=aggregate.shopify_schema_ignored_counts,
         )
 
     drift_summary = _build_drift_summary(
-        ticket_total=ticket_schema_total,
-        ticket_new=ticket_schema_new,
-        ticket_unique=len(ticket_schema_seen),
-        shopify_total=shopify_schema_total,
-        shopify_new=shopify_schema_new,
-        shopify_unique=len(shopify_schema_seen),
+        ticket_total=aggregate.ticket_schema_total,
+        ticket_new=aggregate.ticket_schema_new,
+        ticket_unique=len(aggregate.ticket_schema_seen),
+        shopify_total=aggregate.shopify_schema_total,
+        shopify_new=aggregate.shopify_schema_new,
+        shopify_unique=len(aggregate.shopify_schema_seen),
         threshold=DRIFT_WARNING_THRESHOLD,
     )
     
     # B61/C: Build drift watch with current metrics
     drift_watch = _compute_drift_watch(
-        ticket_results=ticket_results,
-        ticket_schema_total=ticket_schema_total,
-        ticket_schema_new=ticket_schema_new,
-        shopify_schema_total=shopify_schema_total,
-        shopify_schema_new=shopify_schema_new,
+        ticket_results=aggregate.ticket_results,
+        ticket_schema_total=aggregate.ticket_schema_total,
+        ticket_schema_new=aggregate.ticket_schema_new,
+        shopify_schema_total=aggregate.shopify_schema_total,
+        shopify_schema_new=aggregate.shopify_schema_new,
     )
     
     timing_summary = _summarize_timing(
-        ticket_durations, run_duration_seconds=time.monotonic() - run_started
+        aggregate.ticket_durations,
+        run_duration_seconds=time.monotonic() - run_started,
+        stage_durations=aggregate.stage_durations,
+        concurrency=concurrency,
     )
     summary_payload = _build_summary_payload(
         run_id=run_id,
         tickets_requested=tickets_requested,
-        ticket_results=ticket_results,
+        ticket_results=aggregate.ticket_results,
         timing=timing_summary,
         drift=drift_summary,
         schema_key_stats=schema_key_stats,
@@ -2926,7 +3227,7 @@ def main() -> int:
         "top_failure_reasons": summary_payload.get("top_failure_reasons", []),
         "counts": counts,
         "shopify_probe": shopify_probe,
-        "tickets": ticket_results,
+        "tickets": aggregate.ticket_results,
         "summary_path": str(summary_path),
         "run_warnings": list(run_warnings),
         "http_trace_path": str(trace_path),
@@ -2971,7 +3272,7 @@ def main() -> int:
     LOGGER.info("Report written to %s", report_path)
     LOGGER.info("Summary written to %s", summary_path)
     LOGGER.info("HTTP trace written to %s", trace_path)
-    return 1 if had_errors else 0
+    return 1 if aggregate.had_errors else 0
 
 
 if __name__ == "__main__":
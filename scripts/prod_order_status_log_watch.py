@@ -6,11 +6,17 @@ import os
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-import boto3
-import requests
-from boto3.dynamodb.conditions import Attr
+try:
+    import boto3  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency for local runs
+    boto3 = None  # type: ignore
+
+try:
+    import requests  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency for local runs
+    requests = None  # type: ignore
 
 
 WORKER_LOG_GROUP = "/aws/lambda/rp-mw-prod-worker"
@@ -34,6 +40,16 @@ ISSUE_TERMS = [
     "openai_intent_disabled",
 ]
 ORDER_STATUS_INTENTS = {"order_status_tracking", "shipping_delay_not_shipped"}
+STATE_TABLE_NAME = "rp_mw_prod_conversation_state"
+# GSI keyed by the worker's UTC hour bucket (updated_hour) and updated_at.
+STATE_UPDATED_INDEX = "updated_hour-index"
+STATE_UPDATED_BUCKET_FORMAT = "%Y-%m-%dT%H"
+DEFAULT_MAX_EVENTS_PER_INTERVAL = 5000
+CURSOR_FILENAME = "prod_log_watch_cursor.json"
+# Events can land in CloudWatch after their timestamp; each read starts this
+# far before the previous interval's end (deduped by eventId) so late
+# arrivals are counted in the next interval instead of being lost.
+LOG_INGESTION_GRACE_SECONDS = 120
 
 
 def _default_output_dir() -> str:
@@ -55,6 +71,20 @@ def _parse_args() -> argparse.Namespace:
         "--out-dir",
         default=_default_output_dir(),
     )
+    parser.add_argument(
+        "--max-events-per-interval",
+        type=int,
+        default=DEFAULT_MAX_EVENTS_PER_INTERVAL,
+        help=(
+            "Stop reading matching log events for an interval after this many; "
+            "the remainder is picked up by the next interval."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue reading logs from the persisted cursor in --out-dir.",
+    )
     return parser.parse_args()
 
 
@@ -95,40 +125,173 @@ def _load_richpanel_key(sm_client, env: str = "prod") -> str:
     return _extract_api_key(resp.get("SecretString") or "")
 
 
-def _fetch_logs(logs_client, start: datetime, end: datetime) -> List[Dict[str, Any]]:
-    events: List[Dict[str, Any]] = []
+def _term_variants(term: str) -> List[str]:
+    # Filter patterns are case-sensitive; plain words also appear capitalized
+    # or upper-cased (log levels, "Traceback", "Task timed out").
+    if any(ch in term for ch in "._"):
+        return [term]
+    return list(dict.fromkeys([term, term.capitalize(), term.upper()]))
+
+
+def build_filter_pattern(terms: Iterable[str]) -> str:
+    """OR together every term (and its case variants) as quoted filter terms."""
+    variants: List[str] = []
+    for term in terms:
+        variants.extend(_term_variants(term))
+    return " ".join(f'?"{variant}"' for variant in dict.fromkeys(variants))
+
+
+class LogCursor:
+    """
+    Persisted read position for the worker log group.
+
+    Stores where the next read starts plus the ids (and timestamps) of the
+    events already counted at or after that point, so re-reading the ingestion
+    grace window does not double count.
+    """
+
+    def __init__(self, start_ms: int, seen_ids: Optional[Dict[str, int]] = None) -> None:
+        self.start_ms = int(start_ms)
+        self.seen_ids: Dict[str, int] = dict(seen_ids or {})
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["LogCursor"]:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or "start_ms" not in payload:
+            return None
+        start_ms = int(payload["start_ms"])
+        seen_ids = payload.get("seen_ids") or {}
+        if isinstance(seen_ids, list):
+            # Older cursor files only listed the ids seen at start_ms.
+            seen_ids = {str(event_id): start_ms for event_id in seen_ids}
+        return cls(start_ms, {str(k): int(v) for k, v in seen_ids.items()})
+
+    def save(self, path: Path) -> None:
+        self._forget_before(self.start_ms)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"start_ms": self.start_ms, "seen_ids": dict(sorted(self.seen_ids.items()))},
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+
+    def advance(self, event: Dict[str, Any]) -> None:
+        timestamp = int(event.get("timestamp") or 0)
+        event_id = str(event.get("eventId") or "")
+        if timestamp > self.start_ms:
+            self.start_ms = timestamp
+        if event_id:
+            self.seen_ids[event_id] = timestamp
+
+    def rewind_to(self, start_ms: int) -> None:
+        """Start the next read at start_ms, which may be before events already counted."""
+        self.start_ms = int(start_ms)
+        self._forget_before(self.start_ms)
+
+    def _forget_before(self, start_ms: int) -> None:
+        self.seen_ids = {
+            event_id: timestamp
+            for event_id, timestamp in self.seen_ids.items()
+            if timestamp >= start_ms
+        }
+
+
+def _iter_log_events(
+    logs_client,
+    cursor: LogCursor,
+    end: datetime,
+    *,
+    filter_pattern: str,
+) -> Iterator[Dict[str, Any]]:
+    """Yield new matching worker events page by page, oldest first."""
     paginator = logs_client.get_paginator("filter_log_events")
     for page in paginator.paginate(
         logGroupName=WORKER_LOG_GROUP,
-        startTime=_ms(start),
+        startTime=cursor.start_ms,
         endTime=_ms(end),
+        filterPattern=filter_pattern,
     ):
-        events.extend(page.get("events") or [])
-    return events
+        for event in page.get("events") or []:
+            if str(event.get("eventId") or "") in cursor.seen_ids:
+                continue
+            yield event
+
+
+def _count_log_terms(
+    events: Iterable[Dict[str, Any]],
+    *,
+    cursor: LogCursor,
+    max_events: int,
+) -> Tuple[int, Dict[str, int], Dict[str, int], bool]:
+    """Count failure/issue term hits while advancing the cursor; bounded by max_events."""
+    failure_counts = {term: 0 for term in FAILURE_TERMS}
+    issue_counts = {term: 0 for term in ISSUE_TERMS}
+    matched = 0
+    truncated = False
+    for event in events:
+        if max_events > 0 and matched >= max_events:
+            truncated = True
+            break
+        matched += 1
+        _tally_terms(event, FAILURE_TERMS, failure_counts)
+        _tally_terms(event, ISSUE_TERMS, issue_counts)
+        cursor.advance(event)
+    return matched, failure_counts, issue_counts, truncated
+
 
+def _updated_hour_buckets(start: datetime, end: datetime) -> List[str]:
+    bucket = start.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    buckets: List[str] = []
+    while bucket <= end:
+        buckets.append(bucket.strftime(STATE_UPDATED_BUCKET_FORMAT))
+        bucket += timedelta(hours=1)
+    return buckets
 
-def _scan_order_status_state(
+
+def _query_order_status_state(
     state_table, start: datetime, end: datetime
 ) -> List[Dict[str, Any]]:
-    # recorded_at is ISO8601 string and lexicographically sortable for UTC timestamps.
+    # updated_at is an ISO8601 UTC string, so the sort-key range is lexicographic.
     start_iso = _iso(start)
     end_iso = _iso(end)
 
     items: List[Dict[str, Any]] = []
-    scan_kwargs = {
-        "FilterExpression": Attr("updated_at").between(start_iso, end_iso)
-        & Attr("routing.category").eq("order_status"),
-        "ProjectionExpression": (
-            "conversation_id, updated_at, routing, outbound_result, order_status_intent"
-        ),
-    }
-    response = state_table.scan(**scan_kwargs)
-    items.extend(response.get("Items") or [])
-    while "LastEvaluatedKey" in response:
-        response = state_table.scan(
-            **scan_kwargs, ExclusiveStartKey=response["LastEvaluatedKey"]
-        )
+    for bucket in _updated_hour_buckets(start, end):
+        query_kwargs = {
+            "IndexName": STATE_UPDATED_INDEX,
+            "KeyConditionExpression": (
+                "#hour = :hour AND #updated_at BETWEEN :start AND :end"
+            ),
+            "FilterExpression": "#routing.#category = :category",
+            "ProjectionExpression": (
+                "conversation_id, updated_at, routing, outbound_result, order_status_intent"
+            ),
+            "ExpressionAttributeNames": {
+                "#hour": "updated_hour",
+                "#updated_at": "updated_at",
+                "#routing": "routing",
+                "#category": "category",
+            },
+            "ExpressionAttributeValues": {
+                ":hour": bucket,
+                ":start": start_iso,
+                ":end": end_iso,
+                ":category": "order_status",
+            },
+        }
+        response = state_table.query(**query_kwargs)
         items.extend(response.get("Items") or [])
+        while "LastEvaluatedKey" in response:
+            response = state_table.query(
+                **query_kwargs, ExclusiveStartKey=response["LastEvaluatedKey"]
+            )
+            items.extend(response.get("Items") or [])
     return items
 
 
@@ -141,7 +304,7 @@ def _resolve_ticket_number(
 ) -> Optional[str]:
     if conversation_id in cache:
         return cache[conversation_id]
-    if not conversation_id:
+    if not conversation_id or requests is None:
         cache[conversation_id] = None
         return None
 
@@ -165,14 +328,11 @@ def _resolve_ticket_number(
         return None
 
 
-def _aggregate_terms(events: List[Dict[str, Any]], terms: List[str]) -> Dict[str, int]:
-    counts = {term: 0 for term in terms}
-    for ev in events:
-        msg = str(ev.get("message") or "").lower()
-        for term in terms:
-            if term in msg:
-                counts[term] += 1
-    return counts
+def _tally_terms(event: Dict[str, Any], terms: List[str], counts: Dict[str, int]) -> None:
+    msg = str(event.get("message") or "").lower()
+    for term in terms:
+        if term in msg:
+            counts[term] += 1
 
 
 def _build_interval_report(
@@ -180,7 +340,8 @@ def _build_interval_report(
     index: int,
     start: datetime,
     end: datetime,
-    events: List[Dict[str, Any]],
+    matched_events: int,
+    events_truncated: bool,
     failure_counts: Dict[str, int],
     issue_counts: Dict[str, int],
     order_items: List[Dict[str, Any]],
@@ -241,7 +402,10 @@ def _build_interval_report(
         "interval_index": index,
         "window_start_utc": _iso(start),
         "window_end_utc": _iso(end),
-        "worker_events_count": len(events),
+        "matched_events_count": matched_events,
+        # Original name of matched_events_count, kept for existing consumers.
+        "worker_events_count": matched_events,
+        "matched_events_truncated": events_truncated,
         "failures": failure_counts,
         "issues": issue_counts,
         "order_status_tickets": sorted(
@@ -270,7 +434,10 @@ def _write_markdown(path: Path, all_reports: List[Dict[str, Any]]) -> None:
             f"## Interval {report['interval_index']} ({report['window_start_utc']} -> {report['window_end_utc']})"
         )
         lines.append("")
-        lines.append(f"- Worker events: {report['worker_events_count']}")
+        truncated_note = " (truncated)" if report.get("matched_events_truncated") else ""
+        lines.append(
+            f"- Matching worker events: {report['matched_events_count']}{truncated_note}"
+        )
         fail_total = sum(report["failures"].values())
         issue_total = sum(report["issues"].values())
         lines.append(f"- Failure term hits: {fail_total}")
@@ -316,14 +483,18 @@ def main() -> int:
     jsonl_path = out_dir / "prod_log_watch_findings.jsonl"
     md_path = out_dir / "prod_log_watch_findings.md"
     status_path = out_dir / "prod_log_watch_status.json"
+    cursor_path = out_dir / CURSOR_FILENAME
 
+    if boto3 is None:
+        raise SystemExit("boto3 is required to read prod logs and conversation state")
     session = boto3.Session(profile_name=args.profile, region_name=args.region)
     logs_client = session.client("logs")
     sm_client = session.client("secretsmanager")
     ddb = session.resource("dynamodb")
     cw = session.client("cloudwatch")
 
-    state_table = ddb.Table("rp_mw_prod_conversation_state")
+    state_table = ddb.Table(STATE_TABLE_NAME)
+    filter_pattern = build_filter_pattern(FAILURE_TERMS + ISSUE_TERMS)
 
     start_ts = _utc_now()
     end_ts = start_ts + timedelta(hours=args.hours)
@@ -332,6 +503,11 @@ def main() -> int:
     idx = 1
     ticket_cache: Dict[str, Optional[str]] = {}
     reports: List[Dict[str, Any]] = []
+    log_cursor = LogCursor.load(cursor_path) if args.resume else None
+    if log_cursor is None:
+        log_cursor = LogCursor(_ms(start_ts))
+    # The grace re-read never reaches back past where this run started reading.
+    log_floor_ms = log_cursor.start_ms
 
     # Fresh run marker.
     status_path.write_text(
@@ -355,10 +531,22 @@ def main() -> int:
             time.sleep(5)
             continue
 
-        events = _fetch_logs(logs_client, cursor, interval_end)
-        failure_counts = _aggregate_terms(events, FAILURE_TERMS)
-        issue_counts = _aggregate_terms(events, ISSUE_TERMS)
-        order_items = _scan_order_status_state(state_table, cursor, interval_end)
+        matched_events, failure_counts, issue_counts, events_truncated = _count_log_terms(
+            _iter_log_events(
+                logs_client, log_cursor, interval_end, filter_pattern=filter_pattern
+            ),
+            cursor=log_cursor,
+            max_events=args.max_events_per_interval,
+        )
+        if not events_truncated:
+            log_cursor.rewind_to(
+                max(
+                    log_floor_ms,
+                    _ms(interval_end - timedelta(seconds=LOG_INGESTION_GRACE_SECONDS)),
+                )
+            )
+        log_cursor.save(cursor_path)
+        order_items = _query_order_status_state(state_table, cursor, interval_end)
 
         # Load API key only for intervals that need ticket lookups to reduce
         # in-memory exposure time for long-running monitoring sessions.
@@ -370,7 +558,8 @@ def main() -> int:
             index=idx,
             start=cursor,
             end=interval_end,
-            events=events,
+            matched_events=matched_events,
+            events_truncated=events_truncated,
             failure_counts=failure_counts,
             issue_counts=issue_counts,
             order_items=order_items,
@@ -417,7 +606,7 @@ def main() -> int:
 
         print(
             f"[interval {idx}] {report['window_start_utc']} -> {report['window_end_utc']} "
-            f"| events={report['worker_events_count']} "
+            f"| events={report['matched_events_count']} "
             f"| failures={sum(report['failures'].values())} "
             f"| issues={sum(report['issues'].values())} "
             f"| order_status_tickets={len(report['order_status_tickets'])}"
@@ -39,6 +39,9 @@ from richpanel_middleware.automation.order_status_intent import (  # type: ignor
     classify_order_status_intent,
     redact_ticket_text,
 )
+from richpanel_middleware.automation.prompt_compaction import (  # type: ignore
+    COMPACTION_STATS,
+)
 from richpanel_middleware.automation.router import (  # type: ignore
     extract_customer_message,
 )
@@ -47,6 +50,9 @@ from richpanel_middleware.commerce.order_lookup import (  # type: ignore
     lookup_order_summary,
 )
 from richpanel_middleware.ingest.envelope import build_event_envelope  # type: ignore
+from richpanel_middleware.integrations.openai import (  # type: ignore
+    PROMPT_CACHE_STATS,
+)
 from richpanel_middleware.integrations.richpanel import (  # type: ignore
     RichpanelRequestError,
     SecretLoadError,
@@ -70,6 +76,7 @@ from readonly_shadow_utils import (
     extract_ticket_fields,
     fetch_recent_ticket_refs,
     safe_error,
+    ShadowRunCheckpoint,
 )
 from aws_account_preflight import ENV_ACCOUNT_IDS, normalize_env
 from aws_secrets_preflight import run_aws_secrets_preflight
@@ -817,6 +824,7 @@ def _build_markdown_report(report: Dict[str, Any]) -> str:
     request_burst = report.get("richpanel_request_burst") or {}
     retry_after_validation = report.get("richpanel_retry_after_validation") or {}
     identity = report.get("richpanel_identity") or {}
+    prompt_cache = report.get("openai_prompt_cache") or {}
 
     classification_summary = ", ".join(
         f"{key}: {value}" for key, value in classification_counts.items()
@@ -966,6 +974,23 @@ def _build_markdown_report(report: Dict[str, Any]) -> str:
             "- No outbound messages are sent; would_auto_reply is theoretical only.",
         ]
     )
+    if prompt_cache:
+        summary_lines.extend(
+            [
+                "",
+                "## OpenAI Prompt Cache (per call type)",
+                "| Call type | Calls | Prompt tokens | Cached tokens | Cache-hit ratio | Latency saved (ms) |",
+                "| --- | --- | --- | --- | --- | --- |",
+            ]
+        )
+        for call_type, entry in prompt_cache.items():
+            saved = entry.get("latency_saved_ms")
+            summary_lines.append(
+                f"| {call_type} | {entry.get('calls', 0)} | {entry.get('prompt_tokens', 0)} "
+                f"| {entry.get('cached_tokens', 0)} "
+                f"| {entry.get('cache_hit_ratio', 0.0) * 100:.1f}% "
+                f"| {saved if saved is not None else 'n/a'} |"
+            )
     if retry_diag:
         status_counts = retry_diag.get("status_counts", {})
         status_summary = ", ".join(
@@ -1022,6 +1047,66 @@ def _build_markdown_report(report: Dict[str, Any]) -> str:
     return "\n".join(summary_lines) + "\n"
 
 
+def _checkpoint_path(out_json: Path, run_id: str) -> Path:
+    return out_json.parent / f"prod_shadow_order_status_checkpoint_{run_id}.jsonl"
+
+
+def _tally_ticket_result(
+    result: Dict[str, Any],
+    *,
+    stats: Counter[str],
+    failure_modes: Counter[str],
+    order_status_failure_modes: Counter[str],
+    no_match_reasons: Counter[str],
+    order_status_no_match_reasons: Counter[str],
+) -> None:
+    stats["tickets_scanned"] += 1
+    if result.get("classified_order_status"):
+        stats["classified_order_status_true"] += 1
+    else:
+        stats["classified_order_status_false"] += 1
+    stats[result.get("match_result", "no_match")] += 1
+    if result.get("shopify_lookup_forced"):
+        stats["shopify_lookup_forced"] += 1
+    if result.get("tracking_present"):
+        stats["tracking_present"] += 1
+    if result.get("eta_window"):
+        stats["eta_available"] += 1
+    if result.get("error"):
+        stats["errors"] += 1
+    if (
+        isinstance(result.get("openai_routing"), dict)
+        and result["openai_routing"].get("llm_called")
+    ):
+        stats["openai_routing_called"] += 1
+    if (
+        isinstance(result.get("openai_intent"), dict)
+        and result["openai_intent"].get("llm_called")
+    ):
+        stats["openai_intent_called"] += 1
+
+    failure_mode = _failure_mode(
+        match_result=result.get("match_result", "no_match"),
+        order_number_present=bool(result.get("order_number_redacted")),
+        email_present=bool(result.get("customer_email_redacted")),
+        error=result.get("error"),
+        order_resolution=(
+            result.get("order_resolution")
+            if isinstance(result.get("order_resolution"), dict)
+            else None
+        ),
+    )
+    if failure_mode:
+        failure_modes[failure_mode] += 1
+        if result.get("classified_order_status"):
+            order_status_failure_modes[failure_mode] += 1
+    no_match_reason = result.get("no_match_reason")
+    if no_match_reason:
+        no_match_reasons[no_match_reason] += 1
+        if result.get("classified_order_status"):
+            order_status_no_match_reasons[no_match_reason] += 1
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Prod read-only shadow report for order status."
@@ -1179,6 +1264,14 @@ def main() -> int:
     parser.add_argument("--shopify-secret-id", help="Shopify secret id override.")
     parser.add_argument("--shop-domain", help="Shopify shop domain override.")
     parser.add_argument("--run-id", help="Optional run id override.")
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help=(
+            "Resume an interrupted run from its checkpoint next to --out-json; "
+            "completed tickets are skipped."
+        ),
+    )
     parser.add_argument("--out-json", required=True, help="Output JSON report path.")
     parser.add_argument("--out-md", required=True, help="Output markdown report path.")
     parser.add_argument(
@@ -1293,41 +1386,63 @@ def main() -> int:
         explicit_refs += _load_ticket_refs(args.ticket_refs_path)
     explicit_refs = [value for value in dict.fromkeys(explicit_refs) if value]
 
+    if args.resume and args.run_id and args.run_id != args.resume:
+        raise SystemExit("--run-id and --resume must match when both are set.")
+    run_id = args.resume or args.run_id or _build_run_id()
+    out_json = Path(args.out_json).expanduser().resolve()
+    out_md = Path(args.out_md).expanduser().resolve()
+    out_json.parent.mkdir(parents=True, exist_ok=True)
+    out_md.parent.mkdir(parents=True, exist_ok=True)
+    checkpoint = ShadowRunCheckpoint(_checkpoint_path(out_json, run_id))
+
     ticket_refs: List[str] = []
     sample_mode = "explicit"
     tickets_requested = 0
     run_warnings: List[str] = []
 
-    if explicit_refs:
-        ticket_refs = explicit_refs
-        tickets_requested = len(explicit_refs)
-        sample_mode = "explicit"
+    if args.resume:
+        if not checkpoint.exists:
+            raise SystemExit(f"No checkpoint found for run {run_id}.")
+        checkpoint.load()
+        metadata = checkpoint.metadata
+        ticket_refs = list(checkpoint.ticket_refs)
+        tickets_requested = int(metadata.get("tickets_requested") or len(ticket_refs))
+        sample_mode = str(metadata.get("sample_mode") or sample_mode)
+        run_warnings.extend(metadata.get("listing_warnings") or [])
     else:
-        try:
-            ticket_refs = fetch_recent_ticket_refs(
-                rp_client, sample_size=sample_size, list_path=args.ticket_list_path
-            )
-        except (SystemExit, RichpanelRequestError, SecretLoadError, RichpanelTransportError):
-            if args.allow_empty_sample:
-                run_warnings.append("ticket_listing_failed")
-                LOGGER.warning("Ticket listing failed; continuing with empty sample")
-                ticket_refs = []
-            else:
-                raise
-        tickets_requested = sample_size
-        sample_mode = "recent"
-
-    if not ticket_refs:
-        if args.allow_empty_sample:
-            LOGGER.warning("No tickets available for evaluation; continuing")
+        if explicit_refs:
+            ticket_refs = explicit_refs
+            tickets_requested = len(explicit_refs)
+            sample_mode = "explicit"
         else:
-            raise SystemExit("No tickets available for evaluation")
+            try:
+                ticket_refs = fetch_recent_ticket_refs(
+                    rp_client, sample_size=sample_size, list_path=args.ticket_list_path
+                )
+            except (SystemExit, RichpanelRequestError, SecretLoadError, RichpanelTransportError):
+                if args.allow_empty_sample:
+                    run_warnings.append("ticket_listing_failed")
+                    LOGGER.warning("Ticket listing failed; continuing with empty sample")
+                    ticket_refs = []
+                else:
+                    raise
+            tickets_requested = sample_size
+            sample_mode = "recent"
 
-    run_id = args.run_id or _build_run_id()
-    out_json = Path(args.out_json).expanduser().resolve()
-    out_md = Path(args.out_md).expanduser().resolve()
-    out_json.parent.mkdir(parents=True, exist_ok=True)
-    out_md.parent.mkdir(parents=True, exist_ok=True)
+        if not ticket_refs:
+            if args.allow_empty_sample:
+                LOGGER.warning("No tickets available for evaluation; continuing")
+            else:
+                raise SystemExit("No tickets available for evaluation")
+        checkpoint.start(
+            run_id=run_id,
+            ticket_refs=ticket_refs,
+            metadata={
+                "tickets_requested": tickets_requested,
+                "sample_mode": sample_mode,
+                "listing_warnings": list(run_warnings),
+            },
+        )
 
     started_at = datetime.now(timezone.utc)
     start_time = time.monotonic()
@@ -1339,14 +1454,22 @@ def main() -> int:
     stats = Counter()
     trace_entries: List[Dict[str, Any]] = []
 
+    pending_refs = checkpoint.pending(ticket_refs)
+    if len(pending_refs) < len(ticket_refs):
+        LOGGER.info(
+            "Resuming run %s: %d of %d tickets already checkpointed",
+            run_id,
+            len(ticket_refs) - len(pending_refs),
+            len(ticket_refs),
+        )
     batches: List[List[str]]
     if args.batch_size and args.batch_size > 0:
         batches = [
-            ticket_refs[i : i + args.batch_size]
-            for i in range(0, len(ticket_refs), args.batch_size)
+            pending_refs[i : i + args.batch_size]
+            for i in range(0, len(pending_refs), args.batch_size)
         ]
     else:
-        batches = [ticket_refs]
+        batches = [pending_refs]
 
     for batch_index, batch_refs in enumerate(batches):
         if batch_index and args.batch_delay_seconds:
@@ -1363,6 +1486,7 @@ def main() -> int:
             order_resolution = None
             shopify_calls_before = shopify_client.request_count
             error: Optional[Dict[str, str]] = None
+            ticket_warnings: List[str] = []
             match_attempted = False
             if _env_truthy(os.environ.get("RICHPANEL_TRACE_ENABLED")):
                 rp_client.clear_request_trace()
@@ -1439,7 +1563,7 @@ def main() -> int:
                 classified_order_status = bool(
                     intent_result.is_order_status if intent_result else False
                 )
-                if not order_status_intent.llm_called:
+                if not order_status_intent.llm_called and intent_result is None:
                     classified_order_status = routing.intent in ORDER_STATUS_INTENTS
                 result["classified_order_status"] = classified_order_status
                 result["routing_intent"] = routing.intent
@@ -1470,11 +1594,12 @@ def main() -> int:
                     "gated_reason": order_status_intent.gated_reason,
                     "accepted": order_status_intent.accepted,
                 }
-                result["classification_source"] = (
-                    "openai_intent"
-                    if order_status_intent.llm_called
-                    else "deterministic_router"
-                )
+                if order_status_intent.llm_called:
+                    result["classification_source"] = "openai_intent"
+                elif intent_result is not None:
+                    result["classification_source"] = "local_intent_model"
+                else:
+                    result["classification_source"] = "deterministic_router"
 
                 match_result = "no_match"
                 tracking_present = False
@@ -1563,7 +1688,7 @@ def main() -> int:
                     result["would_auto_reply"] = False
                     result["failure_reason"] = "ticket_fetch_failed"
                     result["no_match_reason"] = "richpanel_fetch_failed"
-                    run_warnings.append("ticket_fetch_failed")
+                    ticket_warnings.append("ticket_fetch_failed")
                 else:
                     raise
             except (RichpanelRequestError, SecretLoadError, RichpanelTransportError) as exc:
@@ -1630,11 +1755,10 @@ def main() -> int:
                     result["error"] = error
                 elapsed = time.monotonic() - ticket_started
                 result["elapsed_seconds"] = round(elapsed, 3)
-                ticket_results.append(result)
 
+                ticket_trace: List[Dict[str, Any]] = []
                 if _env_truthy(os.environ.get("RICHPANEL_TRACE_ENABLED")):
                     ticket_trace = rp_client.get_request_trace()
-                    trace_entries.extend(ticket_trace)
                     result["richpanel_request_count"] = len(ticket_trace)
                     endpoint_counts: Counter[str] = Counter()
                     for entry in ticket_trace:
@@ -1644,54 +1768,31 @@ def main() -> int:
                     result["richpanel_request_counts_by_endpoint"] = dict(
                         endpoint_counts
                     )
-
-                stats["tickets_scanned"] += 1
-                if result.get("classified_order_status"):
-                    stats["classified_order_status_true"] += 1
-                else:
-                    stats["classified_order_status_false"] += 1
-                stats[result.get("match_result", "no_match")] += 1
-                if result.get("shopify_lookup_forced"):
-                    stats["shopify_lookup_forced"] += 1
-                if result.get("tracking_present"):
-                    stats["tracking_present"] += 1
-                if result.get("eta_window"):
-                    stats["eta_available"] += 1
-                if result.get("error"):
-                    stats["errors"] += 1
-                if (
-                    isinstance(result.get("openai_routing"), dict)
-                    and result["openai_routing"].get("llm_called")
-                ):
-                    stats["openai_routing_called"] += 1
-                if (
-                    isinstance(result.get("openai_intent"), dict)
-                    and result["openai_intent"].get("llm_called")
-                ):
-                    stats["openai_intent_called"] += 1
-
-                failure_mode = _failure_mode(
-                    match_result=result.get("match_result", "no_match"),
-                    order_number_present=bool(result.get("order_number_redacted")),
-                    email_present=bool(result.get("customer_email_redacted")),
-                    error=result.get("error"),
-                    order_resolution=(
-                        result.get("order_resolution")
-                        if isinstance(result.get("order_resolution"), dict)
-                        else None
-                    ),
-                )
-                if failure_mode:
-                    failure_modes[failure_mode] += 1
-                    if result.get("classified_order_status"):
-                        order_status_failure_modes[failure_mode] += 1
-                no_match_reason = result.get("no_match_reason")
-                if no_match_reason:
-                    no_match_reasons[no_match_reason] += 1
-                    if result.get("classified_order_status"):
-                        order_status_no_match_reasons[no_match_reason] += 1
-                if args.throttle_seconds:
-                    time.sleep(args.throttle_seconds)
+            # Warnings ride along with the ticket so a resumed run reports them.
+            checkpoint.append(
+                ticket_ref,
+                {
+                    "result": result,
+                    "trace_entries": ticket_trace,
+                    "warnings": ticket_warnings,
+                },
+            )
+            if args.throttle_seconds:
+                time.sleep(args.throttle_seconds)
+
+    for record in checkpoint.iter_records(ticket_refs):
+        result = record.get("result") or {}
+        ticket_results.append(result)
+        trace_entries.extend(record.get("trace_entries") or [])
+        run_warnings.extend(record.get("warnings") or [])
+        _tally_ticket_result(
+            result,
+            stats=stats,
+            failure_modes=failure_modes,
+            order_status_failure_modes=order_status_failure_modes,
+            no_match_reasons=no_match_reasons,
+            order_status_no_match_reasons=order_status_no_match_reasons,
+        )
 
     stats["tickets_requested"] = tickets_requested
     stats["ticket_count"] = len(ticket_results)
@@ -1911,6 +2012,8 @@ def main() -> int:
         "tickets": ticket_results,
         "richpanel_retry_diagnostics": retry_diagnostics or None,
         "richpanel_request_burst": request_burst or None,
+        "openai_prompt_cache": PROMPT_CACHE_STATS.snapshot() or None,
+        "prompt_compaction": COMPACTION_STATS.snapshot() or None,
         "richpanel_retry_after_validation": retry_after_validation or None,
         "richpanel_identity": _build_identity_block(
             client=rp_client,
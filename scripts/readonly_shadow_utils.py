@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 import hashlib
+import json
+import os
 import re
 import urllib.parse
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 from richpanel_middleware.integrations.richpanel.client import (  # type: ignore
     RichpanelClient,
@@ -486,3 +489,139 @@ def extract_comment_message(
         return ""
     best = min(candidates, key=lambda item: item[0])
     return best[1]
+
+
+CHECKPOINT_VERSION = 1
+
+
+def checkpoint_ticket_key(ticket_ref: str) -> str:
+    return _fingerprint(str(ticket_ref).strip(), length=32)
+
+
+class ShadowRunCheckpoint:
+    """
+    Append-only JSONL checkpoint for shadow runs.
+
+    The first line is a header with the run id and the ordered ticket sample so a
+    resumed run evaluates exactly the same tickets. Every following line holds one
+    finished ticket, keyed by a hash of its ref. Lines are flushed as they are
+    written; a torn final line (process killed mid-write) is ignored on load.
+    Checkpoints are local working files: they carry raw ticket refs so a run can
+    be resumed, and should not be shared as evidence artifacts.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.header: Dict[str, Any] = {}
+        self.completed: set[str] = set()
+
+    @property
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> "ShadowRunCheckpoint":
+        self._repair_tail()
+        self.header = {}
+        self.completed = set()
+        for record in self._iter_lines():
+            if record.get("type") == "header":
+                self.header = record
+            elif record.get("type") == "ticket" and record.get("ticket_key"):
+                self.completed.add(str(record["ticket_key"]))
+        return self
+
+    def start(
+        self,
+        *,
+        run_id: str,
+        ticket_refs: List[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if self.exists:
+            raise SystemExit(
+                f"Checkpoint already exists for run {run_id}; use --resume {run_id}"
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.header = {
+            "type": "header",
+            "version": CHECKPOINT_VERSION,
+            "run_id": run_id,
+            "ticket_refs": list(ticket_refs),
+            "metadata": dict(metadata or {}),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.completed = set()
+        self._write_line(self.header)
+
+    @property
+    def ticket_refs(self) -> List[str]:
+        refs = self.header.get("ticket_refs")
+        return [str(ref) for ref in refs] if isinstance(refs, list) else []
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        metadata = self.header.get("metadata")
+        return metadata if isinstance(metadata, dict) else {}
+
+    def is_completed(self, ticket_ref: str) -> bool:
+        return checkpoint_ticket_key(ticket_ref) in self.completed
+
+    def pending(self, ticket_refs: List[str]) -> List[str]:
+        return [ref for ref in ticket_refs if not self.is_completed(ref)]
+
+    def append(self, ticket_ref: str, record: Dict[str, Any]) -> None:
+        key = checkpoint_ticket_key(ticket_ref)
+        self._write_line({"type": "ticket", "ticket_key": key, "record": record})
+        self.completed.add(key)
+
+    def iter_records(self, ticket_refs: List[str]) -> Iterator[Dict[str, Any]]:
+        """Yield ticket records in `ticket_refs` order (last write wins)."""
+        offsets: Dict[str, int] = {}
+        position = 0
+        with self.path.open("rb") as fh:
+            for raw in fh:
+                record = self._decode(raw)
+                if record and record.get("type") == "ticket":
+                    offsets[str(record.get("ticket_key"))] = position
+                position += len(raw)
+            for ref in ticket_refs:
+                offset = offsets.get(checkpoint_ticket_key(ref))
+                if offset is None:
+                    continue
+                fh.seek(offset)
+                record = self._decode(fh.readline())
+                if record and isinstance(record.get("record"), dict):
+                    yield record["record"]
+
+    def _repair_tail(self) -> None:
+        # Terminate a torn final line so the next append starts on a fresh line.
+        if not self.exists or self.path.stat().st_size == 0:
+            return
+        with self.path.open("rb+") as fh:
+            fh.seek(-1, os.SEEK_END)
+            if fh.read(1) != b"\n":
+                fh.write(b"\n")
+
+    def _iter_lines(self) -> Iterator[Dict[str, Any]]:
+        if not self.exists:
+            return
+        with self.path.open("rb") as fh:
+            for raw in fh:
+                record = self._decode(raw)
+                if record:
+                    yield record
+
+    @staticmethod
+    def _decode(raw: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            record = json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None
+        return record if isinstance(record, dict) else None
+
+    def _write_line(self, payload: Dict[str, Any]) -> None:
+        line = json.dumps(payload, ensure_ascii=False, sort_keys=True) + "\n"
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(line)
+            fh.flush()
+            os.fsync(fh.fileno())
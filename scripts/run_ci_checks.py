@@ -98,6 +98,23 @@ def main() -> int:
         ["python", "scripts/test_order_lookup.py"],
         ["python", "scripts/test_llm_reply_rewriter.py"],
         ["python", "scripts/test_llm_routing.py"],
+        ["python", "scripts/test_local_intent_model.py"],
+        ["python", "scripts/test_prompt_compaction.py"],
+        ["python", "scripts/test_pii_sanitizer.py"],
+        ["python", "scripts/test_queue_lanes.py"],
+        ["python", "scripts/test_envelope_group_sharding.py"],
+        ["python", "scripts/test_claim_check.py"],
+        ["python", "scripts/test_conversation_marker.py"],
+        ["python", "scripts/test_echo_suppression.py"],
+        ["python", "scripts/test_order_resolution_reuse.py"],
+        ["python", "scripts/test_ticket_fetch_policy.py"],
+        ["python", "scripts/test_tracing.py"],
+        ["python", "scripts/test_emf_metrics.py"],
+        ["python", "scripts/test_upstream_cassettes.py"],
+        ["python", "scripts/test_capacity_simulator.py"],
+        ["python", "scripts/test_import_time_budget.py"],
+        ["python", "scripts/test_kill_switch_cache.py"],
+        ["python", "scripts/test_prod_order_status_log_watch.py"],
         ["python", "scripts/test_llm_reply_rewriter.py"],
         ["python", "scripts/test_worker_handler_flag_wiring.py"],
         ["python", "scripts/test_read_only_shadow_mode.py"],
@@ -8,6 +8,7 @@ and writes a PII-safe JSON proof artifact. No side effects permitted.
 from __future__ import annotations
 
 import argparse
+import contextlib
 import hashlib
 import json
 import logging
@@ -72,6 +73,7 @@ from readonly_shadow_utils import (
     safe_error as _safe_error,
     summarize_comment_metadata,
 )
+from upstream_cassettes import CassetteRecorder, recording
 
 LOGGER = logging.getLogger("shadow_order_status")
 logging.basicConfig(
@@ -663,6 +665,7 @@ def run_ticket(
     allow_network: bool,
     outbound_enabled: bool,
     rewrite_enabled: bool,
+    cassette_recorder: Optional[CassetteRecorder] = None,
 ) -> Dict[str, Any]:
     ticket_redacted = _redact_identifier(ticket_id) or "redacted"
     ticket = _fetch_ticket(richpanel_client, ticket_id)
@@ -682,6 +685,8 @@ def run_ticket(
     payload["customer_message"] = customer_message
 
     envelope = _build_event_envelope(payload, ticket_id=ticket_id)
+    if cassette_recorder is not None:
+        cassette_recorder.add_event(payload)
     routing, routing_artifact = compute_dual_routing(
         payload,
         conversation_id=envelope.conversation_id,
@@ -883,6 +888,13 @@ def main() -> int:
         action="store_false",
         help="Skip AWS account + secrets preflight.",
     )
+    parser.add_argument(
+        "--record-cassette",
+        help=(
+            "Also save sanitized upstream responses and event payloads to this "
+            "cassette path (for scripts/bench_worker.py replay)."
+        ),
+    )
     parser.set_defaults(preflight_secrets=True)
     args = parser.parse_args()
 
@@ -920,6 +932,17 @@ def main() -> int:
     openai_allow_network = _to_bool(os.environ.get("OPENAI_ALLOW_NETWORK"), False)
     allow_openai = openai_allow_network and outbound_enabled
 
+    cassette_scope = contextlib.ExitStack()
+    cassette_recorder: Optional[CassetteRecorder] = None
+    if args.record_cassette:
+        # Installed before the clients are built so their transports record.
+        cassette_recorder = cassette_scope.enter_context(
+            recording(
+                Path(args.record_cassette).expanduser().resolve(),
+                note=f"shadow_order_status env={env_name}",
+            )
+        )
+
     richpanel_client = _build_richpanel_client()
     shopify_client = _build_shopify_client(
         allow_network=allow_network, env_name=env_name
@@ -978,6 +1001,7 @@ def main() -> int:
                     allow_network=allow_network,
                     outbound_enabled=outbound_enabled,
                     rewrite_enabled=rewrite_enabled,
+                    cassette_recorder=cassette_recorder,
                 )
             except SystemExit:
                 raise
@@ -990,6 +1014,7 @@ def main() -> int:
             results.append(result)
     finally:
         trace.stop()
+        cassette_scope.close()
         with trace_path.open("w", encoding="utf-8") as handle:
             json.dump(trace.to_dict(), handle, ensure_ascii=False, indent=2)
         trace.assert_read_only(allow_openai=allow_openai, trace_path=trace_path)
@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+"""
+Capacity simulator for the worker: queue backlog, Lambda timeouts and
+upstream rate-limit headroom under injected latency and failures.
+
+The real ``lambda_handler`` processes every batch, but in virtual time:
+``time.monotonic``/``time.sleep`` are pointed at a virtual clock, so the
+clients' retry backoff, the Richpanel 429 cooldown and TokenBucketRateLimiter
+waits advance the clock instead of blocking. Upstream calls go through a
+fault-injecting Transport (installed with set_transport_factory) that:
+- samples a per-upstream latency from a log-normal fitted to median/p99;
+- enforces the upstream's own quota across all instances (e.g. Richpanel
+  50 requests / 30 s) and answers 429 + Retry-After when it is exceeded;
+- plays scheduled 429 bursts and 5xx storms, plus a baseline error rate;
+- raises the client's TransportError when latency exceeds its timeout.
+Response bodies come from a cassette (see upstream_cassettes.py).
+
+Arrivals are Poisson at --arrival-rate. Up to --concurrency instances
+(reservedConcurrentExecutions) each take the oldest visible messages in
+batches; each instance has its own Richpanel limiter at --richpanel-rps,
+as each Lambda process does. An invocation longer than --timeout is a
+Lambda timeout: its messages reappear after the visibility timeout and go
+to the DLQ after --max-receive-count receives, like the event source does.
+
+Several --concurrency / --richpanel-rps values run as a grid:
+
+    python scripts/simulate_capacity.py --arrival-rate 0.5 --events 600 \\
+        --concurrency 1 2 4 --richpanel-rps 0.5 1.0 --profile faults.json
+
+A profile overrides DEFAULT_PROFILE per upstream, e.g.
+    {"richpanel": {"throttle_bursts": [{"start_s": 120, "duration_s": 30,
+                                         "retry_after_s": 10}]},
+     "openai": {"error_storms": [{"start_s": 300, "duration_s": 60,
+                                  "rate": 0.5, "status": 503}]}}
+
+Limitations: a batch runs to completion before the next one starts, so
+cross-instance interleaving is approximated at batch granularity (the
+upstream quota windows still count requests by virtual timestamp). OpenAI
+hedging and speculative rewrites use real threads and are disabled here.
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import contextlib
+import copy
+import heapq
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+import bench_worker  # noqa: E402  (sets the worker's table env before import)
+from integrations.openai import client as openai_client  # noqa: E402
+from lambda_handlers.worker import handler as worker  # noqa: E402
+from richpanel_middleware.integrations.richpanel import client as richpanel_client  # noqa: E402
+from upstream_cassettes import (  # noqa: E402
+    Cassette,
+    ReplayedResponse,
+    ReplayTransport,
+    install_transport_factory,
+    transport_error_for,
+)
+
+# Production worker settings (infra/cdk workerEnvironment / WorkerLambda).
+DEFAULT_TIMEOUT_S = 60.0
+DEFAULT_VISIBILITY_TIMEOUT_S = 90.0
+DEFAULT_MAX_RECEIVE_COUNT = 5
+DEFAULT_RICHPANEL_RPS = 0.5
+RICHPANEL_LIMITER_CAPACITY = 5.0
+SIMULATION_ENV = {
+    "RICHPANEL_HTTP_MAX_ATTEMPTS": "6",
+    "RICHPANEL_429_COOLDOWN_MULTIPLIER": "3.0",
+    # Both run work on real threads, which virtual time cannot drive.
+    "OPENAI_HEDGE_ENABLED": "false",
+    "MW_SPECULATIVE_REWRITE_ENABLED": "false",
+}
+
+DEFAULT_PROFILE: Dict[str, Dict[str, Any]] = {
+    "richpanel": {
+        "latency_ms": {"median": 240, "p99": 1500},
+        "quota": {"limit": 50, "window_s": 30},
+    },
+    "shopify": {
+        "latency_ms": {"median": 170, "p99": 900},
+        "quota": {"limit": 40, "window_s": 20},
+    },
+    "shipstation": {
+        "latency_ms": {"median": 310, "p99": 1800},
+        "quota": {"limit": 40, "window_s": 60},
+    },
+    "openai": {
+        "latency_ms": {"median": 620, "p99": 4000},
+    },
+}
+
+_Z99 = 2.326
+
+
+class VirtualClock:
+    """Real elapsed time plus everything slept; set() jumps to a start time."""
+
+    def __init__(self) -> None:
+        self._offset = 0.0
+
+    def now(self) -> float:
+        return self._offset + time.perf_counter()
+
+    def set(self, value: float) -> None:
+        self._offset = value - time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            self._offset += seconds
+
+
+@contextlib.contextmanager
+def virtual_time(clock: VirtualClock) -> Iterator[VirtualClock]:
+    real_monotonic, real_sleep = time.monotonic, time.sleep
+    time.monotonic = clock.now  # type: ignore[assignment]
+    time.sleep = clock.sleep  # type: ignore[assignment]
+    try:
+        yield clock
+    finally:
+        time.monotonic = real_monotonic  # type: ignore[assignment]
+        time.sleep = real_sleep  # type: ignore[assignment]
+
+
+@dataclass
+class Window:
+    start_s: float
+    duration_s: float
+    rate: float = 1.0
+    status: int = 503
+    retry_after_s: float = 5.0
+
+    def active(self, t: float) -> bool:
+        return self.start_s <= t < self.start_s + self.duration_s
+
+
+@dataclass
+class UpstreamProfile:
+    median_ms: float
+    p99_ms: float
+    error_rate: float = 0.0
+    quota_limit: Optional[int] = None
+    quota_window_s: float = 1.0
+    throttle_bursts: List[Window] = field(default_factory=list)
+    error_storms: List[Window] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UpstreamProfile":
+        latency = data.get("latency_ms") or {}
+        quota = data.get("quota") or {}
+        return cls(
+            median_ms=float(latency.get("median", 200)),
+            p99_ms=float(latency.get("p99", latency.get("median", 200))),
+            error_rate=float(data.get("error_rate", 0.0)),
+            quota_limit=int(quota["limit"]) if quota.get("limit") else None,
+            quota_window_s=float(quota.get("window_s", 1.0)),
+            throttle_bursts=[Window(**w) for w in data.get("throttle_bursts") or []],
+            error_storms=[Window(**w) for w in data.get("error_storms") or []],
+        )
+
+    def sample_latency_s(self, rng: random.Random) -> float:
+        sigma = max(math.log(max(self.p99_ms, self.median_ms) / self.median_ms) / _Z99, 0.0)
+        return self.median_ms * math.exp(rng.gauss(0.0, sigma)) / 1000
+
+
+def load_profile(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, UpstreamProfile]:
+    merged = copy.deepcopy(DEFAULT_PROFILE)
+    for service, values in (overrides or {}).items():
+        merged.setdefault(service, {}).update(values)
+    return {service: UpstreamProfile.from_dict(data) for service, data in merged.items()}
+
+
+@dataclass
+class UpstreamStats:
+    requests: int = 0
+    ok: int = 0
+    throttled_quota: int = 0
+    throttled_burst: int = 0
+    server_errors: int = 0
+    timeouts: int = 0
+    accepted_at: List[float] = field(default_factory=list)
+
+    def peak_in_window(self, window_s: float) -> int:
+        peak, left = 0, 0
+        for right, at in enumerate(self.accepted_at):
+            while at - self.accepted_at[left] >= window_s:
+                left += 1
+            peak = max(peak, right - left + 1)
+        return peak
+
+
+class FaultInjectingTransport:
+    """Serves cassette bodies with injected latency, quotas and failures."""
+
+    def __init__(
+        self,
+        service: str,
+        profile: UpstreamProfile,
+        inner: ReplayTransport,
+        clock: VirtualClock,
+        rng: random.Random,
+        stats: UpstreamStats,
+    ) -> None:
+        self.service = service
+        self.profile = profile
+        self.inner = inner
+        self.clock = clock
+        self.rng = rng
+        self.stats = stats
+
+    def send(self, request: Any) -> Any:
+        profile, stats = self.profile, self.stats
+        started = self.clock.now()
+        stats.requests += 1
+        latency = profile.sample_latency_s(self.rng)
+        timeout = getattr(request, "timeout", None)
+        if timeout and latency > float(timeout):
+            self.clock.sleep(float(timeout))
+            stats.timeouts += 1
+            raise transport_error_for(request)
+
+        burst = next((w for w in profile.throttle_bursts if w.active(started)), None)
+        if burst is not None:
+            stats.throttled_burst += 1
+            return self._throttled(min(latency, 0.05), burst.retry_after_s)
+        if profile.quota_limit is not None:
+            accepted = stats.accepted_at
+            in_window = bisect.bisect_right(accepted, started) - bisect.bisect_left(
+                accepted, started - profile.quota_window_s
+            )
+            if in_window >= profile.quota_limit:
+                stats.throttled_quota += 1
+                oldest = accepted[bisect.bisect_left(accepted, started - profile.quota_window_s)]
+                return self._throttled(
+                    min(latency, 0.05), max(oldest + profile.quota_window_s - started, 1.0)
+                )
+        bisect.insort(stats.accepted_at, started)
+
+        self.clock.sleep(latency)
+        storm = next((w for w in profile.error_storms if w.active(started)), None)
+        error_rate = storm.rate if storm is not None else profile.error_rate
+        if error_rate and self.rng.random() < error_rate:
+            stats.server_errors += 1
+            return ReplayedResponse(
+                status_code=storm.status if storm is not None else 503,
+                headers={"content-type": "application/json"},
+                body=b'{"error":"injected"}',
+            )
+        stats.ok += 1
+        return self.inner.send(request)
+
+    def _throttled(self, latency: float, retry_after_s: float) -> ReplayedResponse:
+        self.clock.sleep(latency)
+        return ReplayedResponse(
+            status_code=429,
+            headers={"retry-after": str(int(math.ceil(retry_after_s)))},
+            body=b'{"error":"rate_limited"}',
+        )
+
+
+@dataclass(order=True)
+class _Message:
+    visible_at: float
+    seq: int
+    arrival_s: float = field(compare=False)
+    body: Dict[str, Any] = field(compare=False)
+    message_id: str = field(compare=False, default_factory=lambda: str(uuid.uuid4()))
+    receive_count: int = field(compare=False, default=0)
+
+
+@dataclass
+class _Instance:
+    free_at: float
+    index: int
+    limiter: Any
+    fast_model_until: Dict[str, float] = field(default_factory=dict)
+    busy_s: float = 0.0
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    result = bench_worker._percentile(values, pct)
+    return round(result, 3) if result is not None else None
+
+
+def simulate(
+    cassette: Cassette,
+    *,
+    arrival_rate: float,
+    events: int,
+    concurrency: int,
+    richpanel_rps: float,
+    batch_size: int = 1,
+    timeout_s: float = DEFAULT_TIMEOUT_S,
+    visibility_timeout_s: float = DEFAULT_VISIBILITY_TIMEOUT_S,
+    max_receive_count: int = DEFAULT_MAX_RECEIVE_COUNT,
+    profile: Optional[Dict[str, UpstreamProfile]] = None,
+    seed: int = 7,
+) -> Dict[str, Any]:
+    profile = profile or load_profile()
+    rng = random.Random(seed)
+    clock = VirtualClock()
+    stats = {service: UpstreamStats() for service in profile}
+    replays = {
+        service: ReplayTransport(cassette, service, latency_scale=0.0) for service in profile
+    }
+
+    def _factory(service: str, default: Any) -> Any:
+        if service not in profile:
+            return default()
+        return FaultInjectingTransport(
+            service, profile[service], replays[service], clock, rng, stats[service]
+        )
+
+    queue: List[_Message] = []
+    sequence = itertools.count()
+    arrival = 0.0
+    for body in bench_worker.build_events(cassette, events, seed=seed):
+        arrival += rng.expovariate(arrival_rate)
+        heapq.heappush(queue, _Message(arrival, next(sequence), arrival, body))
+
+    clock.set(0.0)  # limiters read the clock when built
+    instances = [
+        _Instance(
+            free_at=0.0,
+            index=index,
+            limiter=richpanel_client.TokenBucketRateLimiter(
+                rate=richpanel_rps,
+                capacity=RICHPANEL_LIMITER_CAPACITY,
+                clock=clock.now,
+                sleeper=clock.sleep,
+            ),
+        )
+        for index in range(concurrency)
+    ]
+    durations: List[float] = []
+    latencies: List[float] = []
+    queue_waits: List[float] = []
+    completed = failed_receives = timed_out = dead_lettered = 0
+    max_backlog = 0
+    last_completion = 0.0
+    epoch = time.time()
+
+    saved_limiter = richpanel_client._GLOBAL_RATE_LIMITER
+    saved_fast_model = dict(openai_client._FAST_MODEL_UNTIL)
+    try:
+        with bench_worker.replay_environment(SIMULATION_ENV), bench_worker.worker_stand_ins(), \
+                install_transport_factory(_factory), virtual_time(clock), \
+                open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            while queue:
+                instance = min(instances, key=lambda item: (item.free_at, item.index))
+                start = max(instance.free_at, queue[0].visible_at)
+                batch: List[_Message] = []
+                while queue and queue[0].visible_at <= start and len(batch) < batch_size:
+                    batch.append(heapq.heappop(queue))
+                max_backlog = max(
+                    max_backlog, sum(1 for message in queue if message.visible_at <= start)
+                )
+                for message in batch:
+                    message.receive_count += 1
+
+                # Per-process state: each Lambda instance has its own limiter
+                # and OpenAI fast-model fallback window.
+                richpanel_client._GLOBAL_RATE_LIMITER = instance.limiter
+                openai_client._FAST_MODEL_UNTIL.clear()
+                openai_client._FAST_MODEL_UNTIL.update(instance.fast_model_until)
+                clock.set(start)
+                result = worker.lambda_handler(
+                    {
+                        "Records": [
+                            {
+                                "messageId": message.message_id,
+                                "body": json.dumps(message.body),
+                                "attributes": {
+                                    "SentTimestamp": str(int((epoch + message.arrival_s) * 1000)),
+                                    "ApproximateReceiveCount": str(message.receive_count),
+                                },
+                            }
+                            for message in batch
+                        ]
+                    },
+                    None,
+                )
+                duration = clock.now() - start
+                instance.fast_model_until = dict(openai_client._FAST_MODEL_UNTIL)
+
+                durations.append(duration)
+                invocation_timed_out = duration > timeout_s
+                timed_out += int(invocation_timed_out)
+                end = start + min(duration, timeout_s)
+                instance.free_at = end
+                instance.busy_s += end - start
+                failed_ids = {
+                    item.get("itemIdentifier") for item in result.get("batchItemFailures") or []
+                }
+                for message in batch:
+                    if invocation_timed_out or message.message_id in failed_ids:
+                        failed_receives += 1
+                        if message.receive_count >= max_receive_count:
+                            dead_lettered += 1
+                            continue
+                        message.visible_at = start + visibility_timeout_s
+                        message.seq = next(sequence)
+                        heapq.heappush(queue, message)
+                        continue
+                    completed += 1
+                    latencies.append(end - message.arrival_s)
+                    queue_waits.append(start - message.arrival_s)
+                    last_completion = max(last_completion, end)
+    finally:
+        richpanel_client._GLOBAL_RATE_LIMITER = saved_limiter
+        openai_client._FAST_MODEL_UNTIL.clear()
+        openai_client._FAST_MODEL_UNTIL.update(saved_fast_model)
+
+    makespan = max(last_completion, max(i.free_at for i in instances), 1e-9)
+    upstream: Dict[str, Any] = {}
+    for service, service_stats in stats.items():
+        if not service_stats.requests:
+            continue
+        entry: Dict[str, Any] = {
+            "requests": service_stats.requests,
+            "requests_per_s": round(service_stats.requests / makespan, 3),
+            "throttled_quota": service_stats.throttled_quota,
+            "throttled_burst": service_stats.throttled_burst,
+            "server_errors": service_stats.server_errors,
+            "timeouts": service_stats.timeouts,
+        }
+        service_profile = profile[service]
+        if service_profile.quota_limit:
+            peak = service_stats.peak_in_window(service_profile.quota_window_s)
+            entry["quota"] = {
+                "limit": service_profile.quota_limit,
+                "window_s": service_profile.quota_window_s,
+                "peak_in_window": peak,
+                "headroom_pct": round((1 - peak / service_profile.quota_limit) * 100, 1),
+            }
+        upstream[service] = entry
+
+    limiter_stats = [instance.limiter.get_stats() for instance in instances]
+    limiter_requests = sum(s["total_requests"] for s in limiter_stats)
+    richpanel_quota = profile.get("richpanel")
+    limiter: Dict[str, Any] = {
+        "rps_per_instance": richpanel_rps,
+        "aggregate_rps": round(richpanel_rps * concurrency, 3),
+        "requests": limiter_requests,
+        "total_wait_s": round(sum(s["total_wait_seconds"] for s in limiter_stats), 2),
+        "waits_over_1s": sum(s["waits_over_1s"] for s in limiter_stats),
+    }
+    if richpanel_quota is not None and richpanel_quota.quota_limit:
+        quota_rps = richpanel_quota.quota_limit / richpanel_quota.quota_window_s
+        # Worst case: every instance draining its limiter at once.
+        limiter["headroom_vs_quota_pct"] = round(
+            (1 - (richpanel_rps * concurrency) / quota_rps) * 100, 1
+        )
+
+    invocations = len(durations)
+    return {
+        "config": {
+            "arrival_rate_eps": arrival_rate,
+            "events": events,
+            "concurrency": concurrency,
+            "batch_size": batch_size,
+            "richpanel_rps": richpanel_rps,
+            "timeout_s": timeout_s,
+            "visibility_timeout_s": visibility_timeout_s,
+            "max_receive_count": max_receive_count,
+            "seed": seed,
+        },
+        "throughput_eps": round(completed / makespan, 4),
+        "offered_eps": round(events / max(arrival, 1e-9), 4),
+        "utilization": round(sum(i.busy_s for i in instances) / (makespan * concurrency), 3),
+        "simulated_s": round(makespan, 1),
+        "events": {
+            "completed": completed,
+            "dead_lettered": dead_lettered,
+            "failed_receives": failed_receives,
+            "max_backlog": max_backlog,
+        },
+        "invocations": {
+            "count": invocations,
+            "timed_out": timed_out,
+            "timeout_probability": round(timed_out / invocations, 4) if invocations else None,
+            "duration_s": {
+                "p50": _percentile(durations, 50),
+                "p95": _percentile(durations, 95),
+                "p99": _percentile(durations, 99),
+                "max": round(max(durations), 3) if durations else None,
+            },
+        },
+        "event_latency_s": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+            "queue_wait_p95": _percentile(queue_waits, 95),
+        },
+        "upstream": upstream,
+        "richpanel_limiter": limiter,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--cassette", default=str(bench_worker.DEFAULT_CASSETTE))
+    parser.add_argument("--profile", help="JSON file overriding DEFAULT_PROFILE per upstream")
+    parser.add_argument("--arrival-rate", type=float, required=True, help="Events per second")
+    parser.add_argument("--events", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1])
+    parser.add_argument("--richpanel-rps", type=float, nargs="+", default=[DEFAULT_RICHPANEL_RPS])
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S)
+    parser.add_argument("--visibility-timeout", type=float, default=DEFAULT_VISIBILITY_TIMEOUT_S)
+    parser.add_argument("--max-receive-count", type=int, default=DEFAULT_MAX_RECEIVE_COUNT)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="Write the JSON report here as well")
+    args = parser.parse_args()
+    if args.arrival_rate <= 0 or args.events < 1 or args.batch_size < 1:
+        raise SystemExit("--arrival-rate, --events and --batch-size must be positive")
+    if min(args.concurrency) < 1 or min(args.richpanel_rps) <= 0:
+        raise SystemExit("--concurrency and --richpanel-rps must be positive")
+
+    logging.getLogger("richpanel_middleware").setLevel(logging.CRITICAL)
+    logging.getLogger("integrations").setLevel(logging.CRITICAL)
+    worker.LOGGER.setLevel(logging.CRITICAL)
+
+    overrides = json.loads(Path(args.profile).read_text(encoding="utf-8")) if args.profile else None
+    profile = load_profile(overrides)
+    cassette = Cassette.load(Path(args.cassette))
+    scenarios: List[Dict[str, Any]] = []
+    grid: List[Tuple[int, float]] = [
+        (concurrency, rps) for concurrency in args.concurrency for rps in args.richpanel_rps
+    ]
+    for concurrency, rps in grid:
+        scenarios.append(
+            simulate(
+                cassette,
+                arrival_rate=args.arrival_rate,
+                events=args.events,
+                concurrency=concurrency,
+                richpanel_rps=rps,
+                batch_size=args.batch_size,
+                timeout_s=args.timeout,
+                visibility_timeout_s=args.visibility_timeout,
+                max_receive_count=args.max_receive_count,
+                profile=profile,
+                seed=args.seed,
+            )
+        )
+    report = {
+        "cassette": {"fingerprint": cassette.fingerprint()},
+        "profile": {
+            service: {
+                "median_ms": p.median_ms,
+                "p99_ms": p.p99_ms,
+                "error_rate": p.error_rate,
+                "quota": [p.quota_limit, p.quota_window_s] if p.quota_limit else None,
+                "throttle_bursts": len(p.throttle_bursts),
+                "error_storms": len(p.error_storms),
+            }
+            for service, p in profile.items()
+        },
+        "scenarios": scenarios,
+    }
+    rendered = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
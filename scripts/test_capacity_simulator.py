@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+import sys
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Dict
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import simulate_capacity as sim  # noqa: E402
+from bench_worker import DEFAULT_CASSETTE  # noqa: E402
+from integrations.openai.client import TransportError, TransportRequest  # noqa: E402
+from upstream_cassettes import Cassette, ReplayTransport  # noqa: E402
+
+
+def _request(timeout: float = 10.0) -> TransportRequest:
+    return TransportRequest(
+        method="GET",
+        url="https://api.richpanel.com/v1/tickets/12345",
+        headers={},
+        body=None,
+        timeout=timeout,
+    )
+
+
+class FaultInjectingTransportTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = sim.VirtualClock()
+        self.clock.set(0.0)
+        self.stats = sim.UpstreamStats()
+        self.inner = ReplayTransport(Cassette(), "richpanel", latency_scale=0.0)
+
+    def _transport(self, **profile: Any) -> sim.FaultInjectingTransport:
+        data: Dict[str, Any] = {"latency_ms": {"median": 100, "p99": 100}}
+        data.update(profile)
+        return sim.FaultInjectingTransport(
+            "richpanel",
+            sim.UpstreamProfile.from_dict(data),
+            self.inner,
+            self.clock,
+            random.Random(1),
+            self.stats,
+        )
+
+    def test_quota_answers_429_with_retry_after_and_advances_clock(self) -> None:
+        transport = self._transport(quota={"limit": 2, "window_s": 30})
+        statuses = [transport.send(_request()).status_code for _ in range(3)]
+        self.assertEqual(statuses, [404, 404, 429])
+        self.assertEqual(self.stats.throttled_quota, 1)
+        self.assertGreaterEqual(self.clock.now(), 0.2)
+        throttled = transport._throttled(0.0, 12.2)
+        self.assertEqual(throttled.headers["retry-after"], "13")
+        self.assertEqual(self.stats.peak_in_window(30), 2)
+
+    def test_bursts_storms_and_timeouts(self) -> None:
+        transport = self._transport(
+            throttle_bursts=[{"start_s": 0, "duration_s": 1, "retry_after_s": 5}],
+            error_storms=[{"start_s": 1, "duration_s": 10, "rate": 1.0, "status": 502}],
+        )
+        self.assertEqual(transport.send(_request()).status_code, 429)
+        self.clock.set(2.0)
+        self.assertEqual(transport.send(_request()).status_code, 502)
+        with self.assertRaises(TransportError):
+            transport.send(_request(timeout=0.01))
+        self.assertEqual(
+            (self.stats.throttled_burst, self.stats.server_errors, self.stats.timeouts),
+            (1, 1, 1),
+        )
+
+
+class SimulateTests(unittest.TestCase):
+    cassette: Cassette
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.cassette = Cassette.load(DEFAULT_CASSETTE)
+
+    def test_more_concurrency_drains_backlog_faster(self) -> None:
+        monotonic = time.monotonic
+        reports = [
+            sim.simulate(
+                self.cassette, arrival_rate=1.0, events=40, concurrency=c, richpanel_rps=0.5
+            )
+            for c in (1, 3)
+        ]
+        self.assertIs(time.monotonic, monotonic)
+        single, triple = reports
+        for report in reports:
+            self.assertEqual(report["events"]["completed"], 40)
+            self.assertEqual(report["invocations"]["timed_out"], 0)
+            self.assertGreaterEqual(report["upstream"]["openai"]["requests"], 80)
+            self.assertIn("headroom_pct", report["upstream"]["shopify"]["quota"])
+        self.assertLess(
+            triple["event_latency_s"]["p95"], single["event_latency_s"]["p95"]
+        )
+        self.assertEqual(triple["richpanel_limiter"]["aggregate_rps"], 1.5)
+        self.assertEqual(triple["richpanel_limiter"]["headroom_vs_quota_pct"], 10.0)
+
+    def test_slow_upstream_times_out_and_dead_letters(self) -> None:
+        profile = sim.load_profile({"openai": {"latency_ms": {"median": 2000, "p99": 2000}}})
+        report = sim.simulate(
+            self.cassette,
+            arrival_rate=0.2,
+            events=3,
+            concurrency=1,
+            richpanel_rps=0.5,
+            timeout_s=1.0,
+            visibility_timeout_s=5.0,
+            max_receive_count=2,
+            profile=profile,
+        )
+        self.assertEqual(report["invocations"]["timeout_probability"], 1.0)
+        self.assertEqual(report["invocations"]["count"], 6)
+        self.assertEqual(report["events"]["dead_lettered"], 3)
+        self.assertEqual(report["events"]["completed"], 0)
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(FaultInjectingTransportTests))
+    suite.addTests(loader.loadTestsFromTestCase(SimulateTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import ast
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Set
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("QUEUE_URL", "https://sqs.local/heavy.fifo")
+os.environ.setdefault("WEBHOOK_SECRET_ARN", "rp-mw/local/richpanel/webhook_token")
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+
+from handler_test_support import (  # noqa: E402
+    RecordingSqs,
+    ingress_patches,
+    start_patches,
+    webhook_event,
+)
+from lambda_handlers.ingress import handler as ingress  # noqa: E402
+from lambda_handlers.worker import handler as worker  # noqa: E402
+from richpanel_middleware.automation.router import extract_customer_message  # noqa: E402
+from richpanel_middleware.ingest.claim_check import (  # noqa: E402
+    CLAIM_CHECK_KEY,
+    PIPELINE_PAYLOAD_FIELDS,
+    ClaimCheckError,
+    LocalPayloadStore,
+    S3PayloadStore,
+    hydrate_payload,
+    load_claimed_payload,
+    prepare_payload,
+    slim_payload,
+)
+
+
+def _oversized_payload() -> Dict[str, Any]:
+    messages = [
+        {"sender_type": "customer", "body": f"message {i} " + "x" * 9_000}
+        for i in range(30)
+    ]
+    messages[-1] = {"sender_type": "customer", "body": "Where is my order #12345?"}
+    return {
+        "conversation_id": "c-big",
+        "message_id": "m-big",
+        "customer_message": "Where is my order #12345?",
+        "messages": messages,
+        "attachments": [{"data": "A" * 50_000}],
+        "browser_context": {"user_agent": "x" * 2_000},
+    }
+
+
+# Modules that read the queued webhook payload, and the local names it travels
+# under there (order_lookup walks "candidate" dicts starting at the payload).
+_PAYLOAD_READERS = (
+    "richpanel_middleware/automation",
+    "richpanel_middleware/commerce",
+    "richpanel_middleware/ingest",
+    "richpanel_middleware/integrations/richpanel",
+    "lambda_handlers/worker/handler.py",
+)
+_PAYLOAD_NAMES = {"payload", "payload_dict", "candidate"}
+# The local intent model reads its own JSON artifact through a "payload" name.
+_NOT_WEBHOOK_PAYLOAD = {"local_intent_model.py"}
+
+
+def _payload_keys_read(path: Path) -> Set[str]:
+    def is_payload(node: ast.AST) -> bool:
+        if isinstance(node, ast.Name):
+            return node.id in _PAYLOAD_NAMES
+        return isinstance(node, ast.Attribute) and node.attr == "payload"
+
+    keys: Set[str] = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr == "get"
+            and node.args
+            and isinstance(node.args[0], ast.Constant)
+            and is_payload(node.func.value)
+        ):
+            key = node.args[0].value
+        elif (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.ctx, ast.Load)
+            and isinstance(node.slice, ast.Constant)
+            and is_payload(node.value)
+        ):
+            key = node.slice.value
+        else:
+            continue
+        if isinstance(key, str):
+            keys.add(key)
+    return keys
+
+
+class _FakeS3:
+    def __init__(self) -> None:
+        self.objects: Dict[str, bytes] = {}
+
+    def put_object(self, *, Bucket, Key, Body, ContentType):  # type: ignore[no-untyped-def]
+        self.objects[f"{Bucket}/{Key}"] = Body
+
+    def get_object(self, *, Bucket, Key):  # type: ignore[no-untyped-def]
+        body = self.objects[f"{Bucket}/{Key}"]
+        return {"Body": mock.Mock(read=mock.Mock(return_value=body))}
+
+
+class SlimPayloadTests(unittest.TestCase):
+    def test_keeps_allowlisted_fields_only(self) -> None:
+        result = slim_payload(
+            {"customer_message": "hi", "ticket": {"id": "t1", "extra": 1}, "attachments": []}
+        )
+        self.assertEqual(result.payload, {"customer_message": "hi", "ticket": {"id": "t1", "extra": 1}})
+        self.assertEqual(result.dropped_keys, ("attachments",))
+        self.assertFalse(result.truncated)
+
+    def test_caps_keep_first_and_newest_list_items(self) -> None:
+        payload = {"messages": [{"body": str(i)} for i in range(50)], "subject": "s" * 100}
+        result = slim_payload(payload, cap_values=True, max_list_items=5, max_string_chars=10)
+        self.assertEqual([m["body"] for m in result.payload["messages"]], ["0", "46", "47", "48", "49"])
+        self.assertEqual(result.payload["subject"], "s" * 10)
+        self.assertEqual(result.truncated_paths, ("messages", "subject"))
+
+    def test_routing_text_survives_capping(self) -> None:
+        payload = _oversized_payload()
+        capped = slim_payload(payload, cap_values=True).payload
+        self.assertEqual(extract_customer_message(capped), extract_customer_message(payload))
+
+    def test_allowlist_covers_every_pipeline_payload_read(self) -> None:
+        paths: List[Path] = []
+        for entry in _PAYLOAD_READERS:
+            target = SRC / entry
+            paths.extend(sorted(target.glob("*.py")) if target.is_dir() else [target])
+        reads: Dict[str, Set[str]] = {}
+        for path in paths:
+            if path.name in _NOT_WEBHOOK_PAYLOAD:
+                continue
+            for key in _payload_keys_read(path):
+                reads.setdefault(key, set()).add(str(path.relative_to(SRC)))
+        self.assertIn("trigger", reads)
+        missing = {key: sorted(files) for key, files in reads.items() if key not in PIPELINE_PAYLOAD_FIELDS}
+        self.assertEqual(missing, {})
+
+
+class PreparePayloadTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = LocalPayloadStore(tmp.name)
+
+    def test_small_payload_is_not_offloaded(self) -> None:
+        prepared = prepare_payload(
+            {"customer_message": "hi", "noise": "y" * 200_000}, store=self.store
+        )
+        self.assertFalse(prepared.offloaded)
+        self.assertEqual(prepared.payload, {"customer_message": "hi"})
+        self.assertLess(prepared.queued_bytes, prepared.original_bytes)
+
+    def test_oversized_payload_round_trips_through_store(self) -> None:
+        payload = _oversized_payload()
+        prepared = prepare_payload(payload, store=self.store, threshold_bytes=64 * 1024)
+
+        self.assertTrue(prepared.offloaded)
+        self.assertLess(prepared.queued_bytes, 256 * 1024)
+        claim = prepared.payload[CLAIM_CHECK_KEY]
+        self.assertTrue(claim["truncated"])
+        self.assertEqual(load_claimed_payload(prepared.payload, self.store), payload)
+
+        hydrated, fetched = hydrate_payload(prepared.payload, store=self.store)
+        self.assertTrue(fetched)
+        self.assertEqual(hydrated, slim_payload(payload).payload)
+
+    def test_hydrate_is_lazy_and_verifies_digest(self) -> None:
+        prepared = prepare_payload(_oversized_payload(), store=self.store, threshold_bytes=1024)
+        untouched = dict(prepared.payload)
+        untouched[CLAIM_CHECK_KEY] = dict(untouched[CLAIM_CHECK_KEY], truncated=False)
+        self.assertEqual(hydrate_payload(untouched, store=self.store), (untouched, False))
+
+        tampered = dict(prepared.payload)
+        tampered[CLAIM_CHECK_KEY] = dict(tampered[CLAIM_CHECK_KEY], sha256="0" * 64)
+        with self.assertRaises(ClaimCheckError):
+            hydrate_payload(tampered, store=self.store)
+
+    def test_refs_outside_store_are_refused(self) -> None:
+        with self.assertRaises(ClaimCheckError):
+            self.store.get("../outside.json")
+        s3_store = S3PayloadStore("claims", _FakeS3())
+        with self.assertRaises(ClaimCheckError):
+            s3_store.get("s3://other-bucket/payloads/x.json")
+
+    def test_s3_store_round_trip(self) -> None:
+        s3_store = S3PayloadStore("claims", _FakeS3())
+        ref = s3_store.put("abc.json", b"{}")
+        self.assertEqual(ref, "s3://claims/payloads/abc.json")
+        self.assertEqual(s3_store.get(ref), b"{}")
+
+    def test_without_store_caps_only_when_queue_limit_exceeded(self) -> None:
+        medium = {"customer_message": "m" * 100_000}
+        self.assertEqual(prepare_payload(medium, store=None).payload, medium)
+        prepared = prepare_payload(_oversized_payload(), store=None)
+        self.assertFalse(prepared.offloaded)
+        self.assertTrue(prepared.truncated_paths)
+        self.assertNotIn(CLAIM_CHECK_KEY, prepared.payload)
+
+
+class HandlerClaimCheckTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = LocalPayloadStore(tmp.name)
+        self.sqs = RecordingSqs()
+        patches: List[Any] = [
+            mock.patch.object(ingress, "FAST_QUEUE_URL", ""),
+            mock.patch.object(ingress, "_PAYLOAD_STORE", {"loaded": True, "store": self.store}),
+            mock.patch.object(worker, "_PAYLOAD_STORE", {"loaded": True, "store": self.store}),
+        ]
+        start_patches(self, patches + ingress_patches(ingress, self.sqs))
+
+    def test_ingress_offloads_and_worker_hydrates(self) -> None:
+        payload = _oversized_payload()
+        response = ingress.lambda_handler(webhook_event(payload), None)
+        self.assertEqual(response["statusCode"], 200)
+        message = self.sqs.sent[-1]["MessageBody"]
+        self.assertLess(len(message.encode("utf-8")), 256 * 1024)
+
+        body = json.loads(message)
+        self.assertNotIn("attachments", body["payload"])
+        self.assertIn(CLAIM_CHECK_KEY, body["payload"])
+
+        worker._hydrate_claim_check(body)
+        self.assertEqual(len(body["payload"]["messages"]), 30)
+        self.assertNotIn("attachments", body["payload"])
+
+    def test_slimming_can_be_disabled(self) -> None:
+        with mock.patch.dict(os.environ, {"MW_PAYLOAD_SLIMMING_ENABLED": "false"}):
+            ingress.lambda_handler(webhook_event({"conversation_id": "c-1", "extra": 1}), None)
+        self.assertEqual(json.loads(self.sqs.sent[-1]["MessageBody"])["payload"]["extra"], 1)
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(SlimPayloadTests))
+    suite.addTests(loader.loadTestsFromTestCase(PreparePayloadTests))
+    suite.addTests(loader.loadTestsFromTestCase(HandlerClaimCheckTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, cast
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+os.environ.setdefault("CONVERSATION_STATE_TABLE_NAME", "local-conversation-state")
+os.environ.setdefault("AUDIT_TRAIL_TABLE_NAME", "local-audit-trail")
+
+from handler_test_support import local_worker_patches, start_patches  # noqa: E402
+from lambda_handlers.worker import handler as worker  # noqa: E402
+from richpanel_middleware.automation import pipeline as pipeline_module  # noqa: E402
+from richpanel_middleware.automation.pipeline import (  # noqa: E402
+    AUTO_REPLY_MARKER_ATTR,
+    EMAIL_SUPPORT_ROUTE_TAG,
+    SKIP_FOLLOWUP_TAG,
+    execute_order_status_reply,
+    execute_plan,
+    plan_actions,
+)
+from richpanel_middleware.ingest.envelope import build_event_envelope  # noqa: E402
+from richpanel_middleware.integrations.richpanel.client import (  # noqa: E402
+    RichpanelExecutor,
+    RichpanelResponse,
+)
+
+STATE_TABLE = "local-conversation-state"
+MARKER = {"reason": "sent", "event_id": "evt-1", "recorded_at": "2026-01-01T00:00:00+00:00"}
+
+
+class _CountingExecutor:
+    def __init__(self) -> None:
+        self.calls: List[Dict[str, Any]] = []
+
+    def execute(self, method: str, path: str, **kwargs: Any) -> RichpanelResponse:
+        self.calls.append({"method": method, "path": path, "kwargs": kwargs})
+        return RichpanelResponse(
+            status_code=200,
+            headers={"content-type": "application/json"},
+            body=json.dumps({"ticket": {"id": "t-1", "status": "open"}}).encode("utf-8"),
+            url=path,
+            dry_run=False,
+        )
+
+
+def _envelope() -> Any:
+    return build_event_envelope(
+        {"ticket_id": "t-1", "message_id": "m-2", "message": "Where is my order #12345?"}
+    )
+
+
+def _load_marker(envelope: Any) -> Any:
+    return worker._load_conversation_state(envelope).get(AUTO_REPLY_MARKER_ATTR)
+
+
+class _WorkerStateTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        patches = local_worker_patches(worker)
+        patches.append(mock.patch.object(worker, "CONVERSATION_STATE_TABLE_NAME", STATE_TABLE))
+        start_patches(self, patches)
+
+    def _seed_marker(self) -> None:
+        worker._table(STATE_TABLE).put_item(
+            Item={"conversation_id": "t-1", AUTO_REPLY_MARKER_ATTR: dict(MARKER)}
+        )
+
+
+class KnownFollowupPlanTests(unittest.TestCase):
+    def test_marker_skips_intent_and_order_lookup(self) -> None:
+        with mock.patch.object(
+            pipeline_module, "classify_order_status_intent"
+        ) as intent, mock.patch.object(pipeline_module, "lookup_order_summary") as lookup:
+            plan = plan_actions(
+                _envelope(),
+                safe_mode=False,
+                automation_enabled=True,
+                allow_network=True,
+                outbound_enabled=True,
+                auto_reply_marker=dict(MARKER),
+            )
+        intent.assert_not_called()
+        lookup.assert_not_called()
+        self.assertIn("followup_after_auto_reply", plan.reasons)
+        self.assertEqual([a["type"] for a in plan.actions], ["analyze"])
+        assert plan.routing is not None
+        self.assertIn(EMAIL_SUPPORT_ROUTE_TAG, plan.routing.tags)
+        self.assertIn(SKIP_FOLLOWUP_TAG, plan.routing.tags)
+
+    def test_reply_step_makes_no_richpanel_calls(self) -> None:
+        envelope = _envelope()
+        plan = plan_actions(
+            envelope, safe_mode=False, automation_enabled=True, auto_reply_marker=dict(MARKER)
+        )
+        executor = _CountingExecutor()
+        result = execute_order_status_reply(
+            envelope,
+            plan,
+            safe_mode=False,
+            automation_enabled=True,
+            allow_network=True,
+            outbound_enabled=True,
+            richpanel_executor=cast(RichpanelExecutor, executor),
+        )
+        self.assertEqual(result["reason"], "followup_after_auto_reply")
+        self.assertFalse(result["sent"])
+        self.assertEqual(executor.calls, [])
+
+    def test_marker_is_carried_when_automation_is_off(self) -> None:
+        envelope = _envelope()
+        plan = plan_actions(
+            envelope, safe_mode=True, automation_enabled=False, auto_reply_marker=dict(MARKER)
+        )
+        self.assertNotIn("followup_after_auto_reply", plan.reasons)
+        execution = execute_plan(envelope, plan)
+        self.assertEqual(execution.state_record[AUTO_REPLY_MARKER_ATTR], MARKER)
+
+
+class WorkerMarkerTests(_WorkerStateTestCase):
+    def test_marker_round_trip(self) -> None:
+        envelope = _envelope()
+        self.assertIsNone(_load_marker(envelope))
+        plan = plan_actions(envelope, safe_mode=True, automation_enabled=False)
+        worker._execute_and_record(envelope, plan)
+        worker._record_auto_reply_marker(
+            envelope,
+            plan,
+            outbound_result={"sent": True, "reason": "sent", "responses": [{"dry_run": False}]},
+        )
+        marker = _load_marker(envelope)
+        self.assertEqual(marker["reason"], "sent")
+        self.assertEqual(marker["event_id"], envelope.event_id)
+
+    def test_dry_run_and_unsent_outcomes_do_not_write(self) -> None:
+        envelope = _envelope()
+        plan = plan_actions(envelope, safe_mode=True, automation_enabled=False)
+        worker._record_auto_reply_marker(
+            envelope,
+            plan,
+            outbound_result={"sent": True, "reason": "sent", "responses": [{"dry_run": True}]},
+        )
+        worker._record_auto_reply_marker(
+            envelope, plan, outbound_result={"sent": False, "reason": "already_resolved"}
+        )
+        self.assertIsNone(_load_marker(envelope))
+
+    def test_marker_can_be_disabled(self) -> None:
+        self._seed_marker()
+        with mock.patch.dict(os.environ, {"MW_CONVERSATION_MARKER_ENABLED": "false"}):
+            self.assertIsNone(_load_marker(_envelope()))
+        self.assertEqual(_load_marker(_envelope()), MARKER)
+
+    def test_read_failure_falls_back_to_full_pipeline(self) -> None:
+        with mock.patch.object(
+            worker, "_table", side_effect=RuntimeError("ddb down")
+        ), self.assertLogs(level="WARNING") as logs:
+            self.assertIsNone(_load_marker(_envelope()))
+        self.assertIn("worker.conversation_state_read_failed", logs.output[0])
+
+    def test_followup_event_short_circuits_in_lambda_handler(self) -> None:
+        self._seed_marker()
+        worker._FLAG_CACHE.update({"safe_mode": False, "automation_enabled": True, "expires_at": 1e12})
+        self.addCleanup(
+            worker._FLAG_CACHE.update,
+            {"safe_mode": True, "automation_enabled": False, "expires_at": 0.0},
+        )
+        envelope = _envelope()
+        with mock.patch.object(pipeline_module, "lookup_order_summary") as lookup:
+            result = worker.lambda_handler(
+                {"Records": [{"messageId": "1", "body": json.dumps(envelope.to_message())}]},
+                None,
+            )
+        self.assertEqual(result, {"batchItemFailures": []})
+        lookup.assert_not_called()
+        latest = worker._table(STATE_TABLE).items[-1]
+        self.assertEqual(latest[AUTO_REPLY_MARKER_ATTR], MARKER)
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(KnownFollowupPlanTests))
+    suite.addTests(loader.loadTestsFromTestCase(WorkerMarkerTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
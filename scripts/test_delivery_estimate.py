@@ -4,7 +4,7 @@ import json
 import os
 import sys
 import unittest
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
 from unittest import mock
 
@@ -13,7 +13,9 @@ SRC = ROOT / "backend" / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
+from richpanel_middleware.automation import delivery_estimate  # noqa: E402
 from richpanel_middleware.automation.delivery_estimate import (  # noqa: E402
+    BusinessDayCalendar,
     add_business_days,
     build_no_tracking_reply,
     build_tracking_reply,
@@ -183,6 +185,43 @@ class DeliveryEstimateTests(unittest.TestCase):
         self.assertEqual(window["min_days"], 1)
         self.assertEqual(window["max_days"], 2)
 
+    def test_transit_map_compiled_once_per_env_value(self) -> None:
+        custom_map = {"standard": [3, 5]}
+        with mock.patch.dict(
+            os.environ,
+            {"SHIPPING_METHOD_TRANSIT_MAP_JSON": json.dumps(custom_map)},
+        ), mock.patch.object(
+            delivery_estimate,
+            "_load_shipping_method_transit_map",
+            wraps=delivery_estimate._load_shipping_method_transit_map,
+        ) as loader:
+            for _ in range(5):
+                normalize_shipping_method("Standard Shipping")
+        self.assertEqual(loader.call_count, 1)
+
+    def test_transit_map_recompiles_when_env_changes(self) -> None:
+        with mock.patch.dict(
+            os.environ,
+            {"SHIPPING_METHOD_TRANSIT_MAP_JSON": json.dumps({"standard": [3, 5]})},
+        ):
+            first = normalize_shipping_method("Standard Shipping")
+        with mock.patch.dict(
+            os.environ,
+            {"SHIPPING_METHOD_TRANSIT_MAP_JSON": json.dumps({"standard": [6, 9]})},
+        ):
+            second = normalize_shipping_method("Standard Shipping")
+        assert first is not None and second is not None
+        self.assertEqual((first["min_days"], first["max_days"]), (3, 5))
+        self.assertEqual((second["min_days"], second["max_days"]), (6, 9))
+
+    def test_compiled_transit_map_digit_fallback_to_plain_keys(self) -> None:
+        compiled = delivery_estimate._CompiledTransitMap(
+            {"2-day": (2, 2), "ground": (3, 7)}
+        )
+        self.assertEqual(compiled.match("ground 48 states"), (3, 7))
+        self.assertEqual(compiled.match("2-day ground"), (2, 2))
+        self.assertIsNone(compiled.match("pickup"))
+
     def test_same_day_order_remaining_window(self) -> None:
         estimate = compute_delivery_estimate(
             order_created_at="2024-01-02",
@@ -414,6 +453,89 @@ class DeliveryEstimateTests(unittest.TestCase):
         self.assertTrue(reply["body"].endswith("We'll send tracking as soon as it ships."))
 
 
+class BusinessDayCalendarTests(unittest.TestCase):
+    @staticmethod
+    def _walk_between(start: date, end: date, holidays: set) -> int:
+        sign = 1
+        if start > end:
+            start, end = end, start
+            sign = -1
+        days = 0
+        cursor = start
+        while cursor < end:
+            cursor += timedelta(days=1)
+            if cursor.weekday() < 5 and cursor not in holidays:
+                days += 1
+        return days * sign
+
+    @staticmethod
+    def _walk_add(start: date, days: int, holidays: set) -> date:
+        step = 1 if days > 0 else -1
+        remaining = abs(days)
+        cursor = start
+        while remaining > 0:
+            cursor += timedelta(days=step)
+            if cursor.weekday() < 5 and cursor not in holidays:
+                remaining -= 1
+        return cursor
+
+    def test_calendar_matches_day_by_day_walk(self) -> None:
+        holidays = {date(2024, 11, 28), date(2024, 12, 25), date(2025, 1, 1)}
+        for calendar, expected_holidays in (
+            (BusinessDayCalendar(), set()),
+            (BusinessDayCalendar(sorted(holidays)), holidays),
+        ):
+            base = date(2024, 12, 20)
+            for offset in range(-400, 400, 7):
+                start = base + timedelta(days=offset)
+                for span in (-30, -1, 0, 3, 45):
+                    end = start + timedelta(days=span)
+                    self.assertEqual(
+                        calendar.business_days_between(start, end),
+                        self._walk_between(start, end, expected_holidays),
+                    )
+                for days in (-20, -1, 1, 5, 60):
+                    self.assertEqual(
+                        calendar.add_business_days(start, days),
+                        self._walk_add(start, days, expected_holidays),
+                    )
+
+    def test_holiday_skipped_when_adding_days(self) -> None:
+        calendar = BusinessDayCalendar(["2024-12-25"])
+        self.assertEqual(
+            calendar.add_business_days(date(2024, 12, 24), 1), date(2024, 12, 26)
+        )
+        self.assertFalse(calendar.is_business_day("2024-12-25"))
+
+    def test_far_dates_extend_calendar(self) -> None:
+        calendar = BusinessDayCalendar()
+        self.assertEqual(
+            calendar.business_days_between(date(2024, 1, 5), date(2024, 1, 8)), 1
+        )
+        self.assertEqual(
+            calendar.business_days_between(date(1999, 1, 4), date(2030, 1, 7)),
+            self._walk_between(date(1999, 1, 4), date(2030, 1, 7), set()),
+        )
+        self.assertEqual(
+            calendar.add_business_days(date(2024, 1, 5), 5000),
+            self._walk_add(date(2024, 1, 5), 5000, set()),
+        )
+
+    def test_holidays_env_applies_to_module_helpers(self) -> None:
+        with mock.patch.dict(
+            os.environ, {"DELIVERY_ESTIMATE_HOLIDAYS_JSON": '["2024-01-08"]'}
+        ):
+            self.assertEqual(
+                business_days_between(date(2024, 1, 5), date(2024, 1, 9)), 1
+            )
+        with mock.patch.dict(
+            os.environ, {"DELIVERY_ESTIMATE_HOLIDAYS_JSON": "{not-valid"}
+        ):
+            self.assertEqual(
+                business_days_between(date(2024, 1, 5), date(2024, 1, 9)), 2
+            )
+
+
 class TrackingUrlTests(unittest.TestCase):
     def test_build_tracking_url_variants(self) -> None:
         self.assertEqual(
@@ -476,6 +598,9 @@ def main() -> int:  # pragma: no cover
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromTestCase(DeliveryEstimateTests)
     )
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(BusinessDayCalendarTests)
+    )
     suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(TrackingUrlTests))
     result = unittest.TextTestRunner(verbosity=2).run(suite)
     return 0 if result.wasSuccessful() else 1
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, cast
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("QUEUE_URL", "https://sqs.local/heavy.fifo")
+os.environ.setdefault("WEBHOOK_SECRET_ARN", "rp-mw/local/richpanel/webhook_token")
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+
+from handler_test_support import (  # noqa: E402
+    Clock,
+    RecordingSqs,
+    ingress_patches,
+    local_worker_patches,
+    start_patches,
+    webhook_event,
+)
+from lambda_handlers.ingress import handler as ingress  # noqa: E402
+from lambda_handlers.worker import handler as worker  # noqa: E402
+from richpanel_middleware.ingest.envelope import build_event_envelope  # noqa: E402
+from richpanel_middleware.integrations.richpanel.client import (  # noqa: E402
+    RichpanelClient,
+    RichpanelExecutor,
+    RichpanelResponse,
+)
+from richpanel_middleware.integrations.richpanel.write_journal import (  # noqa: E402
+    DynamoWriteJournal,
+    EchoSuppressionStats,
+    InMemoryWriteJournal,
+    JournalEntry,
+    classify_echo,
+    fingerprint_text,
+    parse_ticket_write,
+    record_ticket_write,
+    set_write_journal,
+)
+
+NOW = 1_800_000_000.0
+
+
+class _FakeTable:
+    def __init__(self) -> None:
+        self.items: Dict[str, Dict[str, Any]] = {}
+
+    def update_item(self, *, Key, UpdateExpression, ExpressionAttributeValues):  # type: ignore[no-untyped-def]
+        item = self.items.setdefault(Key["ticket_id"], dict(Key))
+        names = {
+            ":op": "last_operation",
+            ":written_at": "written_at",
+            ":expires_at": "expires_at",
+            ":fp": "reply_fingerprint",
+        }
+        for placeholder, value in ExpressionAttributeValues.items():
+            item[names[placeholder]] = value
+
+    def get_item(self, *, Key):  # type: ignore[no-untyped-def]
+        item = self.items.get(Key["ticket_id"])
+        return {"Item": dict(item)} if item else {}
+
+
+class _RecordingClient:
+    def __init__(self, journal: InMemoryWriteJournal) -> None:
+        self.journal = journal
+        self.journaled_before_dispatch: List[bool] = []
+
+    def request(self, method: str, path: str, **kwargs: Any) -> RichpanelResponse:
+        self.journaled_before_dispatch.append(self.journal.latest("t-9") is not None)
+        return RichpanelResponse(
+            status_code=200, headers={}, body=b"{}", url=path, dry_run=kwargs["dry_run"]
+        )
+
+
+class ParseTicketWriteTests(unittest.TestCase):
+    def test_mutating_ticket_paths(self) -> None:
+        self.assertEqual(parse_ticket_write("PUT", "/v1/tickets/t-1"), ("t-1", "update_ticket"))
+        self.assertEqual(
+            parse_ticket_write("put", "/v1/tickets/a%40b/add-tags"), ("a@b", "add_tags")
+        )
+        self.assertIsNone(parse_ticket_write("GET", "/v1/tickets/t-1"))
+        self.assertIsNone(parse_ticket_write("PUT", "/v1/customers/c-1"))
+
+    def test_fingerprint_ignores_markup_and_whitespace(self) -> None:
+        self.assertEqual(
+            fingerprint_text("<p>Your order  has <b>shipped</b>.</p>"),
+            fingerprint_text("your order has shipped."),
+        )
+        self.assertIsNone(fingerprint_text("   "))
+
+
+class ClassifyEchoTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = Clock(NOW)
+        self.journal = InMemoryWriteJournal(ttl_seconds=300, clock=self.clock)
+        self.stats = EchoSuppressionStats()
+
+    def _classify(self, payload: Dict[str, Any], **kwargs: Any) -> Any:
+        return classify_echo(payload, journal=self.journal, stats=self.stats, **kwargs)
+
+    def _record_reply(self, text: str) -> None:
+        record_ticket_write(
+            "PUT",
+            "/v1/tickets/t-1",
+            json_body={"ticket": {"comment": {"body": text}}},
+            journal=self.journal,
+            clock=self.clock,
+        )
+
+    def test_own_reply_is_echo_but_customer_text_is_not(self) -> None:
+        self._record_reply("<p>Your order has shipped.</p>")
+        own = self._classify({"ticket_id": "t-1", "message": "Your order has shipped."})
+        self.assertTrue(own.echo)
+        self.assertEqual(own.reason, "own_reply")
+
+        customer = self._classify({"ticket_id": "t-1", "message": "Thanks, where is it?"})
+        self.assertFalse(customer.echo)
+        self.assertEqual(customer.reason, "customer_content")
+
+    def test_tag_write_keeps_reply_fingerprint(self) -> None:
+        self._record_reply("Shipped!")
+        record_ticket_write(
+            "PUT", "/v1/tickets/t-1/add-tags", json_body={"tags": ["x"]},
+            journal=self.journal, clock=self.clock,
+        )
+        self.assertTrue(self._classify({"ticket_id": "t-1", "message": "Shipped!"}).echo)
+
+    def test_messageless_webhook_after_write(self) -> None:
+        self._record_reply("Shipped!")
+        self.assertEqual(
+            self._classify({"conversation_id": "t-1"}).reason, "recent_write_no_message"
+        )
+        trigger = self._classify({"conversation_id": "t-1", "trigger": "customer_message"})
+        self.assertFalse(trigger.echo)
+        self.assertEqual(self._classify({"conversation_id": "t-2"}).reason, "no_recent_write")
+
+    def test_ttl_and_write_after_event(self) -> None:
+        self._record_reply("Shipped!")
+        late = self._classify({"ticket_id": "t-1"}, received_at=NOW - 5)
+        self.assertEqual(late.reason, "write_after_event")
+        self.clock.now = NOW + 301
+        self.assertEqual(self._classify({"ticket_id": "t-1"}).reason, "no_recent_write")
+
+    def test_stats_count_suppressions(self) -> None:
+        self._record_reply("Shipped!")
+        self._classify({"ticket_id": "t-1"})
+        self._classify({"ticket_id": "t-1", "message": "hello?"})
+        snapshot = self.stats.snapshot()
+        self.assertEqual(snapshot["checked"], 2)
+        self.assertEqual(snapshot["suppressed:recent_write_no_message"], 1)
+        self.assertEqual(snapshot["suppressed_ratio"], 0.5)
+
+
+class DynamoWriteJournalTests(unittest.TestCase):
+    def test_round_trip_and_window(self) -> None:
+        clock = Clock(NOW)
+        table = _FakeTable()
+        journal = DynamoWriteJournal(table, ttl_seconds=60, clock=clock)
+        journal.record(JournalEntry("t-1", "send_message", NOW, "abc"))
+        self.assertEqual(table.items["t-1"]["expires_at"], int(NOW) + 60)
+
+        entry = journal.latest("t-1")
+        self.assertEqual(entry, JournalEntry("t-1", "send_message", NOW, "abc"))
+        clock.now = NOW + 61
+        self.assertIsNone(journal.latest("t-1"))
+
+    def test_record_failures_are_swallowed(self) -> None:
+        journal = mock.Mock()
+        journal.record.side_effect = RuntimeError("ddb down")
+        self.assertIsNone(record_ticket_write("PUT", "/v1/tickets/t-1", journal=journal))
+
+
+class ExecutorJournalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.journal = InMemoryWriteJournal()
+        set_write_journal(self.journal)
+        self.addCleanup(set_write_journal, None)
+        self.client = _RecordingClient(self.journal)
+
+    def _executor(self, outbound_enabled: bool) -> RichpanelExecutor:
+        return RichpanelExecutor(
+            client=cast(RichpanelClient, self.client), outbound_enabled=outbound_enabled
+        )
+
+    def test_live_writes_are_journaled_before_dispatch(self) -> None:
+        self._executor(True).execute(
+            "PUT", "/v1/tickets/t-9/add-tags", json_body={"tags": ["mw"]}
+        )
+        self.assertEqual(self.client.journaled_before_dispatch, [True])
+        entry = self.journal.latest("t-9")
+        assert entry is not None
+        self.assertEqual(entry.operation, "add_tags")
+
+    def test_dry_run_writes_are_not_journaled(self) -> None:
+        self._executor(False).execute("PUT", "/v1/tickets/t-9", json_body={})
+        self._executor(True).execute("PUT", "/v1/tickets/t-9", json_body={}, dry_run=True)
+        self.assertIsNone(self.journal.latest("t-9"))
+
+
+class HandlerEchoTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.journal = InMemoryWriteJournal()
+        self.sqs = RecordingSqs()
+        patches = ingress_patches(ingress, self.sqs)
+        patches.append(mock.patch.object(ingress, "_WRITE_JOURNAL", self.journal))
+        start_patches(self, patches)
+
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = ingress.lambda_handler(webhook_event(payload), None)
+        return json.loads(response["body"])
+
+    def test_ingress_drops_echo_and_enqueues_customer_messages(self) -> None:
+        record_ticket_write("PUT", "/v1/tickets/t-1/add-tags", journal=self.journal)
+        self.assertEqual(self._post({"ticket_id": "t-1"})["status"], "suppressed_echo")
+        self.assertEqual(len(self.sqs.sent), 0)
+
+        body = self._post({"ticket_id": "t-1", "customer_message": "Any update?"})
+        self.assertEqual(body["status"], "accepted")
+        self.assertEqual(len(self.sqs.sent), 1)
+
+    def test_ingress_suppression_can_be_disabled(self) -> None:
+        record_ticket_write("PUT", "/v1/tickets/t-1", journal=self.journal)
+        with mock.patch.dict(os.environ, {"MW_ECHO_SUPPRESSION_ENABLED": "false"}):
+            self.assertEqual(self._post({"ticket_id": "t-1"})["status"], "accepted")
+
+    def test_worker_keeps_events_received_before_the_write(self) -> None:
+        envelope = build_event_envelope({"ticket_id": "t-1"})
+        received_at = worker.datetime.fromisoformat(
+            envelope.received_at.replace("Z", "+00:00")
+        ).timestamp()
+        self.journal.record(JournalEntry("t-1", "update_ticket", received_at + 10))
+        self.assertFalse(worker._is_echo(envelope, self.journal))
+
+        self.journal.record(JournalEntry("t-1", "update_ticket", received_at - 1))
+        self.assertTrue(worker._is_echo(envelope, self.journal))
+
+    def test_customer_trigger_survives_slimming_and_worker_recheck(self) -> None:
+        self.journal.record(JournalEntry("t1", "add_tags", worker.time.time() - 10))
+        body = self._post({"ticket_id": "t1", "trigger": "customer_message"})
+        self.assertEqual(body["status"], "accepted")
+        message = self.sqs.sent[-1]["MessageBody"]
+        self.assertEqual(json.loads(message)["payload"]["trigger"], "customer_message")
+
+        patches = local_worker_patches(worker)
+        patches += [
+            mock.patch.object(worker, "_WRITE_JOURNAL", self.journal),
+            mock.patch.object(worker, "_load_kill_switches", return_value=(True, False)),
+        ]
+        start_patches(self, patches)
+        result = worker.lambda_handler({"Records": [{"messageId": "m-1", "body": message}]}, None)
+        persisted = worker._table(os.environ["IDEMPOTENCY_TABLE_NAME"]).items
+        self.assertEqual(result["batchItemFailures"], [])
+        self.assertEqual(len(persisted), 1)
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(ParseTicketWriteTests))
+    suite.addTests(loader.loadTestsFromTestCase(ClassifyEchoTests))
+    suite.addTests(loader.loadTestsFromTestCase(DynamoWriteJournalTests))
+    suite.addTests(loader.loadTestsFromTestCase(ExecutorJournalTests))
+    suite.addTests(loader.loadTestsFromTestCase(HandlerEchoTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
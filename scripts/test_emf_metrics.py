@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+os.environ.setdefault("CONVERSATION_STATE_TABLE_NAME", "local-conversation-state")
+os.environ.setdefault("AUDIT_TRAIL_TABLE_NAME", "local-audit-trail")
+
+from integrations.common import notify_upstream_attempt  # noqa: E402
+from handler_test_support import local_worker_patches, start_patches  # noqa: E402
+from lambda_handlers.worker import handler as worker  # noqa: E402
+from richpanel_middleware.ingest.envelope import build_event_envelope  # noqa: E402
+from richpanel_middleware.observability import metrics  # noqa: E402
+from richpanel_middleware.observability.metrics import (  # noqa: E402
+    MAX_VALUES_PER_METRIC,
+    MetricsBuffer,
+    count,
+    metrics_scope,
+    put_metric,
+    upstream_outcome,
+)
+
+
+def _metric_names(document: Dict[str, Any]) -> List[str]:
+    return [m["Name"] for m in document["_aws"]["CloudWatchMetrics"][0]["Metrics"]]
+
+
+class MetricsBufferTests(unittest.TestCase):
+    def test_samples_group_by_dimension_set(self) -> None:
+        buffer = MetricsBuffer("rp-mw/test")
+        buffer.put("StageLatency", 12.5, stage="plan")
+        buffer.put("StageLatency", 30, stage="plan")
+        buffer.put("StageLatency", 4, stage="normalize_event")
+        buffer.put("CacheLookups", 1, "Count", stage="plan", event_id="evt-1")
+
+        documents = buffer.documents(timestamp_ms=1)
+        self.assertEqual(len(documents), 2)
+        plan = next(d for d in documents if d["stage"] == "plan")
+        self.assertEqual(plan["StageLatency"], [12.5, 30.0])
+        self.assertEqual(plan["CacheLookups"], 1.0)
+        self.assertNotIn("event_id", plan)
+        self.assertEqual(_metric_names(plan), ["CacheLookups", "StageLatency"])
+        directive = plan["_aws"]["CloudWatchMetrics"][0]
+        self.assertEqual(directive["Namespace"], "rp-mw/test")
+        self.assertEqual(directive["Dimensions"], [["stage"]])
+
+    def test_value_arrays_are_split_at_emf_limit(self) -> None:
+        buffer = MetricsBuffer("rp-mw/test")
+        for value in range(MAX_VALUES_PER_METRIC + 5):
+            buffer.put("QueueWait", value, lane="fast")
+        documents = buffer.documents(timestamp_ms=1)
+        self.assertEqual([len(d["QueueWait"]) for d in documents], [MAX_VALUES_PER_METRIC, 5])
+
+    def test_flush_emits_json_lines_and_clears(self) -> None:
+        buffer = MetricsBuffer("rp-mw/test")
+        buffer.put("StageLatency", 1, stage="plan")
+        lines: List[str] = []
+        self.assertEqual(buffer.flush(lines.append), 1)
+        self.assertEqual(json.loads(lines[0])["StageLatency"], 1.0)
+        self.assertEqual(buffer.flush(lines.append), 0)
+
+    def test_upstream_outcomes(self) -> None:
+        self.assertEqual(
+            [upstream_outcome(code) for code in (None, 200, 404, 429, 503)],
+            ["transport_error", "ok", "client_error", "throttled", "server_error"],
+        )
+
+
+class MetricsScopeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.dict(os.environ, {"MW_METRICS_ENABLED": "true"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_put_metric_outside_scope_is_noop(self) -> None:
+        put_metric("StageLatency", 1, stage="plan")
+        lines: List[str] = []
+        with metrics_scope(lines.append):
+            pass
+        self.assertEqual(lines, [])
+
+    def test_upstream_attempts_feed_latency_and_retries(self) -> None:
+        lines: List[str] = []
+        with metrics_scope(lines.append):
+            notify_upstream_attempt("shopify", attempt=1, status_code=429, latency_ms=5)
+            notify_upstream_attempt("shopify", attempt=2, status_code=200, latency_ms=9)
+            count(metrics.LLM_GATED, stage="intent", outcome="safe_mode")
+        documents = [json.loads(line) for line in lines]
+        by_dims = {
+            tuple(d["_aws"]["CloudWatchMetrics"][0]["Dimensions"][0]): d for d in documents
+        }
+        throttled = [
+            d for d in documents if d.get("upstream") == "shopify" and d.get("outcome") == "throttled"
+        ]
+        self.assertEqual(throttled[0]["UpstreamLatency"], 5.0)
+        self.assertEqual(by_dims[("upstream",)]["UpstreamRetries"], 1.0)
+        self.assertEqual(by_dims[("outcome", "stage")]["LLMGated"], 1.0)
+
+    def test_disabled_scope_emits_nothing(self) -> None:
+        lines: List[str] = []
+        with mock.patch.dict(os.environ, {"MW_METRICS_ENABLED": "false"}):
+            with metrics_scope(lines.append) as buffer:
+                put_metric("StageLatency", 1, stage="plan")
+        self.assertIsNone(buffer)
+        self.assertEqual(lines, [])
+
+    def test_enabled_by_default_only_when_deployed(self) -> None:
+        deployed = (
+            {"MW_METRICS_NAMESPACE": "rp-mw/prod"},
+            {"AWS_LAMBDA_FUNCTION_NAME": "rp-mw-prod-worker"},
+        )
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if key not in {"MW_METRICS_ENABLED", "MW_METRICS_NAMESPACE", "AWS_LAMBDA_FUNCTION_NAME"}
+        }
+        with mock.patch.dict(os.environ, env, clear=True):
+            self.assertFalse(metrics.metrics_enabled())
+            for extra in deployed:
+                with mock.patch.dict(os.environ, extra):
+                    self.assertTrue(metrics.metrics_enabled())
+            with mock.patch.dict(os.environ, {**deployed[1], "MW_METRICS_ENABLED": "false"}):
+                self.assertFalse(metrics.metrics_enabled())
+
+
+class WorkerMetricsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patches = local_worker_patches(worker)
+        patches += [
+            mock.patch.object(worker, "_load_kill_switches", return_value=(True, False)),
+            mock.patch.dict(os.environ, {"MW_METRICS_NAMESPACE": "rp-mw/test"}),
+        ]
+        start_patches(self, patches)
+
+    def test_handler_flushes_stage_and_queue_metrics_once(self) -> None:
+        body = build_event_envelope({"conversation_id": "c-1", "customer_message": "hi"})
+        records = [
+            {
+                "messageId": str(index),
+                "body": json.dumps(body.to_message()),
+                "attributes": {"SentTimestamp": "0"},
+            }
+            for index in range(2)
+        ]
+        with mock.patch("builtins.print") as emitted, self.assertLogs(worker.LOGGER, "INFO"):
+            worker.lambda_handler({"Records": records}, None)
+
+        documents = [json.loads(call.args[0]) for call in emitted.call_args_list]
+        total = next(d for d in documents if d.get("stage") == "total")
+        self.assertEqual(len(total["StageLatency"]), 2)
+        self.assertIn("plan/intent", {d.get("stage") for d in documents})
+        self.assertEqual(
+            sum(1 for d in documents if "QueueWait" in d), 1
+        )
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(MetricsBufferTests))
+    suite.addTests(loader.loadTestsFromTestCase(MetricsScopeTests))
+    suite.addTests(loader.loadTestsFromTestCase(WorkerMetricsTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
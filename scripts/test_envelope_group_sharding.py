@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from richpanel_middleware.ingest.envelope import (  # noqa: E402
+    DEFAULT_GROUP_SHARDS_ENV,
+    DEFAULT_MESSAGE_GROUP_ID,
+    build_event_envelope,
+    get_default_group_shards,
+)
+
+
+class DefaultGroupShardingTests(unittest.TestCase):
+    def test_identified_events_keep_their_group(self) -> None:
+        envelope = build_event_envelope({"ticket_id": "t-1", "email": "a@example.com"})
+        self.assertEqual(envelope.group_id, "t-1")
+        self.assertIsNone(envelope.group_fallback)
+
+    def test_same_customer_email_shares_a_shard(self) -> None:
+        first = build_event_envelope({"email": "Ann@Example.com", "message_id": "m1"})
+        second = build_event_envelope({"customer_email": "ann@example.com ", "message_id": "m2"})
+
+        self.assertEqual(first.group_id, second.group_id)
+        self.assertTrue(first.group_id.startswith(f"{DEFAULT_MESSAGE_GROUP_ID}-"))
+        self.assertEqual(first.group_fallback, "customer_email")
+        self.assertEqual(first.conversation_id, DEFAULT_MESSAGE_GROUP_ID)
+
+    def test_unrelated_events_spread_over_shards(self) -> None:
+        groups = {
+            build_event_envelope({"email": f"user{i}@example.com"}, default_group_shards=8).group_id
+            for i in range(200)
+        }
+        self.assertEqual(len(groups), 8)
+
+    def test_shard_key_precedence_and_unkeyed(self) -> None:
+        self.assertEqual(
+            build_event_envelope({"ticket_number": "1001", "message_id": "m"}).group_fallback,
+            "ticket_number",
+        )
+        self.assertEqual(build_event_envelope({"message_id": "m"}).group_fallback, "message_id")
+        self.assertEqual(build_event_envelope({}).group_fallback, "unkeyed")
+
+    def test_single_shard_restores_legacy_group(self) -> None:
+        envelope = build_event_envelope({"email": "a@example.com"}, default_group_shards=1)
+        self.assertEqual(envelope.group_id, DEFAULT_MESSAGE_GROUP_ID)
+        self.assertEqual(envelope.group_fallback, "customer_email")
+
+    def test_shard_count_from_env(self) -> None:
+        with mock.patch.dict(os.environ, {DEFAULT_GROUP_SHARDS_ENV: "3"}):
+            self.assertEqual(get_default_group_shards(), 3)
+            groups = {
+                build_event_envelope({"email": f"u{i}@example.com"}).group_id for i in range(60)
+            }
+        self.assertEqual(len(groups), 3)
+        with mock.patch.dict(os.environ, {DEFAULT_GROUP_SHARDS_ENV: "zero"}):
+            self.assertEqual(get_default_group_shards(), 8)
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(DefaultGroupShardingTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
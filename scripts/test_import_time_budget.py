@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import import_time_report as report_module  # noqa: E402
+from richpanel_middleware import integrations  # noqa: E402
+from richpanel_middleware.automation import delivery_estimate, pipeline  # noqa: E402
+
+_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   richpanel_middleware
+import time:      2300 |       2300 |       richpanel_middleware.commerce.order_lookup
+import time:       150 |       2450 |     richpanel_middleware.commerce
+import time:        20 |       2470 |   richpanel_middleware.commerce.order_lookup
+import time:       900 |       3490 | lambda_handlers.worker.handler
+"""
+
+
+class ParseAndBudgetTests(unittest.TestCase):
+    def test_parse_importtime_merges_package_reentry(self) -> None:
+        timings = report_module.parse_importtime(_SAMPLE)
+        self.assertEqual(timings["richpanel_middleware.commerce.order_lookup"], (2320, 2470))
+        self.assertEqual(timings["lambda_handlers.worker.handler"], (900, 3490))
+        self.assertNotIn("imported package", timings)
+
+    def test_check_budget_reports_each_violation(self) -> None:
+        report = {
+            "module": "lambda_handlers.worker.handler",
+            "total_ms": 120.0,
+            "modules_loaded": ["ssl", "json"],
+            "cumulative_ms": {"richpanel_middleware.automation.router": 30.0},
+        }
+        budget = {
+            "forbidden_modules": ["ssl", "http.client"],
+            "max_total_ms": 100,
+            "max_module_ms": {"richpanel_middleware.automation.router": 25},
+        }
+        violations = report_module.check_budget(report, budget)
+        self.assertEqual(len(violations), 3)
+        self.assertIn("ssl is loaded at import time", violations)
+        budget.update(max_total_ms=150, max_module_ms={}, forbidden_modules=[])
+        self.assertEqual(report_module.check_budget(report, budget), [])
+
+
+class ColdPathTests(unittest.TestCase):
+    def test_worker_import_skips_forbidden_modules(self) -> None:
+        budget = report_module.load_budget()
+        report = report_module.measure(runs=1)
+        # Wall-clock ceilings are checked by the CLI; CI only gates on what loads.
+        violations = report_module.check_budget(
+            report, {"forbidden_modules": budget["forbidden_modules"]}
+        )
+        self.assertEqual(violations, [])
+        self.assertGreater(report["total_ms"], 0)
+
+    def test_deferred_pipeline_names_resolve_on_call(self) -> None:
+        self.assertEqual(pipeline.compute_delivery_estimate.__name__, "compute_delivery_estimate")
+        self.assertEqual(
+            pipeline.normalize_shipping_method("Standard Shipping"),
+            delivery_estimate.normalize_shipping_method("Standard Shipping"),
+        )
+
+    def test_integrations_package_exports_resolve_lazily(self) -> None:
+        from richpanel_middleware.integrations.shopify import ShopifyClient
+
+        self.assertIs(integrations.ShopifyClient, ShopifyClient)
+        self.assertIn("ShipStationClient", dir(integrations))
+        self.assertEqual(sorted(integrations.__all__), sorted(integrations._EXPORTS))
+        with self.assertRaises(AttributeError):
+            integrations.NotAClient  # noqa: B018
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(ParseAndBudgetTests))
+    suite.addTests(loader.loadTestsFromTestCase(ColdPathTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+os.environ.setdefault("CONVERSATION_STATE_TABLE_NAME", "local-conversation-state")
+os.environ.setdefault("AUDIT_TRAIL_TABLE_NAME", "local-audit-trail")
+
+from lambda_handlers.worker import handler as worker  # noqa: E402
+
+
+class _FakeSSM:
+    def __init__(self, safe_mode: str = "false", automation_enabled: str = "true") -> None:
+        self.values = {
+            worker.SAFE_MODE_PARAM: safe_mode,
+            worker.AUTOMATION_ENABLED_PARAM: automation_enabled,
+        }
+        self.version = 1
+        self.calls = 0
+        self.error: Optional[Exception] = None
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_parameters(self, Names: List[str], WithDecryption: bool = False) -> Dict[str, Any]:
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {
+            "Parameters": [
+                {"Name": name, "Value": self.values[name], "Version": self.version}
+                for name in Names
+            ]
+        }
+
+
+class KillSwitchCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.saved = (worker.boto3, worker._SSM_CLIENT, dict(worker._FLAG_CACHE))
+        self.ssm = _FakeSSM()
+        worker.boto3 = object()  # type: ignore
+        worker._SSM_CLIENT = self.ssm  # type: ignore
+        worker._FLAG_CACHE.clear()
+        worker._FLAG_CACHE.update(
+            {"safe_mode": True, "automation_enabled": False, "expires_at": 0.0}
+        )
+
+    def tearDown(self) -> None:
+        self.ssm.release.set()
+        for thread in threading.enumerate():
+            if thread.name == "kill-switch-refresh":
+                thread.join(5)
+        worker.boto3, worker._SSM_CLIENT, flags = self.saved
+        worker._FLAG_CACHE.clear()
+        worker._FLAG_CACHE.update(flags)
+
+    def _make_stale(self, seconds: float = 1.0) -> None:
+        worker._FLAG_CACHE["expires_at"] = time.time() - seconds
+
+    def _wait_for_refresh(self) -> None:
+        with worker._FLAG_REFRESH:
+            self.assertTrue(
+                worker._FLAG_REFRESH.wait_for(lambda: not worker._FLAG_REFRESHING, timeout=5)
+            )
+
+    def test_stale_flags_are_served_while_one_background_refresh_runs(self) -> None:
+        self.assertEqual(worker._load_kill_switches(), (False, True))
+        self.ssm.values[worker.SAFE_MODE_PARAM] = "true"
+        self.ssm.version = 2
+        self.ssm.release.clear()
+        self._make_stale()
+
+        started = time.perf_counter()
+        results = [worker._load_kill_switches() for _ in range(5)]
+        self.assertLess(time.perf_counter() - started, 1.0)
+        self.assertEqual(results, [(False, True)] * 5)
+        self.assertTrue(worker._FLAG_REFRESHING)
+
+        self.ssm.release.set()
+        self._wait_for_refresh()
+        self.assertEqual(worker._load_kill_switches(), (True, False))
+        self.assertEqual(self.ssm.calls, 2)
+
+    def test_concurrent_callers_past_hard_ttl_share_one_read(self) -> None:
+        self.ssm.release.clear()
+        results: List[Any] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(worker._load_kill_switches()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        self.ssm.release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, [(False, True)] * 4)
+        self.assertEqual(self.ssm.calls, 1)
+
+    def test_failed_background_refresh_keeps_flags_until_hard_ttl(self) -> None:
+        worker._load_kill_switches()
+        self.ssm.error = RuntimeError("ThrottlingException")
+        self._make_stale()
+        with self.assertLogs(level="WARNING") as logs:
+            self.assertEqual(worker._load_kill_switches(), (False, True))
+            self._wait_for_refresh()
+        self.assertIn("worker.flag_refresh_failed", logs.output[0])
+        # Backed off: the next stale read does not call SSM again.
+        self.assertEqual(worker._load_kill_switches(), (False, True))
+        self.assertEqual(self.ssm.calls, 2)
+
+        self._make_stale(worker.FLAG_CACHE_HARD_TTL_SECONDS)
+        with self.assertLogs(level="ERROR"):
+            self.assertEqual(worker._load_kill_switches(), (True, False))
+        self.assertEqual(self.ssm.calls, 3)
+
+    def test_unchanged_parameter_versions_keep_parsed_flags(self) -> None:
+        worker._load_kill_switches()
+        self.ssm.values[worker.SAFE_MODE_PARAM] = "true"
+        self._make_stale(worker.FLAG_CACHE_HARD_TTL_SECONDS)
+        self.assertEqual(worker._load_kill_switches(), (False, True))
+        self.assertGreater(worker._FLAG_CACHE["expires_at"], time.time())
+
+        self.ssm.version = 2
+        self._make_stale(worker.FLAG_CACHE_HARD_TTL_SECONDS)
+        self.assertEqual(worker._load_kill_switches(), (True, False))
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(KillSwitchCacheTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
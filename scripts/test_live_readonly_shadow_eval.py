@@ -3438,6 +3438,287 @@ class LiveReadonlyShadowEvalOpenAITests(unittest.TestCase):
             self.assertEqual(payload["shopify_probe"]["error"]["type"], "shopify_error")
 
 
+class _MultiTicketStubClient:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, str]] = []
+
+    def request(self, method: str, path: str, **kwargs) -> _StubResponse:
+        self.requests.append((method, path))
+        if path.startswith("/v1/tickets/"):
+            ticket_id = path.rsplit("/", 1)[-1]
+            payload = {
+                "ticket": {
+                    "id": ticket_id,
+                    "conversation_id": f"conv-{ticket_id}",
+                    "order": {"order_id": f"order-{ticket_id}"},
+                }
+            }
+            return _StubResponse(payload)
+        return _StubResponse({}, status_code=404)
+
+
+class LiveReadonlyShadowEvalConcurrencyTests(unittest.TestCase):
+    def test_summarize_timing_includes_stage_percentiles(self) -> None:
+        timing = shadow_eval._summarize_timing(
+            [0.1, 0.2, 0.3],
+            run_duration_seconds=0.4,
+            stage_durations={"order_lookup": [0.05, 0.1, 0.2]},
+            concurrency=3,
+        )
+        self.assertEqual(timing["ticket_p50_seconds"], 0.2)
+        self.assertEqual(timing["concurrency"], 3)
+        self.assertEqual(
+            set(timing["stages"].keys()), set(shadow_eval.SHADOW_STAGES)
+        )
+        lookup = timing["stages"]["order_lookup"]
+        self.assertEqual(lookup["count"], 3)
+        self.assertEqual(lookup["p50_seconds"], 0.1)
+        self.assertEqual(lookup["p99_seconds"], 0.2)
+        self.assertEqual(timing["stages"]["pipeline"]["count"], 0)
+
+    def test_summarize_timing_without_stages_is_unchanged(self) -> None:
+        timing = shadow_eval._summarize_timing([], run_duration_seconds=1.0)
+        self.assertNotIn("stages", timing)
+        self.assertEqual(timing["ticket_p95_seconds"], 0.0)
+
+    def test_concurrent_outcomes_preserve_input_order(self) -> None:
+        refs = [f"t-{index}" for index in range(6)]
+        delays = {"t-0": 0.05, "t-1": 0.0, "t-2": 0.03, "t-3": 0.0}
+        built_clients: list[_MultiTicketStubClient] = []
+
+        def _factory() -> _MultiTicketStubClient:
+            client = _MultiTicketStubClient()
+            built_clients.append(client)
+            return client
+
+        def _slow_lookup(envelope, **kwargs):
+            order_id = envelope.payload.get("order_id", "")
+            ref = str(order_id).replace("order-", "")
+            shadow_eval.time.sleep(delays.get(ref, 0.01))
+            return {}
+
+        plan = SimpleNamespace(actions=[], routing=None)
+        options = shadow_eval._TicketEvalOptions(
+            shopify_client=None,
+            skip_conversations=True,
+            shopify_gate=shadow_eval.threading.BoundedSemaphore(2),
+            openai_gate=shadow_eval.threading.BoundedSemaphore(1),
+        )
+        with mock.patch.object(
+            shadow_eval, "lookup_order_summary", side_effect=_slow_lookup
+        ), mock.patch.object(
+            shadow_eval, "plan_actions", return_value=plan
+        ), mock.patch.object(
+            shadow_eval, "normalize_event", return_value=SimpleNamespace()
+        ):
+            outcomes = list(
+                shadow_eval._iter_ticket_outcomes(
+                    refs,
+                    options=options,
+                    rp_client=_MultiTicketStubClient(),
+                    client_factory=_factory,
+                    concurrency=3,
+                )
+            )
+
+        self.assertEqual(
+            [outcome.result["ticket_id_redacted"] for outcome in outcomes],
+            [shadow_eval._redact_identifier(ref) for ref in refs],
+        )
+        self.assertLessEqual(len(built_clients), 3)
+        self.assertEqual(
+            sum(len(client.requests) for client in built_clients), len(refs)
+        )
+        for outcome in outcomes:
+            self.assertIn("order_lookup", outcome.stage_seconds)
+            self.assertIn("pipeline", outcome.stage_seconds)
+
+    def test_concurrent_outcomes_propagate_fatal_errors(self) -> None:
+        options = shadow_eval._TicketEvalOptions(shopify_client=None)
+        with mock.patch.object(
+            shadow_eval, "_fetch_ticket", side_effect=SystemExit("fatal")
+        ):
+            with self.assertRaises(SystemExit):
+                list(
+                    shadow_eval._iter_ticket_outcomes(
+                        ["t-1", "t-2"],
+                        options=options,
+                        rp_client=_MultiTicketStubClient(),
+                        client_factory=_MultiTicketStubClient,
+                        concurrency=2,
+                    )
+                )
+
+    def test_main_concurrent_mode_skips_startup_wait(self) -> None:
+        env = {
+            "MW_ENV": "dev",
+            "MW_ALLOW_NETWORK_READS": "true",
+            "RICHPANEL_WRITE_DISABLED": "true",
+            "RICHPANEL_READ_ONLY": "true",
+            "RICHPANEL_OUTBOUND_ENABLED": "false",
+        }
+        plan = SimpleNamespace(actions=[], routing=None)
+        with TemporaryDirectory() as tmpdir, mock.patch.dict(
+            os.environ, _with_openai_env(env), clear=True
+        ):
+            paths = (
+                Path(tmpdir) / "artifact.json",
+                Path(tmpdir) / "summary.json",
+                Path(tmpdir) / "report.md",
+                Path(tmpdir) / "trace.json",
+            )
+            argv = [
+                "live_readonly_shadow_eval.py",
+                "--ticket-id",
+                "t-1",
+                "--ticket-id",
+                "t-2",
+                "--ticket-id",
+                "t-3",
+                "--allow-non-prod",
+                "--no-preflight-secrets",
+                "--concurrency",
+                "3",
+            ]
+            with mock.patch.object(sys, "argv", argv), mock.patch.object(
+                shadow_eval,
+                "_build_richpanel_client",
+                side_effect=lambda **kwargs: _MultiTicketStubClient(),
+            ), mock.patch.object(
+                shadow_eval, "_resolve_output_paths", return_value=paths
+            ), mock.patch.object(
+                shadow_eval, "normalize_event", return_value=SimpleNamespace()
+            ), mock.patch.object(
+                shadow_eval, "plan_actions", return_value=plan
+            ), mock.patch.object(
+                shadow_eval, "lookup_order_summary", return_value={}
+            ), mock.patch.object(
+                shadow_eval.time, "sleep"
+            ) as sleep_mock:
+                result = shadow_eval.main()
+                rate_limit_rps = os.environ.get("RICHPANEL_RATE_LIMIT_RPS")
+            self.assertEqual(result, 0)
+            sleep_mock.assert_not_called()
+            self.assertEqual(rate_limit_rps, "1.0")
+            payload = json.loads(paths[0].read_text(encoding="utf-8"))
+            self.assertEqual(
+                [ticket["ticket_id_redacted"] for ticket in payload["tickets"]],
+                [shadow_eval._redact_identifier(ref) for ref in ("t-1", "t-2", "t-3")],
+            )
+            summary = json.loads(paths[1].read_text(encoding="utf-8"))
+            self.assertEqual(summary["timing"]["concurrency"], 3)
+            self.assertEqual(summary["timing"]["stages"]["ticket_fetch"]["count"], 3)
+
+
+class LiveReadonlyShadowEvalResumeTests(unittest.TestCase):
+    def test_resume_skips_checkpointed_tickets(self) -> None:
+        env = {
+            "MW_ENV": "dev",
+            "MW_ALLOW_NETWORK_READS": "true",
+            "RICHPANEL_WRITE_DISABLED": "true",
+            "RICHPANEL_READ_ONLY": "true",
+            "RICHPANEL_OUTBOUND_ENABLED": "false",
+        }
+        plan = SimpleNamespace(actions=[], routing=None)
+        with TemporaryDirectory() as tmpdir, mock.patch.dict(
+            os.environ, _with_openai_env(env), clear=True
+        ):
+            paths = (
+                Path(tmpdir) / "artifact.json",
+                Path(tmpdir) / "summary.json",
+                Path(tmpdir) / "report.md",
+                Path(tmpdir) / "trace.json",
+            )
+            base_argv = [
+                "live_readonly_shadow_eval.py",
+                "--allow-non-prod",
+                "--no-preflight-secrets",
+            ]
+            first_argv = base_argv + ["--run-id", "run-1"]
+            for ref in ("t-1", "t-2", "t-3"):
+                first_argv += ["--ticket-id", ref]
+            first_client = _MultiTicketStubClient()
+            with mock.patch.object(sys, "argv", first_argv), mock.patch.object(
+                shadow_eval, "_build_richpanel_client", return_value=first_client
+            ), mock.patch.object(
+                shadow_eval, "_resolve_output_paths", return_value=paths
+            ), mock.patch.object(
+                shadow_eval, "normalize_event", return_value=SimpleNamespace()
+            ), mock.patch.object(
+                shadow_eval, "plan_actions", side_effect=[plan, KeyboardInterrupt()]
+            ), mock.patch.object(
+                shadow_eval, "lookup_order_summary", return_value={}
+            ), mock.patch.object(shadow_eval.time, "sleep"):
+                with self.assertRaises(KeyboardInterrupt):
+                    shadow_eval.main()
+            self.assertFalse(paths[0].exists())
+
+            resumed_client = _MultiTicketStubClient()
+            with mock.patch.object(
+                sys, "argv", base_argv + ["--resume", "run-1"]
+            ), mock.patch.object(
+                shadow_eval, "_build_richpanel_client", return_value=resumed_client
+            ), mock.patch.object(
+                shadow_eval, "_resolve_output_paths", return_value=paths
+            ), mock.patch.object(
+                shadow_eval, "normalize_event", return_value=SimpleNamespace()
+            ), mock.patch.object(
+                shadow_eval, "plan_actions", return_value=plan
+            ), mock.patch.object(
+                shadow_eval, "lookup_order_summary", return_value={}
+            ), mock.patch.object(shadow_eval.time, "sleep"):
+                self.assertEqual(shadow_eval.main(), 0)
+
+            fetched = {
+                path
+                for _method, path in resumed_client.requests
+                if path.startswith("/v1/tickets/")
+            }
+            self.assertNotIn("/v1/tickets/t-1", fetched)
+            self.assertIn("/v1/tickets/t-2", fetched)
+            payload = json.loads(paths[0].read_text(encoding="utf-8"))
+            self.assertEqual(payload["run_id"], "run-1")
+            self.assertEqual(
+                [ticket["ticket_id_redacted"] for ticket in payload["tickets"]],
+                [shadow_eval._redact_identifier(ref) for ref in ("t-1", "t-2", "t-3")],
+            )
+
+    def test_resume_without_checkpoint_fails(self) -> None:
+        env = {
+            "MW_ENV": "dev",
+            "MW_ALLOW_NETWORK_READS": "true",
+            "RICHPANEL_WRITE_DISABLED": "true",
+            "RICHPANEL_READ_ONLY": "true",
+            "RICHPANEL_OUTBOUND_ENABLED": "false",
+        }
+        with TemporaryDirectory() as tmpdir, mock.patch.dict(
+            os.environ, _with_openai_env(env), clear=True
+        ):
+            paths = (
+                Path(tmpdir) / "artifact.json",
+                Path(tmpdir) / "summary.json",
+                Path(tmpdir) / "report.md",
+                Path(tmpdir) / "trace.json",
+            )
+            argv = [
+                "live_readonly_shadow_eval.py",
+                "--allow-non-prod",
+                "--no-preflight-secrets",
+                "--resume",
+                "missing-run",
+            ]
+            with mock.patch.object(sys, "argv", argv), mock.patch.object(
+                shadow_eval,
+                "_build_richpanel_client",
+                return_value=_MultiTicketStubClient(),
+            ), mock.patch.object(
+                shadow_eval, "_resolve_output_paths", return_value=paths
+            ):
+                with self.assertRaises(SystemExit) as ctx:
+                    shadow_eval.main()
+            self.assertIn("No checkpoint found", str(ctx.exception))
+
+
 def main() -> int:  # pragma: no cover
     suite = unittest.defaultTestLoader.loadTestsFromTestCase(
         LiveReadonlyShadowEvalGuardTests
@@ -3447,6 +3728,16 @@ def main() -> int:  # pragma: no cover
             LiveReadonlyShadowEvalHelpersTests
         )
     )
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(
+            LiveReadonlyShadowEvalConcurrencyTests
+        )
+    )
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(
+            LiveReadonlyShadowEvalResumeTests
+        )
+    )
     result = unittest.TextTestRunner(verbosity=2).run(suite)
     return 0 if result.wasSuccessful() else 1
 
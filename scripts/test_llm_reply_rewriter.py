@@ -19,7 +19,9 @@ from richpanel_middleware.automation import (  # noqa: E402
     llm_reply_rewriter as rewriter,
 )
 from richpanel_middleware.automation.llm_reply_rewriter import (  # noqa: E402
+    extract_reply_template,
     rewrite_reply,
+    rewrite_reply_template,
 )
 from richpanel_middleware.integrations.openai import (  # noqa: E402
     ChatCompletionResponse,
@@ -463,6 +465,128 @@ class ReplyRewriteTests(unittest.TestCase):
         self.assertEqual(result.body, rewritten)
 
 
+def _tracking_draft(tracking_number: str, carrier: str) -> tuple[str, dict]:
+    url = f"https://tracking.example.com/track/{tracking_number}"
+    body = (
+        "Here's the latest tracking information for your order:\n\n"
+        f"- Carrier: {carrier}\n"
+        f"- Tracking number: {tracking_number}\n"
+        f"- Tracking link: {url}\n"
+    )
+    values = {
+        "tracking_number": tracking_number,
+        "tracking_url": url,
+        "carrier": carrier,
+    }
+    return body, values
+
+
+class ReplyTemplateCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        os.environ["OPENAI_REPLY_REWRITE_ENABLED"] = "true"
+        rewriter.clear_template_cache()
+        self.addCleanup(os.environ.pop, "OPENAI_REPLY_REWRITE_ENABLED", None)
+        self.addCleanup(rewriter.clear_template_cache)
+
+    def _client(self, body: str) -> _FakeClient:
+        return _fake_client(
+            response=ChatCompletionResponse(
+                model="gpt-5.2-chat-latest",
+                message=json.dumps({"body": body, "confidence": 0.95, "risk_flags": []}),
+                status_code=200,
+                url="https://example.com",
+                raw={"id": "resp-template"},
+            )
+        )
+
+    def _rewrite(self, body: str, template, client, **kwargs):  # type: ignore[no-untyped-def]
+        return rewrite_reply_template(
+            body,
+            template,
+            conversation_id="t-tpl",
+            event_id="evt-tpl",
+            safe_mode=False,
+            automation_enabled=True,
+            allow_network=True,
+            outbound_enabled=True,
+            client=cast(OpenAIClient, client),
+            **kwargs,
+        )
+
+    def test_extract_template_round_trips(self) -> None:
+        body, values = _tracking_draft("1Z999AA10123456784", "UPS")
+        template = extract_reply_template(body, values)
+        assert template is not None
+        self.assertIn("{{tracking_number}}", template.text)
+        self.assertIn("{{tracking_url}}", template.text)
+        self.assertNotIn("1Z999AA10123456784", template.text)
+        self.assertEqual(template.fill(template.text), body)
+
+        other_body, other_values = _tracking_draft("9400111899223197428490", "USPS")
+        other = extract_reply_template(other_body, other_values)
+        assert other is not None
+        self.assertEqual(other.template_id, template.template_id)
+
+    def test_cache_hit_fills_values_without_second_call(self) -> None:
+        rewritten_template = (
+            "Good news! {{carrier}} tracking number {{tracking_number}} "
+            "is live at {{tracking_url}}."
+        )
+        client = self._client(rewritten_template)
+        first_body, first_values = _tracking_draft("1Z999AA10123456784", "UPS")
+        second_body, second_values = _tracking_draft("1Z999AA10123456799", "UPS")
+
+        first = self._rewrite(
+            first_body, extract_reply_template(first_body, first_values), client
+        )
+        second = self._rewrite(
+            second_body, extract_reply_template(second_body, second_values), client
+        )
+
+        self.assertEqual(client.calls, 1)
+        self.assertTrue(first.rewritten)
+        self.assertEqual(first.template_cache, "miss")
+        self.assertEqual(first.response_id, "resp-template")
+        self.assertTrue(second.rewritten)
+        self.assertEqual(second.template_cache, "hit")
+        self.assertFalse(second.llm_called)
+        self.assertEqual(second.response_id_unavailable_reason, "template_cache_hit")
+        self.assertIn("1Z999AA10123456799", second.body)
+        self.assertIn(
+            "https://tracking.example.com/track/1Z999AA10123456799", second.body
+        )
+        self.assertNotIn("1Z999AA10123456784", second.body)
+
+    def test_dropped_placeholder_fails_closed(self) -> None:
+        client = self._client("Your {{carrier}} package is on the way.")
+        body, values = _tracking_draft("1Z999AA10123456784", "UPS")
+        template = extract_reply_template(body, values)
+
+        result = self._rewrite(body, template, client)
+
+        self.assertFalse(result.rewritten)
+        self.assertEqual(result.reason, "missing_placeholders")
+        self.assertEqual(result.body, body)
+
+    def test_cache_entry_expires_after_ttl(self) -> None:
+        client = self._client(
+            "{{carrier}}: {{tracking_number}} ({{tracking_url}})"
+        )
+        body, values = _tracking_draft("1Z999AA10123456784", "UPS")
+        template = extract_reply_template(body, values)
+        now = [1000.0]
+
+        self._rewrite(body, template, client, clock=lambda: now[0])
+        now[0] += rewriter.TEMPLATE_CACHE_TTL_SECONDS - 1
+        cached = self._rewrite(body, template, client, clock=lambda: now[0])
+        now[0] += 2
+        refreshed = self._rewrite(body, template, client, clock=lambda: now[0])
+
+        self.assertEqual(cached.template_cache, "hit")
+        self.assertEqual(refreshed.template_cache, "miss")
+        self.assertEqual(client.calls, 2)
+
+
 class ReplyRewriteHelperTests(unittest.TestCase):
     def test_extract_urls_and_tracking_tokens(self) -> None:
         text = (
@@ -645,6 +769,9 @@ class ReplyRewriteHelperTests(unittest.TestCase):
 
 def main() -> int:
     suite = unittest.defaultTestLoader.loadTestsFromTestCase(ReplyRewriteTests)
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(ReplyTemplateCacheTests)
+    )
     result = unittest.TextTestRunner(verbosity=2).run(suite)
     return 0 if result.wasSuccessful() else 1
 
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from richpanel_middleware.automation import llm_routing, local_intent_model  # noqa: E402
+from richpanel_middleware.automation.llm_routing import compute_dual_routing  # noqa: E402
+from richpanel_middleware.automation.local_intent_model import (  # noqa: E402
+    DEFAULT_MODEL_PATH,
+    LocalIntentModel,
+    LocalIntentPrediction,
+    train_local_intent_model,
+)
+from richpanel_middleware.automation.order_status_intent import (  # noqa: E402
+    classify_order_status_intent,
+)
+from richpanel_middleware.integrations.openai import OpenAIRequestError  # noqa: E402
+import train_local_intent_model as trainer  # noqa: E402
+
+GOLDEN = SCRIPTS / "fixtures" / "intent_eval" / "order_status_golden.jsonl"
+
+
+class _CountingClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def chat_completion(self, request, *, safe_mode, automation_enabled):  # type: ignore[no-untyped-def]
+        self.calls += 1
+        raise AssertionError("LLM should not be called")
+
+
+class _OfflineClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def chat_completion(self, request, *, safe_mode, automation_enabled):  # type: ignore[no-untyped-def]
+        self.calls += 1
+        raise OpenAIRequestError("offline")
+
+
+class LocalIntentModelTests(unittest.TestCase):
+    def test_training_separates_golden_labels(self) -> None:
+        examples = trainer.load_golden_examples(GOLDEN)
+        model = train_local_intent_model(examples)
+
+        self.assertTrue(model.predict("Where is my order #1234?").is_order_status)
+        self.assertFalse(model.predict("I want a refund for my purchase.").is_order_status)
+
+    def test_artifact_round_trip_keeps_version(self) -> None:
+        model = train_local_intent_model([("where is my order", True), ("refund please", False)])
+        restored = LocalIntentModel.from_dict(json.loads(json.dumps(model.to_dict())))
+
+        self.assertEqual(restored.version, model.version)
+        self.assertAlmostEqual(
+            restored.predict_proba("where is my package"),
+            model.predict_proba("where is my package"),
+            places=6,
+        )
+
+    def test_tampered_artifact_is_rejected(self) -> None:
+        payload = train_local_intent_model([("where is my order", True)]).to_dict()
+        payload["bias"] = payload["bias"] + 1.0
+        with self.assertRaises(ValueError):
+            LocalIntentModel.from_dict(payload)
+
+    def test_committed_artifact_loads(self) -> None:
+        model = local_intent_model.load_local_intent_model(DEFAULT_MODEL_PATH)
+        assert model is not None
+        self.assertTrue(model.version.startswith("local-intent-"))
+        # Trained on the golden sets plus the shadow-eval LLM labels, and its
+        # cross-validation backs the default confidence threshold.
+        self.assertGreater(model.metadata["cross_validation"]["rows"], 1000)
+        default = next(
+            row
+            for row in model.metadata["cross_validation"]["thresholds"]
+            if row["min_confidence"] == local_intent_model.DEFAULT_MIN_CONFIDENCE
+        )
+        self.assertGreaterEqual(default["accuracy_on_avoided"], 0.98)
+        self.assertLessEqual(default["false_order_status_on_avoided"], 2)
+
+    def test_dedupe_drops_repeats_and_conflicting_labels(self) -> None:
+        examples, conflicting = trainer.dedupe_examples(
+            [
+                ("Where is my order?", True),
+                ("where is  my ORDER?", True),
+                ("1108876", True),
+                ("1108876", False),
+                ("Refund please", False),
+            ]
+        )
+        self.assertEqual(examples, [("Where is my order?", True), ("Refund please", False)])
+        self.assertEqual(conflicting, 1)
+
+    def test_cross_validation_reports_avoided_calls(self) -> None:
+        examples = trainer.load_golden_examples(GOLDEN)
+        scored = trainer.cross_validate(examples, folds=4, seed=7, epochs=50)
+        summary = trainer.summarize(scored, [0.0, 1.01])
+
+        self.assertEqual(summary["rows"], len(examples))
+        # Rows only count as answered locally where the router agrees.
+        agreeing = sum(1 for *_, agrees in scored if agrees)
+        self.assertLess(agreeing, len(examples))
+        self.assertEqual(summary["thresholds"][0]["llm_calls_avoided"], agreeing)
+        self.assertEqual(summary["thresholds"][1]["llm_calls_avoided"], 0)
+
+
+class LocalIntentTierTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        artifact = Path(tmp.name) / "model.json"
+        model = train_local_intent_model(trainer.load_golden_examples(GOLDEN))
+        artifact.write_text(json.dumps(model.to_dict()), encoding="utf-8")
+        patcher = mock.patch.dict(
+            os.environ,
+            {
+                "MW_LOCAL_INTENT_MODEL_ENABLED": "true",
+                "MW_LOCAL_INTENT_MODEL_PATH": str(artifact),
+                "MW_LOCAL_INTENT_MIN_CONFIDENCE": "0.6",
+                "MW_OPENAI_INTENT_ENABLED": "true",
+                "MW_OPENAI_ROUTING_ENABLED": "true",
+                "MW_OPENAI_ROUTING_PRIMARY": "true",
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        local_intent_model.clear_local_intent_model_cache()
+        self.addCleanup(local_intent_model.clear_local_intent_model_cache)
+
+    def test_confident_intent_skips_llm(self) -> None:
+        client = _CountingClient()
+        artifact = classify_order_status_intent(
+            "Where is my order #1234? Need the tracking number.",
+            conversation_id="c",
+            event_id="e",
+            safe_mode=False,
+            automation_enabled=True,
+            allow_network=True,
+            outbound_enabled=True,
+            client=client,  # type: ignore[arg-type]
+        )
+
+        self.assertEqual(client.calls, 0)
+        self.assertFalse(artifact.llm_called)
+        self.assertEqual(artifact.response_id_unavailable_reason, "local_model")
+        assert artifact.result is not None
+        self.assertTrue(artifact.result.is_order_status)
+        self.assertEqual(artifact.result.extracted_order_number, "1234")
+
+    def test_intent_asks_llm_when_router_disagrees_with_local_model(self) -> None:
+        client = _OfflineClient()
+        prediction = LocalIntentPrediction(
+            is_order_status=True, probability=0.99, confidence=0.98, model_version="local-intent-x"
+        )
+        with mock.patch.object(llm_routing, "confident_local_prediction", return_value=prediction):
+            artifact = classify_order_status_intent(
+                "I want a refund for my purchase.",
+                conversation_id="c",
+                event_id="e",
+                safe_mode=False,
+                automation_enabled=True,
+                allow_network=True,
+                outbound_enabled=True,
+                client=client,  # type: ignore[arg-type]
+            )
+
+        self.assertEqual(client.calls, 1)
+        self.assertTrue(artifact.llm_called)
+        self.assertNotEqual(artifact.response_id_unavailable_reason, "local_model")
+
+    def test_gated_intent_does_not_use_local_model(self) -> None:
+        artifact = classify_order_status_intent(
+            "Where is my order?",
+            conversation_id="c",
+            event_id="e",
+            safe_mode=True,
+            automation_enabled=True,
+            allow_network=True,
+            outbound_enabled=True,
+        )
+        self.assertEqual(artifact.gated_reason, "safe_mode")
+        self.assertIsNone(artifact.result)
+
+    def test_routing_keeps_deterministic_when_local_model_agrees(self) -> None:
+        client = _CountingClient()
+        routing, artifact = compute_dual_routing(
+            {"customer_message": "Where is my order? Need a tracking update."},
+            conversation_id="c",
+            event_id="e",
+            safe_mode=False,
+            automation_enabled=True,
+            allow_network=True,
+            outbound_enabled=True,
+            client=client,  # type: ignore[arg-type]
+        )
+
+        self.assertEqual(client.calls, 0)
+        self.assertEqual(artifact.primary_source, "deterministic")
+        assert artifact.llm_suggestion is not None
+        self.assertEqual(artifact.llm_suggestion["source"], "local_model")
+        self.assertFalse(artifact.llm_suggestion["llm_called"])
+        self.assertEqual(routing.intent, artifact.deterministic["intent"])
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(LocalIntentModelTests))
+    suite.addTests(loader.loadTestsFromTestCase(LocalIntentTierTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
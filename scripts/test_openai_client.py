@@ -3,7 +3,9 @@ from __future__ import annotations
 import json
 import os
 import sys
+import threading
 import unittest
+from unittest import mock
 from pathlib import Path
 from typing import Optional
 
@@ -13,6 +15,17 @@ if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
 
 from integrations.openai import OpenAIClient as BoundaryOpenAIClient  # noqa: E402
+from richpanel_middleware.automation.llm_reply_rewriter import (  # noqa: E402
+    _build_prompt as build_rewrite_prompt,
+)
+from richpanel_middleware.automation.llm_routing import (  # noqa: E402
+    _build_routing_prompt,
+)
+from richpanel_middleware.automation.order_status_prompts import (  # noqa: E402
+    OrderStatusReplyContext,
+    build_order_status_intent_prompt,
+    build_order_status_reply_prompt,
+)
 from richpanel_middleware.automation.prompts import (  # noqa: E402
     ORDER_STATUS_SYSTEM_PROMPT,
     build_order_status_contract,
@@ -22,10 +35,16 @@ from richpanel_middleware.automation.prompts import (  # noqa: E402
 )
 from richpanel_middleware.integrations.openai import (  # noqa: E402
     ChatCompletionRequest,
+    ChatCompletionUsage,
     ChatMessage,
+    LatencyHistogram,
     OpenAIClient,
+    OpenAIRequestError,
+    PromptCacheStats,
+    TransportError,
     TransportRequest,
     TransportResponse,
+    reset_fast_model_fallbacks,
 )
 
 FIXTURES = ROOT / "scripts" / "fixtures" / "order_status_samples.json"
@@ -310,8 +329,267 @@ class OpenAIClientTests(unittest.TestCase):
             request.to_payload()
 
 
+def _ok_response(model: str) -> TransportResponse:
+    body = {"model": model, "choices": [{"message": {"content": "ok"}}]}
+    return TransportResponse(
+        status_code=200, headers={}, body=json.dumps(body).encode("utf-8")
+    )
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class OpenAIClientLatencyTests(unittest.TestCase):
+    def setUp(self) -> None:
+        reset_fast_model_fallbacks()
+        self.addCleanup(reset_fast_model_fallbacks)
+        patcher = mock.patch.dict(
+            os.environ,
+            {
+                "OPENAI_HEDGE_ENABLED": "false",
+                "OPENAI_FAST_MODEL": "gpt-fast",
+                "OPENAI_MAX_ATTEMPTS": "3",
+            },
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _request(self, **kwargs) -> ChatCompletionRequest:  # type: ignore[no-untyped-def]
+        return ChatCompletionRequest(
+            model="gpt-slow",
+            messages=[ChatMessage(role="user", content="hi")],
+            **kwargs,
+        )
+
+    def test_histogram_percentiles_roll_over_window(self) -> None:
+        histogram = LatencyHistogram(window=10)
+        for value in range(1, 21):
+            histogram.record("m", value / 10)
+
+        self.assertEqual(histogram.count("m"), 10)
+        self.assertAlmostEqual(histogram.percentile("m", 50) or 0, 1.5)
+        self.assertAlmostEqual(histogram.percentile("m", 95) or 0, 2.0)
+        self.assertIsNone(histogram.percentile("other", 95))
+        self.assertEqual(histogram.snapshot()["m"]["p95_ms"], 2000.0)
+
+    def test_hedged_request_returns_first_answer(self) -> None:
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        class _SlowThenFastTransport:
+            def __init__(self) -> None:
+                self.calls = 0
+                self._lock = threading.Lock()
+
+            def send(self, request: TransportRequest) -> TransportResponse:
+                with self._lock:
+                    self.calls += 1
+                    call = self.calls
+                if call == 1:
+                    release.wait(5)
+                    return _ok_response("slow-primary")
+                return _ok_response("hedge")
+
+        histogram = LatencyHistogram()
+        for _ in range(20):
+            histogram.record("gpt-slow", 0.02)
+        transport = _SlowThenFastTransport()
+        with mock.patch.dict(os.environ, {"OPENAI_HEDGE_ENABLED": "true"}):
+            client = OpenAIClient(
+                api_key="test-key",
+                allow_network=True,
+                transport=transport,
+                latency_histogram=histogram,
+            )
+        response = client.chat_completion(
+            self._request(), safe_mode=False, automation_enabled=True
+        )
+
+        self.assertEqual(response.model, "hedge")
+        self.assertEqual(transport.calls, 2)
+
+    def test_budget_breach_falls_back_to_fast_model_for_call_type(self) -> None:
+        clock = _FakeClock()
+
+        class _TimeoutThenOkTransport:
+            def __init__(self) -> None:
+                self.models: list[str] = []
+                self.timeouts: list[float] = []
+
+            def send(self, request: TransportRequest) -> TransportResponse:
+                model = json.loads(request.body or b"{}")["model"]
+                self.models.append(model)
+                self.timeouts.append(request.timeout)
+                if model == "gpt-slow":
+                    clock.now += 5.0
+                    raise TransportError("timed out")
+                return _ok_response(model)
+
+        transport = _TimeoutThenOkTransport()
+        sleeps: list[float] = []
+        client = OpenAIClient(
+            api_key="test-key",
+            allow_network=True,
+            transport=transport,
+            sleeper=sleeps.append,
+            clock=clock,
+            latency_histogram=LatencyHistogram(),
+        )
+        request = self._request(call_type="reply_rewrite", latency_budget_seconds=4.0)
+
+        first = client.chat_completion(request, safe_mode=False, automation_enabled=True)
+        second = client.chat_completion(request, safe_mode=False, automation_enabled=True)
+
+        self.assertEqual(first.model, "gpt-fast")
+        self.assertEqual(second.model, "gpt-fast")
+        self.assertEqual(transport.models, ["gpt-slow", "gpt-fast", "gpt-fast"])
+        self.assertEqual(transport.timeouts[0], 4.0)
+        self.assertEqual(transport.timeouts[1], client.timeout_seconds)
+        self.assertEqual(sleeps, [])
+
+        # Other call types are not pinned and still start on their own model.
+        with self.assertRaises(OpenAIRequestError):
+            client.chat_completion(
+                self._request(call_type="routing"),
+                safe_mode=False,
+                automation_enabled=True,
+            )
+        self.assertEqual(transport.models[3], "gpt-slow")
+
+    def test_budget_breach_without_fast_model_stops_retrying(self) -> None:
+        clock = _FakeClock()
+
+        class _SlowFailingTransport:
+            calls = 0
+
+            def send(self, request: TransportRequest) -> TransportResponse:
+                self.calls += 1
+                clock.now += 5.0
+                raise TransportError("timed out")
+
+        transport = _SlowFailingTransport()
+        with mock.patch.dict(os.environ, {"OPENAI_FAST_MODEL": ""}):
+            client = OpenAIClient(
+                api_key="test-key",
+                allow_network=True,
+                transport=transport,
+                sleeper=lambda _delay: None,
+                clock=clock,
+                latency_histogram=LatencyHistogram(),
+            )
+        with self.assertRaises(OpenAIRequestError):
+            client.chat_completion(
+                self._request(call_type="routing", latency_budget_seconds=2.0),
+                safe_mode=False,
+                automation_enabled=True,
+            )
+        self.assertEqual(transport.calls, 1)
+
+
+class PromptCacheAccountingTests(unittest.TestCase):
+    def test_usage_block_is_parsed_with_cached_tokens(self) -> None:
+        body = {
+            "model": "gpt-5.2-chat-latest",
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {
+                "prompt_tokens": 1500,
+                "completion_tokens": 40,
+                "total_tokens": 1540,
+                "prompt_tokens_details": {"cached_tokens": 1280},
+            },
+        }
+        transport = _RecordingTransport(
+            TransportResponse(
+                status_code=200, headers={}, body=json.dumps(body).encode("utf-8")
+            )
+        )
+        stats = PromptCacheStats()
+        client = OpenAIClient(
+            api_key="test-key",
+            allow_network=True,
+            transport=transport,
+            prompt_cache_stats=stats,
+        )
+        response = client.chat_completion(
+            ChatCompletionRequest(
+                model="gpt-5.2-chat-latest",
+                messages=[ChatMessage(role="user", content="hi")],
+                call_type="routing",
+            ),
+            safe_mode=False,
+            automation_enabled=True,
+        )
+
+        self.assertEqual(
+            response.usage,
+            ChatCompletionUsage(
+                prompt_tokens=1500,
+                completion_tokens=40,
+                total_tokens=1540,
+                cached_tokens=1280,
+            ),
+        )
+        snapshot = stats.snapshot()["routing"]
+        self.assertEqual(snapshot["calls"], 1)
+        self.assertEqual(snapshot["cache_hit_calls"], 1)
+        self.assertAlmostEqual(snapshot["cache_hit_ratio"], 0.8533)
+
+    def test_prompt_prefixes_are_byte_stable(self) -> None:
+        builders = {
+            "routing": _build_routing_prompt,
+            "intent": lambda text: build_order_status_intent_prompt(
+                text, metadata={"ticket_channel": "email"}
+            ),
+            "reply": lambda text: build_order_status_reply_prompt(
+                context=OrderStatusReplyContext(tracking_number="1Z"),
+                draft_reply=text,
+            ),
+            "rewrite": build_rewrite_prompt,
+        }
+        for name, build in builders.items():
+            with self.subTest(prompt=name):
+                first = build("where is my order")
+                second = build("I need a refund for a damaged item")
+                self.assertGreater(len(first), 2)
+                self.assertEqual(first[:-1], second[:-1])
+                self.assertNotEqual(first[-1], second[-1])
+
+    def test_missing_or_malformed_usage_is_tolerated(self) -> None:
+        self.assertIsNone(ChatCompletionUsage.from_raw({}))
+        usage = ChatCompletionUsage.from_raw(
+            {"usage": {"prompt_tokens": "12", "prompt_tokens_details": None}}
+        )
+        self.assertEqual(usage, ChatCompletionUsage(prompt_tokens=12))
+
+    def test_stats_estimate_latency_saved_per_call_type(self) -> None:
+        stats = PromptCacheStats()
+        stats.record("intent", ChatCompletionUsage(prompt_tokens=1200), 900)
+        stats.record("intent", ChatCompletionUsage(prompt_tokens=1200), 1100)
+        stats.record(
+            "intent", ChatCompletionUsage(prompt_tokens=1200, cached_tokens=1024), 600
+        )
+        stats.record(None, ChatCompletionUsage(prompt_tokens=10), 50)
+
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["intent"]["mean_latency_ms_miss"], 1000.0)
+        self.assertEqual(snapshot["intent"]["mean_latency_ms_hit"], 600.0)
+        self.assertEqual(snapshot["intent"]["latency_saved_ms"], 400.0)
+        self.assertIsNone(snapshot["unspecified"]["latency_saved_ms"])
+
+
 def main() -> int:
     suite = unittest.defaultTestLoader.loadTestsFromTestCase(OpenAIClientTests)
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(OpenAIClientLatencyTests)
+    )
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(PromptCacheAccountingTests)
+    )
     result = unittest.TextTestRunner(verbosity=2).run(suite)
     return 0 if result.wasSuccessful() else 1
 
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+os.environ.setdefault("CONVERSATION_STATE_TABLE_NAME", "local-conversation-state")
+os.environ.setdefault("AUDIT_TRAIL_TABLE_NAME", "local-audit-trail")
+
+from handler_test_support import local_worker_patches, start_patches  # noqa: E402
+from lambda_handlers.worker import handler as worker  # noqa: E402
+from richpanel_middleware.automation import pipeline as pipeline_module  # noqa: E402
+from richpanel_middleware.automation.order_status_intent import (  # noqa: E402
+    OrderStatusIntentArtifact,
+    OrderStatusIntentResult,
+)
+from richpanel_middleware.automation.pipeline import (  # noqa: E402
+    RESOLVED_ORDER_ATTR,
+    execute_plan,
+    plan_actions,
+)
+from richpanel_middleware.commerce.order_lookup import (  # noqa: E402
+    SHOPIFY_ORDER_FIELDS_REFRESH,
+    lookup_order_summary,
+    resolved_order_for_state,
+)
+from richpanel_middleware.ingest.envelope import build_event_envelope  # noqa: E402
+from richpanel_middleware.integrations.shopify import ShopifyResponse  # noqa: E402
+
+STATE_TABLE = "local-conversation-state"
+RESOLVED = {
+    "order_id": "1001",
+    "order_number": "1001",
+    "resolvedBy": "shopify_email_name",
+    "confidence": "high",
+    "reason": "email_name_match",
+}
+
+
+def _order(number: int, *, tracking: Optional[str] = None) -> Dict[str, Any]:
+    order: Dict[str, Any] = {
+        "id": 9_000 + number,
+        "order_number": number,
+        "name": f"#{number}",
+        "email": "jane@example.com",
+        "customer": {"first_name": "Jane", "last_name": "Doe"},
+        "created_at": "2026-01-01T00:00:00Z",
+        "fulfillment_status": "fulfilled" if tracking else None,
+        "fulfillments": (
+            [{"tracking_numbers": [tracking], "tracking_company": "UPS"}]
+            if tracking
+            else []
+        ),
+    }
+    return order
+
+
+def _response(data: Dict[str, Any]) -> ShopifyResponse:
+    return ShopifyResponse(
+        status_code=200,
+        headers={},
+        body=json.dumps(data).encode("utf-8"),
+        url="https://shop.local",
+    )
+
+
+class _RecordingShopify:
+    def __init__(self, orders: List[Dict[str, Any]]) -> None:
+        self.orders = orders
+        self.calls: List[Dict[str, Any]] = []
+
+    def find_orders_by_name(self, name: str, **kwargs: Any) -> ShopifyResponse:
+        self.calls.append({"op": "name", "name": name, "fields": kwargs.get("fields")})
+        matches = [o for o in self.orders if o["name"] == name]
+        return _response({"orders": matches})
+
+    def list_orders_by_email(self, email: str, **kwargs: Any) -> ShopifyResponse:
+        self.calls.append({"op": "email", "email": email})
+        return _response({"orders": self.orders})
+
+    def get_order(self, order_id: str, **kwargs: Any) -> ShopifyResponse:
+        self.calls.append({"op": "get", "order_id": order_id})
+        return ShopifyResponse(status_code=404, headers={}, body=b"{}", url="")
+
+
+class _NoShipStation:
+    def list_shipments(self, *args: Any, **kwargs: Any) -> Any:
+        raise RuntimeError("ShipStation not expected")
+
+
+def _lookup(payload: Dict[str, Any], shopify: _RecordingShopify, **kwargs: Any) -> Dict[str, Any]:
+    return lookup_order_summary(
+        build_event_envelope(dict(payload, conversation_id="c-1")),
+        safe_mode=False,
+        automation_enabled=True,
+        allow_network=True,
+        shopify_client=shopify,  # type: ignore[arg-type]
+        shipstation_client=_NoShipStation(),  # type: ignore[arg-type]
+        **kwargs,
+    )
+
+
+FOLLOWUP = {
+    "customer_message": "Any news on my package?",
+    "email": "jane@example.com",
+    "customer_profile": {"first_name": "Jane", "last_name": "Doe"},
+}
+
+
+class LookupReuseTests(unittest.TestCase):
+    def test_first_message_resolves_and_is_persistable(self) -> None:
+        shopify = _RecordingShopify([_order(1001, tracking="1Z1"), _order(999)])
+        summary = _lookup(FOLLOWUP, shopify)
+        self.assertEqual([c["op"] for c in shopify.calls], ["email"])
+        self.assertEqual(resolved_order_for_state(summary), RESOLVED)
+
+    def test_followup_refreshes_fulfillment_only(self) -> None:
+        shopify = _RecordingShopify([_order(1001, tracking="1Z-NEW"), _order(999)])
+        summary = _lookup(FOLLOWUP, shopify, resolved_order=dict(RESOLVED))
+
+        self.assertEqual(shopify.calls, [
+            {"op": "name", "name": "#1001", "fields": SHOPIFY_ORDER_FIELDS_REFRESH}
+        ])
+        self.assertNotIn("email", SHOPIFY_ORDER_FIELDS_REFRESH)
+        self.assertNotIn("customer", SHOPIFY_ORDER_FIELDS_REFRESH)
+        self.assertEqual(summary["order_id"], "1001")
+        self.assertEqual(summary["tracking_number"], "1Z-NEW")
+        self.assertEqual(summary["order_resolution"]["reused_from"], "conversation_state")
+        self.assertEqual(resolved_order_for_state(summary), RESOLVED)
+
+    def test_same_order_number_mentioned_still_reuses(self) -> None:
+        shopify = _RecordingShopify([_order(1001, tracking="1Z1")])
+        payload = dict(FOLLOWUP, customer_message="Where is order #1001?")
+        summary = _lookup(payload, shopify, resolved_order=dict(RESOLVED))
+        self.assertEqual(len(shopify.calls), 1)
+        self.assertEqual(summary["order_resolution"]["reused_from"], "conversation_state")
+
+    def test_different_order_number_re_resolves(self) -> None:
+        shopify = _RecordingShopify([_order(1001), _order(2002, tracking="1Z2")])
+        payload = dict(FOLLOWUP, customer_message="And where is order #2002?")
+        summary = _lookup(payload, shopify, resolved_order=dict(RESOLVED))
+
+        self.assertEqual(shopify.calls[0]["name"], "#2002")
+        self.assertEqual(summary["order_id"], "2002")
+        self.assertEqual(summary["order_resolution"]["resolvedBy"], "richpanel_order_number")
+        stored = resolved_order_for_state(summary)
+        assert stored is not None
+        self.assertEqual(stored["order_number"], "2002")
+
+    def test_refresh_miss_falls_back_to_full_resolution(self) -> None:
+        shopify = _RecordingShopify([_order(999, tracking="1Z9")])
+        summary = _lookup(FOLLOWUP, shopify, resolved_order=dict(RESOLVED))
+        self.assertEqual([c["op"] for c in shopify.calls], ["name", "email"])
+        self.assertEqual(summary["order_id"], "999")
+
+    def test_offline_lookup_ignores_stored_resolution(self) -> None:
+        shopify = _RecordingShopify([])
+        summary = lookup_order_summary(
+            build_event_envelope(dict(FOLLOWUP, conversation_id="c-1")),
+            safe_mode=False,
+            automation_enabled=True,
+            allow_network=False,
+            shopify_client=shopify,  # type: ignore[arg-type]
+            resolved_order=dict(RESOLVED),
+        )
+        self.assertEqual(shopify.calls, [])
+        self.assertEqual(summary["order_id"], "unknown")
+
+    def test_only_confident_matches_are_persisted(self) -> None:
+        for resolution in (
+            {"resolvedBy": "no_match", "confidence": "low"},
+            {"resolvedBy": "shopify_email_only", "confidence": "medium"},
+        ):
+            self.assertIsNone(
+                resolved_order_for_state({"order_id": "1001", "order_resolution": resolution})
+            )
+        self.assertIsNone(
+            resolved_order_for_state(
+                {"order_id": "unknown", "order_resolution": {"resolvedBy": "x", "confidence": "high"}}
+            )
+        )
+
+
+class ConversationStateReuseTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patches = local_worker_patches(worker)
+        patches.append(mock.patch.object(worker, "CONVERSATION_STATE_TABLE_NAME", STATE_TABLE))
+        start_patches(self, patches)
+
+    def test_plan_carries_resolution_into_state_record(self) -> None:
+        envelope = build_event_envelope(dict(FOLLOWUP, conversation_id="c-1"))
+        plan = plan_actions(
+            envelope, safe_mode=True, automation_enabled=False, resolved_order=dict(RESOLVED)
+        )
+        self.assertEqual(execute_plan(envelope, plan).state_record[RESOLVED_ORDER_ATTR], RESOLVED)
+
+    def test_plan_passes_stored_resolution_to_lookup(self) -> None:
+        envelope = build_event_envelope(
+            dict(FOLLOWUP, conversation_id="c-1", customer_message="Where is my order?")
+        )
+        intent = OrderStatusIntentArtifact(
+            result=OrderStatusIntentResult(
+                is_order_status=True,
+                confidence=0.95,
+                reason="stubbed",
+                extracted_order_number=None,
+                language="en",
+            ),
+            llm_called=False,
+            model="gpt-test",
+            response_id=None,
+            response_id_unavailable_reason="stubbed",
+            confidence_threshold=0.85,
+            accepted=True,
+        )
+        with mock.patch.object(
+            pipeline_module, "classify_order_status_intent", return_value=intent
+        ), mock.patch.object(
+            pipeline_module, "lookup_order_summary", return_value={"order_id": "unknown"}
+        ) as lookup:
+            plan = plan_actions(
+                envelope,
+                safe_mode=False,
+                automation_enabled=True,
+                resolved_order=dict(RESOLVED),
+            )
+        self.assertEqual(lookup.call_args.kwargs["resolved_order"], RESOLVED)
+        self.assertEqual(plan.resolved_order, RESOLVED)
+
+    def test_state_round_trip_and_flag(self) -> None:
+        envelope = build_event_envelope(dict(FOLLOWUP, conversation_id="c-1"))
+        plan = plan_actions(
+            envelope, safe_mode=True, automation_enabled=False, resolved_order=dict(RESOLVED)
+        )
+        worker._execute_and_record(envelope, plan)
+        self.assertEqual(worker._load_conversation_state(envelope), {RESOLVED_ORDER_ATTR: RESOLVED})
+        with mock.patch.dict(os.environ, {"MW_ORDER_RESOLUTION_REUSE_ENABLED": "false"}):
+            self.assertEqual(worker._load_conversation_state(envelope), {})
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(LookupReuseTests))
+    suite.addTests(loader.loadTestsFromTestCase(ConversationStateReuseTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
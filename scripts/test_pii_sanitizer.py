@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from richpanel_middleware.automation import pii_sanitizer  # noqa: E402
+from richpanel_middleware.automation.pii_sanitizer import (  # noqa: E402
+    _sanitize_multi_pass,
+    sanitize_for_openai,
+)
+import bench_pii_sanitizer  # noqa: E402
+
+# Fragments chosen to hit every PII class, their boundaries and the inputs
+# where the multi-pass rewriting matters (adjacent matches, quoted tokens,
+# characters re.IGNORECASE folds onto ASCII letters).
+_FRAGMENTS = [
+    "order", "Order #", "order number ", "order no. ", "#", "12345", "555-123-4567",
+    "(555) 123 4567", "+1 555.123.4567", "john@example.com", "a.b+c@mail.co.uk",
+    "http://x.com/a?b=1", "https://shop.example.com/order/12345", "123 Main St",
+    "42 Oak Avenue.", "my name is John Smith", "This is Jane", "I'm Bob", "i am Alice Doe",
+    "hi John", "Hello there", "Dear Customer Team", "Thanks, Sam", "Regards\nJo Ann",
+    "best, Al", "cheers Tom Lee", "<b>", "</p>", '<div class="x">', "&amp;", "&lt;b&gt;",
+    "&nbsp;", "<", ">", " ", "  ", "\n", "\t", ".", ",", "!", "?", ":", "(", ")", "'", "-",
+    "_", "__ORDER_TOKEN_0__", "where is my package", "tracking", "5", "2024", "St",
+    "street", "way", "@", "x", "Y", "é", " ", " ", "İ am Ann", "ıf",
+    "ſincerely, Kim", "Kelly", "٣٤٥", "\x1c", "%", "a%b-c",
+    "x+15551234567", "y(555) 123-4567", "-foo@bar.io", ".e@f.gh", "9\nSt",
+    "order 12345@gmail.com", "Re order #12345@shop.com", "Order 5512@example.com",
+]
+
+
+def _random_text(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 25)):
+        parts.append(rng.choice(_FRAGMENTS))
+        if rng.random() < 0.5:
+            parts.append(rng.choice([" ", " ", "\n", "", ", "]))
+    return "".join(parts)
+
+
+class SanitizerEquivalenceTests(unittest.TestCase):
+    def _assert_equivalent(self, text: str, max_chars=2000) -> None:  # type: ignore[no-untyped-def]
+        self.assertEqual(
+            sanitize_for_openai(text, max_chars=max_chars),
+            _sanitize_multi_pass(text, max_chars=max_chars),
+            msg=repr(text),
+        )
+
+    def test_randomized_fragments_match_multi_pass(self) -> None:
+        rng = random.Random(20240537)
+        for _ in range(5000):
+            self._assert_equivalent(_random_text(rng), rng.choice([None, 2000, 40]))
+
+    def test_randomized_characters_match_multi_pass(self) -> None:
+        rng = random.Random(11)
+        alphabet = "aehimorst ST0123456789#@.+-()<>&;:,'\n_%/ıſ"
+        for _ in range(3000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 60)))
+            self._assert_equivalent(text, None)
+
+    def test_benchmark_corpus_matches_without_fallback(self) -> None:
+        corpus = bench_pii_sanitizer.build_corpus(12, seed=3)
+        with mock.patch.object(
+            pii_sanitizer, "_sanitize_multi_pass", wraps=_sanitize_multi_pass
+        ) as multi_pass:
+            results = [sanitize_for_openai(text, max_chars=None) for text in corpus]
+        self.assertEqual(multi_pass.call_count, 0)
+        self.assertEqual(results, [_sanitize_multi_pass(text, max_chars=None) for text in corpus])
+
+    def test_known_cases(self) -> None:
+        cases = {
+            "Hi Sarah, order #10452 &amp; call 555-201-3344": "Hi <redacted>, order #10452 & call <redacted>",
+            "<p>my name is Ann Lee</p><p>ann@example.com</p>": "my name is <redacted> <redacted>",
+            "Ship to 1200 Market Street.\nRegards, Bob": "Ship to <redacted> Regards <redacted>",
+            "see https://x.example/track?id=9": "see <redacted>",
+            "order number 99812 and 5551234567@y.com": "order number 99812 and <redacted>",
+        }
+        for text, expected in cases.items():
+            self.assertEqual(sanitize_for_openai(text), expected)
+            self._assert_equivalent(text)
+
+    def test_ambiguous_input_defers_to_multi_pass(self) -> None:
+        self.assertIsNone(pii_sanitizer._redact_single_pass("order 12345-foo@bar.com"))
+        self.assertIsNone(pii_sanitizer._redact_single_pass("order 12345@gmail.com"))
+        self.assertIsNone(pii_sanitizer._redact_single_pass("__ORDER_TOKEN_0__ hi"))
+        self.assertIsNotNone(pii_sanitizer._redact_single_pass("Where is order 12345?"))
+
+    def test_first_characters_cover_case_folding(self) -> None:
+        # Every character re.I folds onto a case-insensitive branch's first
+        # letter must be listed in that branch's first-character class.
+        branches = [
+            (re.compile("(?i)[" + "".join(re.findall(r"[a-z]", first)) + "]"), re.compile(first))
+            for _, first, rest, _ in pii_sanitizer._BRANCHES
+            if first.startswith("[") and "(?i:" in rest
+        ]
+        any_letter = re.compile(
+            "(?i)[" + "".join(folded.pattern[5:-1] for folded, _ in branches) + "]"
+        )
+        for code in range(sys.maxunicode + 1):
+            char = chr(code)
+            if not any_letter.fullmatch(char):
+                continue
+            for folded, listed in branches:
+                if folded.fullmatch(char):
+                    self.assertTrue(listed.fullmatch(char), msg=f"{listed.pattern} misses {char!r}")
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(SanitizerEquivalenceTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
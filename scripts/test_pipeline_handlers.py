@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 import sys
+import threading
 import time
 import unittest
 from unittest import mock
@@ -33,6 +34,7 @@ from richpanel_middleware.automation.pipeline import (  # noqa: E402
     normalize_event,
     plan_actions,
     build_no_tracking_reply,
+    compute_delivery_estimate,
     _fingerprint_reply_body,
     _extract_customer_email_from_payload,
     _match_allowlist_email,
@@ -64,6 +66,7 @@ from richpanel_middleware.automation.order_status_intent import (  # noqa: E402
 )
 from richpanel_middleware.automation.router import RoutingDecision  # noqa: E402
 from richpanel_middleware.ingest.envelope import build_event_envelope  # noqa: E402
+from richpanel_middleware.observability.tracing import current_trace, start_trace  # noqa: E402
 from lambda_handlers.worker import handler as worker  # noqa: E402
 from richpanel_middleware.integrations.richpanel.client import (  # noqa: E402
     RichpanelExecutor,
@@ -142,6 +145,45 @@ class FingerprintReplyBodyTests(unittest.TestCase):
         )
 
 
+class ReplyTemplateDerivationTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.dict(
+            os.environ, {"OPENAI_REPLY_REWRITE_TEMPLATE_CACHE_ENABLED": "true"}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _template(self, order_id: str, created_at: str, method: str):  # type: ignore[no-untyped-def]
+        summary = {"order_id": order_id, "created_at": created_at, "shipping_method": method}
+        estimate = compute_delivery_estimate(created_at, method, "2025-03-14")
+        draft = build_no_tracking_reply(
+            summary, inquiry_date="2025-03-14", delivery_estimate=estimate
+        )
+        assert draft is not None
+        parameters = {"order_summary": summary, "delivery_estimate": estimate}
+        return draft["body"], pipeline_module._reply_template(
+            parameters, draft, draft["body"]
+        )
+
+    def test_no_tracking_replies_share_one_template(self) -> None:
+        body, template = self._template("1001", "2025-03-12", "Standard Shipping")
+        other_body, other = self._template("2002", "2025-03-11", "Standard Shipping")
+
+        assert template is not None and other is not None
+        self.assertEqual(template.template_id, other.template_id)
+        self.assertIn("{{order_id}}", template.text)
+        self.assertNotIn("1001", template.text)
+        self.assertEqual(template.fill(template.text), body)
+        self.assertEqual(other.fill(other.text), other_body)
+
+    def test_template_disabled_by_default(self) -> None:
+        with mock.patch.dict(
+            os.environ, {"OPENAI_REPLY_REWRITE_TEMPLATE_CACHE_ENABLED": "false"}
+        ):
+            _, template = self._template("1001", "2025-03-12", "Standard Shipping")
+        self.assertIsNone(template)
+
+
 class PipelineTests(unittest.TestCase):
     def setUp(self) -> None:
         # Reset worker caches so each test is deterministic and offline-safe.
@@ -738,6 +780,9 @@ class PipelineTests(unittest.TestCase):
 
         self.assertEqual(state_item["event_id"], envelope.event_id)
         self.assertIn("expires_at", state_item)
+        self.assertEqual(
+            state_item["updated_hour"], str(state_item["updated_at"])[:13]
+        )
         self.assertIn("ts_action_id", audit_item)
         self.assertEqual(audit_item["event_id"], envelope.event_id)
         self.assertIn("routing", state_item)
@@ -1743,6 +1788,173 @@ class OutboundOrderStatusTests(unittest.TestCase):
             openai_rewrite.get("rewritten_hash"),
         )
 
+    def _build_speculative_plan(self) -> tuple[Any, Any]:
+        envelope = build_event_envelope(
+            {
+                "ticket_id": "t-outbound",
+                "order_id": "ord-123",
+                "shipping_method": "2 business days",
+                "created_at": "2024-12-20T00:00:00Z",
+                "message": "Where is my order?",
+            }
+        )
+        with mock.patch.dict(
+            os.environ, {"MW_SPECULATIVE_REWRITE_ENABLED": "true"}, clear=False
+        ):
+            plan = plan_actions(
+                envelope,
+                safe_mode=False,
+                automation_enabled=True,
+                allow_network=True,
+                outbound_enabled=True,
+            )
+        return envelope, plan
+
+    def test_speculative_rewrite_disabled_by_default(self) -> None:
+        envelope = build_event_envelope({"ticket_id": "t-1", "order_id": "ord-1"})
+        plan = plan_actions(
+            envelope,
+            safe_mode=False,
+            automation_enabled=True,
+            allow_network=True,
+            outbound_enabled=True,
+        )
+        self.assertIsNone(plan.speculative_rewrite)
+
+    def test_speculative_rewrite_is_adopted_with_same_evidence(self) -> None:
+        rewrite_result = ReplyRewriteResult(
+            body="rewritten body",
+            rewritten=True,
+            reason="applied",
+            model="gpt-5.2-chat-latest",
+            confidence=0.91,
+            dry_run=False,
+            fingerprint="fp",
+            llm_called=True,
+            response_id="resp-1",
+        )
+        rewrite_threads: list[str] = []
+
+        def _rewrite(*args: Any, **kwargs: Any) -> ReplyRewriteResult:
+            rewrite_threads.append(threading.current_thread().name)
+            return rewrite_result
+
+        results = []
+        with mock.patch(
+            "richpanel_middleware.automation.pipeline.rewrite_reply",
+            side_effect=_rewrite,
+        ):
+            for build_plan in (self._build_order_status_plan, self._build_speculative_plan):
+                envelope, plan = build_plan()
+                results.append(
+                    execute_order_status_reply(
+                        envelope,
+                        plan,
+                        safe_mode=False,
+                        automation_enabled=True,
+                        allow_network=True,
+                        outbound_enabled=True,
+                        richpanel_executor=cast(RichpanelExecutor, _RecordingExecutor()),
+                    )
+                )
+
+        self.assertEqual(len(rewrite_threads), 2)
+        self.assertEqual(rewrite_threads[0], threading.current_thread().name)
+        self.assertTrue(rewrite_threads[1].startswith("speculative-rewrite"))
+        self.assertTrue(results[1]["sent"])
+        self.assertEqual(results[0]["openai_rewrite"], results[1]["openai_rewrite"])
+
+    def test_speculative_rewrite_runs_in_callers_trace(self) -> None:
+        seen_traces: list[Any] = []
+
+        def _rewrite(*args: Any, **kwargs: Any) -> ReplyRewriteResult:
+            seen_traces.append(current_trace())
+            return ReplyRewriteResult(
+                body="rewritten body",
+                rewritten=True,
+                reason="applied",
+                model="gpt-5.2-chat-latest",
+                confidence=0.91,
+                dry_run=False,
+                fingerprint="fp",
+                llm_called=True,
+                response_id="resp-1",
+            )
+
+        with mock.patch(
+            "richpanel_middleware.automation.pipeline.rewrite_reply",
+            side_effect=_rewrite,
+        ), start_trace("event") as trace:
+            _, plan = self._build_speculative_plan()
+            speculative = plan.speculative_rewrite
+            self.assertIsNotNone(speculative)
+            assert speculative is not None
+            speculative.result()
+
+        self.assertEqual(seen_traces, [trace])
+
+    def test_speculative_rewrite_discarded_when_inputs_change(self) -> None:
+        envelope, plan = self._build_speculative_plan()
+        speculative = plan.speculative_rewrite
+        self.assertIsNotNone(speculative)
+        action = next(
+            a for a in plan.actions if a["type"] == "order_status_draft_reply"
+        )
+        action["parameters"]["draft_reply"]["body"] += " Thanks!"
+        inline_result = ReplyRewriteResult(
+            body="inline body",
+            rewritten=True,
+            reason="applied",
+            model="gpt-5.2-chat-latest",
+            confidence=0.91,
+            dry_run=False,
+            fingerprint="fp",
+            llm_called=True,
+            response_id="resp-inline",
+        )
+
+        with mock.patch(
+            "richpanel_middleware.automation.pipeline.rewrite_reply",
+            return_value=inline_result,
+        ) as rewrite_mock, mock.patch.object(
+            speculative, "result", side_effect=AssertionError("stale rewrite used")
+        ):
+            result = execute_order_status_reply(
+                envelope,
+                plan,
+                safe_mode=False,
+                automation_enabled=True,
+                allow_network=True,
+                outbound_enabled=True,
+                richpanel_executor=cast(RichpanelExecutor, _RecordingExecutor()),
+            )
+
+        rewrite_mock.assert_called_once()
+        self.assertEqual(result["openai_rewrite"]["response_id"], "resp-inline")
+
+    def test_speculative_rewrite_discarded_when_gate_blocks(self) -> None:
+        envelope, plan = self._build_speculative_plan()
+        speculative = plan.speculative_rewrite
+        self.assertIsNotNone(speculative)
+
+        with mock.patch.object(speculative, "discard") as discard_mock:
+            result = execute_order_status_reply(
+                envelope,
+                plan,
+                safe_mode=False,
+                automation_enabled=True,
+                allow_network=True,
+                outbound_enabled=True,
+                richpanel_executor=cast(
+                    RichpanelExecutor, _RecordingExecutor(ticket_status="resolved")
+                ),
+            )
+
+        self.assertFalse(result["sent"])
+        self.assertEqual(result["reason"], "already_resolved")
+        self.assertNotIn("openai_rewrite", result)
+        discard_mock.assert_called_once()
+
     def test_outbound_skips_when_ticket_already_resolved(self) -> None:
         envelope, plan = self._build_order_status_plan()
         executor = _RecordingExecutor(ticket_status="resolved")
@@ -2514,6 +2726,9 @@ class OutboundRoutingTagsTests(unittest.TestCase):
 
 def _build_suite() -> unittest.TestSuite:
     suite = unittest.defaultTestLoader.loadTestsFromTestCase(FingerprintReplyBodyTests)
+    suite.addTests(
+        unittest.defaultTestLoader.loadTestsFromTestCase(ReplyTemplateDerivationTests)
+    )
     suite.addTests(unittest.defaultTestLoader.loadTestsFromTestCase(PipelineTests))
     suite.addTests(
         unittest.defaultTestLoader.loadTestsFromTestCase(OutboundOrderStatusTests)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / "scripts"
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+import prod_order_status_log_watch as watch  # noqa: E402
+
+T0 = datetime(2026, 3, 1, 10, 50, tzinfo=timezone.utc)
+
+
+def _event(event_id: str, at: datetime, message: str) -> Dict[str, Any]:
+    return {"eventId": event_id, "timestamp": watch._ms(at), "message": message}
+
+
+class _FakeLogs:
+    """filter_log_events over a mutable event list (events may arrive late)."""
+
+    def __init__(self) -> None:
+        self.events: List[Dict[str, Any]] = []
+        self.calls: List[Dict[str, Any]] = []
+
+    def get_paginator(self, name: str) -> "_FakeLogs":
+        assert name == "filter_log_events"
+        return self
+
+    def paginate(self, **kwargs: Any):  # type: ignore[no-untyped-def]
+        self.calls.append(kwargs)
+        matching = sorted(
+            (
+                event
+                for event in self.events
+                if kwargs["startTime"] <= event["timestamp"] <= kwargs["endTime"]
+            ),
+            key=lambda event: event["timestamp"],
+        )
+        for offset in range(0, len(matching), 2):
+            yield {"events": matching[offset : offset + 2]}
+
+
+class _FakeStateTable:
+    """Query on the updated_hour GSI, paging one item at a time."""
+
+    def __init__(self, items: List[Dict[str, Any]]) -> None:
+        self.items = items
+        self.queries: List[Dict[str, Any]] = []
+
+    def query(self, **kwargs: Any) -> Dict[str, Any]:
+        self.queries.append(kwargs)
+        values = kwargs["ExpressionAttributeValues"]
+        matching = [
+            item
+            for item in self.items
+            if item["updated_hour"] == values[":hour"]
+            and values[":start"] <= item["updated_at"] <= values[":end"]
+            and item["routing"].get("category") == values[":category"]
+        ]
+        offset = int(kwargs.get("ExclusiveStartKey", {}).get("offset", 0))
+        response: Dict[str, Any] = {"Items": matching[offset : offset + 1]}
+        if offset + 1 < len(matching):
+            response["LastEvaluatedKey"] = {"offset": offset + 1}
+        return response
+
+
+def _run_interval(
+    logs: _FakeLogs,
+    cursor: watch.LogCursor,
+    end: datetime,
+    *,
+    max_events: int = 100,
+    floor: datetime = T0,
+):  # type: ignore[no-untyped-def]
+    """One main() interval: count new events, then rewind by the grace window."""
+    result = watch._count_log_terms(
+        watch._iter_log_events(logs, cursor, end, filter_pattern="p"),
+        cursor=cursor,
+        max_events=max_events,
+    )
+    if not result[3]:
+        cursor.rewind_to(
+            max(
+                watch._ms(floor),
+                watch._ms(end - timedelta(seconds=watch.LOG_INGESTION_GRACE_SECONDS)),
+            )
+        )
+    return result
+
+
+class FilterPatternTests(unittest.TestCase):
+    def test_plain_words_get_case_variants(self) -> None:
+        pattern = watch.build_filter_pattern(watch.FAILURE_TERMS + watch.ISSUE_TERMS)
+        for variant in ("error", "Error", "ERROR", "Traceback", "Task timed out"):
+            self.assertIn(f'?"{variant}"', pattern)
+        # Event names are logged verbatim, so they are not case-expanded.
+        self.assertIn('?"richpanel.write_blocked"', pattern)
+        self.assertNotIn("RICHPANEL.WRITE_BLOCKED", pattern)
+        terms = pattern.split(" ?")
+        self.assertEqual(len(terms), len(set(terms)))
+
+    def test_duplicate_terms_appear_once(self) -> None:
+        self.assertEqual(
+            watch.build_filter_pattern(["error", "Error", "read_only_guard"]),
+            '?"error" ?"Error" ?"ERROR" ?"read_only_guard"',
+        )
+
+
+class LogCursorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / watch.CURSOR_FILENAME
+        self.logs = _FakeLogs()
+
+    def test_save_and_load_round_trip(self) -> None:
+        cursor = watch.LogCursor(1_000, {"b": 1_500, "a": 1_000, "old": 900})
+        cursor.save(self.path)
+        loaded = watch.LogCursor.load(self.path)
+        assert loaded is not None
+        self.assertEqual(
+            (loaded.start_ms, loaded.seen_ids), (1_000, {"a": 1_000, "b": 1_500})
+        )
+        self.assertFalse(self.path.with_suffix(".json.tmp").exists())
+
+        # Cursor files written before ids carried timestamps still load.
+        self.path.write_text('{"start_ms": 2000, "seen_ids": ["x"]}', encoding="utf-8")
+        legacy = watch.LogCursor.load(self.path)
+        assert legacy is not None
+        self.assertEqual((legacy.start_ms, legacy.seen_ids), (2_000, {"x": 2_000}))
+
+        self.path.write_text("{not json", encoding="utf-8")
+        self.assertIsNone(watch.LogCursor.load(self.path))
+        self.assertIsNone(watch.LogCursor.load(self.path.with_name("missing.json")))
+
+    def test_resumed_cursor_does_not_recount_boundary_events(self) -> None:
+        self.logs.events = [
+            _event("e1", T0 + timedelta(minutes=1), "ERROR boom"),
+            _event("e2", T0 + timedelta(minutes=9), "automation.order_status_reply.skip"),
+            _event("e3", T0 + timedelta(minutes=9), "Traceback (most recent call last)"),
+        ]
+        cursor = watch.LogCursor(watch._ms(T0))
+        matched, failures, issues, truncated = _run_interval(
+            self.logs, cursor, T0 + timedelta(minutes=10)
+        )
+        self.assertEqual((matched, truncated), (3, False))
+        self.assertEqual(failures["error"], 1)
+        self.assertEqual(failures["traceback"], 1)
+        self.assertEqual(issues["automation.order_status_reply.skip"], 1)
+        cursor.save(self.path)
+
+        # Next interval (after a restart with --resume) re-reads the grace
+        # window but counts only the event that was not seen yet.
+        self.logs.events.append(_event("e4", T0 + timedelta(minutes=12), "exception"))
+        resumed = watch.LogCursor.load(self.path)
+        assert resumed is not None
+        self.assertEqual(set(resumed.seen_ids), {"e2", "e3"})
+        matched, failures, _, _ = _run_interval(
+            self.logs, resumed, T0 + timedelta(minutes=20)
+        )
+        self.assertEqual(matched, 1)
+        self.assertEqual(failures["exception"], 1)
+        self.assertEqual(failures["error"], 0)
+        self.assertEqual(self.logs.calls[-1]["startTime"], watch._ms(T0 + timedelta(minutes=8)))
+
+    def test_late_events_inside_grace_window_are_counted_next_interval(self) -> None:
+        end = T0 + timedelta(minutes=10)
+        grace_start = end - timedelta(seconds=watch.LOG_INGESTION_GRACE_SECONDS)
+        # An event right at the interval end was already counted...
+        self.logs.events = [_event("edge", end, "error")]
+        cursor = watch.LogCursor(watch._ms(T0))
+        self.assertEqual(_run_interval(self.logs, cursor, end)[0], 1)
+        self.assertEqual(cursor.start_ms, watch._ms(grace_start))
+
+        # ...and these were logged before it but ingested after the read.
+        self.logs.events += [
+            _event("late", end - timedelta(seconds=30), "error"),
+            _event("too-late", grace_start - timedelta(seconds=1), "error"),
+        ]
+        matched, failures, _, _ = _run_interval(self.logs, cursor, end + timedelta(minutes=10))
+        self.assertEqual((matched, failures["error"]), (1, 1))
+        self.assertEqual(self.logs.calls[-1]["startTime"], watch._ms(grace_start))
+
+        # The re-read window moves on, so nothing is counted twice.
+        matched, _, _, _ = _run_interval(self.logs, cursor, end + timedelta(minutes=20))
+        self.assertEqual(matched, 0)
+
+    def test_rewind_forgets_ids_before_the_new_start(self) -> None:
+        cursor = watch.LogCursor(5_000, {"e1": 5_000, "e0": 3_000})
+        cursor.rewind_to(4_000)
+        self.assertEqual((cursor.start_ms, cursor.seen_ids), (4_000, {"e1": 5_000}))
+
+    def test_grace_window_does_not_reach_before_the_watch_started(self) -> None:
+        self.logs.events = [_event("before", T0 - timedelta(seconds=10), "error")]
+        cursor = watch.LogCursor(watch._ms(T0))
+        _run_interval(self.logs, cursor, T0 + timedelta(minutes=1))
+        self.assertEqual(cursor.start_ms, watch._ms(T0))
+        matched, _, _, _ = _run_interval(self.logs, cursor, T0 + timedelta(minutes=2))
+        self.assertEqual(matched, 0)
+
+    def test_truncated_interval_resumes_from_last_counted_event(self) -> None:
+        self.logs.events = [
+            _event(f"e{i}", T0 + timedelta(minutes=i), "error") for i in range(1, 6)
+        ]
+        cursor = watch.LogCursor(watch._ms(T0))
+        matched, failures, _, truncated = _run_interval(
+            self.logs, cursor, T0 + timedelta(minutes=10), max_events=2
+        )
+        self.assertEqual((matched, failures["error"], truncated), (2, 2, True))
+        self.assertEqual(cursor.start_ms, watch._ms(T0 + timedelta(minutes=2)))
+        self.assertEqual(set(cursor.seen_ids), {"e1", "e2"})
+
+        matched, _, _, truncated = _run_interval(
+            self.logs, cursor, T0 + timedelta(minutes=20), max_events=2
+        )
+        self.assertEqual((matched, truncated), (2, True))
+        matched, _, _, truncated = _run_interval(
+            self.logs, cursor, T0 + timedelta(minutes=20), max_events=2
+        )
+        self.assertEqual((matched, truncated), (1, False))
+
+
+class OrderStatusStateQueryTests(unittest.TestCase):
+    def _item(self, conversation_id: str, at: datetime, category: str = "order_status"):  # type: ignore[no-untyped-def]
+        return {
+            "conversation_id": conversation_id,
+            "updated_hour": at.strftime(watch.STATE_UPDATED_BUCKET_FORMAT),
+            "updated_at": watch._iso(at),
+            "routing": {"category": category},
+        }
+
+    def test_queries_every_hour_bucket_in_the_window(self) -> None:
+        start, end = T0, T0 + timedelta(hours=1, minutes=15)  # 10:50 -> 12:05
+        table = _FakeStateTable(
+            [
+                self._item("before", start - timedelta(minutes=1)),
+                self._item("c-10", start + timedelta(minutes=5)),
+                self._item("c-11a", start + timedelta(minutes=20)),
+                self._item("c-11b", start + timedelta(minutes=40)),
+                self._item("returns", start + timedelta(minutes=41), category="returns"),
+                self._item("c-12", end - timedelta(minutes=1)),
+                self._item("after", end + timedelta(minutes=1)),
+            ]
+        )
+
+        items = watch._query_order_status_state(table, start, end)
+
+        self.assertEqual(
+            [item["conversation_id"] for item in items], ["c-10", "c-11a", "c-11b", "c-12"]
+        )
+        hours = [query["ExpressionAttributeValues"][":hour"] for query in table.queries]
+        # The 11:00 bucket has two items, so it takes a second (paged) query.
+        self.assertEqual(hours, ["2026-03-01T10", "2026-03-01T11", "2026-03-01T11", "2026-03-01T12"])
+        self.assertEqual({query["IndexName"] for query in table.queries}, {"updated_hour-index"})
+        self.assertEqual(table.queries[2]["ExclusiveStartKey"], {"offset": 1})
+        self.assertEqual(
+            table.queries[0]["ExpressionAttributeNames"]["#hour"], "updated_hour"
+        )
+
+    def test_hour_buckets_cover_partial_hours_at_both_ends(self) -> None:
+        self.assertEqual(
+            watch._updated_hour_buckets(T0, T0 + timedelta(minutes=5)),
+            ["2026-03-01T10"],
+        )
+        self.assertEqual(
+            watch._updated_hour_buckets(T0, T0 + timedelta(minutes=10)),
+            ["2026-03-01T10", "2026-03-01T11"],
+        )
+
+
+class IntervalReportTests(unittest.TestCase):
+    def test_report_keeps_the_original_event_count_key(self) -> None:
+        report = watch._build_interval_report(
+            index=1,
+            start=T0,
+            end=T0 + timedelta(minutes=10),
+            matched_events=3,
+            events_truncated=False,
+            failure_counts={},
+            issue_counts={},
+            order_items=[],
+            api_key=None,
+            ticket_cache={},
+        )
+        self.assertEqual(report["matched_events_count"], 3)
+        self.assertEqual(report["worker_events_count"], 3)
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(FilterPatternTests))
+    suite.addTests(loader.loadTestsFromTestCase(LogCursorTests))
+    suite.addTests(loader.loadTestsFromTestCase(OrderStatusStateQueryTests))
+    suite.addTests(loader.loadTestsFromTestCase(IntervalReportTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from richpanel_middleware.automation.llm_routing import (  # noqa: E402
+    _build_routing_prompt,
+)
+from richpanel_middleware.automation.prompt_compaction import (  # noqa: E402
+    COMPACTION_STATS,
+    compact_for_llm,
+    compact_text,
+    get_token_budget,
+)
+import eval_order_status_intent as intent_eval  # noqa: E402
+
+EVAL_DIR = SCRIPTS / "fixtures" / "intent_eval"
+
+THREAD = (
+    "Where is my order? Still no tracking.\n\n"
+    "Thanks,\nSam\n\n"
+    "On Mon, Mar 3, 2025 at 9:12 AM Support <support@example.com> wrote:\n"
+    "> I want a refund for my previous order.\n"
+)
+
+
+class CompactTextTests(unittest.TestCase):
+    def test_quoted_reply_is_dropped(self) -> None:
+        result = compact_text(THREAD, budget_tokens=500)
+
+        self.assertEqual(result.text, "Where is my order? Still no tracking.\n\nThanks,\nSam")
+        self.assertEqual(result.removed, ("quoted_reply",))
+        self.assertGreater(result.tokens_removed, 0)
+
+    def test_wrapped_reply_header_and_outlook_headers(self) -> None:
+        wrapped = "Any update?\nOn Mon, Jan 6, 2025 at 10:00 AM Jane <\njane@example.com> wrote:\nold"
+        outlook = (
+            "Cancel it please.\n________________________________\n"
+            "From: Shop <shop@example.com>\nSent: Monday\nSubject: Order\n\nold"
+        )
+
+        self.assertEqual(compact_text(wrapped, budget_tokens=500).text, "Any update?")
+        self.assertEqual(compact_text(outlook, budget_tokens=500).text, "Cancel it please.")
+
+    def test_html_quote_signature_and_footer(self) -> None:
+        html_body = (
+            "<div>Can you cancel it?</div><div><br></div>"
+            '<div class="gmail_quote"><blockquote>where is my order</blockquote></div>'
+        )
+        footer = (
+            "Has it shipped?\n\n--\nJordan\n\n"
+            "CONFIDENTIALITY NOTICE: This message is intended only for the addressee."
+        )
+
+        self.assertEqual(compact_text(html_body, budget_tokens=500).text, "Can you cancel it?")
+        result = compact_text(footer, budget_tokens=500)
+        self.assertEqual(result.text, "Has it shipped?")
+        self.assertEqual(result.removed, ("signature",))
+
+    def test_never_empties_text_and_truncates_to_budget(self) -> None:
+        self.assertEqual(compact_text("> only quoted", budget_tokens=500).text, "> only quoted")
+
+        result = compact_text("word " * 400, budget_tokens=10)
+        self.assertLessEqual(len(result.text), 43)
+        self.assertTrue(result.text.endswith("..."))
+        self.assertIn("truncated", result.removed)
+
+
+class CompactForLlmTests(unittest.TestCase):
+    def setUp(self) -> None:
+        COMPACTION_STATS.reset()
+        self.addCleanup(COMPACTION_STATS.reset)
+
+    def test_budget_env_override_and_invalid_values(self) -> None:
+        with mock.patch.dict(os.environ, {"MW_PROMPT_TOKEN_BUDGET_ROUTING": "50"}):
+            self.assertEqual(get_token_budget("routing"), 50)
+        with mock.patch.dict(os.environ, {"MW_PROMPT_TOKEN_BUDGET_ROUTING": "nope"}):
+            self.assertEqual(get_token_budget("routing"), 500)
+
+    def test_disabled_returns_text_unchanged(self) -> None:
+        with mock.patch.dict(os.environ, {"MW_PROMPT_COMPACTION_ENABLED": "false"}):
+            result = compact_for_llm(THREAD, call_type="routing")
+
+        self.assertEqual(result.text, THREAD)
+        self.assertEqual(COMPACTION_STATS.snapshot(), {})
+
+    def test_routing_prompt_excludes_quoted_history_and_records_savings(self) -> None:
+        messages = _build_routing_prompt(THREAD)
+
+        self.assertNotIn("refund", messages[-1].content)
+        snapshot = COMPACTION_STATS.snapshot()["routing"]
+        self.assertEqual(snapshot["compacted_calls"], 1)
+        self.assertGreater(snapshot["tokens_removed"], 0)
+
+
+class CompactionEvalTests(unittest.TestCase):
+    def _metrics(self, name: str) -> dict:
+        examples = intent_eval.load_jsonl_dataset(EVAL_DIR / name)
+        return intent_eval._evaluate_examples(
+            examples, use_openai=False, allow_network=False
+        )
+
+    def test_accuracy_does_not_drop_on_eval_sets(self) -> None:
+        for name in ("order_status_golden.jsonl", "order_status_email_threads.jsonl"):
+            with self.subTest(dataset=name):
+                summary = self._metrics(name)
+                raw = summary["metrics"]["deterministic"]
+                compacted = summary["metrics"]["deterministic_compacted"]
+                self.assertGreaterEqual(compacted["precision"], raw["precision"])
+                self.assertGreaterEqual(compacted["recall"], raw["recall"])
+
+    def test_email_threads_shed_most_tokens(self) -> None:
+        counts = self._metrics("order_status_email_threads.jsonl")["counts"]
+        self.assertGreater(
+            counts["compaction_tokens_removed"], counts["compaction_tokens_before"] // 2
+        )
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(CompactTextTests))
+    suite.addTests(loader.loadTestsFromTestCase(CompactForLlmTests))
+    suite.addTests(loader.loadTestsFromTestCase(CompactionEvalTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("QUEUE_URL", "https://sqs.local/heavy.fifo")
+os.environ.setdefault("WEBHOOK_SECRET_ARN", "rp-mw/local/richpanel/webhook_token")
+
+from handler_test_support import (  # noqa: E402
+    Clock,
+    RecordingSqs,
+    ingress_patches,
+    start_patches,
+    webhook_event,
+)
+from lambda_handlers.ingress import handler as ingress  # noqa: E402
+from richpanel_middleware.ingest.envelope import normalize_envelope  # noqa: E402
+from richpanel_middleware.ingest.lanes import (  # noqa: E402
+    LANE_FAST,
+    LANE_HEAVY,
+    DynamoLanePinStore,
+    InMemoryLanePinStore,
+    classify_lane,
+)
+
+
+class _ConditionalCheckFailed(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class _FakePinTable:
+    def __init__(self) -> None:
+        self.items: Dict[str, Dict[str, Any]] = {}
+
+    def put_item(self, *, Item, ConditionExpression, ExpressionAttributeValues):  # type: ignore[no-untyped-def]
+        existing = self.items.get(Item["group_id"])
+        if existing and existing["expires_at"] >= ExpressionAttributeValues[":now"]:
+            raise _ConditionalCheckFailed()
+        self.items[Item["group_id"]] = dict(Item)
+
+    def update_item(  # type: ignore[no-untyped-def]
+        self, *, Key, UpdateExpression, ConditionExpression, ExpressionAttributeValues, ReturnValues
+    ):
+        values = ExpressionAttributeValues
+        existing = self.items.get(Key["group_id"])
+        if existing and existing["expires_at"] < values[":now"]:
+            raise _ConditionalCheckFailed()
+        item = existing or {"group_id": Key["group_id"], "lane": values[":lane"]}
+        item["expires_at"] = values[":expires_at"]
+        self.items[Key["group_id"]] = item
+        return {"Attributes": dict(item)}
+
+    def get_item(self, *, Key, ConsistentRead):  # type: ignore[no-untyped-def]
+        item = self.items.get(Key["group_id"])
+        return {"Item": dict(item)} if item else {}
+
+
+class ClassifyLaneTests(unittest.TestCase):
+    def test_order_status_message_is_heavy(self) -> None:
+        decision = classify_lane({"customer_message": "Where is my order? No tracking yet."})
+        self.assertEqual(decision.lane, LANE_HEAVY)
+
+    def test_order_number_is_heavy(self) -> None:
+        decision = classify_lane({"customer_message": "Question", "order_number": "12345"})
+        self.assertEqual(decision.lane, LANE_HEAVY)
+        self.assertEqual(decision.reason, "order_number_present")
+
+    def test_route_only_message_is_fast(self) -> None:
+        decision = classify_lane({"customer_message": "I want to cancel my subscription"})
+        self.assertEqual(decision.lane, LANE_FAST)
+
+    def test_empty_payload_is_fast(self) -> None:
+        self.assertEqual(classify_lane({}).lane, LANE_FAST)
+
+
+class LanePinStoreTests(unittest.TestCase):
+    def test_in_memory_first_lane_wins_until_expiry(self) -> None:
+        clock = Clock()
+        store = InMemoryLanePinStore(ttl_seconds=60, clock=clock)
+        self.assertEqual(store.claim("conv-1", LANE_HEAVY), LANE_HEAVY)
+        self.assertEqual(store.claim("conv-1", LANE_FAST), LANE_HEAVY)
+        clock.now += 61
+        self.assertEqual(store.claim("conv-1", LANE_FAST), LANE_FAST)
+
+    def test_dynamo_store_returns_existing_pin(self) -> None:
+        clock = Clock()
+        table = _FakePinTable()
+        store = DynamoLanePinStore(table, ttl_seconds=60, clock=clock)
+        self.assertEqual(store.claim("conv-1", LANE_FAST), LANE_FAST)
+        self.assertEqual(store.claim("conv-1", LANE_HEAVY), LANE_FAST)
+        clock.now += 61
+        self.assertEqual(store.claim("conv-1", LANE_HEAVY), LANE_HEAVY)
+
+    def test_claims_slide_the_pin_expiry(self) -> None:
+        for make_store in (
+            lambda clock: InMemoryLanePinStore(ttl_seconds=900, clock=clock),
+            lambda clock: DynamoLanePinStore(_FakePinTable(), ttl_seconds=900, clock=clock),
+        ):
+            clock = Clock()
+            store = make_store(clock)
+            self.assertEqual(store.claim("conv-1", LANE_HEAVY), LANE_HEAVY)
+            clock.now += 890
+            self.assertEqual(store.claim("conv-1", LANE_FAST), LANE_HEAVY)
+            # 905s after the first claim, but only 15s after the last one.
+            clock.now += 15
+            self.assertEqual(store.claim("conv-1", LANE_FAST), LANE_HEAVY)
+            clock.now += 901
+            self.assertEqual(store.claim("conv-1", LANE_FAST), LANE_FAST)
+
+    def test_dynamo_store_replaces_an_expired_pin_not_yet_deleted(self) -> None:
+        clock = Clock()
+        table = _FakePinTable()
+        table.items["conv-1"] = {"group_id": "conv-1", "lane": LANE_HEAVY, "expires_at": 10}
+        store = DynamoLanePinStore(table, ttl_seconds=60, clock=clock)
+        self.assertEqual(store.claim("conv-1", LANE_FAST), LANE_FAST)
+        self.assertEqual(table.items["conv-1"]["expires_at"], 1060)
+
+
+class IngressLaneTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sqs = RecordingSqs()
+        patches: List[Any] = [
+            mock.patch.object(ingress, "FAST_QUEUE_URL", "https://sqs.local/fast.fifo"),
+            mock.patch.object(ingress, "_LANE_PIN_STORE", InMemoryLanePinStore()),
+        ]
+        start_patches(self, patches + ingress_patches(ingress, self.sqs))
+
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = ingress.lambda_handler(webhook_event(payload), None)
+        self.assertEqual(response["statusCode"], 200)
+        return self.sqs.sent[-1]
+
+    def test_events_split_by_lane_and_group_stays_pinned(self) -> None:
+        heavy = self._post(
+            {"conversation_id": "c-1", "message_id": "m1", "customer_message": "Where is my order?"}
+        )
+        fast = self._post(
+            {"conversation_id": "c-2", "message_id": "m2", "customer_message": "Cancel my subscription"}
+        )
+        follow_up = self._post(
+            {"conversation_id": "c-1", "message_id": "m3", "customer_message": "Cancel my subscription"}
+        )
+
+        self.assertEqual(heavy["QueueUrl"], ingress.QUEUE_URL)
+        self.assertEqual(fast["QueueUrl"], "https://sqs.local/fast.fifo")
+        self.assertEqual(follow_up["QueueUrl"], ingress.QUEUE_URL)
+        body = json.loads(follow_up["MessageBody"])
+        self.assertEqual(body["lane"], LANE_HEAVY)
+        self.assertEqual(normalize_envelope(body).lane, LANE_HEAVY)
+
+    def test_single_queue_when_fast_lane_not_configured(self) -> None:
+        with mock.patch.object(ingress, "FAST_QUEUE_URL", ""):
+            sent = self._post({"conversation_id": "c-9", "customer_message": "Cancel my subscription"})
+        self.assertEqual(sent["QueueUrl"], ingress.QUEUE_URL)
+        self.assertNotIn("lane", json.loads(sent["MessageBody"]))
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(ClassifyLaneTests))
+    suite.addTests(loader.loadTestsFromTestCase(LanePinStoreTests))
+    suite.addTests(loader.loadTestsFromTestCase(IngressLaneTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
+import tempfile
 import unittest
+from pathlib import Path
 from unittest import mock
 
 import readonly_shadow_utils as utils
@@ -46,5 +48,56 @@ class ReadonlyShadowUtilsTests(unittest.TestCase):
             client.request("POST", "/admin/api/2024-01/orders.json")
 
 
+class ShadowRunCheckpointTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "checkpoint.jsonl"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_resume_skips_completed_and_yields_in_ticket_order(self) -> None:
+        checkpoint = utils.ShadowRunCheckpoint(self.path)
+        checkpoint.start(
+            run_id="run-1", ticket_refs=["a", "b", "c"], metadata={"sample_mode": "recent"}
+        )
+        checkpoint.append("b", {"value": 2})
+        checkpoint.append("a", {"value": 1})
+
+        resumed = utils.ShadowRunCheckpoint(self.path).load()
+        self.assertEqual(resumed.ticket_refs, ["a", "b", "c"])
+        self.assertEqual(resumed.metadata, {"sample_mode": "recent"})
+        self.assertEqual(resumed.pending(resumed.ticket_refs), ["c"])
+        resumed.append("c", {"value": 3})
+        records = list(resumed.iter_records(resumed.ticket_refs))
+        self.assertEqual([record["value"] for record in records], [1, 2, 3])
+
+    def test_torn_tail_is_ignored_and_repaired(self) -> None:
+        checkpoint = utils.ShadowRunCheckpoint(self.path)
+        checkpoint.start(run_id="run-1", ticket_refs=["a", "b"])
+        checkpoint.append("a", {"value": 1})
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write('{"type": "ticket", "ticket_key": "trunc')
+
+        resumed = utils.ShadowRunCheckpoint(self.path).load()
+        self.assertEqual(resumed.pending(["a", "b"]), ["b"])
+        resumed.append("b", {"value": 2})
+        records = list(resumed.iter_records(["a", "b"]))
+        self.assertEqual([record["value"] for record in records], [1, 2])
+
+    def test_start_refuses_existing_checkpoint(self) -> None:
+        utils.ShadowRunCheckpoint(self.path).start(run_id="run-1", ticket_refs=["a"])
+        with self.assertRaises(SystemExit) as ctx:
+            utils.ShadowRunCheckpoint(self.path).start(run_id="run-1", ticket_refs=["a"])
+        self.assertIn("--resume run-1", str(ctx.exception))
+
+    def test_ticket_refs_are_hashed_in_record_lines(self) -> None:
+        checkpoint = utils.ShadowRunCheckpoint(self.path)
+        checkpoint.start(run_id="run-1", ticket_refs=["91608"])
+        checkpoint.append("91608", {"value": 1})
+        last_line = self.path.read_text(encoding="utf-8").splitlines()[-1]
+        self.assertNotIn("91608", last_line)
+
+
 if __name__ == "__main__":
     unittest.main()
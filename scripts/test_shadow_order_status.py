@@ -218,6 +218,173 @@ class ProdShadowTicketRefsTests(unittest.TestCase):
             payload = json.loads(out_json.read_text(encoding="utf-8"))
         self.assertEqual(payload["ticket_count"], 2)
 
+    def test_resume_skips_checkpointed_tickets(self) -> None:
+        env = {
+            "MW_ALLOW_NETWORK_READS": "true",
+            "RICHPANEL_READ_ONLY": "true",
+            "RICHPANEL_WRITE_DISABLED": "true",
+            "RICHPANEL_OUTBOUND_ENABLED": "false",
+            "MW_OPENAI_ROUTING_ENABLED": "true",
+            "MW_OPENAI_INTENT_ENABLED": "true",
+            "MW_OPENAI_SHADOW_ENABLED": "true",
+            "OPENAI_ALLOW_NETWORK": "true",
+            "SHOPIFY_OUTBOUND_ENABLED": "true",
+            "SHOPIFY_WRITE_DISABLED": "true",
+            "SHOPIFY_SHOP_DOMAIN": "test-shop.myshopify.com",
+        }
+        stub_ticket = {
+            "id": "ticket-1",
+            "created_at": "2026-02-01T00:00:00Z",
+            "conversation_id": "conv-1",
+            "comments": [],
+        }
+        routing = SimpleNamespace(intent="order_status_tracking")
+        routing_artifact = SimpleNamespace(primary_source=None, llm_suggestion={})
+        order_status_intent = SimpleNamespace(
+            llm_called=False,
+            response_id=None,
+            response_id_unavailable_reason=None,
+            gated_reason=None,
+            accepted=None,
+            result=None,
+        )
+        with TemporaryDirectory() as tmpdir, mock.patch.dict(
+            os.environ, _with_openai_env(env), clear=True
+        ):
+            out_json = Path(tmpdir) / "out.json"
+            out_md = Path(tmpdir) / "out.md"
+            base_argv = [
+                "prod_shadow_order_status_report.py",
+                "--env",
+                "prod",
+                "--out-json",
+                str(out_json),
+                "--out-md",
+                str(out_md),
+            ]
+            first_argv = base_argv + [
+                "--run-id",
+                "run-1",
+                "--ticket-id",
+                "ref-1",
+                "--ticket-id",
+                "ref-2",
+            ]
+            with mock.patch.object(
+                prod_shadow, "_fetch_conversation", return_value={}
+            ), mock.patch.object(
+                prod_shadow, "compute_dual_routing", return_value=(routing, routing_artifact)
+            ), mock.patch.object(
+                prod_shadow, "classify_order_status_intent", return_value=order_status_intent
+            ), mock.patch.object(
+                prod_shadow, "lookup_order_summary", return_value={}
+            ):
+                with mock.patch.object(sys, "argv", first_argv), mock.patch.object(
+                    prod_shadow,
+                    "_fetch_ticket",
+                    side_effect=[stub_ticket, KeyboardInterrupt()],
+                ):
+                    with self.assertRaises(KeyboardInterrupt):
+                        prod_shadow.main()
+                self.assertFalse(out_json.exists())
+
+                with mock.patch.object(
+                    sys, "argv", base_argv + ["--resume", "run-1"]
+                ), mock.patch.object(
+                    prod_shadow, "_fetch_ticket", return_value=stub_ticket
+                ) as fetch_mock:
+                    self.assertEqual(prod_shadow.main(), 0)
+            fetched = [call.args[1] for call in fetch_mock.call_args_list]
+            payload = json.loads(out_json.read_text(encoding="utf-8"))
+        self.assertEqual(fetched, ["ref-2"])
+        self.assertEqual(payload["run_id"], "run-1")
+        self.assertEqual(payload["ticket_count"], 2)
+        self.assertEqual(payload["stats"]["tickets_scanned"], 2)
+
+    def test_resume_keeps_ticket_fetch_warnings(self) -> None:
+        env = {
+            "MW_ALLOW_NETWORK_READS": "true",
+            "RICHPANEL_READ_ONLY": "true",
+            "RICHPANEL_WRITE_DISABLED": "true",
+            "RICHPANEL_OUTBOUND_ENABLED": "false",
+            "MW_OPENAI_ROUTING_ENABLED": "true",
+            "MW_OPENAI_INTENT_ENABLED": "true",
+            "MW_OPENAI_SHADOW_ENABLED": "true",
+            "OPENAI_ALLOW_NETWORK": "true",
+            "SHOPIFY_OUTBOUND_ENABLED": "true",
+            "SHOPIFY_WRITE_DISABLED": "true",
+            "SHOPIFY_SHOP_DOMAIN": "test-shop.myshopify.com",
+        }
+        stub_ticket = {
+            "id": "ticket-2",
+            "created_at": "2026-02-01T00:00:00Z",
+            "conversation_id": "conv-2",
+            "comments": [],
+        }
+        routing = SimpleNamespace(intent="order_status_tracking")
+        routing_artifact = SimpleNamespace(primary_source=None, llm_suggestion={})
+        order_status_intent = SimpleNamespace(
+            llm_called=False,
+            response_id=None,
+            response_id_unavailable_reason=None,
+            gated_reason=None,
+            accepted=None,
+            result=None,
+        )
+        with TemporaryDirectory() as tmpdir, mock.patch.dict(
+            os.environ, _with_openai_env(env), clear=True
+        ):
+            out_json = Path(tmpdir) / "out.json"
+            base_argv = [
+                "prod_shadow_order_status_report.py",
+                "--env",
+                "prod",
+                "--out-json",
+                str(out_json),
+                "--out-md",
+                str(Path(tmpdir) / "out.md"),
+                "--allow-ticket-fetch-failures",
+            ]
+            first_argv = base_argv + [
+                "--run-id",
+                "run-1",
+                "--ticket-id",
+                "ref-1",
+                "--ticket-id",
+                "ref-2",
+            ]
+            with mock.patch.object(
+                prod_shadow, "_fetch_conversation", return_value={}
+            ), mock.patch.object(
+                prod_shadow, "compute_dual_routing", return_value=(routing, routing_artifact)
+            ), mock.patch.object(
+                prod_shadow, "classify_order_status_intent", return_value=order_status_intent
+            ), mock.patch.object(
+                prod_shadow, "lookup_order_summary", return_value={}
+            ):
+                with mock.patch.object(sys, "argv", first_argv), mock.patch.object(
+                    prod_shadow,
+                    "_fetch_ticket",
+                    side_effect=[
+                        SystemExit("Ticket lookup failed for redacted: 404"),
+                        KeyboardInterrupt(),
+                    ],
+                ):
+                    with self.assertRaises(KeyboardInterrupt):
+                        prod_shadow.main()
+
+                with mock.patch.object(
+                    sys, "argv", base_argv + ["--resume", "run-1"]
+                ), mock.patch.object(
+                    prod_shadow, "_fetch_ticket", return_value=stub_ticket
+                ) as fetch_mock:
+                    self.assertEqual(prod_shadow.main(), 0)
+            fetched = [call.args[1] for call in fetch_mock.call_args_list]
+            payload = json.loads(out_json.read_text(encoding="utf-8"))
+        self.assertEqual(fetched, ["ref-2"])
+        self.assertEqual(payload["ticket_count"], 2)
+        self.assertIn("ticket_fetch_failed", payload["run_warnings"])
+
     def test_require_env_flag_missing_and_mismatch(self) -> None:
         with mock.patch.dict(os.environ, _with_openai_env({}), clear=True):
             with self.assertRaises(SystemExit):
@@ -267,7 +434,9 @@ class ProdShadowTicketRefsTests(unittest.TestCase):
                 str(out_path),
                 "--confirm-live-readonly",
             ]
-            with mock.patch.object(sys, "argv", argv):
+            with mock.patch.object(sys, "argv", argv), mock.patch.object(
+                shadow, "_build_trace_path", return_value=Path(tmpdir) / "trace.json"
+            ):
                 with self.assertRaises(SystemExit) as ctx:
                     shadow.main()
         self.assertIn("ticket-id", str(ctx.exception))
@@ -1068,7 +1237,9 @@ class ShadowOrderStatusNoWriteTests(unittest.TestCase):
                 "2",
                 "--confirm-live-readonly",
             ]
-            with mock.patch.object(sys, "argv", argv):
+            with mock.patch.object(sys, "argv", argv), mock.patch.object(
+                shadow, "_build_trace_path", return_value=Path(tmpdir) / "trace.json"
+            ):
                 with self.assertRaises(SystemExit):
                     shadow.main()
 
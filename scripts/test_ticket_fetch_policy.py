@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from richpanel_middleware.automation import pipeline as pipeline_module  # noqa: E402
+from richpanel_middleware.automation.order_status_intent import (  # noqa: E402
+    OrderStatusIntentArtifact,
+    OrderStatusIntentResult,
+)
+from richpanel_middleware.automation.pipeline import (  # noqa: E402
+    execute_plan,
+    plan_actions,
+)
+from richpanel_middleware.automation.ticket_fetch import (  # noqa: E402
+    POLICY_ALWAYS,
+    POLICY_COMPLETE_PAYLOAD,
+    POLICY_ORDER_IDENTITY,
+    TICKET_FETCH_STATS,
+    TicketFetchStats,
+    decide_ticket_fetch,
+    ticket_fetch_policy,
+)
+from richpanel_middleware.commerce.order_lookup import missing_lookup_inputs  # noqa: E402
+from richpanel_middleware.ingest.envelope import build_event_envelope  # noqa: E402
+
+COMPLETE = {
+    "conversation_id": "c-1",
+    "customer_message": "Where is my order #123456?",
+    "email": "jane@example.com",
+    "via": {"channel": "email"},
+}
+RESOLVED = {"order_id": "1001", "order_number": "1001", "confidence": "high"}
+
+
+def _accepted_intent() -> OrderStatusIntentArtifact:
+    return OrderStatusIntentArtifact(
+        result=OrderStatusIntentResult(
+            is_order_status=True,
+            confidence=0.95,
+            reason="stubbed",
+            extracted_order_number=None,
+            language="en",
+        ),
+        llm_called=False,
+        model="gpt-test",
+        response_id=None,
+        response_id_unavailable_reason="stubbed",
+        confidence_threshold=0.85,
+        accepted=True,
+    )
+
+
+class DecisionTests(unittest.TestCase):
+    def test_lookup_inputs(self) -> None:
+        self.assertEqual(missing_lookup_inputs(COMPLETE), ())
+        self.assertEqual(
+            missing_lookup_inputs({"customer_message": "where is it?"}),
+            ("order_identity", "customer_email"),
+        )
+        self.assertEqual(
+            missing_lookup_inputs(
+                {"customer_message": "where is it?", "customer": {"email": "a@b.co"}},
+                resolved_order=RESOLVED,
+            ),
+            (),
+        )
+
+    def test_policies(self) -> None:
+        no_email = {"customer_message": "Order #123456 please"}
+        complete = decide_ticket_fetch(no_email, policy=POLICY_COMPLETE_PAYLOAD)
+        self.assertTrue(complete.fetch)
+        self.assertEqual(complete.missing, ("customer_email",))
+        self.assertFalse(decide_ticket_fetch(no_email, policy=POLICY_ORDER_IDENTITY).fetch)
+        self.assertTrue(decide_ticket_fetch(COMPLETE, policy=POLICY_ALWAYS).fetch)
+
+        skipped = decide_ticket_fetch(dict(COMPLETE, ticket_number="88"))
+        self.assertFalse(skipped.fetch)
+        self.assertEqual(skipped.reads, 2)
+        self.assertEqual(
+            skipped.to_dict(),
+            {
+                "fetched": False,
+                "skipped": True,
+                "policy": POLICY_COMPLETE_PAYLOAD,
+                "reason": "payload_sufficient",
+                "missing": [],
+            },
+        )
+
+    def test_policy_env(self) -> None:
+        with mock.patch.dict(os.environ, {"MW_TICKET_FETCH_POLICY": "Always"}):
+            self.assertEqual(ticket_fetch_policy(), POLICY_ALWAYS)
+        with mock.patch.dict(os.environ, {"MW_TICKET_FETCH_POLICY": "bogus"}):
+            self.assertEqual(ticket_fetch_policy(), POLICY_COMPLETE_PAYLOAD)
+
+    def test_stats_per_channel(self) -> None:
+        stats = TicketFetchStats()
+        stats.record("email", decide_ticket_fetch(dict(COMPLETE, ticket_number="88")))
+        stats.record("email", decide_ticket_fetch({"customer_message": "hi"}))
+        stats.record(None, decide_ticket_fetch(COMPLETE))
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["email"]["checked"], 2)
+        self.assertEqual(snapshot["email"]["reads_saved"], 2)
+        self.assertEqual(snapshot["email"]["skip_ratio"], 0.5)
+        self.assertEqual(snapshot["unknown"]["skipped"], 1)
+
+
+class PlanTicketFetchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        TICKET_FETCH_STATS.reset()
+        self.addCleanup(TICKET_FETCH_STATS.reset)
+        patches = [
+            mock.patch.object(
+                pipeline_module, "classify_order_status_intent", return_value=_accepted_intent()
+            ),
+            mock.patch.object(
+                pipeline_module, "lookup_order_summary", return_value={"order_id": "unknown"}
+            ),
+            mock.patch.object(
+                pipeline_module, "_resolve_target_ticket_id", return_value="c-1"
+            ),
+            mock.patch.object(
+                pipeline_module,
+                "_safe_ticket_snapshot_fetch",
+                return_value=(None, None, None, None),
+            ),
+            mock.patch.object(pipeline_module, "RichpanelExecutor"),
+            mock.patch.object(pipeline_module, "_start_speculative_rewrite", return_value=None),
+        ]
+        self.mocks = [patcher.start() for patcher in patches]
+        for patcher in patches:
+            self.addCleanup(patcher.stop)
+        self.snapshot_fetch = self.mocks[3]
+
+    def _plan(self, payload: Dict[str, Any]) -> Any:
+        envelope = build_event_envelope(payload)
+        plan = plan_actions(
+            envelope, safe_mode=False, automation_enabled=True, allow_network=True
+        )
+        return envelope, plan
+
+    def test_sufficient_payload_skips_richpanel_reads(self) -> None:
+        envelope, plan = self._plan(COMPLETE)
+        self.snapshot_fetch.assert_not_called()
+        audit = execute_plan(envelope, plan).audit_record
+        self.assertTrue(audit["ticket_fetch"]["skipped"])
+        self.assertEqual(TICKET_FETCH_STATS.snapshot()["email"]["reads_saved"], 1)
+
+    def test_incomplete_payload_still_fetches(self) -> None:
+        envelope, plan = self._plan({"conversation_id": "c-1", "customer_message": "Where?"})
+        self.snapshot_fetch.assert_called_once()
+        audit = execute_plan(envelope, plan).audit_record
+        self.assertEqual(audit["ticket_fetch"]["missing"], ["order_identity", "customer_email"])
+
+    def test_always_policy_restores_previous_behaviour(self) -> None:
+        with mock.patch.dict(os.environ, {"MW_TICKET_FETCH_POLICY": "always"}):
+            self._plan(COMPLETE)
+        self.snapshot_fetch.assert_called_once()
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(DecisionTests))
+    suite.addTests(loader.loadTestsFromTestCase(PlanTicketFetchTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
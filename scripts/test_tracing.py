@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+os.environ.setdefault("CONVERSATION_STATE_TABLE_NAME", "local-conversation-state")
+os.environ.setdefault("AUDIT_TRAIL_TABLE_NAME", "local-audit-trail")
+
+from integrations.common import notify_upstream_attempt  # noqa: E402
+from handler_test_support import local_worker_patches, start_patches  # noqa: E402
+from lambda_handlers.worker import handler as worker  # noqa: E402
+from richpanel_middleware.ingest.envelope import build_event_envelope  # noqa: E402
+from richpanel_middleware.observability import tracing  # noqa: E402
+from richpanel_middleware.observability.tracing import (  # noqa: E402
+    TIMING_LOG_EVENT,
+    current_trace,
+    span,
+    start_trace,
+)
+
+
+def _timing_lines(records: List[Any]) -> List[Dict[str, Any]]:
+    return [r.timing for r in records if r.getMessage() == TIMING_LOG_EVENT]
+
+
+class SpanTests(unittest.TestCase):
+    def test_span_is_shared_noop_without_trace(self) -> None:
+        self.assertIsNone(current_trace())
+        with span("anything") as first, span("else") as second:
+            first.set_attribute("ignored", True)
+        self.assertIs(first, second)
+
+    def test_nested_spans_and_upstream_attribution(self) -> None:
+        with self.assertLogs(tracing.LOGGER, level="INFO") as logs:
+            with start_trace("worker.event", event_id="evt-1") as trace:
+                trace.add_stage("kill_switches", 2.0)
+                with span("plan"):
+                    notify_upstream_attempt("openai", attempt=1, status_code=200, latency_ms=40)
+                    with span("order_lookup"):
+                        notify_upstream_attempt("shopify", attempt=1, status_code=429, latency_ms=5)
+                        notify_upstream_attempt("shopify", attempt=2, status_code=200, latency_ms=7)
+                with span("plan"):
+                    pass
+
+        (timing,) = _timing_lines(logs.records)
+        self.assertEqual(timing["trace"], "worker.event")
+        self.assertEqual(timing["event_id"], "evt-1")
+        stages = timing["stages"]
+        self.assertEqual(
+            list(stages), ["kill_switches", "plan/order_lookup", "plan"]
+        )
+        self.assertEqual(stages["plan"]["count"], 2)
+        self.assertEqual(stages["plan"]["upstream"]["openai"]["calls"], 1)
+        self.assertNotIn("shopify", stages["plan"]["upstream"])
+        self.assertEqual(
+            stages["plan/order_lookup"]["upstream"]["shopify"],
+            {"calls": 2, "retries": 1, "errors": 1, "ms": 12},
+        )
+        self.assertEqual(timing["upstream"]["shopify"]["calls"], 2)
+        self.assertIsNone(current_trace())
+
+    def test_span_records_exception_and_reraises(self) -> None:
+        with self.assertLogs(tracing.LOGGER, level="INFO") as logs:
+            with start_trace("worker.event"):
+                with self.assertRaises(ValueError):
+                    with span("plan"):
+                        raise ValueError("boom")
+        (timing,) = _timing_lines(logs.records)
+        self.assertEqual(timing["stages"]["plan"]["error"], "ValueError")
+
+    def test_disabled_tracing_is_silent(self) -> None:
+        with mock.patch.dict(os.environ, {"MW_TRACING_ENABLED": "false"}):
+            with mock.patch.object(tracing.LOGGER, "info") as info:
+                with start_trace("worker.event") as trace:
+                    trace.add_stage("kill_switches", 1.0)
+                    self.assertIsNone(current_trace())
+                    self.assertIsNone(trace.summary())
+        info.assert_not_called()
+
+
+class WorkerTimingTests(unittest.TestCase):
+    def setUp(self) -> None:
+        patches = local_worker_patches(worker)
+        patches.append(
+            mock.patch.object(worker, "_load_kill_switches", return_value=(True, False))
+        )
+        start_patches(self, patches)
+
+    def test_one_timing_line_per_event(self) -> None:
+        records = [
+            {
+                "messageId": str(index),
+                "body": json.dumps(
+                    build_event_envelope(
+                        {"conversation_id": f"c-{index}", "customer_message": "Where is my order?"}
+                    ).to_message()
+                ),
+            }
+            for index in range(2)
+        ]
+        with self.assertLogs(worker.LOGGER, level="INFO") as logs:
+            result = worker.lambda_handler({"Records": records}, None)
+
+        self.assertEqual(result, {"batchItemFailures": []})
+        timings = _timing_lines(logs.records)
+        self.assertEqual([t["conversation_id"] for t in timings], ["c-0", "c-1"])
+        for stage in (
+            "kill_switches",
+            "normalize_event",
+            "plan",
+            "plan/routing",
+            "plan/intent",
+            "persist_idempotency",
+            "execute_and_record",
+            "outbound_reply",
+            "evidence",
+        ):
+            self.assertIn(stage, timings[0]["stages"])
+        self.assertGreaterEqual(timings[0]["total_ms"], timings[0]["stages"]["plan"]["ms"])
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(SpanTests))
+    suite.addTests(loader.loadTestsFromTestCase(WorkerTimingTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+SCRIPTS = ROOT / "scripts"
+for path in (SRC, SCRIPTS):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+os.environ.setdefault("IDEMPOTENCY_TABLE_NAME", "local-idempotency")
+os.environ.setdefault("SAFE_MODE_PARAM", "/rp-mw/local/safe_mode")
+os.environ.setdefault("AUTOMATION_ENABLED_PARAM", "/rp-mw/local/automation_enabled")
+os.environ.setdefault("CONVERSATION_STATE_TABLE_NAME", "local-conversation-state")
+os.environ.setdefault("AUDIT_TRAIL_TABLE_NAME", "local-audit-trail")
+
+import bench_worker  # noqa: E402
+from integrations.common import default_transport  # noqa: E402
+from integrations.openai.client import TransportRequest, TransportResponse  # noqa: E402
+from upstream_cassettes import (  # noqa: E402
+    Cassette,
+    CassetteRecorder,
+    RecordingTransport,
+    ReplayTransport,
+    install_transport_factory,
+    replaying,
+    route_template,
+    sanitize_value,
+)
+
+
+class _CannedTransport:
+    def __init__(self, responses: List[TransportResponse]) -> None:
+        self.responses = list(responses)
+        self.requests: List[TransportRequest] = []
+
+    def send(self, request: TransportRequest) -> TransportResponse:
+        self.requests.append(request)
+        return self.responses.pop(0)
+
+
+def _chat_request(system: str, user: str) -> TransportRequest:
+    body = {
+        "model": "gpt-test",
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ],
+    }
+    return TransportRequest(
+        method="POST",
+        url="https://api.openai.com/v1/chat/completions",
+        headers={"Authorization": "Bearer sk-secret"},
+        body=json.dumps(body).encode("utf-8"),
+        timeout=5,
+    )
+
+
+def _json_response(payload: Dict[str, Any], status: int = 200) -> TransportResponse:
+    return TransportResponse(
+        status_code=status,
+        headers={"Content-Type": "application/json", "Set-Cookie": "session=abc"},
+        body=json.dumps(payload).encode("utf-8"),
+    )
+
+
+class RouteAndSanitizeTests(unittest.TestCase):
+    def test_route_template_collapses_ids_and_query_values(self) -> None:
+        self.assertEqual(
+            route_template(
+                "https://shop.myshopify.com/admin/api/2024-01/orders/5551234.json?fields=id,name"
+            ),
+            "/admin/api/2024-01/orders/{id}.json?fields",
+        )
+        self.assertEqual(
+            route_template("https://api.richpanel.com/v1/tickets/ava%40example.com?z=1&a=2"),
+            "/v1/tickets/{id}?a&z",
+        )
+
+    def test_identity_fields_get_stable_pseudonyms(self) -> None:
+        event = sanitize_value(
+            {
+                "customer_email": "Ava@Example.com",
+                "customer_message": "I'm ava@example.com, where is order #1001?",
+                "order": {"name": "#1001", "email": "ava@example.com", "phone": "555-0100"},
+            }
+        )
+        self.assertEqual(event["customer_email"], event["order"]["email"])
+        self.assertTrue(event["customer_email"].endswith("@example.invalid"))
+        self.assertEqual(event["order"]["name"], "#1001")
+        self.assertNotIn("ava@example.com", event["customer_message"])
+        self.assertNotIn("555-0100", json.dumps(event))
+
+
+class RecordReplayTests(unittest.TestCase):
+    def test_record_save_load_replay_round_trip(self) -> None:
+        inner = _CannedTransport(
+            [
+                _json_response({"choices": [{"message": {"content": "routing"}}]}),
+                _json_response({"choices": [{"message": {"content": "intent"}}]}),
+            ]
+        )
+        recorder = CassetteRecorder()
+        transport = RecordingTransport(inner, "openai", recorder)
+        transport.send(_chat_request("route it", "where is my order"))
+        transport.send(_chat_request("is it order status", "where is my order"))
+        recorder.add_event({"customer_email": "ava@example.com", "customer_message": "hi"})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cassette.json"
+            recorder.cassette.save(path)
+            saved = path.read_text(encoding="utf-8")
+            cassette = Cassette.load(path)
+
+        self.assertNotIn("sk-secret", saved)
+        self.assertNotIn("session=abc", saved)
+        self.assertNotIn("ava@example.com", saved)
+        self.assertEqual(len(cassette.exchanges), 2)
+
+        sleeps: List[float] = []
+        replay = ReplayTransport(cassette, "openai", latency_scale=1.0, sleeper=sleeps.append)
+        # Same route, different system prompt: each caller gets its own answer.
+        intent = replay.send(_chat_request("is it order status", "another message"))
+        routing = replay.send(_chat_request("route it", "another message"))
+        self.assertIn(b"intent", intent.body)
+        self.assertIn(b"routing", routing.body)
+        self.assertEqual(len(sleeps), sum(1 for e in cassette.exchanges if e.latency_ms > 0))
+
+        missing = replay.send(
+            TransportRequest("GET", "https://api.openai.com/v1/models", {}, None, 5)
+        )
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(
+            replay.stats.snapshot()["misses"], {"openai GET /v1/models": 1}
+        )
+
+    def test_factory_applies_to_default_transport_and_is_restored(self) -> None:
+        built: List[str] = []
+
+        def factory(service: str, default: Any) -> str:
+            built.append(service)
+            return "replay"
+
+        with install_transport_factory(factory):
+            self.assertEqual(default_transport("shopify", lambda: "http"), "replay")
+        self.assertEqual(default_transport("shopify", lambda: "http"), "http")
+        self.assertEqual(built, ["shopify"])
+
+
+class BenchWorkerTests(unittest.TestCase):
+    def test_benchmark_replays_sample_cassette_without_misses(self) -> None:
+        cassette = Cassette.load(bench_worker.DEFAULT_CASSETTE)
+        env_before = dict(os.environ)
+        report = bench_worker.run_benchmark(
+            cassette, events=6, batch_size=4, latency_scale=0.0, seed=3
+        )
+        results = report["results"]
+        self.assertEqual(results["events_processed"], 6)
+        self.assertEqual(results["batches"], 2)
+        self.assertEqual(results["failures"], 0)
+        self.assertEqual(results["cassette_misses"], {})
+        self.assertEqual(results["upstream_calls_per_event"]["openai"], 2.0)
+        self.assertIn("shopify", results["upstream_calls_per_event"])
+        self.assertIsNotNone(results["latency_ms"]["p99"])
+        self.assertEqual(dict(os.environ), env_before)
+
+        comparison = bench_worker.compare(report, report)
+        self.assertEqual(comparison["warnings"], [])
+        self.assertEqual(comparison["deltas"]["latency_p95_ms"]["change_pct"], 0.0)
+
+    def test_replaying_counts_hits_per_service(self) -> None:
+        cassette = Cassette.load(bench_worker.DEFAULT_CASSETTE)
+        with replaying(cassette, latency_scale=0.0) as stats:
+            transport = default_transport("openai", lambda: None)
+            transport.send(_chat_request("unknown prompt", "hello"))
+        self.assertEqual(stats.snapshot(), {"hits": {"openai": 1}, "misses": {}})
+
+
+def main() -> int:
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    suite.addTests(loader.loadTestsFromTestCase(RouteAndSanitizeTests))
+    suite.addTests(loader.loadTestsFromTestCase(RecordReplayTests))
+    suite.addTests(loader.loadTestsFromTestCase(BenchWorkerTests))
+    result = unittest.TextTestRunner(verbosity=2).run(suite)
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -90,6 +90,8 @@ class WorkerHandlerFlagWiringTests(unittest.TestCase):
             automation_enabled=True,
             allow_network=True,
             outbound_enabled=True,
+            auto_reply_marker=None,
+            resolved_order=None,
         )
 
     def test_plan_actions_receives_off_path_flags_when_outbound_disabled(self) -> None:
@@ -144,6 +146,8 @@ class WorkerHandlerFlagWiringTests(unittest.TestCase):
             automation_enabled=True,
             allow_network=False,
             outbound_enabled=False,
+            auto_reply_marker=None,
+            resolved_order=None,
         )
 
     def test_allow_network_enabled_when_shadow_reads_allowed(self) -> None:
@@ -199,6 +203,8 @@ class WorkerHandlerFlagWiringTests(unittest.TestCase):
             automation_enabled=True,
             allow_network=True,
             outbound_enabled=False,
+            auto_reply_marker=None,
+            resolved_order=None,
         )
 
     def test_record_openai_rewrite_evidence_updates_tables(self) -> None:
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Train and evaluate the local order-status intent model (offline, PII-safe).
+
+Training rows come from golden JSONL sets ({"text", "expected"}) and from
+shadow-eval reports (tickets whose classification_source is openai_intent,
+using message_excerpt_redacted as text and the LLM label). The report shows,
+per confidence threshold, how many LLM calls the local tier would avoid and
+how accurate it is on the rows it answers, using k-fold cross-validation so
+no row is scored by a model trained on it. As at runtime, a row only counts
+as answered locally when the deterministic router agrees with the model.
+
+To regenerate the committed artifact, run from the repo root with no
+arguments:
+
+    python scripts/train_local_intent_model.py
+
+That reads the two intent_eval golden sets and every shadow-eval report
+committed under REHYDRATION_PACK/RUNS/*/*/PROOF/prod_*.json (the
+"training_sources" recorded in the artifact's metadata), and overwrites
+backend/src/richpanel_middleware/automation/models/order_status_intent_local.json.
+Training is seeded, so the same inputs give the same file. Retrain after
+adding new prod shadow-eval proofs, and check the printed cross-validation
+report before committing the artifact.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from richpanel_middleware.automation.local_intent_model import (  # type: ignore  # noqa: E402
+    DEFAULT_MODEL_PATH,
+    LocalIntentModel,
+    train_local_intent_model,
+)
+from richpanel_middleware.automation.llm_routing import (  # type: ignore  # noqa: E402
+    _LOCAL_ORDER_STATUS_INTENTS,
+)
+from richpanel_middleware.automation.router import classify_routing  # type: ignore  # noqa: E402
+
+DEFAULT_DATASETS = (
+    ROOT / "scripts" / "fixtures" / "intent_eval" / "order_status_golden.jsonl",
+    ROOT / "scripts" / "fixtures" / "intent_eval" / "order_status_email_threads.jsonl",
+)
+# Shadow-eval reports kept as run proof; rows without an LLM label are skipped.
+DEFAULT_SHADOW_EVAL_GLOB = "REHYDRATION_PACK/RUNS/*/*/PROOF/prod_*.json"
+DEFAULT_THRESHOLDS = (0.7, 0.8, 0.9, 0.95)
+LABELS = {"order_status": True, "non_order_status": False}
+
+Example = Tuple[str, bool]
+Scored = Tuple[bool, bool, float, bool]
+
+
+def _read_rows(path: Path) -> List[Dict[str, Any]]:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    payload = json.loads(text)
+    if isinstance(payload, dict):
+        payload = payload.get("tickets") or payload.get("results") or []
+    return [row for row in payload if isinstance(row, dict)]
+
+
+def load_golden_examples(path: Path) -> List[Example]:
+    examples: List[Example] = []
+    for row in _read_rows(path):
+        text = row.get("text")
+        label = LABELS.get(str(row.get("expected", "")).strip())
+        if isinstance(text, str) and text.strip() and label is not None:
+            examples.append((text, label))
+    return examples
+
+
+def load_shadow_examples(path: Path) -> List[Example]:
+    examples: List[Example] = []
+    for row in _read_rows(path):
+        if row.get("classification_source") != "openai_intent":
+            continue
+        text = row.get("message_excerpt_redacted")
+        label = row.get("classified_order_status")
+        if isinstance(text, str) and text.strip() and isinstance(label, bool):
+            examples.append((text, label))
+    return examples
+
+
+def dedupe_examples(examples: Iterable[Example]) -> Tuple[List[Example], int]:
+    """Keep one row per normalized text; drop texts seen with both labels.
+
+    Shadow-eval runs overlap heavily, and a duplicated text on both sides of
+    a fold would inflate the cross-validated numbers. Returns the kept rows
+    and the number of conflicting texts dropped.
+    """
+    labels: Dict[str, set] = {}
+    first: Dict[str, str] = {}
+    for text, label in examples:
+        key = " ".join(text.lower().split())
+        labels.setdefault(key, set()).add(label)
+        first.setdefault(key, text)
+    kept = [(first[key], next(iter(seen))) for key, seen in labels.items() if len(seen) == 1]
+    return kept, len(labels) - len(kept)
+
+
+def _folds(
+    examples: Sequence[Example], k: int, seed: int
+) -> Iterable[Tuple[List[Example], List[Example]]]:
+    indices = list(range(len(examples)))
+    random.Random(seed).shuffle(indices)
+    k = max(2, min(k, len(indices)))
+    for fold in range(k):
+        held = set(indices[fold::k])
+        yield (
+            [examples[i] for i in indices if i not in held],
+            [examples[i] for i in indices if i in held],
+        )
+
+
+def router_agrees(text: str, predicted: bool) -> bool:
+    intent = classify_routing({"customer_message": text}).intent
+    return (intent in _LOCAL_ORDER_STATUS_INTENTS) == predicted
+
+
+def cross_validate(
+    examples: Sequence[Example],
+    *,
+    folds: int,
+    seed: int,
+    **train_kwargs: Any,
+) -> List[Scored]:
+    """Return (label, predicted, confidence, router_agrees) per row, scored out-of-fold."""
+    scored: List[Scored] = []
+    for train, held in _folds(examples, folds, seed):
+        model = train_local_intent_model(train, seed=seed, **train_kwargs)
+        for text, label in held:
+            prediction = model.predict(text)
+            scored.append(
+                (
+                    label,
+                    prediction.is_order_status,
+                    prediction.confidence,
+                    router_agrees(text, prediction.is_order_status),
+                )
+            )
+    return scored
+
+
+def summarize(scored: Sequence[Scored], thresholds: Sequence[float]) -> Dict[str, Any]:
+    total = len(scored)
+    summary: Dict[str, Any] = {
+        "rows": total,
+        "accuracy_all": round(
+            sum(1 for label, pred, _, _ in scored if label == pred) / total, 4
+        )
+        if total
+        else None,
+        "thresholds": [],
+    }
+    for threshold in thresholds:
+        covered = [
+            (label, pred)
+            for label, pred, conf, agrees in scored
+            if conf >= threshold and agrees
+        ]
+        correct = sum(1 for label, pred in covered if label == pred)
+        false_positive = sum(1 for label, pred in covered if pred and not label)
+        summary["thresholds"].append(
+            {
+                "min_confidence": threshold,
+                "llm_calls_avoided": len(covered),
+                "llm_calls_avoided_rate": round(len(covered) / total, 4) if total else 0.0,
+                "accuracy_on_avoided": round(correct / len(covered), 4) if covered else None,
+                "false_order_status_on_avoided": false_positive,
+            }
+        )
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--dataset",
+        action="append",
+        type=Path,
+        help="Golden JSONL with text/expected (repeatable). Defaults to the intent_eval golden set.",
+    )
+    parser.add_argument(
+        "--shadow-eval",
+        action="append",
+        type=Path,
+        help=(
+            "Shadow-eval JSON report or JSONL checkpoint to learn LLM labels from "
+            f"(repeatable). Defaults to {DEFAULT_SHADOW_EVAL_GLOB}."
+        ),
+    )
+    parser.add_argument("--out", type=Path, default=DEFAULT_MODEL_PATH, help="Artifact path.")
+    parser.add_argument("--report", type=Path, help="Optional path for the JSON report.")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--epochs", type=int, default=50)
+    parser.add_argument("--learning-rate", type=float, default=0.2)
+    parser.add_argument("--l2", type=float, default=3e-3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--threshold",
+        action="append",
+        type=float,
+        help="Confidence threshold(s) to report (repeatable).",
+    )
+    parser.add_argument(
+        "--eval-only",
+        action="store_true",
+        help="Score the existing artifact on the datasets instead of training.",
+    )
+    args = parser.parse_args()
+
+    datasets = args.dataset or list(DEFAULT_DATASETS)
+    thresholds = args.threshold or list(DEFAULT_THRESHOLDS)
+    examples: List[Example] = []
+    sources: List[Dict[str, Any]] = []
+    for path in datasets:
+        rows = load_golden_examples(path)
+        examples.extend(rows)
+        sources.append({"path": path.name, "kind": "golden", "rows": len(rows)})
+    if args.shadow_eval is not None:
+        for path in args.shadow_eval:
+            rows = load_shadow_examples(path)
+            examples.extend(rows)
+            sources.append({"path": path.name, "kind": "shadow_eval", "rows": len(rows)})
+    else:
+        reports = sorted(ROOT.glob(DEFAULT_SHADOW_EVAL_GLOB))
+        rows = [row for path in reports for row in load_shadow_examples(path)]
+        examples.extend(rows)
+        sources.append(
+            {
+                "path": DEFAULT_SHADOW_EVAL_GLOB,
+                "kind": "shadow_eval",
+                "files": len(reports),
+                "rows": len(rows),
+            }
+        )
+    examples, conflicting = dedupe_examples(examples)
+    if not examples:
+        raise SystemExit("no labeled rows found in the given datasets")
+
+    if args.eval_only:
+        payload: Dict[str, Any] = json.loads(args.out.read_text(encoding="utf-8"))
+        model: LocalIntentModel = LocalIntentModel.from_dict(payload)
+        scored: List[Scored] = []
+        for text, label in examples:
+            prediction = model.predict(text)
+            scored.append(
+                (
+                    label,
+                    prediction.is_order_status,
+                    prediction.confidence,
+                    router_agrees(text, prediction.is_order_status),
+                )
+            )
+        report: Dict[str, Any] = {"model_version": model.version, "mode": "eval_only"}
+        report.update(summarize(scored, thresholds))
+    else:
+        train_kwargs: Dict[str, Any] = {
+            "epochs": args.epochs,
+            "learning_rate": args.learning_rate,
+            "l2": args.l2,
+        }
+        scored = cross_validate(examples, folds=args.folds, seed=args.seed, **train_kwargs)
+        cv = summarize(scored, thresholds)
+        model = train_local_intent_model(
+            examples,
+            seed=args.seed,
+            **train_kwargs,
+            metadata={"training_sources": sources, "cross_validation": cv},
+        )
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(model.to_dict(), indent=2) + "\n", encoding="utf-8")
+        report = {"model_version": model.version, "mode": "train", "artifact": args.out.name}
+        report.update(cv)
+    report["training_sources"] = sources
+    report["conflicting_texts_dropped"] = conflicting
+
+    rendered = json.dumps(report, indent=2)
+    if args.report:
+        args.report.write_text(rendered + "\n", encoding="utf-8")
+    print(rendered)
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
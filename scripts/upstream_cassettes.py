@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Record/replay of upstream HTTP exchanges at the client Transport boundary.
+
+Recording wraps each client's default HttpTransport (Richpanel, Shopify,
+ShipStation, OpenAI) via integrations.common.set_transport_factory, so a
+shadow run captures what the real pipeline sent and received. Only the
+service, method, a route template and the sanitized response are kept:
+- request headers and bodies are never stored (auth tokens, prompts);
+- path segments that look like identifiers become ``{id}`` and query values
+  are dropped (only the sorted query keys remain);
+- identity fields in JSON bodies (emails, names, phones, addresses) are
+  replaced by deterministic pseudonyms, so an email in a recorded webhook
+  still matches the same email in a recorded Shopify order; free-text
+  fields go through sanitize_for_openai.
+
+Requests that share a route but serve different callers (OpenAI routing,
+intent and rewrite all POST /v1/chat/completions) are told apart by a
+``variant``: a short hash of the request's system prompt.
+
+Replay serves the recorded responses round-robin per (service, method,
+route, variant), falling back to any variant of the route, and sleeps for
+the recorded latency (scaled; 0 disables sleeping). Unmatched requests get
+a 404 and are counted as misses.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "backend" / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from integrations.common import set_transport_factory  # noqa: E402
+from richpanel_middleware.automation.pii_sanitizer import (  # noqa: E402
+    sanitize_for_openai,
+)
+
+CASSETTE_VERSION = 1
+SERVICES = ("richpanel", "shopify", "shipstation", "openai")
+
+_KEPT_RESPONSE_HEADERS = {
+    "content-type",
+    "retry-after",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+    "x-ratelimit-reset",
+    "x-shopify-shop-api-call-limit",
+}
+_IDENTITY_KEYS = {
+    "email",
+    "customer_email",
+    "contact_email",
+    "phone",
+    "first_name",
+    "last_name",
+    "name",
+    "full_name",
+    "customer_name",
+    "address1",
+    "address2",
+    "street1",
+    "street2",
+    "zip",
+    "postal_code",
+    "company",
+}
+_FREE_TEXT_KEYS = {
+    "body",
+    "message",
+    "text",
+    "customer_message",
+    "subject",
+    "note",
+    "content",
+    "html",
+    "plain_body",
+}
+_ID_SEGMENT = re.compile(r"\d{4,}|^[0-9a-f]{16,}$|^[0-9a-f-]{32,}$", re.IGNORECASE)
+_API_VERSION_SEGMENT = re.compile(r"^\d{4}-\d{2}$")
+# Order names ("#1001") are identity the pipeline matches on, not PII.
+_ORDER_NAME = re.compile(r"^#?\d{3,}$")
+
+
+def route_template(url: str) -> str:
+    """Path with identifier segments collapsed and query values dropped."""
+    parsed = urllib.parse.urlparse(url)
+    segments = []
+    for segment in parsed.path.split("/"):
+        if "@" in segment or "%40" in segment.lower():
+            segment = "{id}"
+        stem, dot, ext = segment.partition(".")
+        if stem and _ID_SEGMENT.search(stem) and not _API_VERSION_SEGMENT.match(stem):
+            segment = "{id}" + (dot + ext if dot else "")
+        segments.append(segment)
+    route = "/".join(segments) or "/"
+    keys = sorted({key for key, _ in urllib.parse.parse_qsl(parsed.query, keep_blank_values=True)})
+    return f"{route}?{'&'.join(keys)}" if keys else route
+
+
+def request_variant(body: Any) -> str:
+    """Hash of the system prompt for chat requests; empty otherwise."""
+    if not body:
+        return ""
+    try:
+        parsed = json.loads(body)
+    except (TypeError, UnicodeDecodeError, ValueError):
+        return ""
+    messages = parsed.get("messages") if isinstance(parsed, dict) else None
+    for message in messages or []:
+        if isinstance(message, dict) and message.get("role") == "system":
+            content = str(message.get("content") or "")
+            return hashlib.sha256(content.encode("utf-8")).hexdigest()[:12]
+    return ""
+
+
+def _pseudonym(value: str, key: str) -> str:
+    digest = hashlib.sha256(value.strip().lower().encode("utf-8")).hexdigest()[:10]
+    if "email" in key or "@" in value:
+        return f"user-{digest}@example.invalid"
+    if key in {"first_name", "last_name", "name", "full_name", "customer_name", "company"}:
+        return f"Name{digest[:6]}"
+    return f"redacted-{digest}"
+
+
+def sanitize_value(value: Any, key: str = "") -> Any:
+    """Pseudonymize identity fields and redact free text, recursively."""
+    if isinstance(value, dict):
+        return {k: sanitize_value(v, str(k).lower()) for k, v in value.items()}
+    if isinstance(value, list):
+        return [sanitize_value(item, key) for item in value]
+    if not isinstance(value, str) or not value:
+        return value
+    if key in _IDENTITY_KEYS:
+        if key == "name" and _ORDER_NAME.match(value):
+            return value
+        return _pseudonym(value, key)
+    if key in _FREE_TEXT_KEYS:
+        return sanitize_for_openai(value, max_chars=None)
+    if "@" in value and "." in value:
+        return _pseudonym(value, "email")
+    return value
+
+
+def sanitize_body(body: bytes) -> str:
+    try:
+        parsed = json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        return sanitize_for_openai(body.decode("utf-8", "replace"), max_chars=None)
+    return json.dumps(sanitize_value(parsed), separators=(",", ":"), sort_keys=True)
+
+
+@dataclass
+class Exchange:
+    service: str
+    method: str
+    route: str
+    status_code: int
+    latency_ms: float
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: str = ""
+    transport_error: bool = False
+    variant: str = ""
+
+
+@dataclass
+class Cassette:
+    exchanges: List[Exchange] = field(default_factory=list)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    recorded_at: str = ""
+    note: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": CASSETTE_VERSION,
+            "recorded_at": self.recorded_at,
+            "note": self.note,
+            "events": self.events,
+            "exchanges": [asdict(exchange) for exchange in self.exchanges],
+        }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2, sort_keys=True), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+        return cls(
+            exchanges=[Exchange(**item) for item in data.get("exchanges", [])],
+            events=list(data.get("events", [])),
+            recorded_at=str(data.get("recorded_at") or ""),
+            note=str(data.get("note") or ""),
+        )
+
+    def fingerprint(self) -> str:
+        encoded = json.dumps(self.to_dict(), sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+@dataclass
+class ReplayedResponse:
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class RecordingTransport:
+    """Delegates to the real transport and records a sanitized exchange."""
+
+    def __init__(self, inner: Any, service: str, recorder: "CassetteRecorder") -> None:
+        self.inner = inner
+        self.service = service
+        self.recorder = recorder
+
+    def send(self, request: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            response = self.inner.send(request)
+        except Exception:
+            self.recorder.add_exchange(
+                Exchange(
+                    service=self.service,
+                    method=request.method.upper(),
+                    route=route_template(request.url),
+                    status_code=0,
+                    latency_ms=round((time.perf_counter() - start) * 1000, 1),
+                    transport_error=True,
+                    variant=request_variant(request.body),
+                )
+            )
+            raise
+        self.recorder.add_exchange(
+            Exchange(
+                service=self.service,
+                method=request.method.upper(),
+                route=route_template(request.url),
+                status_code=int(response.status_code),
+                latency_ms=round((time.perf_counter() - start) * 1000, 1),
+                headers={
+                    str(k).lower(): str(v)
+                    for k, v in (response.headers or {}).items()
+                    if str(k).lower() in _KEPT_RESPONSE_HEADERS
+                },
+                body=sanitize_body(response.body or b""),
+                variant=request_variant(request.body),
+            )
+        )
+        return response
+
+
+class CassetteRecorder:
+    def __init__(self) -> None:
+        self.cassette = Cassette(recorded_at=datetime.now(timezone.utc).isoformat())
+        self._lock = threading.Lock()
+
+    def add_exchange(self, exchange: Exchange) -> None:
+        with self._lock:
+            self.cassette.exchanges.append(exchange)
+
+    def add_event(self, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self.cassette.events.append(sanitize_value(payload))
+
+    def factory(self, service: str, default: Callable[[], Any]) -> Any:
+        return RecordingTransport(default(), service, self)
+
+
+class ReplayTransport:
+    """Serves recorded exchanges for one service, round-robin per route."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        service: str,
+        *,
+        latency_scale: float = 1.0,
+        sleeper: Callable[[float], None] = time.sleep,
+        stats: Optional["ReplayStats"] = None,
+    ) -> None:
+        self.service = service
+        self.latency_scale = latency_scale
+        self.sleeper = sleeper
+        self.stats = stats or ReplayStats()
+        self._routes: Dict[Tuple[str, ...], List[Exchange]] = {}
+        for exchange in cassette.exchanges:
+            if exchange.service == service:
+                route = (exchange.method, exchange.route)
+                self._routes.setdefault(route, []).append(exchange)
+                self._routes.setdefault(route + (exchange.variant,), []).append(exchange)
+        self._cursor: Dict[Tuple[str, ...], int] = {}
+        self._lock = threading.Lock()
+
+    def send(self, request: Any) -> ReplayedResponse:
+        key = (request.method.upper(), route_template(request.url))
+        variant_key = key + (request_variant(getattr(request, "body", None)),)
+        with self._lock:
+            lookup = variant_key if variant_key in self._routes else key
+            candidates = self._routes.get(lookup)
+            if candidates:
+                index = self._cursor.get(lookup, 0)
+                self._cursor[lookup] = index + 1
+                exchange: Optional[Exchange] = candidates[index % len(candidates)]
+            else:
+                exchange = None
+        self.stats.record(self.service, key, hit=exchange is not None)
+        if exchange is None:
+            return ReplayedResponse(
+                status_code=404,
+                headers={"content-type": "application/json"},
+                body=b'{"error":"not_in_cassette"}',
+            )
+        if self.latency_scale > 0 and exchange.latency_ms > 0:
+            self.sleeper(exchange.latency_ms / 1000 * self.latency_scale)
+        if exchange.transport_error:
+            raise transport_error_for(request)
+        return ReplayedResponse(
+            status_code=exchange.status_code,
+            headers=dict(exchange.headers),
+            body=exchange.body.encode("utf-8"),
+        )
+
+
+def transport_error_for(request: Any) -> Exception:
+    # Each client catches its own TransportError class; raise the one that
+    # lives next to the request type it sent.
+    module = sys.modules.get(type(request).__module__)
+    error_cls = getattr(module, "TransportError", None) or OSError
+    return error_cls("replayed transport error")
+
+
+class ReplayStats:
+    def __init__(self) -> None:
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, service: str, key: Tuple[str, str], *, hit: bool) -> None:
+        bucket = self.hits if hit else self.misses
+        label = service if hit else f"{service} {key[0]} {key[1]}"
+        with self._lock:
+            bucket[label] = bucket.get(label, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {"hits": dict(self.hits), "misses": dict(self.misses)}
+
+
+@contextmanager
+def install_transport_factory(
+    factory: Callable[[str, Callable[[], Any]], Any]
+) -> Iterator[None]:
+    previous = set_transport_factory(factory)
+    try:
+        yield
+    finally:
+        set_transport_factory(previous)
+
+
+@contextmanager
+def recording(path: Path, *, note: str = "") -> Iterator[CassetteRecorder]:
+    """Record every upstream exchange made inside the block into ``path``."""
+    recorder = CassetteRecorder()
+    recorder.cassette.note = note
+    with install_transport_factory(recorder.factory):
+        try:
+            yield recorder
+        finally:
+            recorder.cassette.save(Path(path))
+
+
+@contextmanager
+def replaying(
+    cassette: Cassette,
+    *,
+    latency_scale: float = 1.0,
+    sleeper: Callable[[float], None] = time.sleep,
+) -> Iterator[ReplayStats]:
+    """Serve upstream calls made inside the block from ``cassette``."""
+    stats = ReplayStats()
+    transports = {
+        service: ReplayTransport(
+            cassette, service, latency_scale=latency_scale, sleeper=sleeper, stats=stats
+        )
+        for service in SERVICES
+    }
+
+    def _factory(service: str, default: Callable[[], Any]) -> Any:
+        return transports.get(service) or default()
+
+    with install_transport_factory(_factory):
+        yield stats